@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Iterator
+from unittest import mock
+
+import requests
+
+from .synthetic import SyntheticDataset, detail_for, latlng_stream
+
+
+@dataclass
+class ProviderProfile:
+    """Latency and rate-limit behaviour for one stand-in provider."""
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    rate_limit_per_minute: int = 0
+    on_limit: str = "wait"
+
+
+@dataclass
+class ProviderStats:
+    calls: int = 0
+    throttled: int = 0
+    waited_ms: float = 0.0
+    by_method: dict[str, int] = field(default_factory=dict)
+
+
+class ProviderRateLimited(requests.HTTPError):
+    pass
+
+
+class _ProviderGate:
+    def __init__(self, name: str, profile: ProviderProfile, seed: int) -> None:
+        self.name = name
+        self.profile = profile
+        self.stats = ProviderStats()
+        self._lock = threading.Lock()
+        self._tokens = float(profile.rate_limit_per_minute)
+        self._refilled = time.monotonic()
+        self._jitter_state = seed or 1
+
+    def _next_jitter(self) -> float:
+        # Tiny LCG so jitter is deterministic per run without sharing the global random state.
+        self._jitter_state = (1103515245 * self._jitter_state + 12345) % (2**31)
+        return (self._jitter_state / float(2**31) * 2.0 - 1.0) * self.profile.jitter_ms
+
+    def enter(self, method: str) -> None:
+        wait_seconds = 0.0
+        with self._lock:
+            self.stats.calls += 1
+            self.stats.by_method[method] = self.stats.by_method.get(method, 0) + 1
+            limit = self.profile.rate_limit_per_minute
+            if limit > 0:
+                now = time.monotonic()
+                self._tokens = min(float(limit), self._tokens + (now - self._refilled) * limit / 60.0)
+                self._refilled = now
+                if self._tokens < 1.0:
+                    self.stats.throttled += 1
+                    if self.profile.on_limit == "raise":
+                        response = requests.Response()
+                        response.status_code = 429
+                        raise ProviderRateLimited(f"{self.name} rate limit exceeded", response=response)
+                    wait_seconds = (1.0 - self._tokens) * 60.0 / limit
+                    self._tokens = 0.0
+                else:
+                    self._tokens -= 1.0
+            delay_seconds = max(0.0, self.profile.latency_ms + self._next_jitter()) / 1000.0
+        total = wait_seconds + delay_seconds
+        if total > 0:
+            self.stats.waited_ms += wait_seconds * 1000.0
+            time.sleep(total)
+
+
+def _public(item: dict[str, Any]) -> dict[str, Any]:
+    # Every call returns a fresh copy, as decoding an HTTP body would.
+    return {key: value for key, value in item.items() if not key.startswith("_")}
+
+
+def _parse_after(value: Any) -> datetime | None:
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    return None
+
+
+class FakeStravaClient:
+    def __init__(self, dataset: SyntheticDataset, gate: _ProviderGate, *, stream_points: int) -> None:
+        self._dataset = dataset
+        self._gate = gate
+        self._stream_points = stream_points
+        self.updates: list[tuple[int, dict[str, Any]]] = []
+
+    def get_recent_activities(self, per_page: int = 1) -> list[dict[str, Any]]:
+        self._gate.enter("get_recent_activities")
+        return [_public(item) for item in self._dataset.strava_activities[: max(1, int(per_page))]]
+
+    def get_activity_details(self, activity_id: int) -> dict[str, Any]:
+        self._gate.enter("get_activity_details")
+        detail = detail_for(self._dataset, int(activity_id))
+        if detail is None:
+            response = requests.Response()
+            response.status_code = 404
+            raise requests.HTTPError(f"Activity {activity_id} not found", response=response)
+        return _public(detail)
+
+    def get_activity_streams(
+        self,
+        activity_id: int,
+        *,
+        keys: tuple[str, ...] = ("latlng",),
+        key_by_type: bool = True,
+    ) -> Any:
+        self._gate.enter("get_activity_streams")
+        # The summary carries the private loop count the stream generator needs.
+        summary = next(
+            (item for item in self._dataset.strava_activities if int(item["id"]) == int(activity_id)),
+            {},
+        )
+        return latlng_stream(summary, points=self._stream_points, seed=self._dataset.seed)
+
+    def estimate_activity_count(self) -> int | None:
+        self._gate.enter("estimate_activity_count")
+        return len(self._dataset.strava_activities)
+
+    def iter_activities_after(
+        self,
+        after_dt: datetime,
+        per_page: int = 200,
+        *,
+        estimated_total: int | None = None,
+        **_kwargs: Any,
+    ) -> Iterator[dict[str, Any]]:
+        after = _parse_after(after_dt)
+        matching = [
+            item
+            for item in reversed(self._dataset.strava_activities)
+            if after is None or datetime.fromisoformat(item["start_date"].replace("Z", "+00:00")) > after
+        ]
+        for offset in range(0, len(matching), max(1, int(per_page))):
+            self._gate.enter("list_activities_page")
+            for item in matching[offset:offset + per_page]:
+                yield _public(item)
+        if not matching:
+            self._gate.enter("list_activities_page")
+
+    def get_activities_after(self, after_dt: datetime, per_page: int = 200) -> list[dict[str, Any]]:
+        return list(self.iter_activities_after(after_dt, per_page=per_page))
+
+    def update_activity(self, activity_id: int, payload: dict[str, Any]) -> dict[str, Any]:
+        self._gate.enter("update_activity")
+        self.updates.append((int(activity_id), dict(payload)))
+        detail = detail_for(self._dataset, int(activity_id)) or {"id": int(activity_id)}
+        return _public(detail) | dict(payload)
+
+
+class FakeProviders:
+    """Stand-ins for Strava, Smashrun and Intervals.icu driven by a synthetic dataset."""
+
+    def __init__(
+        self,
+        dataset: SyntheticDataset,
+        *,
+        strava: ProviderProfile | None = None,
+        smashrun: ProviderProfile | None = None,
+        intervals: ProviderProfile | None = None,
+        stream_points: int = 1500,
+    ) -> None:
+        self.dataset = dataset
+        self.gates = {
+            "strava": _ProviderGate("strava", strava or ProviderProfile(), dataset.seed),
+            "smashrun": _ProviderGate("smashrun", smashrun or ProviderProfile(), dataset.seed + 1),
+            "intervals": _ProviderGate("intervals", intervals or ProviderProfile(), dataset.seed + 2),
+        }
+        self.stream_points = stream_points
+
+    def strava_client(self, _settings: Any = None) -> FakeStravaClient:
+        return FakeStravaClient(self.dataset, self.gates["strava"], stream_points=self.stream_points)
+
+    def smashrun_activities(
+        self,
+        _token: Any,
+        max_items: int = 600,
+        *,
+        stop_at_activity_id: Any = None,
+    ) -> list[dict[str, Any]]:
+        self.gates["smashrun"].enter("activities")
+        records: list[dict[str, Any]] = []
+        for item in self.dataset.smashrun_activities:
+            if stop_at_activity_id is not None and int(item["activityId"]) <= int(stop_at_activity_id):
+                break
+            records.append(dict(item))
+            if len(records) >= max_items:
+                break
+        return records
+
+    def smashrun_notables(self, _token: Any, latest_activity_id: Any = None) -> list[str]:
+        self.gates["smashrun"].enter("notables")
+        return ["Longest run in 30 days", "Fastest 5K this month"]
+
+    def smashrun_stats(self, _token: Any) -> dict[str, Any]:
+        self.gates["smashrun"].enter("stats")
+        runs = self.dataset.smashrun_activities
+        return {
+            "longestStreak": 41,
+            "totalDistance": round(sum(float(item["distance"] or 0.0) for item in runs) / 1000.0, 1),
+            "runCount": len(runs),
+        }
+
+    def smashrun_badges(self, _token: Any) -> list[dict[str, Any]]:
+        self.gates["smashrun"].enter("badges")
+        newest = self.dataset.smashrun_activities[:3]
+        return [
+            {"badgeName": f"Synthetic Badge {index}", "activityIds": [str(item["activityId"])]}
+            for index, item in enumerate(newest)
+        ]
+
+    def intervals_activity(
+        self,
+        _user_id: Any,
+        _api_key: Any,
+        lookback_days: int = 2,
+        *,
+        strava_activity_id: Any = None,
+        **_kwargs: Any,
+    ) -> dict[str, Any] | None:
+        self.gates["intervals"].enter("activity")
+        record = next(
+            (item for item in self.dataset.intervals_records if item["strava_activity_id"] == str(strava_activity_id)),
+            None,
+        )
+        if record is None:
+            return None
+        return {
+            "icu_ctl": record["avg_fitness"],
+            "icu_atl": record["avg_fatigue"],
+            "ctl": int(round(record["avg_fitness"])),
+            "atl": int(round(record["avg_fatigue"])),
+            "fitness": int(round(record["avg_fitness"])),
+            "fatigue": int(round(record["avg_fatigue"])),
+            "efficiency": f"{record['avg_efficiency_factor']:.2f}",
+            "achievements": [],
+            "training_load": 64,
+            "load": 64,
+            "ramp": 1.4,
+            "ramp_display": "+1.4",
+        }
+
+    def intervals_dashboard_metrics(
+        self,
+        _user_id: Any,
+        _api_key: Any,
+        *,
+        oldest: Any,
+        newest: Any,
+    ) -> list[dict[str, Any]]:
+        self.gates["intervals"].enter("dashboard_metrics")
+        oldest_text = oldest.isoformat() if isinstance(oldest, datetime) else str(oldest or "")
+        return [dict(item) for item in self.dataset.intervals_records if item["start_date"] >= oldest_text[:19]]
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        return {
+            name: {
+                "calls": gate.stats.calls,
+                "throttled": gate.stats.throttled,
+                "waited_ms": round(gate.stats.waited_ms, 1),
+                "by_method": dict(gate.stats.by_method),
+            }
+            for name, gate in self.gates.items()
+        }
+
+    def reset_stats(self) -> None:
+        for gate in self.gates.values():
+            gate.stats = ProviderStats()
+
+    @contextmanager
+    def installed(self) -> Iterator["FakeProviders"]:
+        """Route the pipeline and dashboard provider calls to these stand-ins."""
+        patches = {
+            "chronicle.activity_pipeline.StravaClient": self.strava_client,
+            "chronicle.dashboard_data.StravaClient": self.strava_client,
+            "chronicle.activity_pipeline.get_intervals_activity_data": self.intervals_activity,
+            "chronicle.dashboard_data.get_intervals_dashboard_metrics": self.intervals_dashboard_metrics,
+            "chronicle.pipeline_context_collectors.get_smashrun_activities": self.smashrun_activities,
+            "chronicle.pipeline_context_collectors.get_notables": self.smashrun_notables,
+            "chronicle.pipeline_context_collectors.get_smashrun_stats": self.smashrun_stats,
+            "chronicle.pipeline_context_collectors.get_smashrun_badges": self.smashrun_badges,
+        }
+        with ExitStack() as stack:
+            for target, replacement in patches.items():
+                stack.enter_context(mock.patch(target, replacement))
+            yield self
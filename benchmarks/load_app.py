@@ -0,0 +1,42 @@
+"""Gunicorn entry point for load tests: the real API with stand-in providers.
+
+Each worker regenerates the same synthetic dataset from the CHRONICLE_BENCH_* env so
+background dashboard refreshes never leave the machine.
+"""
+
+from __future__ import annotations
+
+import os
+from datetime import date
+from typing import Any, Callable, Iterable
+
+from .fake_providers import FakeProviders
+from .synthetic import generate_dataset
+
+
+WORKER_PID_HEADER = "X-Chronicle-Worker-Pid"
+SQLITE_BUSY_HEADER = "X-Chronicle-Sqlite-Busy"
+
+_dataset = generate_dataset(
+    years=float(os.environ.get("CHRONICLE_BENCH_YEARS", "3")),
+    seed=int(os.environ.get("CHRONICLE_BENCH_SEED", "1609")),
+    end_date=date.fromisoformat(os.environ["CHRONICLE_BENCH_END_DATE"]) if os.environ.get("CHRONICLE_BENCH_END_DATE") else None,
+)
+# Held open for the life of the worker process.
+_providers_installed = FakeProviders(_dataset).installed()
+_providers_installed.__enter__()
+
+from chronicle.api_server import app as chronicle_app  # noqa: E402
+from chronicle.storage import sqlite_busy_error_count  # noqa: E402
+
+
+def app(environ: dict[str, Any], start_response: Callable[..., Any]) -> Iterable[bytes]:
+    def _start_response(status: str, headers: list[tuple[str, str]], exc_info: Any = None) -> Any:
+        # Lets the harness attribute requests and SQLite lock waits to each worker.
+        headers = list(headers) + [
+            (WORKER_PID_HEADER, str(os.getpid())),
+            (SQLITE_BUSY_HEADER, str(sqlite_busy_error_count())),
+        ]
+        return start_response(status, headers, exc_info)
+
+    return chronicle_app(environ, _start_response)
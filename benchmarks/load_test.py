@@ -0,0 +1,488 @@
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import requests
+
+from .fake_providers import FakeProviders
+from .load_app import SQLITE_BUSY_HEADER, WORKER_PID_HEADER
+from .run import _git_revision
+from .scenarios import benchmark_env, benchmark_environment, seed_plan_state
+from .synthetic import generate_dataset
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+@dataclass(frozen=True)
+class RouteSpec:
+    method: str
+    path: str
+    body: dict[str, Any] | None = None
+
+
+# Dashboard page, Android widget and agent companion polling, plus editor traffic.
+ROUTES: dict[str, RouteSpec] = {
+    "dashboard_data": RouteSpec("GET", "/dashboard/data.json"),
+    "dashboard_summary": RouteSpec("GET", "/dashboard/data.json?mode=summary"),
+    "plan_data": RouteSpec("GET", "/plan/data.json?window_days=14"),
+    "plan_today": RouteSpec("GET", "/plan/today.json"),
+    "editor_profiles": RouteSpec("GET", "/editor/profiles"),
+    "editor_template": RouteSpec("GET", "/editor/template"),
+    "editor_preview": RouteSpec("POST", "/editor/preview", {"context_mode": "sample", "fixture_name": "default"}),
+}
+DEFAULT_ROUTE_MIX = {
+    "dashboard_data": 20,
+    "dashboard_summary": 10,
+    "plan_data": 20,
+    "plan_today": 25,
+    "editor_profiles": 5,
+    "editor_template": 10,
+    "editor_preview": 10,
+}
+DEFAULT_P95_THRESHOLD = 0.20
+DEFAULT_ERROR_RATE_TOLERANCE = 0.01
+
+
+@dataclass
+class RouteSamples:
+    latencies_ms: list[float] = field(default_factory=list)
+    statuses: dict[str, int] = field(default_factory=dict)
+    errors: int = 0
+
+
+def parse_route_mix(raw: str | None) -> dict[str, int]:
+    if not raw:
+        return dict(DEFAULT_ROUTE_MIX)
+    mix: dict[str, int] = {}
+    for part in raw.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in ROUTES:
+            raise ValueError(f"Unknown route '{name}'. Expected one of: {', '.join(sorted(ROUTES))}.")
+        try:
+            mix[name] = int(weight or "1")
+        except ValueError as exc:
+            raise ValueError(f"Route weight for '{name}' must be an integer.") from exc
+    if not any(weight > 0 for weight in mix.values()):
+        raise ValueError("Route mix needs at least one positive weight.")
+    return mix
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def _child_pids(parent_pid: int) -> list[int]:
+    # /proc scan keeps the harness free of extra dependencies; RSS is Linux-only.
+    pids: list[int] = []
+    for entry in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            fields = entry.read_text().rsplit(")", 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        if len(fields) > 1 and fields[1] == str(parent_pid):
+            pids.append(int(entry.parent.name))
+    return sorted(pids)
+
+
+def _rss_kib(pid: int) -> int | None:
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return None
+
+
+class _RssSampler(threading.Thread):
+    def __init__(self, master_pid: int, interval_seconds: float = 0.5) -> None:
+        super().__init__(name="rss-sampler", daemon=True)
+        self.master_pid = master_pid
+        self.interval_seconds = interval_seconds
+        self.peak_kib: dict[int, int] = {}
+        self.last_kib: dict[int, int] = {}
+        self._stop_event = threading.Event()
+
+    def sample(self) -> None:
+        for pid in _child_pids(self.master_pid):
+            rss = _rss_kib(pid)
+            if rss is None:
+                continue
+            self.last_kib[pid] = rss
+            self.peak_kib[pid] = max(rss, self.peak_kib.get(pid, 0))
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval_seconds):
+            self.sample()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join(timeout=5)
+        self.sample()
+
+
+def prepare_state_dir(dataset: Any, state_dir: Path) -> None:
+    """Seed plan rows and a warm dashboard cache the way a running install would have them."""
+    with benchmark_environment(dataset, FakeProviders(dataset), state_dir=state_dir) as context:
+        seed_plan_state(context)
+
+
+def start_server(
+    *,
+    dataset_env: dict[str, str],
+    port: int,
+    workers: int,
+    threads: int,
+    log_path: Path,
+) -> subprocess.Popen:
+    env = os.environ | dataset_env | {"API_WORKERS": str(workers), "API_THREADS": str(threads)}
+    command = [
+        sys.executable,
+        "-m",
+        "gunicorn",
+        "--bind",
+        f"127.0.0.1:{port}",
+        "--workers",
+        str(workers),
+        "--threads",
+        str(threads),
+        "--timeout",
+        "120",
+        "benchmarks.load_app:app",
+    ]
+    with log_path.open("w", encoding="utf-8") as log_file:
+        return subprocess.Popen(command, cwd=REPO_ROOT, env=env, stdout=log_file, stderr=subprocess.STDOUT)
+
+
+def wait_until_ready(base_url: str, process: subprocess.Popen, *, timeout_seconds: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout_seconds
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited early with status {process.returncode}")
+        try:
+            if requests.get(f"{base_url}/health", timeout=2).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f"API did not become ready within {timeout_seconds:.0f}s")
+
+
+def drive_load(
+    base_url: str,
+    *,
+    mix: dict[str, int],
+    rps: float,
+    duration_seconds: float,
+    concurrency: int,
+    seed: int,
+    timeout_seconds: float,
+) -> dict[str, Any]:
+    """Open-loop load: requests start on schedule whether or not earlier ones have finished.
+
+    Latency is measured from each request's scheduled start, so client-side queueing
+    shows up in the percentiles instead of silently lowering the offered rate.
+    """
+    rng = random.Random(seed)
+    names = [name for name, weight in mix.items() if weight > 0]
+    weights = [mix[name] for name in names]
+    total_requests = max(1, int(round(rps * duration_seconds)))
+    plan = [rng.choices(names, weights)[0] for _ in range(total_requests)]
+
+    samples = {name: RouteSamples() for name in names}
+    busy_by_worker: dict[str, int] = {}
+    requests_by_worker: dict[str, int] = {}
+    lock = threading.Lock()
+    local = threading.local()
+
+    def _session() -> requests.Session:
+        session = getattr(local, "session", None)
+        if session is None:
+            session = requests.Session()
+            local.session = session
+        return session
+
+    def _send(name: str, scheduled: float) -> None:
+        spec = ROUTES[name]
+        status_key = "exception"
+        worker_pid = None
+        busy = None
+        try:
+            response = _session().request(spec.method, f"{base_url}{spec.path}", json=spec.body, timeout=timeout_seconds)
+            _ = response.content  # time the full body, not just the headers
+            status_key = str(response.status_code)
+            worker_pid = response.headers.get(WORKER_PID_HEADER)
+            busy = response.headers.get(SQLITE_BUSY_HEADER)
+        except requests.RequestException:
+            pass
+        latency_ms = (time.perf_counter() - scheduled) * 1000.0
+        with lock:
+            route = samples[name]
+            route.latencies_ms.append(latency_ms)
+            route.statuses[status_key] = route.statuses.get(status_key, 0) + 1
+            if status_key == "exception" or status_key.startswith("5"):
+                route.errors += 1
+            if worker_pid:
+                requests_by_worker[worker_pid] = requests_by_worker.get(worker_pid, 0) + 1
+                if busy and busy.isdigit():
+                    busy_by_worker[worker_pid] = max(int(busy), busy_by_worker.get(worker_pid, 0))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="load") as executor:
+        for index, name in enumerate(plan):
+            scheduled = started + index / rps
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(_send, name, scheduled)
+    elapsed = time.perf_counter() - started
+
+    routes = {name: summarize_route(route) for name, route in samples.items()}
+    completed = sum(item["requests"] for item in routes.values())
+    errors = sum(item["errors"] for item in routes.values())
+    all_latencies = sorted(value for route in samples.values() for value in route.latencies_ms)
+    return {
+        "elapsed_seconds": round(elapsed, 3),
+        "requests": completed,
+        "achieved_rps": round(completed / elapsed, 2) if elapsed > 0 else None,
+        "errors": errors,
+        "error_rate": round(errors / completed, 4) if completed else 0.0,
+        "latency_ms": _latency_summary(all_latencies),
+        "routes": routes,
+        "sqlite_busy_errors": sum(busy_by_worker.values()),
+        "requests_by_worker": requests_by_worker,
+    }
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    index = max(0, min(len(sorted_values) - 1, math.ceil(fraction * len(sorted_values)) - 1))
+    return round(sorted_values[index], 3)
+
+
+def _latency_summary(sorted_values: list[float]) -> dict[str, float | None]:
+    if not sorted_values:
+        return {"p50": None, "p90": None, "p95": None, "p99": None, "max": None}
+    return {
+        "p50": _percentile(sorted_values, 0.50),
+        "p90": _percentile(sorted_values, 0.90),
+        "p95": _percentile(sorted_values, 0.95),
+        "p99": _percentile(sorted_values, 0.99),
+        "max": round(sorted_values[-1], 3),
+    }
+
+
+def summarize_route(route: RouteSamples) -> dict[str, Any]:
+    count = len(route.latencies_ms)
+    return {
+        "requests": count,
+        "errors": route.errors,
+        "error_rate": round(route.errors / count, 4) if count else 0.0,
+        "statuses": dict(sorted(route.statuses.items())),
+        "latency_ms": _latency_summary(sorted(route.latencies_ms)),
+    }
+
+
+def compare_load_results(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    *,
+    p95_threshold: float,
+    error_rate_tolerance: float,
+) -> list[dict[str, Any]]:
+    rows: list[dict[str, Any]] = []
+    baseline_routes = ((baseline.get("load") or {}).get("routes") or {}) if isinstance(baseline, dict) else {}
+    for name, route in sorted(((current.get("load") or {}).get("routes") or {}).items()):
+        previous = baseline_routes.get(name)
+        p95 = route["latency_ms"]["p95"]
+        previous_p95 = (previous or {}).get("latency_ms", {}).get("p95") if isinstance(previous, dict) else None
+        if not previous_p95 or p95 is None:
+            rows.append({"route": name, "status": "new", "p95_ms": p95, "error_rate": route["error_rate"]})
+            continue
+        change = (p95 - previous_p95) / previous_p95
+        error_delta = route["error_rate"] - float(previous.get("error_rate") or 0.0)
+        regressed = change > p95_threshold or error_delta > error_rate_tolerance
+        rows.append(
+            {
+                "route": name,
+                "status": "regressed" if regressed else ("improved" if change < -p95_threshold else "unchanged"),
+                "baseline_p95_ms": previous_p95,
+                "p95_ms": p95,
+                "p95_change_pct": round(change * 100.0, 1),
+                "baseline_error_rate": previous.get("error_rate"),
+                "error_rate": route["error_rate"],
+            }
+        )
+    return rows
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.load_test",
+        description="Boot the API under gunicorn on a synthetic state dir and drive a route mix at a target RPS.",
+    )
+    parser.add_argument("--rps", type=float, default=20.0, help="Target requests per second (open loop).")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of load after warmup.")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Seconds of unrecorded load before measuring.")
+    parser.add_argument("--concurrency", type=int, default=32, help="Client threads available to in-flight requests.")
+    parser.add_argument("--mix", help="Weighted routes, e.g. plan_today=50,dashboard_data=50. Default mixes every route.")
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn workers (API_WORKERS).")
+    parser.add_argument("--threads", type=int, default=4, help="gunicorn threads per worker (API_THREADS).")
+    parser.add_argument("--years", type=float, default=3.0)
+    parser.add_argument("--seed", type=int, default=1609)
+    parser.add_argument("--request-timeout", type=float, default=30.0)
+    parser.add_argument("--state-dir", type=Path, help="Keep the synthetic state dir here instead of a temp dir.")
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--compare", type=Path, help="Baseline load results JSON.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_P95_THRESHOLD, help="Per-route p95 regression tolerance.")
+    parser.add_argument(
+        "--error-rate-tolerance",
+        type=float,
+        default=DEFAULT_ERROR_RATE_TOLERANCE,
+        help="Allowed absolute increase in a route's error rate.",
+    )
+    args = parser.parse_args(argv)
+    if args.rps <= 0 or args.duration <= 0:
+        parser.error("--rps and --duration must be positive")
+    try:
+        args.mix = parse_route_mix(args.mix)
+    except ValueError as exc:
+        parser.error(str(exc))
+    return args
+
+
+def run_load_test(args: argparse.Namespace) -> dict[str, Any]:
+    # The plan widget asks for today, so the synthetic history ends today.
+    end_date = date.today()
+    dataset = generate_dataset(years=args.years, seed=args.seed, end_date=end_date)
+    with tempfile.TemporaryDirectory(prefix="chronicle-load-") as tmpdir:
+        state_dir = args.state_dir or Path(tmpdir)
+        state_dir.mkdir(parents=True, exist_ok=True)
+        prepare_state_dir(dataset, state_dir)
+        dataset_env = benchmark_env(dataset, state_dir) | {
+            "CHRONICLE_BENCH_YEARS": str(args.years),
+            "CHRONICLE_BENCH_SEED": str(args.seed),
+            "CHRONICLE_BENCH_END_DATE": end_date.isoformat(),
+        }
+        port = _free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        log_path = Path(tmpdir) / "gunicorn.log"
+        process = start_server(
+            dataset_env=dataset_env,
+            port=port,
+            workers=args.workers,
+            threads=args.threads,
+            log_path=log_path,
+        )
+        sampler = _RssSampler(process.pid)
+        try:
+            wait_until_ready(base_url, process)
+            if args.warmup > 0:
+                drive_load(
+                    base_url,
+                    mix=args.mix,
+                    rps=args.rps,
+                    duration_seconds=args.warmup,
+                    concurrency=args.concurrency,
+                    seed=args.seed + 1,
+                    timeout_seconds=args.request_timeout,
+                )
+            sampler.start()
+            load = drive_load(
+                base_url,
+                mix=args.mix,
+                rps=args.rps,
+                duration_seconds=args.duration,
+                concurrency=args.concurrency,
+                seed=args.seed,
+                timeout_seconds=args.request_timeout,
+            )
+        except Exception:
+            print(log_path.read_text(encoding="utf-8", errors="replace")[-4000:], file=sys.stderr)
+            raise
+        finally:
+            if sampler.is_alive():
+                sampler.stop()
+            process.terminate()
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    workers = {
+        str(pid): {
+            "rss_peak_mb": round(sampler.peak_kib[pid] / 1024.0, 1),
+            "rss_last_mb": round(sampler.last_kib.get(pid, 0) / 1024.0, 1),
+            "requests": load["requests_by_worker"].get(str(pid), 0),
+        }
+        for pid in sorted(sampler.peak_kib)
+    }
+    return {
+        "meta": {
+            "generated_at_utc": datetime.now(timezone.utc).isoformat(),
+            "git_revision": _git_revision(),
+            "target_rps": args.rps,
+            "duration_seconds": args.duration,
+            "warmup_seconds": args.warmup,
+            "concurrency": args.concurrency,
+            "api_workers": args.workers,
+            "api_threads": args.threads,
+            "mix": args.mix,
+            "years": args.years,
+            "seed": args.seed,
+            "activities": len(dataset.strava_activities),
+        },
+        "load": load,
+        "workers": workers,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    results = run_load_test(args)
+    exit_code = 0
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        rows = compare_load_results(
+            results,
+            baseline,
+            p95_threshold=args.threshold,
+            error_rate_tolerance=args.error_rate_tolerance,
+        )
+        results["comparison"] = {
+            "baseline": str(args.compare),
+            "baseline_git_revision": (baseline.get("meta") or {}).get("git_revision"),
+            "p95_threshold": args.threshold,
+            "error_rate_tolerance": args.error_rate_tolerance,
+            "rows": rows,
+        }
+        if any(row["status"] == "regressed" for row in rows):
+            exit_code = 1
+
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text + "\n", encoding="utf-8")
+    print(text)
+    return exit_code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import math
+import platform
+import subprocess
+import sys
+import time
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from .fake_providers import FakeProviders, ProviderProfile
+from .scenarios import SCENARIOS, benchmark_environment
+from .synthetic import generate_dataset
+
+
+DEFAULT_REGRESSION_THRESHOLD = 0.15
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    index = max(0, min(len(sorted_values) - 1, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def _summarize(samples_ms: list[float]) -> dict[str, Any]:
+    ordered = sorted(samples_ms)
+    return {
+        "iterations": len(ordered),
+        "min_ms": round(ordered[0], 3),
+        "p50_ms": round(_percentile(ordered, 0.50), 3),
+        "p95_ms": round(_percentile(ordered, 0.95), 3),
+        "max_ms": round(ordered[-1], 3),
+        "mean_ms": round(sum(ordered) / len(ordered), 3),
+    }
+
+
+def _git_revision() -> str | None:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+            cwd=Path(__file__).resolve().parent,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return completed.stdout.strip() or None if completed.returncode == 0 else None
+
+
+def run_scenario(name: str, args: argparse.Namespace, dataset: Any) -> dict[str, Any]:
+    scenario = SCENARIOS[name]
+    profile = ProviderProfile(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_limit_per_minute=args.rate_limit_per_minute,
+        on_limit=args.on_rate_limit,
+    )
+    providers = FakeProviders(
+        dataset,
+        strava=profile,
+        smashrun=profile,
+        intervals=profile,
+        stream_points=args.stream_points,
+    )
+    with benchmark_environment(dataset, providers) as context:
+        state = scenario.setup(context)
+        for _ in range(args.warmup):
+            scenario.run(context, state)
+        # Provider stats cover the measured iterations only.
+        providers.reset_stats()
+        samples: list[float] = []
+        for _ in range(args.iterations):
+            started = time.perf_counter()
+            scenario.run(context, state)
+            samples.append((time.perf_counter() - started) * 1000.0)
+    return {"description": scenario.description} | _summarize(samples) | {"providers": providers.stats()}
+
+
+def compare_results(current: dict[str, Any], baseline: dict[str, Any], *, threshold: float) -> list[dict[str, Any]]:
+    rows: list[dict[str, Any]] = []
+    baseline_scenarios = baseline.get("scenarios") if isinstance(baseline, dict) else None
+    for name, result in sorted((current.get("scenarios") or {}).items()):
+        previous = (baseline_scenarios or {}).get(name)
+        if not isinstance(previous, dict) or not previous.get("p50_ms"):
+            rows.append({"scenario": name, "status": "new", "p50_ms": result["p50_ms"]})
+            continue
+        change = (result["p50_ms"] - previous["p50_ms"]) / previous["p50_ms"]
+        status = "regressed" if change > threshold else ("improved" if change < -threshold else "unchanged")
+        rows.append(
+            {
+                "scenario": name,
+                "status": status,
+                "baseline_p50_ms": previous["p50_ms"],
+                "p50_ms": result["p50_ms"],
+                "change_pct": round(change * 100.0, 1),
+            }
+        )
+    return rows
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.run",
+        description="Run offline Chronicle benchmarks against synthetic data and stand-in providers.",
+    )
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="Repeat to pick several; default runs all.")
+    parser.add_argument("--years", type=float, default=3.0, help="Years of synthetic history (default 3).")
+    parser.add_argument("--seed", type=int, default=1609)
+    parser.add_argument("--end-date", default="2026-03-01", help="Last synthetic activity date, YYYY-MM-DD.")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Per-call latency added by every stand-in provider.")
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--rate-limit-per-minute", type=int, default=0, help="Token-bucket limit per provider; 0 disables it.")
+    parser.add_argument("--on-rate-limit", choices=("wait", "raise"), default="wait")
+    parser.add_argument("--stream-points", type=int, default=1500, help="latlng points per synthetic activity stream.")
+    parser.add_argument("--output", type=Path, help="Write the JSON results here as well as to stdout.")
+    parser.add_argument("--compare", type=Path, help="Baseline results JSON from an earlier run.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD, help="p50 regression tolerance (0.15 = 15%%).")
+    args = parser.parse_args(argv)
+    if args.iterations < 1:
+        parser.error("--iterations must be at least 1")
+    if args.warmup < 0:
+        parser.error("--warmup must not be negative")
+    try:
+        args.end_date = date.fromisoformat(args.end_date)
+    except ValueError:
+        parser.error("--end-date must be YYYY-MM-DD")
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    dataset = generate_dataset(years=args.years, seed=args.seed, end_date=args.end_date)
+    results: dict[str, Any] = {
+        "meta": {
+            "generated_at_utc": datetime.now(timezone.utc).isoformat(),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "years": args.years,
+            "seed": args.seed,
+            "end_date": args.end_date.isoformat(),
+            "activities": len(dataset.strava_activities),
+            "plan_days": len(dataset.plan_days),
+            "iterations": args.iterations,
+            "warmup": args.warmup,
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "rate_limit_per_minute": args.rate_limit_per_minute,
+        },
+        "scenarios": {},
+    }
+    for name in args.scenario or list(SCENARIOS):
+        print(f"running {name} ...", file=sys.stderr)
+        results["scenarios"][name] = run_scenario(name, args, dataset)
+
+    exit_code = 0
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        comparison = compare_results(results, baseline, threshold=args.threshold)
+        results["comparison"] = {
+            "baseline": str(args.compare),
+            "baseline_git_revision": (baseline.get("meta") or {}).get("git_revision"),
+            "threshold": args.threshold,
+            "rows": comparison,
+        }
+        if any(row["status"] == "regressed" for row in comparison):
+            exit_code = 1
+
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text + "\n", encoding="utf-8")
+    print(text)
+    return exit_code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from chronicle.config import Settings, get_settings, invalidate_settings_cache
+
+from .fake_providers import FakeProviders
+from .synthetic import SyntheticDataset
+
+
+BENCHMARK_ENV = {
+    "STRAVA_CLIENT_ID": "benchmark",
+    "STRAVA_CLIENT_SECRET": "benchmark",
+    "STRAVA_REFRESH_TOKEN": "benchmark",
+    "STRAVA_ACCESS_TOKEN": "benchmark",
+    "SMASHRUN_ACCESS_TOKEN": "benchmark",
+    "INTERVALS_API_KEY": "benchmark",
+    "INTERVALS_USER_ID": "i0",
+    "TIMEZONE": "America/New_York",
+    # Garmin and weather have no stand-ins; their collectors are switched off.
+    "ENABLE_GARMIN": "false",
+    "ENABLE_WEATHER": "false",
+    "ENABLE_CRONO_API": "false",
+    "ENABLE_QUIET_HOURS": "false",
+    "ENABLE_PIPELINE_TRACE": "false",
+    "LOG_LEVEL": "WARNING",
+}
+PLAN_WINDOWS_DAYS = (7, 14, 28, 56)
+INCREMENTAL_NEW_ACTIVITIES = 3
+
+
+@dataclass
+class Scenario:
+    name: str
+    description: str
+    setup: Callable[["BenchmarkContext"], Any]
+    run: Callable[["BenchmarkContext", Any], Any]
+
+
+@dataclass
+class BenchmarkContext:
+    dataset: SyntheticDataset
+    providers: FakeProviders
+    state_dir: Path
+
+    @property
+    def settings(self) -> Settings:
+        return get_settings()
+
+
+def benchmark_env(dataset: SyntheticDataset, state_dir: Path) -> dict[str, str]:
+    return BENCHMARK_ENV | {"DASHBOARD_START_DATE": dataset.start_date.isoformat(), "STATE_DIR": str(state_dir)}
+
+
+@contextmanager
+def benchmark_environment(
+    dataset: SyntheticDataset,
+    providers: FakeProviders,
+    *,
+    state_dir: Path | None = None,
+) -> Iterator[BenchmarkContext]:
+    """Isolated state dir and provider env for one scenario; restores the process env afterwards."""
+    with tempfile.TemporaryDirectory(prefix="chronicle-bench-") as tmpdir:
+        resolved_state_dir = state_dir or Path(tmpdir)
+        overrides = benchmark_env(dataset, resolved_state_dir)
+        previous = {key: os.environ.get(key) for key in overrides}
+        os.environ.update(overrides)
+        invalidate_settings_cache()
+        try:
+            with providers.installed():
+                yield BenchmarkContext(dataset=dataset, providers=providers, state_dir=resolved_state_dir)
+        finally:
+            for key, value in previous.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+            invalidate_settings_cache()
+
+
+def _run_once_setup(_context: BenchmarkContext) -> None:
+    return None
+
+
+def _run_once(context: BenchmarkContext, _state: Any) -> Any:
+    from chronicle.activity_pipeline import run_once
+
+    result = run_once(force_update=True)
+    if str(result.get("status") or "") == "error":
+        raise RuntimeError(f"run_once failed: {result}")
+    return result
+
+
+def _dashboard_full_setup(_context: BenchmarkContext) -> None:
+    return None
+
+
+def _dashboard_full(context: BenchmarkContext, _state: Any) -> Any:
+    from chronicle.dashboard_data import build_dashboard_payload
+
+    return build_dashboard_payload(context.settings)
+
+
+def _dashboard_incremental_setup(context: BenchmarkContext) -> dict[str, Any]:
+    from chronicle.dashboard_data import _normalize_dashboard_payload, build_dashboard_payload
+
+    # Build the cache from a history missing the newest few activities, then revalidate against the full one.
+    older = replace(
+        context.dataset,
+        strava_activities=context.dataset.strava_activities[INCREMENTAL_NEW_ACTIVITIES:],
+    )
+    with FakeProviders(older).installed():
+        cached = _normalize_dashboard_payload(build_dashboard_payload(context.settings), context.settings)
+    return cached
+
+
+def _dashboard_incremental(context: BenchmarkContext, cached: dict[str, Any]) -> Any:
+    from chronicle.dashboard_data import _smart_revalidate_payload, dashboard_data_path
+
+    settings = context.settings
+    payload = _smart_revalidate_payload(settings, dashboard_data_path(settings), cached)
+    if payload.get("sync_mode") != "incremental":
+        raise RuntimeError(f"expected an incremental revalidation, got {payload.get('sync_mode')!r}")
+    return payload
+
+
+def seed_plan_state(context: BenchmarkContext) -> None:
+    from chronicle.dashboard_data import _normalize_dashboard_payload, build_dashboard_payload, dashboard_data_path
+    from chronicle.storage import upsert_plan_days_bulk, write_json
+
+    settings = context.settings
+    if not upsert_plan_days_bulk(settings.processed_log_file, days=context.dataset.plan_days):
+        raise RuntimeError("could not seed plan days")
+    # Plan rows join against the cached dashboard activities for actual miles.
+    payload = _normalize_dashboard_payload(build_dashboard_payload(settings), settings)
+    write_json(dashboard_data_path(settings), payload)
+    return None
+
+
+def _plan_window_runner(window_days: int) -> Callable[[BenchmarkContext, Any], Any]:
+    def _run(context: BenchmarkContext, _state: Any) -> Any:
+        from chronicle.plan_data import get_plan_payload
+
+        return get_plan_payload(
+            context.settings,
+            center_date=context.dataset.end_date.isoformat(),
+            window_days=window_days,
+            today_local=context.dataset.end_date,
+        )
+
+    return _run
+
+
+def _plan_range(context: BenchmarkContext, _state: Any) -> Any:
+    from chronicle.plan_data import get_plan_payload
+
+    end = context.dataset.end_date
+    return get_plan_payload(
+        context.settings,
+        start_date=(end - timedelta(days=180)).isoformat(),
+        end_date=(end + timedelta(days=90)).isoformat(),
+        today_local=end,
+    )
+
+
+def _template_setup(_context: BenchmarkContext) -> dict[str, Any]:
+    from chronicle.description_template import get_sample_template_context
+
+    return get_sample_template_context("default")
+
+
+def _template_render(context: BenchmarkContext, sample_context: dict[str, Any]) -> Any:
+    from chronicle.description_template import render_with_active_template
+
+    result = render_with_active_template(context.settings, sample_context, allow_seed_fallback=True)
+    if not result.get("ok", True):
+        raise RuntimeError(f"template render failed: {result.get('error')}")
+    return result
+
+
+def _profile_setup(context: BenchmarkContext) -> list[dict[str, Any]]:
+    from .synthetic import detail_for
+
+    return [
+        detail
+        for detail in (detail_for(context.dataset, int(item["id"])) for item in context.dataset.strava_activities[:100])
+        if detail is not None
+    ]
+
+
+def _profile_selection(context: BenchmarkContext, details: list[dict[str, Any]]) -> Any:
+    from chronicle.activity_pipeline import _select_activity_profile
+
+    settings = context.settings
+    return [_select_activity_profile(settings, detail) for detail in details]
+
+
+SCENARIOS: dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in [
+        Scenario("run_once", "One forced worker cycle against the stand-in providers.", _run_once_setup, _run_once),
+        Scenario(
+            "dashboard_full",
+            "Full dashboard payload build over the synthetic history.",
+            _dashboard_full_setup,
+            _dashboard_full,
+        ),
+        Scenario(
+            "dashboard_incremental",
+            f"Smart revalidation of a cached dashboard after {INCREMENTAL_NEW_ACTIVITIES} new activities.",
+            _dashboard_incremental_setup,
+            _dashboard_incremental,
+        ),
+        *[
+            Scenario(
+                f"plan_window_{window}d",
+                f"Plan payload centred on the last synthetic day with a {window}-day window.",
+                seed_plan_state,
+                _plan_window_runner(window),
+            )
+            for window in PLAN_WINDOWS_DAYS
+        ],
+        Scenario("plan_range", "Plan payload over an explicit nine-month date range.", seed_plan_state, _plan_range),
+        Scenario("template_render", "Active template render of the default sample context.", _template_setup, _template_render),
+        Scenario(
+            "profile_selection",
+            "Template profile selection for the 100 newest synthetic activities.",
+            _profile_setup,
+            _profile_selection,
+        ),
+    ]
+}
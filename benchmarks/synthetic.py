@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import math
+import random
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+
+
+# A few loops pass through the Royale Hill geofence so summit counting has real work to do.
+HOME_LATITUDE = 34.2402
+HOME_LONGITUDE = -83.9701
+SUMMIT_LATITUDE = 34.24659
+SUMMIT_LONGITUDE = -83.96339
+
+_SPORT_MIX = (
+    ("Run", 0.62),
+    ("TrailRun", 0.12),
+    ("Ride", 0.1),
+    ("Walk", 0.08),
+    ("WeightTraining", 0.05),
+    ("Hike", 0.03),
+)
+_RUN_TYPES = ("Easy", "Recovery", "SOS", "Long Road", "Long Trail", "Race")
+_WORKOUT_CODES = ("Easy-5", "Tempo-6", "Strides", "Hills-8x1", "Long-14")
+
+
+@dataclass
+class SyntheticDataset:
+    seed: int
+    start_date: date
+    end_date: date
+    # Newest first, like GET /athlete/activities.
+    strava_activities: list[dict[str, Any]]
+    smashrun_activities: list[dict[str, Any]]
+    intervals_records: list[dict[str, Any]]
+    plan_days: list[dict[str, Any]]
+    details: dict[int, dict[str, Any]] = field(default_factory=dict)
+
+    def activity_by_id(self, activity_id: int) -> dict[str, Any] | None:
+        detail = self.details.get(int(activity_id))
+        if detail is not None:
+            return detail
+        return next((item for item in self.strava_activities if int(item["id"]) == int(activity_id)), None)
+
+
+def _pick_sport(rng: random.Random) -> str:
+    roll = rng.random()
+    cumulative = 0.0
+    for sport, weight in _SPORT_MIX:
+        cumulative += weight
+        if roll <= cumulative:
+            return sport
+    return _SPORT_MIX[0][0]
+
+
+def _strava_activity(rng: random.Random, activity_id: int, start_utc: datetime, sport: str) -> dict[str, Any]:
+    is_run = sport in {"Run", "TrailRun"}
+    distance_m = 0.0
+    if sport != "WeightTraining":
+        miles = rng.lognormvariate(1.6, 0.45) if is_run else rng.uniform(2.0, 30.0)
+        distance_m = round(min(miles, 30.0) * 1609.34, 1)
+    pace_s_per_m = rng.uniform(0.31, 0.42) if is_run else rng.uniform(0.12, 0.6)
+    moving_time = int(distance_m * pace_s_per_m) if distance_m else rng.randint(1800, 4200)
+    gain_per_mile_ft = rng.uniform(180, 420) if sport == "TrailRun" else rng.uniform(20, 140)
+    elevation_gain_m = round((distance_m / 1609.34) * gain_per_mile_ft / 3.28084, 1)
+    start_local = start_utc - timedelta(hours=5)
+    return {
+        "id": activity_id,
+        "name": f"Synthetic {sport} {activity_id}",
+        "type": "Run" if sport == "TrailRun" else sport,
+        "sport_type": sport,
+        "start_date": start_utc.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "start_date_local": start_local.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "timezone": "(GMT-05:00) America/New_York",
+        "distance": distance_m,
+        "moving_time": moving_time,
+        "elapsed_time": int(moving_time * rng.uniform(1.0, 1.15)),
+        "total_elevation_gain": elevation_gain_m,
+        "average_speed": round(distance_m / moving_time, 3) if moving_time and distance_m else 0.0,
+        "max_speed": round(distance_m / moving_time * 1.6, 3) if moving_time and distance_m else 0.0,
+        "average_heartrate": round(rng.uniform(128, 162), 1) if is_run else None,
+        "max_heartrate": round(rng.uniform(165, 188), 1) if is_run else None,
+        "calories": round(distance_m / 1609.34 * rng.uniform(95, 125), 1),
+        "start_latlng": [HOME_LATITUDE, HOME_LONGITUDE],
+        "map": {"summary_polyline": ""},
+        "_summit_loops": rng.randint(1, 6) if is_run and rng.random() < 0.2 else 0,
+    }
+
+
+def _detail_for(summary: dict[str, Any]) -> dict[str, Any]:
+    detail = {key: value for key, value in summary.items() if not key.startswith("_")}
+    detail["description"] = ""
+    detail["gear_id"] = "g-synthetic"
+    detail["device_name"] = "Synthetic Watch"
+    return detail
+
+
+def latlng_stream(activity: dict[str, Any], *, points: int = 1500, seed: int = 0) -> dict[str, Any]:
+    rng = random.Random(f"{seed}:{activity.get('id')}")
+    loops = int(activity.get("_summit_loops") or 0)
+    distance_m = float(activity.get("distance") or 0.0)
+    if distance_m <= 0:
+        return {"latlng": {"data": [], "series_type": "distance", "original_size": 0, "resolution": "high"}}
+    data: list[list[float]] = []
+    radius = min(0.02, distance_m / 1609.34 * 0.0012)
+    for index in range(points):
+        theta = (2.0 * math.pi * index / points) * max(1, loops or 1)
+        if loops:
+            # Out-and-back spokes from home through the summit.
+            phase = abs(math.sin(theta / 2.0))
+            lat = HOME_LATITUDE + (SUMMIT_LATITUDE - HOME_LATITUDE) * phase
+            lon = HOME_LONGITUDE + (SUMMIT_LONGITUDE - HOME_LONGITUDE) * phase
+        else:
+            lat = HOME_LATITUDE + radius * math.sin(theta)
+            lon = HOME_LONGITUDE + radius * math.cos(theta)
+        data.append([round(lat + rng.gauss(0, 0.00002), 6), round(lon + rng.gauss(0, 0.00002), 6)])
+    return {"latlng": {"data": data, "series_type": "distance", "original_size": points, "resolution": "high"}}
+
+
+def _smashrun_record(rng: random.Random, smashrun_id: int, activity: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "activityId": smashrun_id,
+        "externalId": str(activity["id"]),
+        "startDateTimeLocal": activity["start_date_local"],
+        "startDateTimeUtc": activity["start_date"],
+        "distance": activity["distance"],
+        "duration": activity["moving_time"],
+        "elevationGain": activity["total_elevation_gain"],
+        "heartRateAverage": activity.get("average_heartrate"),
+        "cadenceAverage": round(rng.uniform(164, 182), 1),
+    }
+
+
+def _intervals_record(rng: random.Random, activity: dict[str, Any], fitness: float, fatigue: float) -> dict[str, Any]:
+    return {
+        "strava_activity_id": str(activity["id"]),
+        "start_date": activity["start_date"],
+        "avg_pace_mps": activity["average_speed"] or None,
+        "avg_efficiency_factor": round(rng.uniform(1.1, 1.9), 3),
+        "avg_fitness": round(fitness, 2),
+        "avg_fatigue": round(fatigue, 2),
+        "moving_time_seconds": activity["moving_time"],
+    }
+
+
+def _plan_days(rng: random.Random, start: date, end: date) -> list[dict[str, Any]]:
+    days: list[dict[str, Any]] = []
+    current = start
+    while current <= end:
+        run_type = rng.choice(_RUN_TYPES) if rng.random() < 0.85 else ""
+        sessions: list[dict[str, Any]] = []
+        if run_type:
+            sessions.append(
+                {
+                    "planned_miles": round(rng.uniform(3.0, 16.0), 1),
+                    "run_type": run_type,
+                    "workout_code": rng.choice(_WORKOUT_CODES) if run_type == "SOS" else "",
+                }
+            )
+            if rng.random() < 0.15:
+                sessions.append({"planned_miles": round(rng.uniform(2.0, 5.0), 1), "run_type": "Recovery"})
+        days.append(
+            {
+                "date_local": current.isoformat(),
+                "timezone_name": "America/New_York",
+                "run_type": run_type,
+                "planned_total_miles": round(sum(item["planned_miles"] for item in sessions), 1) if sessions else 0.0,
+                "notes": "synthetic" if rng.random() < 0.05 else "",
+                "sessions": sessions,
+            }
+        )
+        current += timedelta(days=1)
+    return days
+
+
+def generate_dataset(
+    *,
+    years: float = 3.0,
+    seed: int = 1609,
+    end_date: date | None = None,
+    activities_per_week: float = 6.0,
+    plan_days_ahead: int = 120,
+) -> SyntheticDataset:
+    """Deterministic multi-source history: the same arguments always yield the same records."""
+    rng = random.Random(seed)
+    end = end_date or date(2026, 3, 1)
+    start = end - timedelta(days=int(round(365.25 * years)))
+    daily_probability = min(1.0, activities_per_week / 7.0)
+
+    activities: list[dict[str, Any]] = []
+    activity_id = 10_000_000_000
+    current = start
+    while current <= end:
+        sessions_today = 0
+        if rng.random() < daily_probability:
+            sessions_today = 2 if rng.random() < 0.08 else 1
+        for session in range(sessions_today):
+            activity_id += rng.randint(1, 9)
+            start_utc = datetime(current.year, current.month, current.day, tzinfo=timezone.utc) + timedelta(
+                hours=10 + session * 8,
+                minutes=rng.randint(0, 59),
+            )
+            activities.append(_strava_activity(rng, activity_id, start_utc, _pick_sport(rng)))
+        current += timedelta(days=1)
+
+    smashrun: list[dict[str, Any]] = []
+    intervals: list[dict[str, Any]] = []
+    fitness = 35.0
+    fatigue = 35.0
+    for index, activity in enumerate(activities):
+        load = float(activity["moving_time"]) / 60.0
+        fitness += (load - fitness) / 42.0
+        fatigue += (load - fatigue) / 7.0
+        if activity["sport_type"] in {"Run", "TrailRun", "Walk"}:
+            smashrun.append(_smashrun_record(rng, 50_000_000 + index, activity))
+        if activity["distance"]:
+            intervals.append(_intervals_record(rng, activity, fitness, fatigue))
+
+    activities.reverse()
+    smashrun.reverse()
+    dataset = SyntheticDataset(
+        seed=seed,
+        start_date=start,
+        end_date=end,
+        strava_activities=activities,
+        smashrun_activities=smashrun,
+        intervals_records=intervals,
+        plan_days=_plan_days(rng, start, end + timedelta(days=plan_days_ahead)),
+    )
+    for activity in activities[:50]:
+        dataset.details[int(activity["id"])] = _detail_for(activity)
+    return dataset
+
+
+def detail_for(dataset: SyntheticDataset, activity_id: int) -> dict[str, Any] | None:
+    detail = dataset.details.get(int(activity_id))
+    if detail is not None:
+        return detail
+    summary = dataset.activity_by_id(activity_id)
+    if summary is None:
+        return None
+    detail = _detail_for(summary)
+    dataset.details[int(activity_id)] = detail
+    return detail
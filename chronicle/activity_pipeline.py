@@ -1,18 +1,22 @@
 from __future__ import annotations
 
 import argparse
+import base64
+import binascii
 import hashlib
 import json
 import logging
 import math
 import os
+import threading
 import time
 import uuid
 from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
 from typing import Any
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from .config import Settings
+from .config import Settings, get_settings
 from .pipeline_context_collectors import (
     collect_crono_context as _collect_crono_context_impl,
     collect_smashrun_context as _collect_smashrun_context_impl,
@@ -20,9 +24,22 @@ from .pipeline_context_collectors import (
 )
 from .numeric_utils import (
     as_float as _shared_as_float,
+    as_int as _shared_as_int,
     meters_to_feet_int as _shared_meters_to_feet_int,
     mps_to_mph as _shared_mps_to_mph,
 )
+from .metrics import CYCLE_DURATION_BUCKETS_MS, DEFAULT_LATENCY_BUCKETS_MS, histogram_bucket_label
+from .pipeline_trace import (
+    PIPELINE_TRACE_HISTORY_CYCLES,
+    CycleTrace,
+    begin_cycle_trace,
+    end_cycle_trace,
+    stage_percentiles,
+    trace_span,
+)
+from .profiler import start_profile_session
+from .provider_http import host_metrics_snapshot
+from .query_stats import persist_worker_statement_stats
 from .stat_modules import beers_earned, period_stats
 from .stat_modules.intervals_data import get_intervals_activity_data
 from .stat_modules.garmin_metrics import default_metrics as default_garmin_metrics
@@ -30,29 +47,44 @@ from .stat_modules.garmin_metrics import fetch_training_status_and_scores
 from .stat_modules.garmin_metrics import get_activity_payload_for_strava_activity
 from .storage import (
     acquire_runtime_lock,
+    archive_activity_template_context,
+    bind_activity_job_target,
     claim_activity_job,
     complete_activity_job_run,
     delete_runtime_value,
     enqueue_activity_job,
     get_activity_summit_metric,
+    get_garmin_daily_metrics,
     get_runtime_lock_owner,
     get_runtime_value,
     get_runtime_values,
     is_activity_processed,
+    list_smashrun_activities,
+    latest_garmin_period_activity_start,
     mark_activity_processed,
+    observe_runtime_histogram,
     record_activity_output,
     register_activity_discovery,
     release_runtime_lock,
+    replace_garmin_period_activities,
     start_activity_job_run,
     set_runtime_value,
     set_runtime_values,
+    sqlite_busy_error_count,
+    sqlite_op_metrics_snapshot,
     sum_activity_summit_metrics,
+    summarize_garmin_period_activities,
     upsert_activity_summit_metric,
+    upsert_garmin_daily_metrics,
     write_config_snapshot,
     write_json,
 )
 from .template_profiles import get_template_profile, get_working_template_profile, list_template_profiles
-from .template_rendering import render_with_active_template
+from .template_rendering import (
+    render_with_active_template,
+    template_context_fingerprint,
+    write_latest_context_schema,
+)
 from .strava_client import StravaClient, get_gap_speed_mps, mps_to_pace
 
 
@@ -61,9 +93,20 @@ logger = logging.getLogger(__name__)
 
 PERIOD_STATS_ACTIVITIES_CACHE_KEY = "cycle.period_stats.activities_cache"
 DEFAULT_STRAVA_PERIOD_STATS_INCREMENTAL_OVERLAP_HOURS = 48
+GARMIN_PERIOD_SYNC_KEY = "garmin.period_fallback.sync"
+DEFAULT_GARMIN_PERIOD_SYNC_OVERLAP_HOURS = 48
 GARMIN_LOGIN_BLOCKED_UNTIL_KEY = "garmin.login_blocked_until_utc"
 GARMIN_LOGIN_LAST_ERROR_KEY = "garmin.login_last_error"
 DEFAULT_GARMIN_LOGIN_RETRY_COOLDOWN_SECONDS = 6 * 60 * 60
+GARMIN_SESSION_STATS_KEY = "garmin.session.stats"
+GARMIN_SESSION_LOCK_NAME = "garmin_login"
+GARMIN_SESSION_LOCK_TTL_SECONDS = 120
+GARMIN_SESSION_LOCK_WAIT_SECONDS = 30.0
+GARMIN_SESSION_LOCK_POLL_SECONDS = 0.5
+GARMIN_SESSION_REFRESH_MARGIN_SECONDS = 30 * 60
+GARMIN_SESSION_MAX_AGE_SECONDS = 12 * 60 * 60
+GARMIN_DAILY_METRIC_RECENT_TTL_SECONDS = 30 * 60
+GARMIN_DAILY_METRIC_SETTLED_AFTER_DAYS = 2
 CHALLENGE_300_30_PROFILE_ID = "300-30-challenge"
 CHALLENGE_300_30_NAME = "300/30 Challenge"
 CHALLENGE_300_30_START = date(2026, 5, 1)
@@ -117,8 +160,29 @@ def _persist_cycle_service_state(settings: Settings, service_state: dict[str, An
     if not isinstance(service_state, dict):
         return
     snapshot = dict(service_state)
+    snapshot["http_hosts"] = host_metrics_snapshot()
+    snapshot["sqlite_ops"] = sqlite_op_metrics_snapshot()
+    snapshot["sqlite_busy_errors"] = sqlite_busy_error_count()
     snapshot["updated_at_utc"] = datetime.now(timezone.utc).isoformat()
     set_runtime_value(settings.processed_log_file, "cycle.service_calls", snapshot)
+    persist_worker_statement_stats(settings)
+
+
+def _persist_cycle_trace(settings: Settings, trace: CycleTrace | None) -> None:
+    if trace is None:
+        return
+    payload = trace.as_dict()
+    history = get_runtime_value(settings.processed_log_file, "cycle.trace_history")
+    if not isinstance(history, list):
+        history = []
+    history.append({"trace_id": payload["trace_id"], "stages_ms": payload["stages_ms"]})
+    history = history[-PIPELINE_TRACE_HISTORY_CYCLES:]
+    payload["stage_percentiles_ms"] = stage_percentiles(history)
+    payload["history_cycles"] = len(history)
+    set_runtime_values(
+        settings.processed_log_file,
+        {"cycle.trace": payload, "cycle.trace_history": history},
+    )
 
 
 def _service_key(service_name: str, suffix: str) -> str:
@@ -219,6 +283,7 @@ def _record_service_status(
         duration_value = max(0, int(duration_ms))
         increments["duration_count"] = 1
         increments["duration_total_ms"] = duration_value
+        increments[f"duration_bucket.{histogram_bucket_label(duration_value, DEFAULT_LATENCY_BUCKETS_MS)}"] = 1
         updates[_service_key(service_name, "last_duration_ms")] = duration_value
     if error:
         updates[_service_key(service_name, "last_error")] = error
@@ -1756,6 +1821,23 @@ def _build_royale_hill_summit_context(
     }
 
 
+def _smashrun_mirror_activities_for_dates(
+    settings: Settings,
+    date_ranges: list[tuple[date, date]],
+) -> list[dict[str, Any]]:
+    # Mirror rows are keyed by UTC start; pad a day on each side so the local
+    # date filter in the caller decides membership.
+    activities_by_id: dict[str, dict[str, Any]] = {}
+    for first_date, last_date in date_ranges:
+        for activity in list_smashrun_activities(
+            settings.processed_log_file,
+            start_from_utc=datetime.combine(first_date - timedelta(days=1), datetime.min.time(), tzinfo=timezone.utc),
+            start_before_utc=datetime.combine(last_date + timedelta(days=2), datetime.min.time(), tzinfo=timezone.utc),
+        ):
+            activities_by_id[str(activity.get("activityId"))] = activity
+    return list(activities_by_id.values())
+
+
 def _build_300_30_challenge_context(
     settings: Settings,
     strava_client: StravaClient,
@@ -2804,6 +2886,7 @@ def build_profile_preview_training(
         garmin_client,
         reference_activity=matched_garmin_activity,
         reference_date=activity.get("start_date"),
+        settings=settings,
     )
     training["_garmin_activity_aligned"] = bool(isinstance(matched_garmin_activity, dict) and matched_garmin_activity)
     return training
@@ -2917,6 +3000,191 @@ def _profile_activity_update_payload(
     return payload
 
 
+# One authenticated Garmin client per process and account. _GARMIN_SESSIONS_LOCK only
+# guards the dicts; logins and refreshes serialize on a per-account lock, so readers
+# such as garmin_session_snapshot never wait on Garmin network I/O.
+_GARMIN_SESSIONS_LOCK = threading.Lock()
+_GARMIN_SESSIONS: dict[tuple[str, str, str], dict[str, Any]] = {}
+_GARMIN_ACCOUNT_LOCKS: dict[tuple[str, str, str], threading.Lock] = {}
+
+
+def _garmin_session_key(settings: Settings) -> tuple[str, str, str]:
+    password_digest = hashlib.sha256(str(settings.garmin_password or "").encode("utf-8")).hexdigest()
+    return (str(settings.state_dir), str(settings.garmin_email or ""), password_digest)
+
+
+def _garmin_account_lock(session_key: tuple[str, str, str]) -> threading.Lock:
+    with _GARMIN_SESSIONS_LOCK:
+        return _GARMIN_ACCOUNT_LOCKS.setdefault(session_key, threading.Lock())
+
+
+def _garmin_tokenstore_file(tokenstore_dir: Path) -> Path:
+    return tokenstore_dir / "garmin_tokens.json"
+
+
+def _garmin_tokenstore_mtime(tokenstore_dir: Path) -> float | None:
+    try:
+        return _garmin_tokenstore_file(tokenstore_dir).stat().st_mtime
+    except OSError:
+        return None
+
+
+def _garmin_token_expires_at(client: Any) -> datetime | None:
+    inner = getattr(client, "client", None)
+    token = getattr(inner, "di_token", None) or getattr(inner, "jwt_web", None)
+    if not isinstance(token, str):
+        return None
+    parts = token.split(".")
+    if len(parts) < 2:
+        return None
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(parts[1] + "=" * (-len(parts[1]) % 4)).decode("utf-8"))
+        expires_epoch = float(payload.get("exp"))
+    except (ValueError, TypeError, AttributeError, binascii.Error):
+        return None
+    return datetime.fromtimestamp(expires_epoch, tz=timezone.utc)
+
+
+def _garmin_session_authenticated(client: Any) -> bool:
+    inner = getattr(client, "client", None)
+    if inner is None:
+        return True
+    return bool(getattr(inner, "is_authenticated", True))
+
+
+def _update_garmin_session_stats(
+    settings: Settings,
+    updates: dict[str, Any],
+    *,
+    increments: tuple[str, ...] = (),
+) -> dict[str, Any]:
+    current = get_runtime_value(settings.processed_log_file, GARMIN_SESSION_STATS_KEY)
+    stats = dict(current) if isinstance(current, dict) else {}
+    for counter in increments:
+        stats[counter] = (_shared_as_int(stats.get(counter)) or 0) + 1
+    stats.update(updates)
+    return stats
+
+
+def _acquire_garmin_login_lock(settings: Settings, owner: str) -> bool:
+    deadline = time.monotonic() + GARMIN_SESSION_LOCK_WAIT_SECONDS
+    while True:
+        if acquire_runtime_lock(
+            settings.processed_log_file,
+            GARMIN_SESSION_LOCK_NAME,
+            owner,
+            GARMIN_SESSION_LOCK_TTL_SECONDS,
+        ):
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(GARMIN_SESSION_LOCK_POLL_SECONDS)
+
+
+def invalidate_garmin_session(settings: Settings | None = None) -> None:
+    with _GARMIN_SESSIONS_LOCK:
+        if settings is None:
+            _GARMIN_SESSIONS.clear()
+        else:
+            _GARMIN_SESSIONS.pop(_garmin_session_key(settings), None)
+
+
+def garmin_session_snapshot(settings: Settings, *, now_utc: datetime | None = None) -> dict[str, Any]:
+    now = now_utc or datetime.now(timezone.utc)
+    stored = get_runtime_value(settings.processed_log_file, GARMIN_SESSION_STATS_KEY)
+    stats = dict(stored) if isinstance(stored, dict) else {}
+    created_at = _parse_utc_datetime(stats.get("session_created_at_utc"))
+    expires_at = _parse_utc_datetime(stats.get("token_expires_at_utc"))
+    with _GARMIN_SESSIONS_LOCK:
+        entry = _GARMIN_SESSIONS.get(_garmin_session_key(settings))
+        process_session = (
+            {
+                "cached": True,
+                "reuse_count": int(entry["reuse_count"]),
+                "age_seconds": round(time.monotonic() - float(entry["created_monotonic"]), 3),
+            }
+            if entry is not None
+            else {"cached": False}
+        )
+    return {
+        **stats,
+        "session_age_seconds": (
+            round((now - created_at).total_seconds(), 3) if created_at is not None else None
+        ),
+        "token_expires_in_seconds": (
+            round((expires_at - now).total_seconds(), 3) if expires_at is not None else None
+        ),
+        "login_blocked_until_utc": get_runtime_value(settings.processed_log_file, GARMIN_LOGIN_BLOCKED_UNTIL_KEY),
+        "process_session": process_session,
+    }
+
+
+def _reuse_garmin_session(settings: Settings, entry: dict[str, Any], owner: str) -> Any | None:
+    client = entry["client"]
+    if not _garmin_session_authenticated(client):
+        return None
+    if time.monotonic() - float(entry["created_monotonic"]) >= GARMIN_SESSION_MAX_AGE_SECONDS:
+        return None
+
+    tokenstore_dir = settings.state_dir / "garmin_tokens"
+    inner = getattr(client, "client", None)
+    token_mtime = _garmin_tokenstore_mtime(tokenstore_dir)
+    if token_mtime is not None and entry.get("token_mtime") is not None and token_mtime > entry["token_mtime"]:
+        # Another process refreshed or re-logged in; adopt its tokens instead of
+        # refreshing with a refresh token that may already have been rotated.
+        try:
+            inner.load(str(tokenstore_dir))
+        except Exception as exc:
+            logger.info("Garmin session token reload failed; logging in again: %s", exc)
+            return None
+        entry["token_mtime"] = token_mtime
+
+    expires_at = _garmin_token_expires_at(client)
+    now_utc = datetime.now(timezone.utc)
+    if expires_at is not None and (expires_at - now_utc).total_seconds() <= GARMIN_SESSION_REFRESH_MARGIN_SECONDS:
+        refresh_session = getattr(inner, "_refresh_session", None)
+        if not callable(refresh_session):
+            return None
+        if not _acquire_garmin_login_lock(settings, owner):
+            logger.warning("Garmin session refresh lock is busy; using current tokens.")
+            with _GARMIN_SESSIONS_LOCK:
+                entry["reuse_count"] += 1
+            return client
+        try:
+            token_mtime = _garmin_tokenstore_mtime(tokenstore_dir)
+            if token_mtime is not None and token_mtime > float(entry.get("token_mtime") or 0):
+                inner.load(str(tokenstore_dir))
+            expires_at = _garmin_token_expires_at(client)
+            if expires_at is None or (expires_at - now_utc).total_seconds() <= GARMIN_SESSION_REFRESH_MARGIN_SECONDS:
+                refresh_session()
+                expires_at = _garmin_token_expires_at(client)
+                if expires_at is None or expires_at <= now_utc:
+                    return None
+                set_runtime_values(
+                    settings.processed_log_file,
+                    {
+                        GARMIN_SESSION_STATS_KEY: _update_garmin_session_stats(
+                            settings,
+                            {
+                                "last_refresh_at_utc": now_utc.isoformat(),
+                                "token_expires_at_utc": expires_at.isoformat(),
+                            },
+                            increments=("refresh_count",),
+                        )
+                    },
+                )
+            entry["token_mtime"] = _garmin_tokenstore_mtime(tokenstore_dir)
+        except Exception as exc:
+            logger.info("Garmin session refresh failed; logging in again: %s", exc)
+            return None
+        finally:
+            release_runtime_lock(settings.processed_log_file, GARMIN_SESSION_LOCK_NAME, owner)
+
+    with _GARMIN_SESSIONS_LOCK:
+        entry["reuse_count"] += 1
+    return client
+
+
 def _get_garmin_client(settings: Settings) -> Any | None:
     if not settings.enable_garmin:
         return None
@@ -2934,41 +3202,93 @@ def _get_garmin_client(settings: Settings) -> Any | None:
         )
         return None
 
-    try:
-        from garminconnect import Garmin, GarminConnectTooManyRequestsError
-
-        tokenstore_dir = settings.state_dir / "garmin_tokens"
-        client = Garmin(settings.garmin_email, settings.garmin_password)
-        client.login(str(tokenstore_dir))
-        delete_runtime_value(settings.processed_log_file, GARMIN_LOGIN_BLOCKED_UNTIL_KEY)
-        delete_runtime_value(settings.processed_log_file, GARMIN_LOGIN_LAST_ERROR_KEY)
-        return client
-    except GarminConnectTooManyRequestsError as exc:
-        blocked_until = now_utc + timedelta(seconds=_garmin_login_retry_cooldown_seconds())
-        set_runtime_values(
-            settings.processed_log_file,
-            {
-                GARMIN_LOGIN_BLOCKED_UNTIL_KEY: blocked_until.isoformat(),
-                GARMIN_LOGIN_LAST_ERROR_KEY: str(exc),
-                "garmin.login_last_rate_limited_at_utc": now_utc.isoformat(),
-            },
-        )
-        logger.error(
-            "Garmin login rate-limited; skipping further Garmin login attempts until %s: %s",
-            blocked_until.isoformat(),
-            exc,
-        )
-        return None
-    except Exception as exc:
-        set_runtime_values(
-            settings.processed_log_file,
-            {
-                GARMIN_LOGIN_LAST_ERROR_KEY: str(exc),
-                "garmin.login_last_failed_at_utc": now_utc.isoformat(),
-            },
-        )
-        logger.error("Garmin login failed: %s", exc)
-        return None
+    session_key = _garmin_session_key(settings)
+    owner = f"{os.getpid()}:{uuid.uuid4()}"
+    with _garmin_account_lock(session_key):
+        with _GARMIN_SESSIONS_LOCK:
+            entry = _GARMIN_SESSIONS.get(session_key)
+        if entry is not None:
+            client = _reuse_garmin_session(settings, entry, owner)
+            if client is not None:
+                return client
+            with _GARMIN_SESSIONS_LOCK:
+                if _GARMIN_SESSIONS.get(session_key) is entry:
+                    _GARMIN_SESSIONS.pop(session_key, None)
+
+        lock_acquired = _acquire_garmin_login_lock(settings, owner)
+        if not lock_acquired:
+            logger.warning("Garmin login lock is still held by another process; logging in without it.")
+        try:
+            from garminconnect import Garmin, GarminConnectTooManyRequestsError
+
+            tokenstore_dir = settings.state_dir / "garmin_tokens"
+            client = Garmin(settings.garmin_email, settings.garmin_password)
+            client.login(str(tokenstore_dir))
+            delete_runtime_value(settings.processed_log_file, GARMIN_LOGIN_BLOCKED_UNTIL_KEY)
+            delete_runtime_value(settings.processed_log_file, GARMIN_LOGIN_LAST_ERROR_KEY)
+            logged_in_at = datetime.now(timezone.utc)
+            expires_at = _garmin_token_expires_at(client)
+            set_runtime_values(
+                settings.processed_log_file,
+                {
+                    GARMIN_SESSION_STATS_KEY: _update_garmin_session_stats(
+                        settings,
+                        {
+                            "session_created_at_utc": logged_in_at.isoformat(),
+                            "last_login_at_utc": logged_in_at.isoformat(),
+                            "token_expires_at_utc": expires_at.isoformat() if expires_at is not None else None,
+                        },
+                        increments=("login_count",),
+                    )
+                },
+            )
+            with _GARMIN_SESSIONS_LOCK:
+                _GARMIN_SESSIONS[session_key] = {
+                    "client": client,
+                    "created_monotonic": time.monotonic(),
+                    "token_mtime": _garmin_tokenstore_mtime(tokenstore_dir),
+                    "reuse_count": 0,
+                }
+            return client
+        except GarminConnectTooManyRequestsError as exc:
+            blocked_until = now_utc + timedelta(seconds=_garmin_login_retry_cooldown_seconds())
+            set_runtime_values(
+                settings.processed_log_file,
+                {
+                    GARMIN_LOGIN_BLOCKED_UNTIL_KEY: blocked_until.isoformat(),
+                    GARMIN_LOGIN_LAST_ERROR_KEY: str(exc),
+                    "garmin.login_last_rate_limited_at_utc": now_utc.isoformat(),
+                    GARMIN_SESSION_STATS_KEY: _update_garmin_session_stats(
+                        settings,
+                        {"last_login_failed_at_utc": now_utc.isoformat()},
+                        increments=("login_failure_count",),
+                    ),
+                },
+            )
+            logger.error(
+                "Garmin login rate-limited; skipping further Garmin login attempts until %s: %s",
+                blocked_until.isoformat(),
+                exc,
+            )
+            return None
+        except Exception as exc:
+            set_runtime_values(
+                settings.processed_log_file,
+                {
+                    GARMIN_LOGIN_LAST_ERROR_KEY: str(exc),
+                    "garmin.login_last_failed_at_utc": now_utc.isoformat(),
+                    GARMIN_SESSION_STATS_KEY: _update_garmin_session_stats(
+                        settings,
+                        {"last_login_failed_at_utc": now_utc.isoformat()},
+                        increments=("login_failure_count",),
+                    ),
+                },
+            )
+            logger.error("Garmin login failed: %s", exc)
+            return None
+        finally:
+            if lock_acquired:
+                release_runtime_lock(settings.processed_log_file, GARMIN_SESSION_LOCK_NAME, owner)
 
 
 def _ensure_garmin_ready(
@@ -3000,19 +3320,100 @@ def _ensure_garmin_ready(
         raise RuntimeError(f"Garmin login failed: {last_error}")
 
 
+def _record_garmin_endpoint_result(
+    settings: Settings,
+    service_state: dict[str, Any] | None,
+    endpoint: str,
+    result: dict[str, Any],
+) -> None:
+    service_name = f"garmin.{endpoint}"
+    status = str(result.get("status") or "error")
+    duration_ms = result.get("duration_ms")
+    _record_service_status(
+        settings,
+        service_name,
+        status=status,
+        duration_ms=duration_ms if isinstance(duration_ms, int) else None,
+        error=str(result.get("error")) if result.get("error") else None,
+    )
+    cycle_bucket = _service_cycle_bucket(service_state, service_name)
+    if not cycle_bucket:
+        return
+    if status == "cache_hit":
+        cycle_bucket["cache_hits"] = int(cycle_bucket.get("cache_hits", 0) or 0) + 1
+    elif status != "success":
+        cycle_bucket["errors"] = int(cycle_bucket.get("errors", 0) or 0) + 1
+    if status == "timeout":
+        cycle_bucket["timeouts"] = int(cycle_bucket.get("timeouts", 0) or 0) + 1
+    cycle_bucket["last_duration_ms"] = duration_ms
+    cycle_bucket["last_status"] = status
+    cycle_bucket["last_status_at_utc"] = datetime.now(timezone.utc).isoformat()
+
+
+def _garmin_daily_metric_expiry(metric_date: str, payload: Any, now_utc: datetime) -> datetime | None:
+    try:
+        parsed = date.fromisoformat(str(metric_date)[:10])
+    except ValueError:
+        return now_utc + timedelta(seconds=GARMIN_DAILY_METRIC_RECENT_TTL_SECONDS)
+    # Garmin days are local, so a UTC date is only final once it is two days old.
+    settled = parsed <= now_utc.date() - timedelta(days=GARMIN_DAILY_METRIC_SETTLED_AFTER_DAYS)
+    if settled and payload:
+        return None
+    return now_utc + timedelta(seconds=GARMIN_DAILY_METRIC_RECENT_TTL_SECONDS)
+
+
+def _garmin_daily_cache_lookup(settings: Settings, keys: list[tuple[str, str]]) -> dict[tuple[str, str], Any]:
+    return get_garmin_daily_metrics(settings.processed_log_file, keys)
+
+
+def _garmin_daily_cache_store(settings: Settings, payloads: dict[tuple[str, str], Any]) -> None:
+    now_utc = datetime.now(timezone.utc)
+    upsert_garmin_daily_metrics(
+        settings.processed_log_file,
+        [
+            {
+                "metric": metric,
+                "metric_date": metric_date,
+                "payload": payload,
+                "expires_at_utc": _garmin_daily_metric_expiry(metric_date, payload, now_utc),
+            }
+            for (metric, metric_date), payload in payloads.items()
+        ],
+        now_utc=now_utc,
+    )
+
+
 def _get_garmin_metrics(
     client: Any | None,
     *,
     reference_activity: dict[str, Any] | None = None,
     reference_date: datetime | str | None = None,
+    settings: Settings | None = None,
+    service_state: dict[str, Any] | None = None,
 ) -> dict[str, Any]:
     if client is None:
         return default_garmin_metrics()
+    on_endpoint_result = None
+    daily_cache_lookup = None
+    daily_cache_store = None
+    if settings is not None:
+        def on_endpoint_result(endpoint: str, result: dict[str, Any]) -> None:
+            _record_garmin_endpoint_result(settings, service_state, endpoint, result)
+
+        def daily_cache_lookup(keys: list[tuple[str, str]]) -> dict[tuple[str, str], Any]:
+            return _garmin_daily_cache_lookup(settings, keys)
+
+        def daily_cache_store(payloads: dict[tuple[str, str], Any]) -> None:
+            _garmin_daily_cache_store(settings, payloads)
+
     try:
         return fetch_training_status_and_scores(
             client,
             reference_activity=reference_activity,
             reference_date=reference_date,
+            on_endpoint_result=on_endpoint_result,
+            daily_cache_lookup=daily_cache_lookup,
+            daily_cache_store=daily_cache_store,
         )
     except Exception as exc:
         logger.error("Garmin data fetch failed: %s", exc)
@@ -3804,6 +4205,122 @@ def _get_period_stats_activities(
     }
 
 
+def _garmin_period_sync_overlap_hours() -> int:
+    raw = str(
+        os.getenv(
+            "GARMIN_PERIOD_SYNC_OVERLAP_HOURS",
+            str(DEFAULT_GARMIN_PERIOD_SYNC_OVERLAP_HOURS),
+        )
+    ).strip()
+    try:
+        parsed = int(raw)
+    except ValueError:
+        return DEFAULT_GARMIN_PERIOD_SYNC_OVERLAP_HOURS
+    return max(1, min(parsed, 24 * 14))
+
+
+def _garmin_period_local_tz(settings: Settings) -> timezone | ZoneInfo:
+    try:
+        return ZoneInfo(settings.timezone)
+    except ZoneInfoNotFoundError:
+        return timezone.utc
+
+
+def _sync_garmin_period_activities(
+    settings: Settings,
+    garmin_client: Any,
+    *,
+    needed_from_date: date,
+    service_state: dict[str, Any] | None,
+) -> dict[str, Any] | None:
+    local_tz = _garmin_period_local_tz(settings)
+    now_utc = datetime.now(timezone.utc)
+    sync_state = get_runtime_value(settings.processed_log_file, GARMIN_PERIOD_SYNC_KEY)
+    if not isinstance(sync_state, dict) or sync_state.get("timezone") != settings.timezone:
+        sync_state = {}
+    try:
+        covered_from = date.fromisoformat(str(sync_state.get("covered_from_date") or ""))
+    except ValueError:
+        covered_from = None
+    synced_at = _parse_utc_datetime(sync_state.get("synced_at_utc"))
+
+    if covered_from is None or covered_from > needed_from_date:
+        fetch_from_date = needed_from_date
+        mode = "full"
+    else:
+        ttl_seconds = int(settings.service_cache_ttl_seconds)
+        if (
+            settings.enable_service_result_cache
+            and synced_at is not None
+            and ttl_seconds > 0
+            and (now_utc - synced_at).total_seconds() < ttl_seconds
+        ):
+            return {**sync_state, "mode": "store"}
+        watermark = latest_garmin_period_activity_start(settings.processed_log_file) or synced_at or now_utc
+        fetch_from_utc = watermark - timedelta(hours=_garmin_period_sync_overlap_hours())
+        fetch_from_date = max(covered_from, fetch_from_utc.astimezone(local_tz).date())
+        mode = "incremental"
+
+    local_today = now_utc.astimezone(local_tz).date()
+    activities = _run_service_call(
+        settings,
+        "garmin.period_fallback",
+        garmin_client.get_activities_by_date,
+        fetch_from_date.isoformat(),
+        local_today.isoformat(),
+        service_state=service_state,
+    )
+    if not isinstance(activities, list):
+        return sync_state or None
+
+    summaries = [
+        summary
+        for summary in (period_stats.normalize_garmin_period_activity(item) for item in activities)
+        if summary is not None
+    ]
+    since_utc = datetime.combine(fetch_from_date, datetime.min.time(), tzinfo=local_tz).astimezone(timezone.utc)
+    replace_garmin_period_activities(settings.processed_log_file, summaries, since_utc=since_utc)
+    sync_state = {
+        "timezone": settings.timezone,
+        "covered_from_date": min(fetch_from_date, covered_from or fetch_from_date).isoformat(),
+        "synced_at_utc": now_utc.isoformat(),
+        "fetched_from_date": fetch_from_date.isoformat(),
+        "fetched_records": len(activities),
+        "mode": mode,
+    }
+    set_runtime_value(settings.processed_log_file, GARMIN_PERIOD_SYNC_KEY, sync_state)
+    return sync_state
+
+
+def _get_garmin_period_fallback(
+    settings: Settings,
+    garmin_client: Any | None,
+    *,
+    now_utc: datetime,
+    service_state: dict[str, Any] | None,
+) -> dict[str, dict[str, Any]] | None:
+    if garmin_client is None:
+        return None
+    windows = period_stats.garmin_period_windows(now_utc, settings.timezone)
+    sync_state = _sync_garmin_period_activities(
+        settings,
+        garmin_client,
+        needed_from_date=windows["year"][0],
+        service_state=service_state,
+    )
+    if not sync_state:
+        return None
+
+    buckets = summarize_garmin_period_activities(
+        settings.processed_log_file,
+        {period: start_utc for period, (_start_date, start_utc) in windows.items()},
+        end_utc=period_stats.period_windows_end_utc(now_utc, settings.timezone),
+    )
+    if buckets is None:
+        return None
+    return period_stats.format_garmin_period_fallback(buckets)
+
+
 def _select_strava_activity(
     settings: Settings,
     activities: list[dict[str, Any]],
@@ -3920,10 +4437,74 @@ def _is_retryable_run_error(exc: Exception) -> bool:
     return any(token in text for token in retry_tokens)
 
 
-def run_once(force_update: bool = False, activity_id: int | None = None) -> dict[str, Any]:
-    settings = Settings.from_env()
+def _start_cycle_activity_job(
+    settings: Settings,
+    selected_activity_id: int,
+    *,
+    owner: str,
+    force_update: bool,
+    activity_id: int | None,
+) -> tuple[str, str]:
+    job_id = enqueue_activity_job(
+        settings.processed_log_file,
+        selected_activity_id,
+        request_kind=(
+            "manual_activity"
+            if activity_id is not None
+            else ("manual_latest" if force_update else "auto_poll")
+        ),
+        requested_by="manual" if (force_update or activity_id is not None) else "worker",
+        force_update=bool(force_update),
+        priority=10 if (force_update or activity_id is not None) else 100,
+        max_attempts=settings.job_max_attempts,
+    )
+    if not job_id:
+        raise RuntimeError(f"Failed to enqueue activity job for {selected_activity_id}")
+    if not claim_activity_job(
+        settings.processed_log_file,
+        job_id,
+        owner=owner,
+        lease_seconds=settings.run_lock_ttl_seconds,
+    ):
+        raise RuntimeError(f"Failed to claim queued activity job {job_id}")
+    started = start_activity_job_run(
+        settings.processed_log_file,
+        job_id,
+        owner=owner,
+    )
+    if not started:
+        raise RuntimeError(f"Failed to start activity job run for {job_id}")
+    return job_id, str(started["run_id"])
+
+
+def _complete_queued_job_without_update(
+    settings: Settings,
+    job_id: str | None,
+    run_id: str | None,
+    *,
+    owner: str,
+    result: dict[str, Any],
+) -> None:
+    if not job_id or not run_id:
+        return
+    complete_activity_job_run(
+        settings.processed_log_file,
+        job_id,
+        run_id,
+        owner=owner,
+        outcome="succeeded",
+        result=result,
+    )
+
+
+def run_once(
+    force_update: bool = False,
+    activity_id: int | None = None,
+    *,
+    queued_job_id: str | None = None,
+) -> dict[str, Any]:
+    settings = get_settings()
     settings.validate()
-    settings.ensure_state_paths()
 
     _configure_logging(settings.log_level)
     lock_owner = f"{uuid.uuid4()}:{int(time.time())}"
@@ -3951,7 +4532,29 @@ def run_once(force_update: bool = False, activity_id: int | None = None) -> dict
         _persist_cycle_service_state(settings, service_state)
         return {"status": "locked", "lock_owner": current_owner}
 
+    cycle_started = time.perf_counter()
+    cycle_status = "ok"
+    trace_token = begin_cycle_trace(bool(getattr(settings, "enable_pipeline_trace", False)))
+    profile_session = start_profile_session(settings, target="cycles", label="run_once")
     try:
+        if queued_job_id:
+            if not claim_activity_job(
+                settings.processed_log_file,
+                queued_job_id,
+                owner=lock_owner,
+                lease_seconds=settings.run_lock_ttl_seconds,
+            ):
+                return {"status": "job_unavailable", "job_id": queued_job_id}
+            started = start_activity_job_run(
+                settings.processed_log_file,
+                queued_job_id,
+                owner=lock_owner,
+            )
+            if not started:
+                raise RuntimeError(f"Failed to start activity job run for {queued_job_id}")
+            job_id = queued_job_id
+            run_id = str(started["run_id"])
+
         logger.info("Starting update cycle.")
         write_config_snapshot(
             settings.processed_log_file,
@@ -3977,6 +4580,7 @@ def run_once(force_update: bool = False, activity_id: int | None = None) -> dict
         if not activities:
             logger.info("No Strava activities found.")
             result = {"status": "no_activities"}
+            _complete_queued_job_without_update(settings, job_id, run_id, owner=lock_owner, result=result)
             _record_cycle_status(settings, status=result["status"])
             return result
 
@@ -4001,6 +4605,13 @@ def run_once(force_update: bool = False, activity_id: int | None = None) -> dict
         )
         if selection_result is not None:
             logger.info("No unprocessed activities in latest %s items.", len(activities))
+            _complete_queued_job_without_update(
+                settings,
+                job_id,
+                run_id,
+                owner=lock_owner,
+                result=selection_result,
+            )
             _record_cycle_status(
                 settings,
                 status=selection_result["status"],
@@ -4011,36 +4622,16 @@ def run_once(force_update: bool = False, activity_id: int | None = None) -> dict
             raise RuntimeError("Failed to resolve target activity.")
 
         selected_activity_id = int(selected["id"])
-        job_id = enqueue_activity_job(
-            settings.processed_log_file,
-            selected_activity_id,
-            request_kind=(
-                "manual_activity"
-                if activity_id is not None
-                else ("manual_latest" if force_update else "auto_poll")
-            ),
-            requested_by="manual" if (force_update or activity_id is not None) else "worker",
-            force_update=bool(force_update),
-            priority=10 if (force_update or activity_id is not None) else 100,
-            max_attempts=settings.job_max_attempts,
-        )
-        if not job_id:
-            raise RuntimeError(f"Failed to enqueue activity job for {selected_activity_id}")
-        if not claim_activity_job(
-            settings.processed_log_file,
-            job_id,
-            owner=lock_owner,
-            lease_seconds=settings.run_lock_ttl_seconds,
-        ):
-            raise RuntimeError(f"Failed to claim queued activity job {job_id}")
-        started = start_activity_job_run(
-            settings.processed_log_file,
-            job_id,
-            owner=lock_owner,
-        )
-        if not started:
-            raise RuntimeError(f"Failed to start activity job run for {job_id}")
-        run_id = str(started["run_id"])
+        if job_id and run_id:
+            bind_activity_job_target(settings.processed_log_file, job_id, selected_activity_id)
+        else:
+            job_id, run_id = _start_cycle_activity_job(
+                settings,
+                selected_activity_id,
+                owner=lock_owner,
+                force_update=force_update,
+                activity_id=activity_id,
+            )
 
         detailed_activity = _run_required_call(
             settings,
@@ -4130,29 +4721,28 @@ def run_once(force_update: bool = False, activity_id: int | None = None) -> dict
             garmin_client,
             reference_activity=matched_garmin_activity if isinstance(matched_garmin_activity, dict) else None,
             reference_date=detailed_activity.get("start_date"),
+            settings=settings,
+            service_state=service_state,
         )
         training["_garmin_activity_aligned"] = bool(isinstance(matched_garmin_activity, dict) and matched_garmin_activity)
-        selected_profile = _select_activity_profile(settings, detailed_activity, training=training)
+        with trace_span("profile_selection"):
+            selected_profile = _select_activity_profile(settings, detailed_activity, training=training)
         profile_id = str(selected_profile.get("profile_id") or "default")
-        garmin_period_fallback = _run_service_call(
+        garmin_period_fallback = _get_garmin_period_fallback(
             settings,
-            "garmin.period_fallback",
-            period_stats.get_garmin_period_fallback,
             garmin_client,
             now_utc=reference_now_utc,
-            timezone_name=settings.timezone,
             service_state=service_state,
-            cache_key=f"garmin.period_fallback:{reference_local.date().isoformat()}:{settings.timezone}",
-            cache_ttl_seconds=settings.service_cache_ttl_seconds,
         )
 
-        period_summaries = period_stats.get_period_stats(
-            strava_activities,
-            smashrun_elevation_totals,
-            reference_now_utc,
-            timezone_name=settings.timezone,
-            garmin_period_fallback=garmin_period_fallback,
-        )
+        with trace_span("period_stats"):
+            period_summaries = period_stats.get_period_stats(
+                strava_activities,
+                smashrun_elevation_totals,
+                reference_now_utc,
+                timezone_name=settings.timezone,
+                garmin_period_fallback=garmin_period_fallback,
+            )
 
         intervals_payload = None
         if settings.enable_intervals:
@@ -4190,72 +4780,81 @@ def run_once(force_update: bool = False, activity_id: int | None = None) -> dict
         )
 
         activity_local_date = _activity_local_date(detailed_activity, settings.timezone)
-        summit_result = _collect_royale_hill_current_summits(
-            settings,
-            strava_client,
-            detailed_activity,
-            local_date=activity_local_date,
-            service_state=service_state,
-        )
-        summit_context = _build_royale_hill_summit_context(
-            settings,
-            activity_date=activity_local_date,
-            summit_result=summit_result,
-        )
+        with trace_span("summit_geofence"):
+            summit_result = _collect_royale_hill_current_summits(
+                settings,
+                strava_client,
+                detailed_activity,
+                local_date=activity_local_date,
+                service_state=service_state,
+            )
+            summit_context = _build_royale_hill_summit_context(
+                settings,
+                activity_date=activity_local_date,
+                summit_result=summit_result,
+            )
 
         challenge_context = _build_300_30_challenge_context(
             settings,
             strava_client,
             detailed_activity,
             strava_activities,
-            smashrun_context.get("smashrun_activities")
-            if isinstance(smashrun_context.get("smashrun_activities"), list)
-            else [],
+            _smashrun_mirror_activities_for_dates(
+                settings,
+                [
+                    (CHALLENGE_300_30_START, CHALLENGE_300_30_END_EXCLUSIVE),
+                    (activity_local_date, activity_local_date),
+                ]
+                if activity_local_date is not None
+                else [(CHALLENGE_300_30_START, CHALLENGE_300_30_END_EXCLUSIVE)],
+            ),
             profile_id=profile_id,
             service_state=service_state,
             summit_result=summit_result,
         )
 
-        description_context = _build_description_context(
-            detailed_activity=detailed_activity,
-            training=training,
-            intervals_payload=intervals_payload,
-            week=period_summaries["week"],
-            month=period_summaries["month"],
-            year=period_summaries["year"],
-            longest_streak=longest_streak,
-            notables=notables,
-            latest_elevation_feet=latest_elevation_feet,
-            misery_index=misery_index,
-            misery_index_description=misery_desc,
-            air_quality_index=aqi,
-            aqi_description=aqi_desc,
-            crono_line=crono_line,
-            crono_summary=crono_summary,
-            weather_payload=weather_details,
-            timezone_name=settings.timezone,
-            smashrun_activity=smashrun_activity_record,
-            smashrun_stats=smashrun_stats,
-            smashrun_badges=smashrun_badges,
-            garmin_period_fallback=garmin_period_fallback,
-            challenge_context=challenge_context,
-            summit_context=summit_context,
-        )
+        with trace_span("build_context"):
+            description_context = _build_description_context(
+                detailed_activity=detailed_activity,
+                training=training,
+                intervals_payload=intervals_payload,
+                week=period_summaries["week"],
+                month=period_summaries["month"],
+                year=period_summaries["year"],
+                longest_streak=longest_streak,
+                notables=notables,
+                latest_elevation_feet=latest_elevation_feet,
+                misery_index=misery_index,
+                misery_index_description=misery_desc,
+                air_quality_index=aqi,
+                aqi_description=aqi_desc,
+                crono_line=crono_line,
+                crono_summary=crono_summary,
+                weather_payload=weather_details,
+                timezone_name=settings.timezone,
+                smashrun_activity=smashrun_activity_record,
+                smashrun_stats=smashrun_stats,
+                smashrun_badges=smashrun_badges,
+                garmin_period_fallback=garmin_period_fallback,
+                challenge_context=challenge_context,
+                summit_context=summit_context,
+            )
 
-        description_context["profile"] = {
-            "id": profile_id,
-            "label": str(selected_profile.get("profile_label") or profile_id.title()),
-            "reasons": selected_profile.get("reasons") or [],
-            "working_id": str(selected_profile.get("working_profile_id") or "default"),
-            "selection_mode": str(selected_profile.get("selection_mode") or ""),
-        }
+            description_context["profile"] = {
+                "id": profile_id,
+                "label": str(selected_profile.get("profile_label") or profile_id.title()),
+                "reasons": selected_profile.get("reasons") or [],
+                "working_id": str(selected_profile.get("working_profile_id") or "default"),
+                "selection_mode": str(selected_profile.get("selection_mode") or ""),
+            }
 
-        render_result = render_with_active_template(
-            settings,
-            description_context,
-            profile_id=profile_id,
-            allow_seed_fallback=False,
-        )
+        with trace_span("template_render"):
+            render_result = render_with_active_template(
+                settings,
+                description_context,
+                profile_id=profile_id,
+                allow_seed_fallback=False,
+            )
         if render_result["ok"]:
             description = str(render_result["description"])
         else:
@@ -4278,6 +4877,7 @@ def run_once(force_update: bool = False, activity_id: int | None = None) -> dict
             service_state=service_state,
         )
 
+        context_fingerprint = template_context_fingerprint(description_context)
         payload = {
             "updated_at_utc": datetime.now(timezone.utc).isoformat(),
             "activity_id": selected_activity_id,
@@ -4288,6 +4888,7 @@ def run_once(force_update: bool = False, activity_id: int | None = None) -> dict
             "period_stats_sync": period_stats_sync,
             "weather": weather_details,
             "template_context": description_context,
+            "template_context_fingerprint": context_fingerprint,
             "service_calls": service_state,
             "profile_match": {
                 "profile_id": profile_id,
@@ -4312,8 +4913,22 @@ def run_once(force_update: bool = False, activity_id: int | None = None) -> dict
                 "fallback_reason": render_result.get("fallback_reason"),
             },
         }
-        mark_activity_processed(settings.processed_log_file, selected_activity_id)
-        write_json(settings.latest_json_file, payload)
+        with trace_span("storage_writes"):
+            mark_activity_processed(settings.processed_log_file, selected_activity_id)
+            with trace_span("latest_json"):
+                write_json(settings.latest_json_file, payload)
+                try:
+                    # Precompute the editor schema so /editor/schema and /editor/catalog serve it as-is.
+                    write_latest_context_schema(settings.latest_json_file, description_context, context_fingerprint)
+                except (OSError, TypeError, ValueError) as exc:
+                    logger.warning("Failed to precompute editor context schema: %s", exc)
+            archive_activity_template_context(
+                settings.processed_log_file,
+                selected_activity_id,
+                context=description_context,
+                profile_id=profile_id,
+                fingerprint=context_fingerprint,
+            )
 
         logger.info("Activity %s updated successfully.", selected_activity_id)
         result = {
@@ -4336,42 +4951,43 @@ def run_once(force_update: bool = False, activity_id: int | None = None) -> dict
             ),
             "is_custom_template": bool(render_result.get("is_custom_template")),
         }
-        if job_id and run_id:
-            complete_activity_job_run(
+        with trace_span("storage_writes"):
+            if job_id and run_id:
+                complete_activity_job_run(
+                    settings.processed_log_file,
+                    job_id,
+                    run_id,
+                    owner=lock_owner,
+                    outcome="succeeded",
+                    result=result,
+                )
+            record_activity_output(
                 settings.processed_log_file,
-                job_id,
-                run_id,
-                owner=lock_owner,
-                outcome="succeeded",
-                result=result,
+                selected_activity_id,
+                state="succeeded",
+                result_status=result["status"],
+                profile_id=profile_id,
+                title=str(update_payload.get("name") or "").strip() or None,
+                description=description,
+                job_id=job_id,
+                run_id=run_id,
+                error=None,
+                template_hash=str(render_result.get("template_hash") or "").strip() or None,
+                template_path=str(render_result.get("template_path") or "").strip() or None,
+                template_version=(
+                    str(render_result.get("template_version"))
+                    if render_result.get("template_version") is not None
+                    else None
+                ),
+                template_name=(
+                    str(render_result.get("template_name"))
+                    if render_result.get("template_name") is not None
+                    else None
+                ),
+                working_profile_id=str(selected_profile.get("working_profile_id") or "default"),
+                selection_mode=str(selected_profile.get("selection_mode") or ""),
+                is_custom_template=bool(render_result.get("is_custom_template")),
             )
-        record_activity_output(
-            settings.processed_log_file,
-            selected_activity_id,
-            state="succeeded",
-            result_status=result["status"],
-            profile_id=profile_id,
-            title=str(update_payload.get("name") or "").strip() or None,
-            description=description,
-            job_id=job_id,
-            run_id=run_id,
-            error=None,
-            template_hash=str(render_result.get("template_hash") or "").strip() or None,
-            template_path=str(render_result.get("template_path") or "").strip() or None,
-            template_version=(
-                str(render_result.get("template_version"))
-                if render_result.get("template_version") is not None
-                else None
-            ),
-            template_name=(
-                str(render_result.get("template_name"))
-                if render_result.get("template_name") is not None
-                else None
-            ),
-            working_profile_id=str(selected_profile.get("working_profile_id") or "default"),
-            selection_mode=str(selected_profile.get("selection_mode") or ""),
-            is_custom_template=bool(render_result.get("is_custom_template")),
-        )
         _record_cycle_status(
             settings,
             status=result["status"],
@@ -4379,8 +4995,20 @@ def run_once(force_update: bool = False, activity_id: int | None = None) -> dict
         )
         return result
     except Exception as exc:
+        cycle_status = "error"
+        outcome = "retry_wait" if _is_retryable_run_error(exc) else "failed_permanent"
+        if selected_activity_id is None and job_id and run_id:
+            complete_activity_job_run(
+                settings.processed_log_file,
+                job_id,
+                run_id,
+                owner=lock_owner,
+                outcome=outcome,
+                error=str(exc),
+                result={"status": "error", "error": str(exc)},
+                retry_delay_seconds=settings.job_retry_delay_seconds,
+            )
         if selected_activity_id is not None:
-            outcome = "retry_wait" if _is_retryable_run_error(exc) else "failed_permanent"
             if job_id and run_id:
                 complete_activity_job_run(
                     settings.processed_log_file,
@@ -4411,6 +5039,18 @@ def run_once(force_update: bool = False, activity_id: int | None = None) -> dict
     finally:
         service_state["ended_at_utc"] = datetime.now(timezone.utc).isoformat()
         _persist_cycle_service_state(settings, service_state)
+        _persist_cycle_trace(settings, end_cycle_trace(trace_token))
+        if profile_session is not None:
+            if selected_activity_id is not None:
+                profile_session.label = f"run_once:{selected_activity_id}"
+            profile_session.finish(status=cycle_status)
+        observe_runtime_histogram(
+            settings.processed_log_file,
+            "cycle_duration_ms",
+            (time.perf_counter() - cycle_started) * 1000.0,
+            buckets=CYCLE_DURATION_BUCKETS_MS,
+            labels={"status": cycle_status},
+        )
         release_runtime_lock(
             settings.processed_log_file,
             lock_name=lock_name,
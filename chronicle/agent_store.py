@@ -2,10 +2,31 @@ from __future__ import annotations
 
 import json
 import secrets
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from .storage import (
+    get_runtime_value,
+    index_agent_audit_events,
+    index_agent_drafts,
+    index_agent_jobs,
+    query_agent_audit_events,
+    query_agent_drafts,
+    query_agent_jobs,
+    set_runtime_value,
+)
+
+
+AGENT_INDEX_VERSION = 1
+AGENT_INDEX_VERSION_KEY = "agent_control.index.version"
+DEFAULT_LIST_LIMIT = 100
+_AUDIT_BACKFILL_BATCH_SIZE = 500
+
+_AGENT_INDEX_READY: set[str] = set()
+_AGENT_INDEX_LOCK = threading.Lock()
+
 
 def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
@@ -27,10 +48,53 @@ def _audit_log_path(state_dir: Path) -> Path:
     return _agent_root(state_dir) / "audit.jsonl"
 
 
+def _index_path(state_dir: Path) -> Path:
+    # Runtime storage resolves its SQLite file next to this path, i.e. in state_dir.
+    return _agent_root(state_dir)
+
+
 def ensure_agent_store(state_dir: Path) -> None:
     _drafts_dir(state_dir).mkdir(parents=True, exist_ok=True)
     _jobs_dir(state_dir).mkdir(parents=True, exist_ok=True)
     _audit_log_path(state_dir).parent.mkdir(parents=True, exist_ok=True)
+    _ensure_agent_index(state_dir)
+
+
+def _ensure_agent_index(state_dir: Path) -> None:
+    key = str(state_dir.resolve())
+    if key in _AGENT_INDEX_READY:
+        return
+    with _AGENT_INDEX_LOCK:
+        if key in _AGENT_INDEX_READY:
+            return
+        index_path = _index_path(state_dir)
+        if get_runtime_value(index_path, AGENT_INDEX_VERSION_KEY) != AGENT_INDEX_VERSION:
+            _backfill_agent_index(state_dir)
+            set_runtime_value(index_path, AGENT_INDEX_VERSION_KEY, AGENT_INDEX_VERSION)
+        _AGENT_INDEX_READY.add(key)
+
+
+def _backfill_agent_index(state_dir: Path) -> None:
+    index_path = _index_path(state_dir)
+    drafts = [_read_json(path) for path in sorted(_drafts_dir(state_dir).glob("*.json"))]
+    index_agent_drafts(index_path, [record for record in drafts if isinstance(record, dict)])
+    jobs = [_read_json(path) for path in sorted(_jobs_dir(state_dir).glob("*.json"))]
+    index_agent_jobs(index_path, [record for record in jobs if isinstance(record, dict)])
+
+    audit_path = _audit_log_path(state_dir)
+    if not audit_path.is_file():
+        return
+    batch: list[dict[str, Any]] = []
+    with audit_path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            event = _parse_audit_line(line)
+            if event is None:
+                continue
+            batch.append(event)
+            if len(batch) >= _AUDIT_BACKFILL_BATCH_SIZE:
+                index_agent_audit_events(index_path, batch)
+                batch = []
+    index_agent_audit_events(index_path, batch)
 
 
 def _write_json(path: Path, payload: dict[str, Any]) -> None:
@@ -82,6 +146,7 @@ def create_draft(
         "apply_result": None,
     }
     _write_json(_drafts_dir(state_dir) / f"{draft_id}.json", record)
+    index_agent_drafts(_index_path(state_dir), [record])
     return record
 
 
@@ -97,20 +162,26 @@ def update_draft(state_dir: Path, draft_id: str, **updates: Any) -> dict[str, An
     existing.update(updates)
     existing["updated_at_utc"] = _utc_now_iso()
     _write_json(_drafts_dir(state_dir) / f"{draft_id}.json", existing)
+    index_agent_drafts(_index_path(state_dir), [existing])
     return existing
 
 
-def list_drafts(state_dir: Path, *, resource_kind: str | None = None) -> list[dict[str, Any]]:
+def list_drafts(
+    state_dir: Path,
+    *,
+    resource_kind: str | None = None,
+    status: str | None = None,
+    cursor: str | None = None,
+    limit: int | None = None,
+) -> list[dict[str, Any]]:
     ensure_agent_store(state_dir)
-    records: list[dict[str, Any]] = []
-    for path in sorted(_drafts_dir(state_dir).glob("*.json"), reverse=True):
-        record = _read_json(path)
-        if not isinstance(record, dict):
-            continue
-        if resource_kind and str(record.get("resource_kind") or "").strip() != resource_kind:
-            continue
-        records.append(record)
-    return records
+    return query_agent_drafts(
+        _index_path(state_dir),
+        resource_kind=resource_kind,
+        status=status,
+        before_id=cursor,
+        limit=limit,
+    )
 
 
 def create_job(
@@ -137,6 +208,7 @@ def create_job(
         "source": str(source or "").strip() or None,
     }
     _write_json(_jobs_dir(state_dir) / f"{job_id}.json", record)
+    index_agent_jobs(_index_path(state_dir), [record])
     return record
 
 
@@ -164,20 +236,26 @@ def update_job(
         existing["error"] = str(error)
     existing["updated_at_utc"] = _utc_now_iso()
     _write_json(_jobs_dir(state_dir) / f"{job_id}.json", existing)
+    index_agent_jobs(_index_path(state_dir), [existing])
     return existing
 
 
-def list_jobs(state_dir: Path, *, task_kind: str | None = None) -> list[dict[str, Any]]:
+def list_jobs(
+    state_dir: Path,
+    *,
+    task_kind: str | None = None,
+    status: str | None = None,
+    cursor: str | None = None,
+    limit: int | None = None,
+) -> list[dict[str, Any]]:
     ensure_agent_store(state_dir)
-    records: list[dict[str, Any]] = []
-    for path in sorted(_jobs_dir(state_dir).glob("*.json"), reverse=True):
-        record = _read_json(path)
-        if not isinstance(record, dict):
-            continue
-        if task_kind and str(record.get("task_kind") or "").strip() != task_kind:
-            continue
-        records.append(record)
-    return records
+    return query_agent_jobs(
+        _index_path(state_dir),
+        task_kind=task_kind,
+        status=status,
+        before_id=cursor,
+        limit=limit,
+    )
 
 
 def append_audit_event(
@@ -202,23 +280,37 @@ def append_audit_event(
     with _audit_log_path(state_dir).open("a", encoding="utf-8") as handle:
         handle.write(json.dumps(event, sort_keys=True))
         handle.write("\n")
+    index_agent_audit_events(_index_path(state_dir), [event])
     return event
 
 
-def list_audit_events(state_dir: Path, *, limit: int = 100) -> list[dict[str, Any]]:
+def _parse_audit_line(line: str) -> dict[str, Any] | None:
+    text = line.strip()
+    if not text:
+        return None
+    try:
+        payload = json.loads(text)
+    except json.JSONDecodeError:
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def list_audit_events(
+    state_dir: Path,
+    *,
+    limit: int = DEFAULT_LIST_LIMIT,
+    cursor: int | None = None,
+    event_type: str | None = None,
+    resource_kind: str | None = None,
+    resource_id: str | None = None,
+) -> list[dict[str, Any]]:
     ensure_agent_store(state_dir)
-    path = _audit_log_path(state_dir)
-    if not path.is_file():
-        return []
-    lines = path.read_text(encoding="utf-8").splitlines()
-    records: list[dict[str, Any]] = []
-    for line in reversed(lines):
-        if len(records) >= max(1, limit):
-            break
-        try:
-            payload = json.loads(line)
-        except json.JSONDecodeError:
-            continue
-        if isinstance(payload, dict):
-            records.append(payload)
-    return records
+    # Every page comes from the index in seq order, so following a cursor neither skips nor repeats events.
+    return query_agent_audit_events(
+        _index_path(state_dir),
+        event_type=event_type,
+        resource_kind=resource_kind,
+        resource_id=resource_id,
+        before_seq=cursor,
+        limit=max(1, int(limit)),
+    )
@@ -4,6 +4,7 @@ import hashlib
 import json
 import os
 import secrets
+import threading
 import time
 from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
@@ -11,11 +12,12 @@ from typing import Any
 from urllib.parse import urlencode
 
 import requests
-from flask import Flask, redirect, render_template, request
+from flask import Flask, Response, g, redirect, render_template, request
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from .activity_pipeline import (
     build_profile_preview_training,
+    garmin_session_snapshot,
     preview_profile_match,
     preview_specific_profile_against_activity,
     preview_specific_profile_match,
@@ -38,16 +40,42 @@ from .agent_store import (
     update_draft as update_agent_draft,
     update_job as update_agent_job,
 )
-from .config import Settings
-from .dashboard_data import get_dashboard_payload
+from .config import Settings, get_settings, invalidate_settings_cache
+from .dashboard_data import get_dashboard_payload, load_cached_dashboard_payload
+from .event_stream import (
+    EVENT_STREAM_RETRY_MS,
+    event_stream_has_capacity,
+    event_stream_max_clients,
+    stream_change_events,
+)
 from .editor_ai import EditorAssistantRequest, editor_assistant_status, generate_editor_customization
 from .garmin_sync_queue import (
     initiate_garmin_sync_request,
     mark_garmin_sync_request_failed,
     run_garmin_sync_request,
     schedule_garmin_sync_request,
+    send_garmin_sync_batch,
+)
+from .metrics import DEFAULT_LATENCY_BUCKETS_MS, PROMETHEUS_CONTENT_TYPE, HistogramFamily
+from .metrics_exposition import (
+    API_PROCESS_METRICS_PUBLISH_SECONDS,
+    build_metrics_exposition,
+    publish_api_process_metrics,
 )
+from .pipeline_context_collectors import recompute_misery_scores
 from .plan_data import RUN_TYPE_OPTIONS, get_plan_payload
+from .profiler import (
+    arm_profiler,
+    disarm_profiler,
+    get_profiler_arm,
+    load_profile_result,
+    profiler_armed_for,
+    profiler_status,
+    start_profile_session,
+    top_functions,
+)
+from .provider_http import host_metrics_snapshot
+from .query_stats import STATEMENT_SORT_KEYS, statement_report
 from .pace_workshop import (
     DEFAULT_MARATHON_GOAL,
     calculate_race_equivalency,
@@ -67,13 +95,21 @@ from .setup_config import (
     update_setup_env_file,
 )
 from .storage import (
+    ACTIVITY_JOB_LATEST_TARGET,
+    JOB_REQUEST_KIND_RERUN_ACTIVITY,
+    JOB_REQUEST_KIND_RERUN_LATEST,
+    JOB_STATUS_TERMINAL,
     get_plan_setting,
     delete_runtime_value,
+    enqueue_activity_job,
+    get_activity_job,
     get_plan_day,
     get_runtime_value,
     get_runtime_values,
     get_worker_heartbeat,
     is_worker_healthy,
+    list_activity_misery_scores,
+    list_archived_template_contexts,
     list_plan_sessions,
     read_json,
     replace_plan_sessions_for_day,
@@ -117,7 +153,14 @@ from .template_repository import (
     save_active_template,
     update_template_repository_template,
 )
-from .template_rendering import normalize_template_context, render_template_text, validate_template_text
+from .template_rendering import (
+    normalize_template_context,
+    read_latest_context_schema,
+    render_template_batch,
+    render_template_text,
+    template_context_fingerprint,
+    validate_template_text,
+)
 from .template_schema import build_context_schema
 from .strava_client import StravaClient
 from .workout_workshop import (
@@ -141,6 +184,17 @@ app = Flask(
     static_url_path="/static",
 )
 
+_TEMPLATE_CONTEXT_CACHE_LOCK = threading.Lock()
+_TEMPLATE_CONTEXT_CACHE: dict[str, tuple[tuple[Any, ...], dict | None, str | None]] = {}
+_CONTEXT_SCHEMA_CACHE_MAX_ENTRIES = 16
+EDITOR_BATCH_PREVIEW_DEFAULT_LIMIT = 10
+EDITOR_BATCH_PREVIEW_MAX_LIMIT = 50
+_CONTEXT_SCHEMA_CACHE: dict[tuple[str, str], dict] = {}
+_SAMPLE_FIXTURE_NAMES = frozenset(item["name"] for item in list_sample_template_fixtures())
+_REQUEST_METRICS = HistogramFamily(DEFAULT_LATENCY_BUCKETS_MS)
+_API_METRICS_PUBLISHED = {"at": time.monotonic()}
+_PROFILER_ARM_CACHE: dict[str, Any] = {"checked_at": 0.0, "arm": None}
+_PROFILER_ARM_CACHE_SECONDS = 2.0
 _PLAN_RUN_TYPE_OPTIONS = [str(item).strip() for item in RUN_TYPE_OPTIONS if str(item).strip()]
 _PLAN_RUN_TYPE_OPTIONS_BY_KEY = {
     "".join(ch for ch in option.lower() if ch.isalnum()): option
@@ -148,6 +202,70 @@ _PLAN_RUN_TYPE_OPTIONS_BY_KEY = {
 }
 
 
+def _cached_profiler_arm() -> dict[str, Any] | None:
+    # Route profiling is rare; only look at the runtime DB every few seconds per process.
+    now = time.monotonic()
+    if now - float(_PROFILER_ARM_CACHE["checked_at"]) >= _PROFILER_ARM_CACHE_SECONDS:
+        arm = get_profiler_arm(settings, "route")
+        _PROFILER_ARM_CACHE["arm"] = arm if profiler_armed_for(arm, target="route", route=(arm or {}).get("route")) else None
+        _PROFILER_ARM_CACHE["checked_at"] = now
+    return _PROFILER_ARM_CACHE["arm"]
+
+
+@app.before_request
+def _start_request_timer() -> None:
+    g.request_started = time.perf_counter()
+    arm = _cached_profiler_arm()
+    if arm is None:
+        return
+    route = request.url_rule.rule if request.url_rule is not None else request.path
+    for candidate in (route, request.path):
+        if profiler_armed_for(arm, target="route", route=candidate):
+            g.profile_session = start_profile_session(
+                settings,
+                target="route",
+                route=candidate,
+                label=f"{request.method} {request.path}",
+                arm=arm,
+            )
+            if g.profile_session is None:
+                # Another worker took the last slot; re-read the arm on the next request.
+                _PROFILER_ARM_CACHE["checked_at"] = 0.0
+            return
+
+
+@app.teardown_request
+def _finish_request_profile(exc: BaseException | None) -> None:
+    session = g.pop("profile_session", None)
+    if session is None:
+        return
+    status_code = g.pop("response_status_code", None)
+    failed = exc is not None or status_code is None or status_code >= 500
+    session.finish(status="error" if failed else "ok")
+
+
+@app.after_request
+def _observe_request_latency(response: Response) -> Response:
+    g.response_status_code = response.status_code
+    started = getattr(g, "request_started", None)
+    if started is not None:
+        _REQUEST_METRICS.observe(
+            (time.perf_counter() - started) * 1000.0,
+            {
+                # The URL rule keeps label cardinality bounded to declared routes.
+                "route": request.url_rule.rule if request.url_rule is not None else "unmatched",
+                "method": request.method,
+                "status": f"{response.status_code // 100}xx",
+            },
+        )
+    # Scrapes land on one gunicorn worker; the others publish their series periodically.
+    now = time.monotonic()
+    if now - _API_METRICS_PUBLISHED["at"] >= API_PROCESS_METRICS_PUBLISH_SECONDS:
+        _API_METRICS_PUBLISHED["at"] = now
+        publish_api_process_metrics(settings, request_histograms=_REQUEST_METRICS.snapshot())
+    return response
+
+
 def _normalize_plan_run_type_key(value: object) -> str:
     return "".join(ch for ch in str(value or "").strip().lower() if ch.isalnum())
 
@@ -171,6 +289,9 @@ STRAVA_TOKEN_URL = "https://www.strava.com/oauth/token"
 STRAVA_AUTHORIZE_URL = "https://www.strava.com/oauth/authorize"
 METERS_PER_MILE = 1609.34
 PLAN_PACE_WORKSHOP_GOAL_KEY = "pace_workshop.marathon_goal"
+RERUN_JOB_WAIT_MAX_SECONDS = 25
+RERUN_JOB_WAIT_POLL_SECONDS = 0.5
+RERUN_BULK_MAX_ACTIVITIES = 200
 CORE_UI_FLOW_LEGACY_PATHS = {
     "sources": "/setup",
     "build": "/editor",
@@ -254,9 +375,7 @@ def _core_flow_entrypoint(flow_name: str):
 
 
 def _effective_settings() -> Settings:
-    current = Settings.from_env()
-    current.ensure_state_paths()
-    return current
+    return get_settings()
 
 
 def _canonical_json(value: Any) -> str:
@@ -833,14 +952,51 @@ def _state_path_writable(state_dir: Path) -> bool:
         return False
 
 
-def _latest_template_context() -> dict | None:
+def _latest_template_context_entry() -> tuple[dict | None, str | None]:
+    # Editor preview/validate/schema/catalog calls share one normalized context per
+    # version of latest.json instead of re-reading and re-normalizing it per request.
+    latest_path = settings.latest_json_file
+    try:
+        stat = latest_path.stat()
+    except OSError:
+        return None, None
+    version = (str(latest_path), stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    cache_key = "latest"
+    with _TEMPLATE_CONTEXT_CACHE_LOCK:
+        cached = _TEMPLATE_CONTEXT_CACHE.get(cache_key)
+    if cached is not None and cached[0] == version:
+        return cached[1], cached[2]
+
     payload = _latest_payload()
-    if not payload:
-        return None
-    context = payload.get("template_context")
+    context = payload.get("template_context") if payload else None
+    normalized: dict | None = None
+    fingerprint: str | None = None
     if isinstance(context, dict):
-        return normalize_template_context(context)
-    return None
+        fingerprint = str(payload.get("template_context_fingerprint") or "") or template_context_fingerprint(context)
+        normalized = normalize_template_context(context)
+    with _TEMPLATE_CONTEXT_CACHE_LOCK:
+        _TEMPLATE_CONTEXT_CACHE[cache_key] = (version, normalized, fingerprint)
+    return normalized, fingerprint
+
+
+def _latest_template_context() -> dict | None:
+    return _latest_template_context_entry()[0]
+
+
+def _sample_template_context_entry(fixture: str) -> tuple[dict, str]:
+    # Keyed by the fixture actually used, so arbitrary names cannot grow the cache.
+    fixture = _resolve_fixture_name(fixture)
+    cache_key = f"sample:{fixture}"
+    with _TEMPLATE_CONTEXT_CACHE_LOCK:
+        cached = _TEMPLATE_CONTEXT_CACHE.get(cache_key)
+    if cached is not None and cached[1] is not None:
+        return cached[1], str(cached[2])
+    context = get_sample_template_context(fixture)
+    fingerprint = template_context_fingerprint(context)
+    normalized = normalize_template_context(context)
+    with _TEMPLATE_CONTEXT_CACHE_LOCK:
+        _TEMPLATE_CONTEXT_CACHE[cache_key] = ((), normalized, fingerprint)
+    return normalized, fingerprint
 
 
 def _resolve_context_mode(raw_mode: str | None) -> str:
@@ -852,20 +1008,58 @@ def _resolve_context_mode(raw_mode: str | None) -> str:
 
 def _resolve_fixture_name(raw_name: str | None) -> str:
     value = (raw_name or "default").strip().lower()
-    return value or "default"
+    # Unknown names render the default fixture, so label and cache them as that.
+    return value if value in _SAMPLE_FIXTURE_NAMES else "default"
 
 
-def _context_for_mode(mode: str, fixture_name: str | None = None) -> tuple[dict | None, str]:
+def _context_entry_for_mode(mode: str, fixture_name: str | None = None) -> tuple[dict | None, str, str | None]:
     fixture = _resolve_fixture_name(fixture_name)
     if mode == "latest":
-        return _latest_template_context(), "latest"
+        latest, fingerprint = _latest_template_context_entry()
+        return latest, "latest", fingerprint
     if mode in {"sample", "fixture"}:
-        return get_sample_template_context(fixture), f"sample:{fixture}"
+        context, fingerprint = _sample_template_context_entry(fixture)
+        return context, f"sample:{fixture}", fingerprint
 
-    latest = _latest_template_context()
+    latest, fingerprint = _latest_template_context_entry()
     if latest is not None:
-        return latest, "latest"
-    return get_sample_template_context(fixture), f"sample:{fixture}"
+        return latest, "latest", fingerprint
+    context, fingerprint = _sample_template_context_entry(fixture)
+    return context, f"sample:{fixture}", fingerprint
+
+
+def _context_for_mode(mode: str, fixture_name: str | None = None) -> tuple[dict | None, str]:
+    context, context_source, _fingerprint = _context_entry_for_mode(mode, fixture_name)
+    return context, context_source
+
+
+def _context_schema(context: dict | None, context_source: str, fingerprint: str | None) -> tuple[dict, str]:
+    # Schemas are memoized by (context source, context fingerprint); the latest context's
+    # schema is usually precomputed by the pipeline when it writes latest.json.
+    cache_key = (context_source if context is not None else "", fingerprint or "")
+    etag = hashlib.sha256(f"{cache_key[0]}:{cache_key[1]}".encode("utf-8")).hexdigest()[:32]
+    with _TEMPLATE_CONTEXT_CACHE_LOCK:
+        cached = _CONTEXT_SCHEMA_CACHE.get(cache_key)
+    if cached is not None:
+        return cached, etag
+
+    schema = None
+    if context is not None and context_source == "latest" and fingerprint:
+        schema = read_latest_context_schema(settings.latest_json_file, fingerprint)
+    if schema is None:
+        schema = build_context_schema(context or {})
+    with _TEMPLATE_CONTEXT_CACHE_LOCK:
+        if len(_CONTEXT_SCHEMA_CACHE) >= _CONTEXT_SCHEMA_CACHE_MAX_ENTRIES:
+            _CONTEXT_SCHEMA_CACHE.clear()
+        _CONTEXT_SCHEMA_CACHE[cache_key] = schema
+    return schema, etag
+
+
+def _etag_response(payload: dict, etag: str) -> Response | tuple[dict, int, dict[str, str]]:
+    headers = {"ETag": f'"{etag}"', "Cache-Control": "no-cache"}
+    if request.if_none_match.contains(etag):
+        return Response(status=304, headers=headers)
+    return payload, 200, headers
 
 
 def _resolve_profile_id(raw_profile_id: str | None) -> str:
@@ -960,27 +1154,50 @@ def _decorate_workout_with_target_resolution(workout: dict[str, object], maratho
     return decorated
 
 
-def _attached_workout_codes_for_day(path: Path, *, date_key: str) -> list[str]:
-    day_sessions_map = list_plan_sessions(
+def _attached_workout_codes_by_day(path: Path, *, start_date: str, end_date: str) -> dict[str, list[str]]:
+    sessions_map = list_plan_sessions(
         path,
-        start_date=date_key,
-        end_date=date_key,
+        start_date=start_date,
+        end_date=end_date,
     )
-    raw_sessions = day_sessions_map.get(date_key, []) if isinstance(day_sessions_map, dict) else []
-    attached_workouts: list[str] = []
-    seen_codes: set[str] = set()
-    for session in raw_sessions:
-        if not isinstance(session, dict):
-            continue
-        workout_code = str(session.get("workout_code") or session.get("planned_workout") or "").strip()
-        if not workout_code:
-            continue
-        lowered = workout_code.lower()
-        if lowered in seen_codes:
-            continue
-        seen_codes.add(lowered)
-        attached_workouts.append(workout_code)
-    return attached_workouts
+    attached_by_day: dict[str, list[str]] = {}
+    if not isinstance(sessions_map, dict):
+        return attached_by_day
+    for date_key, raw_sessions in sessions_map.items():
+        attached_workouts: list[str] = []
+        seen_codes: set[str] = set()
+        for session in raw_sessions if isinstance(raw_sessions, list) else []:
+            if not isinstance(session, dict):
+                continue
+            workout_code = str(session.get("workout_code") or session.get("planned_workout") or "").strip()
+            if not workout_code:
+                continue
+            lowered = workout_code.lower()
+            if lowered in seen_codes:
+                continue
+            seen_codes.add(lowered)
+            attached_workouts.append(workout_code)
+        if attached_workouts:
+            attached_by_day[str(date_key)] = attached_workouts
+    return attached_by_day
+
+
+def _attached_workout_codes_for_day(path: Path, *, date_key: str) -> list[str]:
+    return _attached_workout_codes_by_day(path, start_date=date_key, end_date=date_key).get(date_key, [])
+
+
+def _garmin_sync_scheduled_result(sync_record: dict[str, object], *, attempt_count: int) -> dict[str, object]:
+    timestamp_utc = str(sync_record.get("updated_at_utc") or "").strip() or datetime.now(timezone.utc).replace(
+        microsecond=0
+    ).isoformat()
+    status_code = str(sync_record.get("status_code") or "").strip() or "calendar_scheduled"
+    return {
+        "outcome": "scheduled",
+        "status_code": status_code,
+        "timestamp_utc": timestamp_utc,
+        "message": "Workout scheduled on Garmin calendar.",
+        "attempt_count": attempt_count,
+    }
 
 
 def _run_garmin_sync_result_for_day(
@@ -1009,23 +1226,13 @@ def _run_garmin_sync_result_for_day(
                 date_local=date_key,
                 workout_code=workout_code,
             )
-            timestamp_utc = str(sync_record.get("updated_at_utc") or "").strip() or datetime.now(timezone.utc).replace(
-                microsecond=0
-            ).isoformat()
-            status_code = str(sync_record.get("status_code") or "").strip() or "calendar_scheduled"
             return {
                 "status": "ok",
                 "date_local": date_key,
                 "sync": sync_record,
                 "garmin_workout": garmin_workout,
                 "calendar_entry": calendar_entry,
-                "result": {
-                    "outcome": "scheduled",
-                    "status_code": status_code,
-                    "timestamp_utc": timestamp_utc,
-                    "message": "Workout scheduled on Garmin calendar.",
-                    "attempt_count": attempt_count,
-                },
+                "result": _garmin_sync_scheduled_result(sync_record, attempt_count=attempt_count),
             }, 200
         except (ValueError, RuntimeError) as exc:
             last_error = exc
@@ -1449,13 +1656,133 @@ def latest() -> tuple[dict, int]:
 @app.get("/service-metrics")
 def service_metrics() -> tuple[dict, int]:
     cycle_metrics = get_runtime_value(settings.processed_log_file, "cycle.service_calls")
+    cycle_trace = get_runtime_value(settings.processed_log_file, "cycle.trace")
     return {
         "status": "ok",
         "time_utc": datetime.now(timezone.utc).isoformat(),
         "cycle_service_calls": cycle_metrics if isinstance(cycle_metrics, dict) else {},
+        "cycle_trace": cycle_trace if isinstance(cycle_trace, dict) else None,
+        "garmin_session": garmin_session_snapshot(_effective_settings()),
+        "api_http_hosts": host_metrics_snapshot(),
     }, 200
 
 
+@app.get("/metrics")
+def metrics() -> Response:
+    exposition = build_metrics_exposition(settings, request_histograms=_REQUEST_METRICS.snapshot())
+    return Response(exposition, status=200, content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@app.get("/control/profiler")
+def control_profiler_get() -> tuple[dict, int]:
+    return {"status": "ok", **profiler_status(settings)}, 200
+
+
+@app.post("/control/profiler/arm")
+def control_profiler_arm() -> tuple[dict, int]:
+    body = request.get_json(silent=True) or {}
+    try:
+        arm = arm_profiler(
+            settings,
+            target=str(body.get("target") or "cycles"),
+            count=body.get("count") or 1,
+            route=body.get("route"),
+            mode=body.get("mode"),
+            interval_ms=body.get("interval_ms"),
+            source="api",
+        )
+    except ValueError as exc:
+        return {"status": "error", "error": str(exc)}, 400
+    _PROFILER_ARM_CACHE["checked_at"] = 0.0
+    return {"status": "ok", "arm": arm}, 200
+
+
+@app.post("/control/profiler/disarm")
+def control_profiler_disarm() -> tuple[dict, int]:
+    body = request.get_json(silent=True) or {}
+    target = str(body.get("target") or "").strip().lower() or None
+    try:
+        arms = disarm_profiler(settings, target=target)
+    except ValueError as exc:
+        return {"status": "error", "error": str(exc)}, 400
+    _PROFILER_ARM_CACHE["checked_at"] = 0.0
+    return {"status": "ok", "arms": arms}, 200
+
+
+@app.get("/control/profiler/top")
+def control_profiler_top() -> tuple[dict, int]:
+    try:
+        limit = max(1, min(200, int(request.args.get("limit") or 25)))
+    except ValueError:
+        return {"status": "error", "error": "limit must be an integer."}, 400
+    mode = str(request.args.get("mode") or "").strip().lower() or None
+    try:
+        top = top_functions(
+            settings,
+            limit=limit,
+            profile_id=str(request.args.get("profile") or "").strip() or None,
+            mode=mode,
+        )
+    except LookupError as exc:
+        return {"status": "error", "error": str(exc)}, 404
+    return {"status": "ok", **top}, 200
+
+
+@app.get("/control/profiler/profiles/<string:profile_id>")
+def control_profiler_download(profile_id: str) -> Response | tuple[dict, int]:
+    loaded = load_profile_result(settings, profile_id)
+    if loaded is None:
+        return {"status": "error", "error": f"Unknown profile '{profile_id}'."}, 404
+    result, path = loaded
+    content_type = "application/octet-stream" if result.get("mode") == "cprofile" else "text/plain; charset=utf-8"
+    return Response(
+        path.read_bytes(),
+        status=200,
+        content_type=content_type,
+        headers={"Content-Disposition": f'attachment; filename="{path.name}"'},
+    )
+
+
+@app.get("/control/sqlite/statements")
+def control_sqlite_statements() -> tuple[dict, int]:
+    try:
+        limit = max(1, min(200, int(request.args.get("limit") or 25)))
+    except ValueError:
+        return {"status": "error", "error": "limit must be an integer."}, 400
+    sort = str(request.args.get("sort") or "total_ms").strip().lower()
+    if sort not in STATEMENT_SORT_KEYS:
+        return {"status": "error", "error": f"sort must be one of: {', '.join(STATEMENT_SORT_KEYS)}."}, 400
+    explain = str(request.args.get("explain") or "").strip().lower() in {"1", "true", "yes", "on"}
+    report = statement_report(settings, live_process="api", sort=sort, limit=limit, explain=explain)
+    return {"status": "ok", **report}, 200
+
+
+@app.get("/misery/scores")
+def misery_scores_get() -> tuple[dict, int]:
+    activity_ids = [item.strip() for item in str(request.args.get("activity_ids") or "").split(",") if item.strip()]
+    try:
+        limit = max(1, min(1000, int(request.args.get("limit") or 100)))
+    except ValueError:
+        return {"status": "error", "error": "limit must be an integer."}, 400
+    scores = list_activity_misery_scores(
+        _effective_settings().processed_log_file,
+        activity_ids=activity_ids or None,
+        limit=limit,
+    )
+    return {"status": "ok", "count": len(scores), "scores": scores}, 200
+
+
+@app.post("/misery/recompute")
+def misery_recompute_post() -> tuple[dict, int]:
+    body = request.get_json(silent=True) or {}
+    raw_ids = body.get("activity_ids") if isinstance(body, dict) else None
+    if raw_ids is not None and not isinstance(raw_ids, list):
+        return {"status": "error", "error": "activity_ids must be a list."}, 400
+    activity_ids = [str(item).strip() for item in raw_ids or [] if str(item).strip()] or None
+    stats = recompute_misery_scores(_effective_settings(), activity_ids=activity_ids)
+    return {"status": "ok", **stats}, 200
+
+
 @app.get("/setup")
 def setup_page() -> str:
     return render_template("setup.html")
@@ -2039,43 +2366,87 @@ def plan_day_garmin_sync_schedule_post(date_local: str) -> tuple[dict, int]:
     }, 200
 
 
-def _execute_garmin_sync_send_for_workout(
+def _garmin_sync_send_error(workout_code: str, sync_payload: object, error: str) -> dict[str, object]:
+    return {
+        "workout_code": workout_code,
+        "status": "error",
+        "sync": sync_payload,
+        "result": None,
+        "garmin_workout": None,
+        "calendar_entry": None,
+        "error": error,
+    }
+
+
+def _finish_garmin_sync_send_for_workout(
     path: Path,
     *,
     date_key: str,
     workout_code: str,
+    sync_payload: dict[str, object],
 ) -> dict[str, object]:
-    sync_payload: dict[str, object] | None = None
     try:
-        sync_payload = initiate_garmin_sync_request(
-            path,
-            date_local=date_key,
-            workout_code=workout_code,
-        )
         result_payload, _http_code = _run_garmin_sync_result_for_day(
             path,
             date_key=date_key,
             requested_workout=workout_code,
         )
-        return {
-            "workout_code": workout_code,
-            "status": str(result_payload.get("status") or "error"),
-            "sync": result_payload.get("sync") or sync_payload,
-            "result": result_payload.get("result"),
-            "garmin_workout": result_payload.get("garmin_workout"),
-            "calendar_entry": result_payload.get("calendar_entry"),
-            **({"error": result_payload.get("error")} if result_payload.get("error") else {}),
-        }
     except (ValueError, RuntimeError) as exc:
-        return {
-            "workout_code": workout_code,
-            "status": "error",
-            "sync": sync_payload,
-            "result": None,
-            "garmin_workout": None,
-            "calendar_entry": None,
-            "error": str(exc),
-        }
+        return _garmin_sync_send_error(workout_code, sync_payload, str(exc))
+    return {
+        "workout_code": workout_code,
+        "status": str(result_payload.get("status") or "error"),
+        "sync": result_payload.get("sync") or sync_payload,
+        "result": result_payload.get("result"),
+        "garmin_workout": result_payload.get("garmin_workout"),
+        "calendar_entry": result_payload.get("calendar_entry"),
+        **({"error": result_payload.get("error")} if result_payload.get("error") else {}),
+    }
+
+
+def _execute_garmin_sync_send_batch(
+    path: Path,
+    items: list[tuple[str, str]],
+) -> list[dict[str, object]]:
+    results: list[dict[str, object] | None] = [None] * len(items)
+    initiated: list[tuple[int, dict[str, object]]] = []
+    for index, (date_key, workout_code) in enumerate(items):
+        try:
+            sync_payload = initiate_garmin_sync_request(
+                path,
+                date_local=date_key,
+                workout_code=workout_code,
+            )
+        except (ValueError, RuntimeError) as exc:
+            results[index] = _garmin_sync_send_error(workout_code, None, str(exc))
+            continue
+        initiated.append((index, sync_payload))
+
+    try:
+        sent = send_garmin_sync_batch(path, [sync_payload for _index, sync_payload in initiated])
+    except (ValueError, RuntimeError):
+        sent = None
+    if sent is not None and len(sent) == len(initiated):
+        for (index, _sync_payload), (sync_record, garmin_workout, calendar_entry) in zip(initiated, sent):
+            results[index] = {
+                "workout_code": items[index][1],
+                "status": "ok",
+                "sync": sync_record,
+                "result": _garmin_sync_scheduled_result(sync_record, attempt_count=1),
+                "garmin_workout": garmin_workout,
+                "calendar_entry": calendar_entry,
+            }
+    else:
+        # Fall back to the per-request path, which retries and records failures.
+        for index, sync_payload in initiated:
+            date_key, workout_code = items[index]
+            results[index] = _finish_garmin_sync_send_for_workout(
+                path,
+                date_key=date_key,
+                workout_code=workout_code,
+                sync_payload=sync_payload,
+            )
+    return [item for item in results if item is not None]
 
 
 @app.post("/plan/day/<string:date_local>/garmin-sync/result")
@@ -2117,14 +2488,10 @@ def plan_day_garmin_sync_send_post(date_local: str) -> tuple[dict, int]:
             "error": "No workout is attached to this plan day. Attach a workout before sending to Garmin.",
         }, 400
 
-    results: list[dict[str, object]] = []
-    for workout_code in attached_workouts:
-        result_payload = _execute_garmin_sync_send_for_workout(
-            current.processed_log_file,
-            date_key=date_key,
-            workout_code=workout_code,
-        )
-        results.append(result_payload)
+    results = _execute_garmin_sync_send_batch(
+        current.processed_log_file,
+        [(date_key, workout_code) for workout_code in attached_workouts],
+    )
 
     succeeded = sum(1 for item in results if str(item.get("status") or "") == "ok")
     failed = len(results) - succeeded
@@ -2159,15 +2526,27 @@ def plan_day_garmin_sync_send_window_post(date_local: str) -> tuple[dict, int]:
         return {"status": "error", "error": "span_days must be an integer."}, 400
     span_days = max(1, min(span_days, 14))
 
+    day_keys = [(start_date + timedelta(days=offset)).isoformat() for offset in range(span_days)]
+    attached_by_day = _attached_workout_codes_by_day(
+        current.processed_log_file,
+        start_date=day_keys[0],
+        end_date=day_keys[-1],
+    )
+    batch_items = [
+        (day_key, workout_code)
+        for day_key in day_keys
+        for workout_code in attached_by_day.get(day_key, [])
+    ]
+    batch_results = iter(_execute_garmin_sync_send_batch(current.processed_log_file, batch_items))
+
     day_results: list[dict[str, object]] = []
-    total_requested = 0
+    total_requested = len(batch_items)
     total_succeeded = 0
     total_failed = 0
     total_skipped = 0
 
-    for offset in range(span_days):
-        day_key = (start_date + timedelta(days=offset)).isoformat()
-        attached_workouts = _attached_workout_codes_for_day(current.processed_log_file, date_key=day_key)
+    for day_key in day_keys:
+        attached_workouts = attached_by_day.get(day_key, [])
         if not attached_workouts:
             day_results.append(
                 {
@@ -2180,20 +2559,12 @@ def plan_day_garmin_sync_send_window_post(date_local: str) -> tuple[dict, int]:
             total_skipped += 1
             continue
 
-        workout_results: list[dict[str, object]] = []
-        for workout_code in attached_workouts:
-            total_requested += 1
-            result_payload = _execute_garmin_sync_send_for_workout(
-                current.processed_log_file,
-                date_key=day_key,
-                workout_code=workout_code,
-            )
-            item_status = str(result_payload.get("status") or "error")
-            if item_status == "ok":
+        workout_results = [next(batch_results) for _workout_code in attached_workouts]
+        for result_payload in workout_results:
+            if str(result_payload.get("status") or "error") == "ok":
                 total_succeeded += 1
             else:
                 total_failed += 1
-            workout_results.append(result_payload)
 
         if all(str(item.get("status") or "") == "ok" for item in workout_results):
             day_status = "ok"
@@ -2436,6 +2807,7 @@ def setup_config_put() -> tuple[dict, int]:
         }, 500
 
     merge_setup_overrides(settings.state_dir, updates)
+    invalidate_settings_cache()
     payload = _setup_payload()
     payload["env_write_path"] = str(env_path)
     return payload, 200
@@ -2577,6 +2949,7 @@ def setup_strava_oauth_callback_get():
             "STRAVA_ACCESS_TOKEN": access_token.strip(),
         },
     )
+    invalidate_settings_cache()
 
     current = _effective_settings()
     write_json(
@@ -2612,6 +2985,7 @@ def setup_strava_disconnect_post() -> tuple[dict, int]:
             "STRAVA_ACCESS_TOKEN": None,
         },
     )
+    invalidate_settings_cache()
     current = _effective_settings()
     current.strava_token_file.unlink(missing_ok=True)
 
@@ -3553,6 +3927,73 @@ def editor_preview() -> tuple[dict, int]:
     }, 200
 
 
+@app.post("/editor/preview/batch")
+def editor_preview_batch() -> tuple[dict, int]:
+    body = request.get_json(silent=True) or {}
+    if not isinstance(body, dict):
+        return {"status": "error", "error": "Request body must be a JSON object."}, 400
+    try:
+        profile_id = _resolve_profile_id(body.get("profile_id"))
+    except ValueError as exc:
+        return {"status": "error", "error": str(exc)}, 400
+    active_template = get_active_template(settings, profile_id=profile_id)["template"]
+    template_text = body.get("template")
+    if template_text is None:
+        template_text = active_template
+    if not isinstance(template_text, str):
+        return {"status": "error", "error": "template must be a string."}, 400
+
+    context_set = str(body.get("contexts") or "fixtures").strip().lower()
+    if context_set not in {"fixtures", "recent", "profile"}:
+        return {"status": "error", "error": "contexts must be one of: fixtures, recent, profile."}, 400
+    try:
+        limit = int(body.get("limit") or EDITOR_BATCH_PREVIEW_DEFAULT_LIMIT)
+    except (TypeError, ValueError):
+        return {"status": "error", "error": "limit must be an integer."}, 400
+    limit = max(1, min(limit, EDITOR_BATCH_PREVIEW_MAX_LIMIT))
+
+    contexts: list[tuple[str, dict]] = []
+    if context_set == "fixtures":
+        for fixture in list_sample_template_fixtures():
+            context, _fingerprint = _sample_template_context_entry(fixture["name"])
+            contexts.append((f"sample:{fixture['name']}", context))
+    else:
+        archived = list_archived_template_contexts(
+            settings.processed_log_file,
+            limit=limit,
+            profile_id=profile_id if context_set == "profile" else None,
+        )
+        contexts = [(f"activity:{item['activity_id']}", item["context"]) for item in archived]
+    if not contexts and context_set == "profile":
+        return {
+            "status": "error",
+            "error": f"No archived activity contexts matched profile '{profile_id}' yet. Use contexts 'recent' instead.",
+        }, 404
+    if not contexts:
+        return {
+            "status": "error",
+            "error": "No archived activity contexts are available yet. Run one update cycle first.",
+        }, 404
+
+    batch = render_template_batch(template_text, contexts, baseline_template_text=active_template)
+    if not batch["ok"]:
+        return {"status": "error", "error": batch["error"]}, 400
+    results = batch["results"]
+    return {
+        "status": "ok",
+        "profile_id": profile_id,
+        "context_set": context_set,
+        "results": results,
+        "summary": {
+            "context_count": len(results),
+            "ok_count": sum(1 for item in results if item["ok"]),
+            "error_count": sum(1 for item in results if not item["ok"]),
+            "changed_count": sum(1 for item in results if item.get("changed")),
+            "total_render_ms": round(sum(float(item["render_ms"]) for item in results), 2),
+        },
+    }, 200
+
+
 @app.post("/editor/assistant/customize")
 def editor_assistant_customize_post() -> tuple[dict, int]:
     body = request.get_json(silent=True) or {}
@@ -3607,34 +4048,31 @@ def editor_assistant_customize_post() -> tuple[dict, int]:
 
 
 @app.get("/editor/schema")
-def editor_schema() -> tuple[dict, int]:
+def editor_schema() -> Response | tuple[dict, int] | tuple[dict, int, dict[str, str]]:
     raw_mode = request.args.get("context_mode")
     try:
         context_mode = _resolve_context_mode(raw_mode)
     except ValueError as exc:
         return {"status": "error", "error": str(exc)}, 400
 
-    context, context_source = _context_for_mode(
+    context, context_source, fingerprint = _context_entry_for_mode(
         context_mode,
         fixture_name=request.args.get("fixture_name"),
     )
-    if context is None:
-        return {
+    schema, etag = _context_schema(context, context_source, fingerprint)
+    return _etag_response(
+        {
             "status": "ok",
-            "has_context": False,
-            "context_source": None,
-            "schema": build_context_schema({}),
-        }, 200
-    return {
-        "status": "ok",
-        "has_context": True,
-        "context_source": context_source,
-        "schema": build_context_schema(context),
-    }, 200
+            "has_context": context is not None,
+            "context_source": context_source if context is not None else None,
+            "schema": schema,
+        },
+        f"schema-{etag}",
+    )
 
 
 @app.get("/editor/catalog")
-def editor_catalog() -> tuple[dict, int]:
+def editor_catalog() -> Response | tuple[dict, int] | tuple[dict, int, dict[str, str]]:
     raw_mode = request.args.get("context_mode")
     try:
         context_mode = _resolve_context_mode(raw_mode)
@@ -3642,30 +4080,22 @@ def editor_catalog() -> tuple[dict, int]:
         return {"status": "error", "error": str(exc)}, 400
 
     fixture_name = request.args.get("fixture_name")
-    context, context_source = _context_for_mode(
+    context, context_source, fingerprint = _context_entry_for_mode(
         context_mode,
         fixture_name=fixture_name,
     )
-    if context is None:
-        schema = build_context_schema({})
-        return {
+    schema, etag = _context_schema(context, context_source, fingerprint)
+    return _etag_response(
+        {
             "status": "ok",
-            "has_context": False,
-            "context_source": None,
+            "has_context": context is not None,
+            "context_source": context_source if context is not None else None,
             "catalog": schema,
             "fixtures": list_sample_template_fixtures(),
             "context_modes": ["latest", "sample", "latest_or_sample", "fixture"],
-        }, 200
-
-    schema = build_context_schema(context)
-    return {
-        "status": "ok",
-        "has_context": True,
-        "context_source": context_source,
-        "catalog": schema,
-        "fixtures": list_sample_template_fixtures(),
-        "context_modes": ["latest", "sample", "latest_or_sample", "fixture"],
-    }, 200
+        },
+        f"catalog-{etag}",
+    )
 
 
 @app.get("/agent-control/handshake")
@@ -3821,6 +4251,13 @@ def agent_control_next_week_context_get() -> tuple[dict, int]:
     }, 200
 
 
+def _agent_control_list_limit() -> int:
+    try:
+        return max(1, min(500, int(request.args.get("limit", "100"))))
+    except ValueError:
+        return 100
+
+
 @app.get("/agent-control/drafts")
 def agent_control_drafts_get() -> tuple[dict, int]:
     current = _effective_settings()
@@ -3828,8 +4265,18 @@ def agent_control_drafts_get() -> tuple[dict, int]:
     if access_error is not None:
         return access_error
     resource_kind = str(request.args.get("resource_kind") or "").strip() or None
-    drafts = list_agent_drafts(current.state_dir, resource_kind=resource_kind)
-    return {"status": "ok", "drafts": drafts, "count": len(drafts)}, 200
+    status = str(request.args.get("status") or "").strip() or None
+    cursor = str(request.args.get("cursor") or "").strip() or None
+    limit = _agent_control_list_limit()
+    drafts = list_agent_drafts(
+        current.state_dir,
+        resource_kind=resource_kind,
+        status=status,
+        cursor=cursor,
+        limit=limit,
+    )
+    next_cursor = drafts[-1].get("draft_id") if len(drafts) >= limit else None
+    return {"status": "ok", "drafts": drafts, "count": len(drafts), "next_cursor": next_cursor}, 200
 
 
 @app.post("/agent-control/drafts")
@@ -4057,8 +4504,12 @@ def agent_control_jobs_get() -> tuple[dict, int]:
     if access_error is not None:
         return access_error
     task_kind = str(request.args.get("task_kind") or "").strip() or None
-    jobs = list_agent_jobs(current.state_dir, task_kind=task_kind)
-    return {"status": "ok", "jobs": jobs, "count": len(jobs)}, 200
+    status = str(request.args.get("status") or "").strip() or None
+    cursor = str(request.args.get("cursor") or "").strip() or None
+    limit = _agent_control_list_limit()
+    jobs = list_agent_jobs(current.state_dir, task_kind=task_kind, status=status, cursor=cursor, limit=limit)
+    next_cursor = jobs[-1].get("job_id") if len(jobs) >= limit else None
+    return {"status": "ok", "jobs": jobs, "count": len(jobs), "next_cursor": next_cursor}, 200
 
 
 @app.get("/agent-control/jobs/<string:job_id>")
@@ -4079,12 +4530,22 @@ def agent_control_audit_get() -> tuple[dict, int]:
     access_error = _require_agent_control_access(current, scope="read")
     if access_error is not None:
         return access_error
+    limit = _agent_control_list_limit()
+    raw_cursor = str(request.args.get("cursor") or "").strip()
     try:
-        limit = max(1, min(500, int(request.args.get("limit", "100"))))
+        cursor = int(raw_cursor) if raw_cursor else None
     except ValueError:
-        limit = 100
-    events = list_audit_events(current.state_dir, limit=limit)
-    return {"status": "ok", "events": events, "count": len(events)}, 200
+        return {"status": "error", "error": "cursor must be the next_cursor value from a previous page."}, 400
+    events = list_audit_events(
+        current.state_dir,
+        limit=limit,
+        cursor=cursor,
+        event_type=str(request.args.get("event_type") or "").strip() or None,
+        resource_kind=str(request.args.get("resource_kind") or "").strip() or None,
+        resource_id=str(request.args.get("resource_id") or "").strip() or None,
+    )
+    next_cursor = str(events[-1]["seq"]) if len(events) >= limit else None
+    return {"status": "ok", "events": events, "count": len(events), "next_cursor": next_cursor}, 200
 
 
 @app.post("/agent/tasks/plan-next-week")
@@ -4385,29 +4846,216 @@ def _run_rerun(force_update: bool, activity_id: int | None = None) -> tuple[dict
         }, 500
 
 
+def _rerun_sync_requested() -> bool:
+    return str(request.args.get("sync") or "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _job_payload(job: dict[str, Any]) -> dict[str, Any]:
+    payload = dict(job)
+    raw_result = payload.pop("last_result_json", None)
+    result: object = None
+    if isinstance(raw_result, str) and raw_result.strip():
+        try:
+            result = json.loads(raw_result)
+        except ValueError:
+            result = raw_result
+    payload["result"] = result
+    payload["terminal"] = payload.get("status") in JOB_STATUS_TERMINAL
+    if payload.get("activity_id") == ACTIVITY_JOB_LATEST_TARGET:
+        payload["activity_id"] = None
+    return payload
+
+
+def _enqueue_rerun_job(current: Settings, activity_id: int | None) -> str | None:
+    return enqueue_activity_job(
+        current.processed_log_file,
+        activity_id if activity_id is not None else ACTIVITY_JOB_LATEST_TARGET,
+        request_kind=(
+            JOB_REQUEST_KIND_RERUN_ACTIVITY if activity_id is not None else JOB_REQUEST_KIND_RERUN_LATEST
+        ),
+        requested_by="api",
+        force_update=True,
+        priority=10,
+        max_attempts=current.job_max_attempts,
+    )
+
+
+def _queue_rerun(activity_id: int | None = None) -> tuple[dict, int]:
+    current = _effective_settings()
+    job_id = _enqueue_rerun_job(current, activity_id)
+    timestamp = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+    if not job_id:
+        return {
+            "status": "error",
+            "error": "Failed to enqueue rerun job.",
+            "status_code": "error",
+            "timestamp_utc": timestamp,
+        }, 500
+    job = get_activity_job(current.processed_log_file, job_id)
+    return {
+        "status": "queued",
+        "status_code": "queued",
+        "job_id": job_id,
+        "job": _job_payload(job) if job else None,
+        "status_url": f"/jobs/{job_id}",
+        "timestamp_utc": timestamp,
+    }, 202
+
+
+def _resolve_bulk_rerun_activity_ids(current: Settings, body: dict[str, Any]) -> list[int]:
+    raw_ids = body.get("activity_ids")
+    if raw_ids is not None:
+        if not isinstance(raw_ids, list):
+            raise ValueError("activity_ids must be a list of integers.")
+        activity_ids: list[int] = []
+        for raw_id in raw_ids:
+            if isinstance(raw_id, bool):
+                raise ValueError("activity_ids must be a list of integers.")
+            try:
+                activity_ids.append(int(raw_id))
+            except (TypeError, ValueError):
+                raise ValueError("activity_ids must be a list of integers.") from None
+        return list(dict.fromkeys(activity_ids))
+
+    start_raw = str(body.get("start_date") or "").strip()
+    end_raw = str(body.get("end_date") or "").strip()
+    if not start_raw or not end_raw:
+        raise ValueError("Provide activity_ids or both start_date and end_date (YYYY-MM-DD).")
+    try:
+        start_date = date.fromisoformat(start_raw)
+        end_date = date.fromisoformat(end_raw)
+    except ValueError:
+        raise ValueError("start_date and end_date must be YYYY-MM-DD.") from None
+    if end_date < start_date:
+        raise ValueError("end_date must be on or after start_date.")
+
+    # Never rebuild here: a cold cache would run a full Strava sync inside the request.
+    payload = load_cached_dashboard_payload(current)
+    if payload is None:
+        raise LookupError("Dashboard data is not cached yet; load the dashboard once or pass activity_ids.")
+    activities = payload.get("activities")
+    matched: list[int] = []
+    for item in activities if isinstance(activities, list) else []:
+        if not isinstance(item, dict):
+            continue
+        try:
+            item_date = date.fromisoformat(str(item.get("date") or ""))
+            item_id = int(item.get("id"))
+        except (TypeError, ValueError):
+            continue
+        if start_date <= item_date <= end_date:
+            matched.append(item_id)
+    return list(dict.fromkeys(matched))
+
+
 @app.post("/rerun/latest")
 def rerun_latest() -> tuple[dict, int]:
-    return _run_rerun(force_update=True)
+    if _rerun_sync_requested():
+        return _run_rerun(force_update=True)
+    return _queue_rerun()
 
 
 @app.post("/rerun/activity/<int:activity_id>")
 def rerun_activity(activity_id: int) -> tuple[dict, int]:
-    return _run_rerun(force_update=True, activity_id=activity_id)
+    if _rerun_sync_requested():
+        return _run_rerun(force_update=True, activity_id=activity_id)
+    return _queue_rerun(activity_id)
 
 
 @app.post("/rerun")
 def rerun() -> tuple[dict, int]:
     body = request.get_json(silent=True) or {}
     activity_id = body.get("activity_id")
-    if activity_id is None:
-        return _run_rerun(force_update=True)
+    activity_id_int: int | None = None
+    if activity_id is not None:
+        try:
+            activity_id_int = int(activity_id)
+        except (TypeError, ValueError):
+            return {"status": "error", "error": "activity_id must be an integer."}, 400
+
+    if _rerun_sync_requested():
+        return _run_rerun(force_update=True, activity_id=activity_id_int)
+    return _queue_rerun(activity_id_int)
 
+
+@app.post("/rerun/bulk")
+def rerun_bulk() -> tuple[dict, int]:
+    body = request.get_json(silent=True) or {}
+    if not isinstance(body, dict):
+        return {"status": "error", "error": "Request body must be a JSON object."}, 400
+    current = _effective_settings()
     try:
-        activity_id_int = int(activity_id)
-    except (TypeError, ValueError):
-        return {"status": "error", "error": "activity_id must be an integer."}, 400
+        activity_ids = _resolve_bulk_rerun_activity_ids(current, body)
+    except ValueError as exc:
+        return {"status": "error", "error": str(exc)}, 400
+    except LookupError as exc:
+        return {"status": "error", "error": str(exc)}, 409
+    if not activity_ids:
+        return {"status": "error", "error": "No activities matched the request."}, 404
+    if len(activity_ids) > RERUN_BULK_MAX_ACTIVITIES:
+        return {
+            "status": "error",
+            "error": f"Bulk rerun is limited to {RERUN_BULK_MAX_ACTIVITIES} activities per request.",
+        }, 400
+
+    jobs: list[dict[str, Any]] = []
+    failed: list[int] = []
+    for activity_id in activity_ids:
+        job_id = _enqueue_rerun_job(current, activity_id)
+        if job_id:
+            jobs.append({"job_id": job_id, "activity_id": str(activity_id), "status_url": f"/jobs/{job_id}"})
+        else:
+            failed.append(activity_id)
+    return {
+        "status": "queued" if jobs else "error",
+        "jobs": jobs,
+        "count": len(jobs),
+        "failed_activity_ids": failed,
+        "timestamp_utc": datetime.now(timezone.utc).replace(microsecond=0).isoformat(),
+    }, 202 if jobs else 500
+
+
+@app.get("/events")
+def events_stream() -> Response | tuple[dict, int, dict[str, str]]:
+    current = _effective_settings()
+    raw_last_event_id = str(
+        request.headers.get("Last-Event-ID") or request.args.get("last_event_id") or ""
+    ).strip()
+    last_event_id: int | None = None
+    if raw_last_event_id:
+        try:
+            last_event_id = max(0, int(raw_last_event_id))
+        except ValueError:
+            last_event_id = None
+    max_clients = event_stream_max_clients(current.api_threads)
+    if not event_stream_has_capacity(current.processed_log_file, max_clients=max_clients):
+        retry_after = str(max(1, EVENT_STREAM_RETRY_MS // 1000))
+        return {"status": "error", "error": "Event stream capacity reached; retry shortly."}, 503, {
+            "Retry-After": retry_after
+        }
+    return Response(
+        stream_change_events(current.processed_log_file, max_clients=max_clients, last_event_id=last_event_id),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
-    return _run_rerun(force_update=True, activity_id=activity_id_int)
+
+@app.get("/jobs/<string:job_id>")
+def job_status_get(job_id: str) -> tuple[dict, int]:
+    current = _effective_settings()
+    try:
+        wait_seconds = max(0.0, min(float(RERUN_JOB_WAIT_MAX_SECONDS), float(request.args.get("wait", "0"))))
+    except ValueError:
+        wait_seconds = 0.0
+    deadline = time.monotonic() + wait_seconds
+    while True:
+        job = get_activity_job(current.processed_log_file, job_id)
+        if job is None:
+            return {"status": "error", "error": "Unknown job_id."}, 404
+        payload = _job_payload(job)
+        if payload["terminal"] or time.monotonic() >= deadline:
+            return {"status": "ok", "job": payload}, 200
+        time.sleep(RERUN_JOB_WAIT_POLL_SECONDS)
 
 
 if __name__ == "__main__":
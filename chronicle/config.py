@@ -2,13 +2,14 @@ from __future__ import annotations
 
 import os
 import shutil
+import threading
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Callable
 
 from datetime import datetime, timezone
 
-from .setup_config import read_setup_overrides_payload
+from .setup_config import read_setup_overrides_payload, setup_overrides_path
 
 try:
     from dotenv import load_dotenv
@@ -167,6 +168,12 @@ class Settings:
     max_optional_service_calls_per_cycle: int
     enable_service_result_cache: bool
     service_cache_ttl_seconds: int
+    enable_pipeline_trace: bool
+    profile_next_cycles: int
+    profile_route: str | None
+    profile_route_requests: int
+    profiler_mode: str
+    profiler_sample_interval_ms: int
     runtime_cleanup_interval_seconds: int
     runtime_retention_service_cache_seconds: int
     runtime_retention_transient_runtime_seconds: int
@@ -299,6 +306,12 @@ class Settings:
             max_optional_service_calls_per_cycle=_int_env("MAX_OPTIONAL_SERVICE_CALLS_PER_CYCLE", 10, minimum=0, maximum=50),
             enable_service_result_cache=_bool_env("ENABLE_SERVICE_RESULT_CACHE", True),
             service_cache_ttl_seconds=_int_env("SERVICE_CACHE_TTL_SECONDS", 600, minimum=0, maximum=86400),
+            enable_pipeline_trace=_bool_env("ENABLE_PIPELINE_TRACE", False),
+            profile_next_cycles=_int_env("PROFILE_NEXT_CYCLES", 0, minimum=0, maximum=50),
+            profile_route=_optional_str_env("PROFILE_ROUTE"),
+            profile_route_requests=_int_env("PROFILE_ROUTE_REQUESTS", 10, minimum=1, maximum=1000),
+            profiler_mode=_str_env("PROFILER_MODE", default="sample").lower(),
+            profiler_sample_interval_ms=_int_env("PROFILER_SAMPLE_INTERVAL_MS", 5, minimum=1, maximum=1000),
             runtime_cleanup_interval_seconds=_int_env(
                 "RUNTIME_CLEANUP_INTERVAL_SECONDS",
                 21600,
@@ -395,3 +408,56 @@ class Settings:
 
     def ensure_state_paths(self) -> None:
         self.state_dir.mkdir(parents=True, exist_ok=True)
+
+
+_SETTINGS_CACHE_LOCK = threading.Lock()
+_SETTINGS_CACHE: dict[str, object] = {}
+
+
+def _settings_file_marker(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (int(stat.st_mtime_ns), int(stat.st_size))
+
+
+def _settings_cache_entry_fresh(entry: dict[str, object]) -> bool:
+    if entry.get("cwd") != os.getcwd():
+        return False
+    if entry.get("environ") != os.environ:
+        return False
+    overrides_path = entry.get("overrides_path")
+    if not isinstance(overrides_path, Path):
+        return False
+    return _settings_file_marker(overrides_path) == entry.get("overrides_marker")
+
+
+def get_settings(*, refresh: bool = False) -> Settings:
+    with _SETTINGS_CACHE_LOCK:
+        entry = _SETTINGS_CACHE.get("entry")
+        if not refresh and isinstance(entry, dict) and _settings_cache_entry_fresh(entry):
+            cached = entry.get("settings")
+            if isinstance(cached, Settings):
+                return cached
+
+        cwd = os.getcwd()
+        environ = dict(os.environ)
+        overrides_path = setup_overrides_path(Path(environ.get("STATE_DIR", "state")).resolve())
+        # Stat before parsing so a write racing the rebuild invalidates the entry on the next call.
+        overrides_marker = _settings_file_marker(overrides_path)
+        current = Settings.from_env()
+        current.ensure_state_paths()
+        _SETTINGS_CACHE["entry"] = {
+            "settings": current,
+            "cwd": cwd,
+            "environ": environ,
+            "overrides_path": overrides_path,
+            "overrides_marker": overrides_marker,
+        }
+        return current
+
+
+def invalidate_settings_cache() -> None:
+    with _SETTINGS_CACHE_LOCK:
+        _SETTINGS_CACHE.pop("entry", None)
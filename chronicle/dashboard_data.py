@@ -5,6 +5,7 @@ import logging
 import os
 import re
 import threading
+import time
 import uuid
 from collections import defaultdict
 from datetime import datetime, timedelta, timezone
@@ -13,12 +14,20 @@ from typing import Any
 
 from .config import Settings
 from .dashboard_response_modes import apply_dashboard_response_mode, normalize_dashboard_response_mode
+from .metrics import DEFAULT_LATENCY_BUCKETS_MS, PAYLOAD_SIZE_BUCKETS_BYTES
 from .stat_modules.intervals_data import get_intervals_dashboard_metrics
 from .storage import (
     acquire_runtime_lock,
+    clear_intervals_metrics,
+    count_intervals_metrics,
+    get_runtime_value,
+    list_intervals_metrics,
+    observe_runtime_histogram,
     read_json,
     release_runtime_lock,
+    set_runtime_value,
     set_runtime_values,
+    upsert_intervals_metrics,
     write_json,
 )
 from .strava_client import MAX_ACTIVITY_PAGES, StravaClient
@@ -36,7 +45,9 @@ DEFAULT_HISTORY_START = datetime(1970, 1, 1, tzinfo=timezone.utc)
 DEFAULT_REFRESH_LOCK_TTL_SECONDS = 300
 DEFAULT_INTERVALS_INCREMENTAL_OVERLAP_HOURS = 48
 DEFAULT_STRAVA_INCREMENTAL_OVERLAP_HOURS = 48
-INTERVALS_CACHE_SCHEMA_VERSION = 1
+INTERVALS_CACHE_SCHEMA_VERSION = 2
+LEGACY_INTERVALS_CACHE_SCHEMA_VERSION = 1
+INTERVALS_CACHE_SYNC_KEY = "dashboard.intervals_cache.sync"
 REFRESH_LOCK_NAME = "dashboard.refresh"
 
 TYPE_LABEL_OVERRIDES = {
@@ -415,88 +426,82 @@ def _sanitize_intervals_record(record: dict[str, Any]) -> dict[str, Any] | None:
     return sanitized
 
 
-def _intervals_record_cache_key(record: dict[str, Any]) -> str | None:
-    activity_id = str(record.get("strava_activity_id") or "").strip()
-    if activity_id:
-        return f"id:{activity_id}"
-    minute_key = _iso_minute_key(record.get("start_date"))
-    if minute_key:
-        return f"minute:{minute_key}"
-    return None
-
-
-def _merge_intervals_records(
-    base_records: list[dict[str, Any]],
-    incoming_records: list[dict[str, Any]],
-) -> list[dict[str, Any]]:
-    merged: dict[str, dict[str, Any]] = {}
-    for record in [*base_records, *incoming_records]:
+def _sanitize_intervals_records(records: object) -> list[dict[str, Any]]:
+    if not isinstance(records, list):
+        return []
+    sanitized_records: list[dict[str, Any]] = []
+    for record in records:
         sanitized = _sanitize_intervals_record(record)
-        if sanitized is None:
-            continue
-        key = _intervals_record_cache_key(sanitized)
-        if not key:
-            continue
-        merged[key] = sanitized
-    return list(merged.values())
+        if sanitized is not None:
+            sanitized_records.append(sanitized)
+    return sanitized_records
 
 
-def _load_intervals_cache_records(
-    cache_payload: dict[str, Any] | None,
-    *,
-    history_start: datetime,
-) -> tuple[list[dict[str, Any]], datetime | None]:
-    if not isinstance(cache_payload, dict):
-        return ([], None)
-    schema_version = int(cache_payload.get("schema_version") or 0)
-    cached_history_start = _as_utc_datetime(
-        cache_payload.get("history_start"),
-        fallback=history_start,
-    )
+def _load_intervals_sync_state(settings: Settings, *, history_start: datetime) -> dict[str, Any] | None:
+    state = get_runtime_value(settings.processed_log_file, INTERVALS_CACHE_SYNC_KEY)
+    if not isinstance(state, dict):
+        return None
+    schema_version = int(state.get("schema_version") or 0)
+    cached_history_start = _as_utc_datetime(state.get("history_start"), fallback=history_start)
     if schema_version != INTERVALS_CACHE_SCHEMA_VERSION or cached_history_start != history_start:
-        return ([], None)
-    raw_records = cache_payload.get("records")
-    records = raw_records if isinstance(raw_records, list) else []
-    latest_sync_at = _parse_iso_datetime(cache_payload.get("latest_sync_at"))
-    return (_merge_intervals_records([], records), latest_sync_at)
+        return None
+    return state
 
 
-def _persist_intervals_cache_records(
-    path: Path,
-    *,
-    history_start: datetime,
-    latest_sync_at: datetime,
-    last_fetch_oldest: datetime,
-    mode: str,
-    records: list[dict[str, Any]],
-) -> None:
-    payload = {
+def _migrate_legacy_intervals_cache(settings: Settings, *, history_start: datetime) -> dict[str, Any] | None:
+    legacy_path = intervals_metrics_cache_path(settings)
+    legacy_payload = read_json(legacy_path)
+    if not isinstance(legacy_payload, dict):
+        return None
+    schema_version = int(legacy_payload.get("schema_version") or 0)
+    cached_history_start = _as_utc_datetime(legacy_payload.get("history_start"), fallback=history_start)
+    latest_sync_at = _parse_iso_datetime(legacy_payload.get("latest_sync_at"))
+    if (
+        schema_version != LEGACY_INTERVALS_CACHE_SCHEMA_VERSION
+        or cached_history_start != history_start
+        or latest_sync_at is None
+    ):
+        return None
+    clear_intervals_metrics(settings.processed_log_file)
+    upsert_intervals_metrics(
+        settings.processed_log_file,
+        _sanitize_intervals_records(legacy_payload.get("records")),
+    )
+    state = {
         "schema_version": INTERVALS_CACHE_SCHEMA_VERSION,
         "history_start": history_start.isoformat(),
         "latest_sync_at": latest_sync_at.isoformat(),
-        "last_fetch_oldest": last_fetch_oldest.isoformat(),
-        "last_fetch_mode": mode,
-        "records": records,
+        "last_fetch_oldest": str(legacy_payload.get("last_fetch_oldest") or ""),
+        "last_fetch_mode": "legacy_import",
     }
-    write_json(path, payload)
+    set_runtime_value(settings.processed_log_file, INTERVALS_CACHE_SYNC_KEY, state)
+    try:
+        legacy_path.unlink()
+    except OSError:
+        pass
+    return state
 
 
-def _get_intervals_records_incremental(
+def _sync_intervals_metrics_incremental(
     settings: Settings,
     *,
     oldest: datetime | str | None,
     newest: datetime | str | None,
-) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+) -> dict[str, Any]:
     now_utc = datetime.now(timezone.utc)
     newest_dt = _as_utc_datetime(newest, fallback=now_utc)
     oldest_dt = _as_utc_datetime(oldest, fallback=DEFAULT_HISTORY_START)
     if oldest_dt > newest_dt:
         oldest_dt = newest_dt
 
-    cache_path = intervals_metrics_cache_path(settings)
-    cached_payload = read_json(cache_path)
-    cached_records, last_sync_at = _load_intervals_cache_records(cached_payload, history_start=oldest_dt)
-    mode = "incremental" if cached_records else "seed"
+    state = _load_intervals_sync_state(settings, history_start=oldest_dt)
+    if state is None:
+        state = _migrate_legacy_intervals_cache(settings, history_start=oldest_dt)
+    if state is None:
+        clear_intervals_metrics(settings.processed_log_file)
+    cached_count = count_intervals_metrics(settings.processed_log_file) if state is not None else 0
+    mode = "incremental" if cached_count > 0 else "seed"
+    last_sync_at = _parse_iso_datetime(state.get("latest_sync_at")) if state is not None else None
 
     current_year_start = datetime(newest_dt.year, 1, 1, tzinfo=timezone.utc)
     overlap = timedelta(hours=_intervals_incremental_overlap_hours())
@@ -517,25 +522,38 @@ def _get_intervals_records_incremental(
         oldest=fetch_oldest,
         newest=newest_dt,
     )
-    merged_records = _merge_intervals_records(cached_records, incoming)
-    _persist_intervals_cache_records(
-        cache_path,
-        history_start=oldest_dt,
-        latest_sync_at=newest_dt,
-        last_fetch_oldest=fetch_oldest,
-        mode=mode,
-        records=merged_records,
-    )
-    return (
-        merged_records,
+    upserted = upsert_intervals_metrics(settings.processed_log_file, _sanitize_intervals_records(incoming))
+    set_runtime_value(
+        settings.processed_log_file,
+        INTERVALS_CACHE_SYNC_KEY,
         {
-            "mode": mode,
-            "fetched_records": int(len(incoming)),
-            "cached_records": int(len(merged_records)),
-            "fetch_oldest": fetch_oldest.isoformat(),
+            "schema_version": INTERVALS_CACHE_SCHEMA_VERSION,
+            "history_start": oldest_dt.isoformat(),
             "latest_sync_at": newest_dt.isoformat(),
+            "last_fetch_oldest": fetch_oldest.isoformat(),
+            "last_fetch_mode": mode,
         },
     )
+    return {
+        "mode": mode,
+        "fetched_records": int(len(incoming)),
+        "upserted_records": int(upserted),
+        "cached_records": int(count_intervals_metrics(settings.processed_log_file)),
+        "fetch_oldest": fetch_oldest.isoformat(),
+        "latest_sync_at": newest_dt.isoformat(),
+    }
+
+
+def _lookup_intervals_metrics(
+    settings: Settings,
+    activities: list[dict[str, Any]],
+) -> tuple[dict[str, dict[str, Any]], dict[str, dict[str, Any]]]:
+    records = list_intervals_metrics(
+        settings.processed_log_file,
+        activity_ids=[str(activity["id"]) for activity in activities],
+        start_minutes=[str(activity.get("_start_minute_key") or "") for activity in activities],
+    )
+    return _index_intervals_metrics(records)
 
 
 def _new_intervals_rollup() -> dict[str, float]:
@@ -720,8 +738,9 @@ def _build_payload_from_activities(
 ) -> dict[str, Any]:
     activities_copy = [dict(item) for item in activities]
 
-    intervals_records: list[dict[str, Any]] = []
     intervals_sync: dict[str, Any] = {}
+    intervals_by_id: dict[str, dict[str, Any]] = {}
+    intervals_by_minute: dict[str, dict[str, Any]] = {}
     intervals_matches = 0
     after_dt = _dashboard_history_start()
     if (
@@ -731,12 +750,12 @@ def _build_payload_from_activities(
         and isinstance(settings.intervals_api_key, str)
         and settings.intervals_api_key.strip()
     ):
-        intervals_records, intervals_sync = _get_intervals_records_incremental(
+        intervals_sync = _sync_intervals_metrics_incremental(
             settings,
             oldest=after_dt,
             newest=datetime.now(timezone.utc),
         )
-    intervals_by_id, intervals_by_minute = _index_intervals_metrics(intervals_records)
+        intervals_by_id, intervals_by_minute = _lookup_intervals_metrics(settings, activities_copy)
     if intervals_by_id or intervals_by_minute:
         for activity in activities_copy:
             matched = intervals_by_id.get(str(activity["id"])) or intervals_by_minute.get(
@@ -908,7 +927,7 @@ def _build_payload_from_activities(
 
     payload["intervals"] = {
         "enabled": bool(settings.enable_intervals),
-        "records": int(len(intervals_records)),
+        "records": int(intervals_sync.get("cached_records") or 0),
         "matched_activities": int(intervals_matches),
         **({"sync_mode": intervals_sync.get("mode")} if intervals_sync.get("mode") else {}),
         **(
@@ -921,6 +940,11 @@ def _build_payload_from_activities(
             if "cached_records" in intervals_sync
             else {}
         ),
+        **(
+            {"upserted_records": int(intervals_sync.get("upserted_records") or 0)}
+            if "upserted_records" in intervals_sync
+            else {}
+        ),
         **({"fetch_oldest": intervals_sync.get("fetch_oldest")} if intervals_sync.get("fetch_oldest") else {}),
         **({"latest_sync_at": intervals_sync.get("latest_sync_at")} if intervals_sync.get("latest_sync_at") else {}),
     }
@@ -933,33 +957,38 @@ def build_dashboard_payload(
     settings: Settings,
     *,
     latest_marker: tuple[str | None, str | None] | None = None,
+    estimated_total: int | None = None,
 ) -> dict[str, Any]:
     client = StravaClient(settings)
     after_dt = _dashboard_history_start()
-    raw_activities = client.get_activities_after(after_dt, per_page=200)
+    raw_count = 0
+    first_raw: dict[str, Any] | None = None
+    deduped_by_id: dict[str, dict[str, Any]] = {}
+    # Pages stream in while later ones are still being fetched; normalize as they arrive.
+    for raw in client.iter_activities_after(after_dt, per_page=200, estimated_total=estimated_total):
+        raw_count += 1
+        if not isinstance(raw, dict):
+            continue
+        if first_raw is None:
+            first_raw = raw
+        normalized = _normalize_activity(raw)
+        if normalized is None:
+            continue
+        deduped_by_id[normalized["id"]] = normalized
+
     marker = latest_marker
     if marker is None:
         derived_id: str | None = None
         derived_start: str | None = None
-        if raw_activities and isinstance(raw_activities[0], dict):
-            first = raw_activities[0]
-            raw_id = first.get("id")
+        if first_raw is not None:
+            raw_id = first_raw.get("id")
             derived_id = str(raw_id).strip() if raw_id is not None else None
-            raw_start = first.get("start_date") or first.get("start_date_local")
+            raw_start = first_raw.get("start_date") or first_raw.get("start_date_local")
             derived_start = str(raw_start).strip() if raw_start is not None else None
         marker = (derived_id or None, derived_start or None)
         if marker == (None, None):
             marker = _fetch_latest_activity_marker(settings)
 
-    deduped_by_id: dict[str, dict[str, Any]] = {}
-    for raw in raw_activities:
-        if not isinstance(raw, dict):
-            continue
-        normalized = _normalize_activity(raw)
-        if normalized is None:
-            continue
-        deduped_by_id[normalized["id"]] = normalized
-
     activities = sorted(
         deduped_by_id.values(),
         key=lambda item: (str(item["date"]), str(item["id"])),
@@ -969,7 +998,7 @@ def build_dashboard_payload(
         settings,
         activities,
         marker=marker,
-        history_truncated=len(raw_activities) >= page_cap,
+        history_truncated=raw_count >= page_cap,
     )
 
 
@@ -995,9 +1024,10 @@ def _build_incremental_payload_from_cache(
         fetch_after = history_start
 
     client = StravaClient(settings)
-    raw_recent = client.get_activities_after(fetch_after, per_page=200)
+    fetched_records = 0
     deduped_by_id: dict[str, dict[str, Any]] = {item["id"]: item for item in cached_activities}
-    for raw in raw_recent:
+    for raw in client.iter_activities_after(fetch_after, per_page=200):
+        fetched_records += 1
         if not isinstance(raw, dict):
             continue
         normalized = _normalize_activity(raw)
@@ -1021,7 +1051,7 @@ def _build_incremental_payload_from_cache(
     )
     payload["sync_mode"] = "incremental"
     payload["sync_fetch_after"] = fetch_after.isoformat()
-    payload["sync_fetched_records"] = int(len(raw_recent))
+    payload["sync_fetched_records"] = int(fetched_records)
     return payload
 
 
@@ -1109,8 +1139,12 @@ def _build_and_persist_payload(
     data_path: Path,
     *,
     latest_marker: tuple[str | None, str | None] | None = None,
+    estimated_total: int | None = None,
 ) -> dict[str, Any]:
-    payload = _normalize_dashboard_payload(build_dashboard_payload(settings, latest_marker=latest_marker), settings)
+    payload = _normalize_dashboard_payload(
+        build_dashboard_payload(settings, latest_marker=latest_marker, estimated_total=estimated_total),
+        settings,
+    )
     _persist_dashboard_payload_cached(data_path, payload)
     return payload
 
@@ -1129,7 +1163,13 @@ def _smart_revalidate_payload(settings: Settings, data_path: Path, cached_payloa
     if isinstance(incremental, dict):
         _persist_dashboard_payload_cached(data_path, incremental)
         return incremental
-    return _build_and_persist_payload(settings, data_path, latest_marker=latest_marker)
+    cached_activities = cached_payload.get("activities")
+    return _build_and_persist_payload(
+        settings,
+        data_path,
+        latest_marker=latest_marker,
+        estimated_total=len(cached_activities) if isinstance(cached_activities, list) and cached_activities else None,
+    )
 
 
 def _run_background_refresh(settings: Settings, *, reason: str) -> None:
@@ -1144,8 +1184,10 @@ def _run_background_refresh(settings: Settings, *, reason: str) -> None:
     if not lock_acquired:
         return
 
+    started = time.perf_counter()
+    data_path = dashboard_data_path(settings)
+    result_label = "error"
     try:
-        data_path = dashboard_data_path(settings)
         cached = _load_dashboard_payload_cached(data_path)
         set_runtime_values(
             settings.processed_log_file,
@@ -1159,17 +1201,14 @@ def _run_background_refresh(settings: Settings, *, reason: str) -> None:
         if isinstance(cached, dict):
             refreshed = _smart_revalidate_payload(settings, data_path, cached)
             latest_id, _latest_start = _payload_latest_marker(refreshed)
-            set_runtime_values(
-                settings.processed_log_file,
-                {
-                    "dashboard.refresh.result": (
-                        "validated_unchanged" if latest_id and latest_id == _payload_latest_marker(cached)[0] else "rebuilt"
-                    )
-                },
+            result_label = (
+                "validated_unchanged" if latest_id and latest_id == _payload_latest_marker(cached)[0] else "rebuilt"
             )
+            set_runtime_values(settings.processed_log_file, {"dashboard.refresh.result": result_label})
         else:
             _build_and_persist_payload(settings, data_path)
-            set_runtime_values(settings.processed_log_file, {"dashboard.refresh.result": "rebuilt"})
+            result_label = "rebuilt"
+            set_runtime_values(settings.processed_log_file, {"dashboard.refresh.result": result_label})
         set_runtime_values(
             settings.processed_log_file,
             {
@@ -1194,6 +1233,7 @@ def _run_background_refresh(settings: Settings, *, reason: str) -> None:
                 "dashboard.refresh.finished_at_utc": _now_iso(),
             },
         )
+        _observe_dashboard_refresh(settings, data_path, started=started, result=result_label)
         release_runtime_lock(
             settings.processed_log_file,
             lock_name=REFRESH_LOCK_NAME,
@@ -1201,6 +1241,28 @@ def _run_background_refresh(settings: Settings, *, reason: str) -> None:
         )
 
 
+def _observe_dashboard_refresh(settings: Settings, data_path: Path, *, started: float, result: str) -> None:
+    observe_runtime_histogram(
+        settings.processed_log_file,
+        "dashboard_refresh_duration_ms",
+        (time.perf_counter() - started) * 1000.0,
+        buckets=DEFAULT_LATENCY_BUCKETS_MS,
+        labels={"result": result},
+    )
+    if result == "error":
+        return
+    try:
+        size_bytes = data_path.stat().st_size
+    except OSError:
+        return
+    observe_runtime_histogram(
+        settings.processed_log_file,
+        "dashboard_payload_bytes",
+        float(size_bytes),
+        buckets=PAYLOAD_SIZE_BUCKETS_BYTES,
+    )
+
+
 def _schedule_background_refresh(settings: Settings, *, reason: str) -> bool:
     global _REFRESH_FUTURE
     with _REFRESH_GUARD:
@@ -1210,6 +1272,11 @@ def _schedule_background_refresh(settings: Settings, *, reason: str) -> bool:
     return True
 
 
+def load_cached_dashboard_payload(settings: Settings) -> dict[str, Any] | None:
+    """Returns the payload as persisted, without ever triggering a rebuild."""
+    return _load_dashboard_payload_cached(dashboard_data_path(settings))
+
+
 def ensure_dashboard_cache_warm(settings: Settings) -> dict[str, Any]:
     data_path = dashboard_data_path(settings)
     cached = _load_dashboard_payload_cached(data_path)
@@ -1,16 +1,22 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
 from copy import deepcopy
 from datetime import date, datetime, timezone
+import difflib
 import hashlib
 import json
 from pathlib import Path
 import re
-from typing import Any
+import time
+from typing import Any, Iterator
 import yaml
 
-from jinja2 import StrictUndefined, TemplateError, meta, pass_context
-from jinja2.sandbox import SandboxedEnvironment
+from jinja2 import StrictUndefined, TemplateError, meta, nodes, pass_context
+from jinja2.sandbox import ImmutableSandboxedEnvironment
+from jinja2.visitor import NodeTransformer
 
 from .config import Settings
 from .numeric_utils import as_float as _shared_as_float
@@ -28,6 +34,10 @@ class _DisplayValueMapping(dict):
     __repr__ = __str__
 
 
+class _NormalizedTemplateContext(dict):
+    """Marker for contexts that already carry the derived intervals/misery fields."""
+
+
 DEFAULT_DESCRIPTION_TEMPLATE = """🏆 {{ streak_days }} days in a row
 {% for notable in notables %}🏅 {{ notable }}
 {% endfor %}{% for achievement in achievements %}🏅 {{ achievement }}
@@ -52,6 +62,10 @@ DEFAULT_DESCRIPTION_TEMPLATE = """🏆 {{ streak_days }} days in a row
 🏃 {{ periods.year.gap }} | 🗺️ {{ periods.year.distance_miles }} | 🏔️ {{ periods.year.elevation_feet }}' | 🕓 {{ periods.year.duration }} | 🍺 {{ periods.year.beers }}"""
 
 MAX_TEMPLATE_CHARS = 16000
+TEMPLATE_RENDER_MAX_LOOP_ITERATIONS = 20000
+TEMPLATE_RENDER_MAX_OUTPUT_BYTES = 65536
+TEMPLATE_RENDER_TIME_BUDGET_SECONDS = 1.0
+TEMPLATE_RENDER_COST_WARNING_RATIO = 0.5
 FORBIDDEN_TEMPLATE_PATTERNS: list[tuple[re.Pattern[str], str]] = [
     (re.compile(r"{%\s*(import|from|include|extends|macro|call)\b", re.IGNORECASE), "Template uses unsupported Jinja control tag."),
     (re.compile(r"\b__\w+\b"), "Template references dunder-style attributes, which are not allowed."),
@@ -1299,12 +1313,21 @@ def icu_form_emoji(context: Any, form_percent: Any | None = None) -> str:
 
 
 def normalize_template_context(context: dict[str, Any]) -> dict[str, Any]:
-    normalized = deepcopy(context)
+    if isinstance(context, _NormalizedTemplateContext):
+        return context
+    # Copy-on-write: only the mappings that gain derived fields are copied; every other
+    # value (period stats, badges, raw weather, ...) is shared with the caller.
+    normalized = _NormalizedTemplateContext(context)
 
     intervals = normalized.get("intervals")
     if isinstance(intervals, dict):
+        intervals = dict(intervals)
+        normalized["intervals"] = intervals
         training = normalized.get("training")
         activity = normalized.get("activity")
+        if isinstance(activity, dict):
+            activity = dict(activity)
+            normalized["activity"] = activity
 
         if "fitness" not in intervals:
             intervals["fitness"] = intervals.get(
@@ -1350,9 +1373,8 @@ def normalize_template_context(context: dict[str, Any]) -> dict[str, Any]:
 
     misery = normalized.get("misery")
     weather = normalized.get("weather")
-    if not isinstance(misery, dict):
-        misery = {}
-        normalized["misery"] = misery
+    misery = dict(misery) if isinstance(misery, dict) else {}
+    normalized["misery"] = misery
 
     if "index" not in misery and isinstance(weather, dict):
         weather_misery = weather.get("misery_index")
@@ -1382,8 +1404,280 @@ def normalize_template_context(context: dict[str, Any]) -> dict[str, Any]:
     return normalized
 
 
-def _template_environment() -> SandboxedEnvironment:
-    env = SandboxedEnvironment(
+class TemplateRenderBudgetExceeded(TemplateError):
+    pass
+
+
+class _RenderGuard:
+    """Per-render cost accounting: loop iterations, output bytes and wall time."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.iterations = 0
+        self.output_bytes = 0
+        self.wrapped: dict[int, tuple[Any, Any]] = {}
+
+    def elapsed_seconds(self) -> float:
+        return time.perf_counter() - self.started
+
+    def check_time(self) -> None:
+        if self.elapsed_seconds() > TEMPLATE_RENDER_TIME_BUDGET_SECONDS:
+            raise TemplateRenderBudgetExceeded(
+                f"Template render exceeded the {TEMPLATE_RENDER_TIME_BUDGET_SECONDS:g}s time budget."
+            )
+
+    def tick(self) -> None:
+        self.iterations += 1
+        if self.iterations > TEMPLATE_RENDER_MAX_LOOP_ITERATIONS:
+            raise TemplateRenderBudgetExceeded(
+                f"Template render exceeded {TEMPLATE_RENDER_MAX_LOOP_ITERATIONS} loop iterations."
+            )
+        if self.iterations % 64 == 0:
+            self.check_time()
+
+    def add_output(self, chunk: str) -> None:
+        self.output_bytes += len(chunk.encode("utf-8"))
+        if self.output_bytes > TEMPLATE_RENDER_MAX_OUTPUT_BYTES:
+            raise TemplateRenderBudgetExceeded(
+                f"Template render exceeded {TEMPLATE_RENDER_MAX_OUTPUT_BYTES} bytes of output."
+            )
+        self.check_time()
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "loop_iterations": self.iterations,
+            "output_bytes": self.output_bytes,
+            "render_ms": round(self.elapsed_seconds() * 1000.0, 2),
+            "limits": {
+                "loop_iterations": TEMPLATE_RENDER_MAX_LOOP_ITERATIONS,
+                "output_bytes": TEMPLATE_RENDER_MAX_OUTPUT_BYTES,
+                "render_ms": round(TEMPLATE_RENDER_TIME_BUDGET_SECONDS * 1000.0, 2),
+            },
+        }
+
+
+_ACTIVE_RENDER_GUARD: ContextVar[_RenderGuard | None] = ContextVar("template_render_guard", default=None)
+
+
+def _metered(iterable: Any) -> Iterator[Any]:
+    guard = _ACTIVE_RENDER_GUARD.get()
+    for item in iterable:
+        if guard is not None:
+            guard.tick()
+        yield item
+
+
+class _GuardedList(list):
+    def __iter__(self) -> Iterator[Any]:
+        return _metered(list.__iter__(self))
+
+
+class _GuardedIterable:
+    def __init__(self, inner: Any) -> None:
+        self._inner = inner
+
+    def __iter__(self) -> Iterator[Any]:
+        return _metered(self._inner)
+
+    def __len__(self) -> int:
+        return len(self._inner)
+
+
+class _GuardedRange(Sequence):
+    """range stand-in that meters iteration but still indexes, slices and reverses like range."""
+
+    def __init__(self, inner: range) -> None:
+        self._inner = inner
+
+    def __getitem__(self, index: Any) -> Any:
+        value = self._inner[index]
+        return _GuardedRange(value) if isinstance(value, range) else value
+
+    def __len__(self) -> int:
+        return len(self._inner)
+
+    def __iter__(self) -> Iterator[Any]:
+        return _metered(self._inner)
+
+    def __reversed__(self) -> Iterator[Any]:
+        return _metered(reversed(self._inner))
+
+    def __contains__(self, item: Any) -> bool:
+        return item in self._inner
+
+    def __repr__(self) -> str:
+        return repr(self._inner)
+
+
+_GUARDED_TYPES = (_GuardedList, _GuardedIterable, _GuardedRange)
+
+
+def _guard_value(value: Any) -> Any:
+    guard = _ACTIVE_RENDER_GUARD.get()
+    if guard is None:
+        return value
+    if type(value) in (list, tuple):
+        # One wrapper per source list per render, so repeated access does not re-copy.
+        cached = guard.wrapped.get(id(value))
+        if cached is not None and cached[0] is value:
+            return cached[1]
+        wrapped = _GuardedList(value)
+        guard.wrapped[id(value)] = (value, wrapped)
+        return wrapped
+    if isinstance(value, range):
+        return _GuardedRange(value)
+    if isinstance(value, (type({}.items()), type({}.keys()), type({}.values()))):
+        return _GuardedIterable(value)
+    return value
+
+
+def _guard_value_size(value: Any) -> Any:
+    if isinstance(value, str) and len(value) * 4 > TEMPLATE_RENDER_MAX_OUTPUT_BYTES:
+        if len(value.encode("utf-8")) > TEMPLATE_RENDER_MAX_OUTPUT_BYTES:
+            raise TemplateRenderBudgetExceeded(
+                f"Template expression would exceed {TEMPLATE_RENDER_MAX_OUTPUT_BYTES} bytes of output."
+            )
+    elif isinstance(value, (list, tuple)) and len(value) > TEMPLATE_RENDER_MAX_LOOP_ITERATIONS:
+        raise TemplateRenderBudgetExceeded(
+            f"Template expression would build more than {TEMPLATE_RENDER_MAX_LOOP_ITERATIONS} "
+            "items, the loop iterations budget."
+        )
+    return value
+
+
+_GUARD_SIZE_FILTER = "_chronicle_guard_size"
+
+
+def _is_block_filter(node: nodes.Node) -> bool:
+    # {% filter %} and {% set %}...{% endset %} filters end in a Filter whose node is the block buffer.
+    while isinstance(node, nodes.Filter):
+        if node.node is None:
+            return True
+        node = node.node
+    return False
+
+
+class _RenderGuardTransformer(NodeTransformer):
+    """Routes loop iterables and value-building expressions through the render guard.
+
+    Values assigned with {% set %} never reach the output until they are
+    printed, so concatenations, filters and set blocks are size-checked where
+    they are built; otherwise repeated doubling exhausts memory in a few steps.
+    """
+
+    def _call_guard(self, attribute: str, node: nodes.Expr) -> nodes.Call:
+        return nodes.Call(
+            nodes.EnvironmentAttribute(attribute, lineno=node.lineno),
+            [node],
+            [],
+            None,
+            None,
+            lineno=node.lineno,
+        )
+
+    def visit_For(self, node: nodes.For) -> nodes.For:
+        node = self.generic_visit(node)
+        node.iter = self._call_guard("guard_loop_iterable", node.iter)
+        return node
+
+    def visit_Concat(self, node: nodes.Concat) -> nodes.Call:
+        return self._call_guard("guard_expression_size", self.generic_visit(node))
+
+    def visit_Filter(self, node: nodes.Filter) -> nodes.Node:
+        node = self.generic_visit(node)
+        return node if _is_block_filter(node) else self._call_guard("guard_expression_size", node)
+
+    def visit_AssignBlock(self, node: nodes.AssignBlock) -> nodes.AssignBlock:
+        node = self.generic_visit(node)
+        size_filter = nodes.Filter(None, _GUARD_SIZE_FILTER, [], [], None, None, lineno=node.lineno)
+        if node.filter is None:
+            node.filter = size_filter
+        else:
+            innermost = node.filter
+            while innermost.node is not None:
+                innermost = innermost.node
+            innermost.node = size_filter
+        return node
+
+
+class _GuardedSandboxedEnvironment(ImmutableSandboxedEnvironment):
+    # Also keeps the optimizer from constant-folding huge literals at compile time.
+    intercepted_binops = frozenset(["*", "+"])
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.filters[_GUARD_SIZE_FILTER] = _guard_value_size
+
+    def _parse(self, source: str, name: str | None, filename: str | None) -> nodes.Template:
+        return _RenderGuardTransformer().visit(super()._parse(source, name, filename))
+
+    def guard_expression_size(self, value: Any) -> Any:
+        return _guard_value_size(value)
+
+    def guard_loop_iterable(self, iterable: Any) -> Any:
+        guarded = _guard_value(iterable)
+        if isinstance(guarded, _GUARDED_TYPES) or _ACTIVE_RENDER_GUARD.get() is None:
+            return guarded
+        return _GuardedIterable(guarded)
+
+    def call_binop(self, context: Any, operator: str, left: Any, right: Any) -> Any:
+        if operator == "*":
+            for sequence, count in ((left, right), (right, left)):
+                if isinstance(sequence, (str, list, tuple)) and isinstance(count, int) and not isinstance(count, bool):
+                    if isinstance(sequence, str) and len(sequence) * count > TEMPLATE_RENDER_MAX_OUTPUT_BYTES:
+                        raise TemplateRenderBudgetExceeded(
+                            f"Template expression would exceed {TEMPLATE_RENDER_MAX_OUTPUT_BYTES} bytes of output."
+                        )
+                    if not isinstance(sequence, str) and len(sequence) * count > TEMPLATE_RENDER_MAX_LOOP_ITERATIONS:
+                        raise TemplateRenderBudgetExceeded(
+                            f"Template expression would build more than {TEMPLATE_RENDER_MAX_LOOP_ITERATIONS} "
+                            "items, the loop iterations budget."
+                        )
+        return _guard_value(_guard_value_size(super().call_binop(context, operator, left, right)))
+
+    def call(__self, __context: Any, __obj: Any, *args: Any, **kwargs: Any) -> Any:
+        guard = _ACTIVE_RENDER_GUARD.get()
+        if guard is not None:
+            guard.check_time()
+        return _guard_value(_guard_value_size(super().call(__context, __obj, *args, **kwargs)))
+
+    def getattr(self, obj: Any, attribute: str) -> Any:
+        return _guard_value(super().getattr(obj, attribute))
+
+    def getitem(self, obj: Any, argument: Any) -> Any:
+        return _guard_value(super().getitem(obj, argument))
+
+
+def _guarded_render(template: Any, context: dict[str, Any]) -> tuple[str, dict[str, Any]]:
+    guard = _RenderGuard()
+    token = _ACTIVE_RENDER_GUARD.set(guard)
+    try:
+        guarded_context = {key: _guard_value(value) for key, value in context.items()}
+        chunks: list[str] = []
+        for chunk in template.generate(guarded_context):
+            guard.add_output(chunk)
+            chunks.append(chunk)
+        return "".join(chunks), guard.report()
+    finally:
+        _ACTIVE_RENDER_GUARD.reset(token)
+
+
+def _render_cost_warnings(cost: dict[str, Any]) -> list[str]:
+    limits = cost.get("limits") or {}
+    heavy = [
+        f"{name.replace('_', ' ')} {cost[name]}/{limits[name]}"
+        for name in ("loop_iterations", "output_bytes", "render_ms")
+        if limits.get(name) and float(cost.get(name) or 0) >= float(limits[name]) * TEMPLATE_RENDER_COST_WARNING_RATIO
+    ]
+    if not heavy:
+        return []
+    return ["Template render cost is close to the budget: " + ", ".join(heavy) + "."]
+
+
+def _template_environment() -> ImmutableSandboxedEnvironment:
+    # Normalized contexts share nested lists with the caller's payload, so templates
+    # must not be able to mutate them. Renders are also metered by _guarded_render.
+    env = _GuardedSandboxedEnvironment(
         autoescape=False,
         trim_blocks=True,
         lstrip_blocks=True,
@@ -3537,6 +3831,7 @@ def validate_template_text(template_text: str, context: dict[str, Any] | None =
     errors: list[str] = []
     warnings: list[str] = []
     undeclared: list[str] = []
+    render_cost: dict[str, Any] | None = None
     lint_warnings, lint_errors = _lint_template_text(template_text)
     warnings.extend(lint_warnings)
     errors.extend(lint_errors)
@@ -3571,19 +3866,23 @@ def validate_template_text(template_text: str, context: dict[str, Any] | None =
             )
 
         try:
-            rendered = env.from_string(template_text).render(context)
+            rendered, render_cost = _guarded_render(env.from_string(template_text), context)
             _normalize_rendered_text(rendered)
+            warnings.extend(_render_cost_warnings(render_cost))
         except TemplateError as exc:
             errors.append(str(exc))
     else:
         warnings.append("No render context was provided for runtime validation.")
 
-    return {
+    result = {
         "valid": len(errors) == 0,
         "errors": errors,
         "warnings": warnings,
         "undeclared_variables": undeclared,
     }
+    if render_cost is not None:
+        result["render_cost"] = render_cost
+    return result
 
 
 def render_template_text(template_text: str, context: dict[str, Any]) -> dict[str, Any]:
@@ -3592,21 +3891,92 @@ def render_template_text(template_text: str, context: dict[str, Any]) -> dict[st
     context = normalize_template_context(context)
     try:
         template = env.from_string(template_text)
-        rendered = template.render(context)
+        rendered, render_cost = _guarded_render(template, context)
     except TemplateError as exc:
         return {
             "ok": False,
             "error": str(exc),
             "description": None,
+            "budget_exceeded": isinstance(exc, TemplateRenderBudgetExceeded),
         }
 
     return {
         "ok": True,
         "error": None,
         "description": _normalize_rendered_text(rendered),
+        "render_cost": render_cost,
     }
 
 
+TEMPLATE_BATCH_PREVIEW_MAX_WORKERS = 4
+
+
+def _render_compiled(template: Any, context: dict[str, Any]) -> tuple[str | None, str | None, dict[str, Any] | None]:
+    try:
+        rendered, render_cost = _guarded_render(template, context)
+        return _normalize_rendered_text(rendered), None, render_cost
+    except TemplateError as exc:
+        return None, str(exc), None
+
+
+def render_template_batch(
+    template_text: str,
+    contexts: list[tuple[str, dict[str, Any]]],
+    *,
+    baseline_template_text: str | None = None,
+    max_workers: int = TEMPLATE_BATCH_PREVIEW_MAX_WORKERS,
+) -> dict[str, Any]:
+    env = _template_environment()
+    try:
+        template = env.from_string(_normalize_template_text(template_text))
+    except TemplateError as exc:
+        return {"ok": False, "error": str(exc), "results": []}
+    baseline = None
+    if baseline_template_text is not None:
+        try:
+            baseline = env.from_string(_normalize_template_text(baseline_template_text))
+        except TemplateError:
+            baseline = None
+
+    def _render_one(item: tuple[str, dict[str, Any]]) -> dict[str, Any]:
+        source, context = item
+        normalized = normalize_template_context(context)
+        started = time.perf_counter()
+        description, error, render_cost = _render_compiled(template, normalized)
+        render_ms = round((time.perf_counter() - started) * 1000.0, 2)
+        result: dict[str, Any] = {
+            "context_source": source,
+            "ok": error is None,
+            "preview": description,
+            "length": len(description) if description is not None else None,
+            "error": error,
+            "render_ms": render_ms,
+            "render_cost": render_cost,
+        }
+        if baseline is not None:
+            baseline_description, baseline_error, _baseline_cost = _render_compiled(baseline, normalized)
+            result["baseline_preview"] = baseline_description
+            result["baseline_error"] = baseline_error
+            result["changed"] = description != baseline_description
+            result["diff"] = list(
+                difflib.unified_diff(
+                    (baseline_description or "").splitlines(),
+                    (description or "").splitlines(),
+                    fromfile="active",
+                    tofile="candidate",
+                    lineterm="",
+                )
+            )
+        return result
+
+    if not contexts:
+        return {"ok": True, "error": None, "results": []}
+    # Compiled jinja templates are safe to render from several threads at once.
+    with ThreadPoolExecutor(max_workers=max(1, min(int(max_workers), len(contexts)))) as executor:
+        results = list(executor.map(_render_one, contexts))
+    return {"ok": True, "error": None, "results": results}
+
+
 def render_with_active_template(
     settings: Settings,
     context: dict[str, Any],
@@ -3630,7 +4000,8 @@ def render_with_active_template(
         render_result["fallback_used"] = False
         return render_result
 
-    if active["is_custom"] and allow_seed_fallback:
+    # Budget overruns always fall back to the seed so an expensive template cannot stall a cycle.
+    if active["is_custom"] and (allow_seed_fallback or render_result.get("budget_exceeded")):
         fallback_result = render_template_text(_profile_template_seed(active_profile_id), context)
         fallback_result["is_custom_template"] = active["is_custom"]
         fallback_result["template_path"] = active["path"]
@@ -4761,6 +5132,15 @@ def _collect_schema_fields(path_prefix: str, value: Any, fields: list[dict[str,
     )
 
 
+def template_context_fingerprint(context: dict[str, Any]) -> str:
+    encoded = json.dumps(context, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:24]
+
+
+def context_schema_cache_path(latest_json_file: Path) -> Path:
+    return latest_json_file.with_name(f"{latest_json_file.stem}.schema.json")
+
+
 def build_context_schema(context: dict[str, Any]) -> dict[str, Any]:
     groups: list[dict[str, Any]] = []
     total_fields = 0
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Iterator
+
+from .storage import latest_change_event_seq, list_change_events
+
+
+EVENT_STREAM_POLL_SECONDS = 1.0
+EVENT_STREAM_MAX_DURATION_SECONDS = 25.0
+EVENT_STREAM_KEEPALIVE_SECONDS = 10.0
+EVENT_STREAM_RETRY_MS = 2000
+EVENT_STREAM_BUFFER_SIZE = 500
+EVENT_STREAM_REPLAY_LIMIT = 500
+EVENT_STREAM_POLLER_IDLE_SECONDS = 30.0
+
+
+def event_stream_max_clients(api_threads: int) -> int:
+    """Streams hold a request thread for their whole lifetime, so leave half the pool for other routes."""
+    return max(1, int(api_threads) // 2)
+
+
+class _ChangeFeed:
+    """Per-process fan-out of the storage change log.
+
+    One poller thread reads new change_log rows for every connected stream, so
+    the SQLite cost of an open stream does not grow with the number of clients.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.condition = threading.Condition()
+        self.events: deque[dict[str, Any]] = deque(maxlen=EVENT_STREAM_BUFFER_SIZE)
+        self.latest_seq = latest_change_event_seq(path)
+        self.clients = 0
+        self.idle_since = time.monotonic()
+        self.poller: threading.Thread | None = None
+
+    def has_capacity(self, max_clients: int) -> bool:
+        with self.condition:
+            return self.clients < max_clients
+
+    def acquire(self, max_clients: int) -> bool:
+        with self.condition:
+            if self.clients >= max_clients:
+                return False
+            self.clients += 1
+            if self.poller is None or not self.poller.is_alive():
+                # Events buffered before the poller went idle are stale; resume from the log head.
+                self.events.clear()
+                self.latest_seq = latest_change_event_seq(self.path)
+                self.poller = threading.Thread(
+                    target=self._poll_loop,
+                    name="chronicle-change-feed",
+                    daemon=True,
+                )
+                self.poller.start()
+            return True
+
+    def release(self) -> None:
+        with self.condition:
+            self.clients = max(0, self.clients - 1)
+            if self.clients == 0:
+                self.idle_since = time.monotonic()
+
+    def wait_for_events(self, after_seq: int, timeout: float) -> list[dict[str, Any]]:
+        with self.condition:
+            self.condition.wait_for(lambda: self.latest_seq > after_seq, timeout=max(0.0, timeout))
+            return [event for event in self.events if int(event["seq"]) > after_seq]
+
+    def _poll_loop(self) -> None:
+        while True:
+            time.sleep(EVENT_STREAM_POLL_SECONDS)
+            with self.condition:
+                after_seq = self.latest_seq
+                if self.clients == 0 and time.monotonic() - self.idle_since >= EVENT_STREAM_POLLER_IDLE_SECONDS:
+                    self.poller = None
+                    return
+            events = list_change_events(self.path, after_seq=after_seq, limit=EVENT_STREAM_BUFFER_SIZE)
+            if not events:
+                continue
+            with self.condition:
+                self.events.extend(events)
+                self.latest_seq = max(self.latest_seq, int(events[-1]["seq"]))
+                self.condition.notify_all()
+
+
+_FEEDS_LOCK = threading.Lock()
+_FEEDS: dict[str, _ChangeFeed] = {}
+
+
+def _change_feed(path: Path) -> _ChangeFeed:
+    key = str(path.resolve())
+    with _FEEDS_LOCK:
+        feed = _FEEDS.get(key)
+        if feed is None:
+            feed = _ChangeFeed(path)
+            _FEEDS[key] = feed
+        return feed
+
+
+def format_sse_event(event: dict[str, Any]) -> str:
+    data = json.dumps(
+        {
+            "seq": event.get("seq"),
+            "topic": event.get("topic"),
+            "payload": event.get("payload"),
+            "created_at_utc": event.get("created_at_utc"),
+        },
+        sort_keys=True,
+    )
+    return f"id: {event.get('seq')}\nevent: {event.get('topic')}\ndata: {data}\n\n"
+
+
+def event_stream_has_capacity(path: Path, *, max_clients: int) -> bool:
+    return _change_feed(path).has_capacity(max_clients)
+
+
+def stream_change_events(
+    path: Path,
+    *,
+    max_clients: int,
+    last_event_id: int | None = None,
+) -> Iterator[str]:
+    feed = _change_feed(path)
+    if not feed.acquire(max_clients):
+        yield f"retry: {EVENT_STREAM_RETRY_MS * 5}\nevent: stream.busy\ndata: {{}}\n\n"
+        return
+    try:
+        yield f"retry: {EVENT_STREAM_RETRY_MS}\n\n"
+        if last_event_id is None:
+            cursor = feed.latest_seq
+            yield format_sse_event({"seq": cursor, "topic": "stream.open", "payload": {}, "created_at_utc": None})
+        else:
+            cursor = max(0, int(last_event_id))
+            for event in list_change_events(path, after_seq=cursor, limit=EVENT_STREAM_REPLAY_LIMIT):
+                cursor = int(event["seq"])
+                yield format_sse_event(event)
+
+        deadline = time.monotonic() + EVENT_STREAM_MAX_DURATION_SECONDS
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            events = feed.wait_for_events(cursor, min(EVENT_STREAM_KEEPALIVE_SECONDS, remaining))
+            if not events:
+                yield ": keepalive\n\n"
+                continue
+            if int(events[0]["seq"]) > cursor + 1:
+                events = list_change_events(path, after_seq=cursor, limit=EVENT_STREAM_REPLAY_LIMIT)
+            for event in events:
+                cursor = int(event["seq"])
+                yield format_sse_event(event)
+    finally:
+        feed.release()
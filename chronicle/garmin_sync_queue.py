@@ -1,11 +1,22 @@
 from __future__ import annotations
 
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 from uuid import uuid4
 
-from .storage import get_plan_setting, set_plan_setting
+from .storage import (
+    delete_plan_setting,
+    get_latest_garmin_sync_request,
+    get_plan_setting,
+    insert_garmin_calendar_entries,
+    insert_garmin_workouts,
+    list_garmin_calendar_entry_records,
+    list_garmin_sync_request_records,
+    list_garmin_workout_records,
+    save_garmin_sync_requests,
+)
 
 PLAN_GARMIN_SYNC_SETTINGS_KEY = "garmin_sync.requests"
 PLAN_GARMIN_WORKOUTS_SETTINGS_KEY = "garmin_sync.workouts"
@@ -14,6 +25,9 @@ ACTIVE_GARMIN_SYNC_STATUSES = {"pending", "in-progress"}
 GARMIN_SYNC_CREATE_PHASE_CODES = {"workout_created", "workout_exists"}
 GARMIN_SYNC_SCHEDULE_PHASE_CODES = {"calendar_scheduled", "calendar_exists"}
 
+_LEGACY_MIGRATION_LOCK = threading.Lock()
+_LEGACY_MIGRATED_PATHS: set[str] = set()
+
 
 def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
@@ -78,30 +92,6 @@ def _normalize_sync_record(item: Any) -> dict[str, Any] | None:
     return normalized
 
 
-def list_garmin_sync_requests(path: Path) -> list[dict[str, Any]]:
-    raw = get_plan_setting(path, PLAN_GARMIN_SYNC_SETTINGS_KEY, [])
-    if not isinstance(raw, list):
-        return []
-    normalized: list[dict[str, Any]] = []
-    for item in raw:
-        record = _normalize_sync_record(item)
-        if record is None:
-            continue
-        normalized.append(record)
-    return normalized
-
-
-def _record_sort_key(record: dict[str, Any]) -> tuple[str, str]:
-    return (
-        str(record.get("updated_at_utc") or ""),
-        str(record.get("queued_at_utc") or ""),
-    )
-
-
-def _persist_sync_requests(path: Path, records: list[dict[str, Any]]) -> None:
-    if not set_plan_setting(path, PLAN_GARMIN_SYNC_SETTINGS_KEY, records):
-        raise RuntimeError("Failed to persist Garmin sync request.")
-
 
 def _normalize_garmin_workout_record(item: Any) -> dict[str, str] | None:
     if not isinstance(item, dict):
@@ -122,58 +112,6 @@ def _normalize_garmin_workout_record(item: Any) -> dict[str, str] | None:
     }
 
 
-def list_garmin_workouts(path: Path) -> list[dict[str, str]]:
-    raw = get_plan_setting(path, PLAN_GARMIN_WORKOUTS_SETTINGS_KEY, [])
-    if not isinstance(raw, list):
-        return []
-    normalized: list[dict[str, str]] = []
-    seen_code_keys: set[str] = set()
-    for item in raw:
-        workout = _normalize_garmin_workout_record(item)
-        if workout is None:
-            continue
-        code_key = str(workout.get("workout_code") or "").lower()
-        if code_key in seen_code_keys:
-            continue
-        seen_code_keys.add(code_key)
-        normalized.append(workout)
-    return normalized
-
-
-def _persist_garmin_workouts(path: Path, workouts: list[dict[str, str]]) -> None:
-    if not set_plan_setting(path, PLAN_GARMIN_WORKOUTS_SETTINGS_KEY, workouts):
-        raise RuntimeError("Failed to persist Garmin workout records.")
-
-
-def ensure_garmin_workout(path: Path, *, workout_code: str) -> tuple[dict[str, str], bool]:
-    normalized_code = str(workout_code or "").strip()
-    if not normalized_code:
-        raise ValueError("workout_code is required.")
-    workouts = list_garmin_workouts(path)
-    existing = next(
-        (
-            workout
-            for workout in workouts
-            if str(workout.get("workout_code") or "").lower() == normalized_code.lower()
-        ),
-        None,
-    )
-    if existing is not None:
-        return dict(existing), False
-
-    now_iso = _utc_now_iso()
-    created = {
-        "garmin_workout_id": f"gw-{uuid4().hex}",
-        "workout_code": normalized_code,
-        "title": normalized_code,
-        "created_at_utc": now_iso,
-        "updated_at_utc": now_iso,
-    }
-    workouts.append(created)
-    _persist_garmin_workouts(path, workouts)
-    return dict(created), True
-
-
 def _normalize_garmin_calendar_entry(item: Any) -> dict[str, str] | None:
     if not isinstance(item, dict):
         return None
@@ -195,27 +133,180 @@ def _normalize_garmin_calendar_entry(item: Any) -> dict[str, str] | None:
     }
 
 
-def list_garmin_calendar_entries(path: Path) -> list[dict[str, str]]:
-    raw = get_plan_setting(path, PLAN_GARMIN_CALENDAR_SETTINGS_KEY, [])
+def _normalized_legacy_list(path: Path, key: str, normalizer: Any) -> list[dict[str, Any]] | None:
+    raw = get_plan_setting(path, key, None)
+    if raw is None:
+        return None
     if not isinstance(raw, list):
         return []
-    normalized: list[dict[str, str]] = []
-    seen_ids: set[str] = set()
-    for item in raw:
-        entry = _normalize_garmin_calendar_entry(item)
-        if entry is None:
-            continue
-        entry_id = str(entry.get("calendar_entry_id") or "")
-        if entry_id in seen_ids:
+    return [record for record in (normalizer(item) for item in raw) if record is not None]
+
+
+def _migrate_legacy_plan_settings(path: Path) -> None:
+    # Older databases kept the queue as JSON lists under plan_settings; move them
+    # into the indexed tables once and drop the settings keys.
+    cache_key = str(Path(path).expanduser().resolve())
+    if cache_key in _LEGACY_MIGRATED_PATHS:
+        return
+    with _LEGACY_MIGRATION_LOCK:
+        if cache_key in _LEGACY_MIGRATED_PATHS:
+            return
+        migrations = (
+            (PLAN_GARMIN_SYNC_SETTINGS_KEY, _normalize_sync_record, save_garmin_sync_requests),
+            (PLAN_GARMIN_WORKOUTS_SETTINGS_KEY, _normalize_garmin_workout_record, insert_garmin_workouts),
+            (PLAN_GARMIN_CALENDAR_SETTINGS_KEY, _normalize_garmin_calendar_entry, insert_garmin_calendar_entries),
+        )
+        for settings_key, normalizer, writer in migrations:
+            records = _normalized_legacy_list(path, settings_key, normalizer)
+            if records is None:
+                continue
+            if records and writer(path, records) < 0:
+                return
+            delete_plan_setting(path, settings_key)
+        _LEGACY_MIGRATED_PATHS.add(cache_key)
+
+
+def list_garmin_sync_requests(path: Path) -> list[dict[str, Any]]:
+    _migrate_legacy_plan_settings(path)
+    normalized: list[dict[str, Any]] = []
+    for item in list_garmin_sync_request_records(path):
+        record = _normalize_sync_record(item)
+        if record is None:
             continue
-        seen_ids.add(entry_id)
-        normalized.append(entry)
+        normalized.append(record)
     return normalized
 
 
-def _persist_garmin_calendar_entries(path: Path, entries: list[dict[str, str]]) -> None:
-    if not set_plan_setting(path, PLAN_GARMIN_CALENDAR_SETTINGS_KEY, entries):
+def _latest_matching_sync_request(
+    path: Path,
+    *,
+    date_local: str,
+    workout_code: str | None = None,
+) -> dict[str, Any] | None:
+    _migrate_legacy_plan_settings(path)
+    latest = get_latest_garmin_sync_request(path, date_local=date_local, workout_code=workout_code)
+    return _normalize_sync_record(latest) if latest is not None else None
+
+
+def _persist_sync_requests(path: Path, records: list[dict[str, Any]]) -> None:
+    if save_garmin_sync_requests(path, records) != len(records):
+        raise RuntimeError("Failed to persist Garmin sync request.")
+
+
+def list_garmin_workouts(path: Path) -> list[dict[str, str]]:
+    _migrate_legacy_plan_settings(path)
+    return list_garmin_workout_records(path)
+
+
+def _garmin_workout_by_id(path: Path, garmin_workout_id: str) -> dict[str, str] | None:
+    _migrate_legacy_plan_settings(path)
+    matches = list_garmin_workout_records(path, garmin_workout_ids=[garmin_workout_id])
+    return matches[0] if matches else None
+
+
+def _ensure_garmin_workouts(path: Path, workout_codes: list[str]) -> dict[str, tuple[dict[str, str], bool]]:
+    _migrate_legacy_plan_settings(path)
+    wanted = {code.lower(): code for code in workout_codes}
+    existing = {
+        str(workout["workout_code"]).lower(): workout
+        for workout in list_garmin_workout_records(path, workout_codes=list(wanted.values()))
+    }
+    missing = [code_key for code_key in wanted if code_key not in existing]
+    if not missing:
+        return {code_key: (existing[code_key], False) for code_key in wanted}
+
+    now_iso = _utc_now_iso()
+    created_ids: set[str] = set()
+    new_workouts: list[dict[str, str]] = []
+    for code_key in missing:
+        workout_id = f"gw-{uuid4().hex}"
+        created_ids.add(workout_id)
+        new_workouts.append(
+            {
+                "garmin_workout_id": workout_id,
+                "workout_code": wanted[code_key],
+                "title": wanted[code_key],
+                "created_at_utc": now_iso,
+                "updated_at_utc": now_iso,
+            }
+        )
+    if insert_garmin_workouts(path, new_workouts) < 0:
+        raise RuntimeError("Failed to persist Garmin workout records.")
+    # Re-read so a concurrent sender that won the insert race supplies the workout id.
+    stored = {
+        str(workout["workout_code"]).lower(): workout
+        for workout in list_garmin_workout_records(path, workout_codes=missing)
+    }
+    resolved: dict[str, tuple[dict[str, str], bool]] = {}
+    for code_key in wanted:
+        if code_key in existing:
+            resolved[code_key] = (existing[code_key], False)
+            continue
+        workout = stored.get(code_key)
+        if workout is None:
+            raise RuntimeError("Failed to persist Garmin workout records.")
+        resolved[code_key] = (workout, workout["garmin_workout_id"] in created_ids)
+    return resolved
+
+
+def ensure_garmin_workout(path: Path, *, workout_code: str) -> tuple[dict[str, str], bool]:
+    normalized_code = str(workout_code or "").strip()
+    if not normalized_code:
+        raise ValueError("workout_code is required.")
+    workout, created = _ensure_garmin_workouts(path, [normalized_code])[normalized_code.lower()]
+    return dict(workout), created
+
+
+def list_garmin_calendar_entries(path: Path) -> list[dict[str, str]]:
+    _migrate_legacy_plan_settings(path)
+    return list_garmin_calendar_entry_records(path)
+
+
+def _ensure_garmin_calendar_entries(
+    path: Path,
+    pairs: list[tuple[str, dict[str, str]]],
+) -> dict[tuple[str, str], tuple[dict[str, str], bool]]:
+    _migrate_legacy_plan_settings(path)
+    wanted = {(date_key, workout["garmin_workout_id"]): workout for date_key, workout in pairs}
+    dates = sorted(date_key for date_key, _workout_id in wanted)
+
+    def _entries_in_window() -> dict[tuple[str, str], dict[str, str]]:
+        return {
+            (entry["date_local"], entry["garmin_workout_id"]): entry
+            for entry in list_garmin_calendar_entry_records(path, start_date=dates[0], end_date=dates[-1])
+        }
+
+    existing = _entries_in_window()
+    missing = [key for key in wanted if key not in existing]
+    if not missing:
+        return {key: (existing[key], False) for key in wanted}
+
+    now_iso = _utc_now_iso()
+    created_ids: set[str] = set()
+    new_entries: list[dict[str, str]] = []
+    for date_key, workout_id in missing:
+        entry_id = f"gcal-{uuid4().hex}"
+        created_ids.add(entry_id)
+        new_entries.append(
+            {
+                "calendar_entry_id": entry_id,
+                "date_local": date_key,
+                "garmin_workout_id": workout_id,
+                "workout_code": wanted[(date_key, workout_id)]["workout_code"],
+                "scheduled_at_utc": now_iso,
+                "updated_at_utc": now_iso,
+            }
+        )
+    if insert_garmin_calendar_entries(path, new_entries) < 0:
         raise RuntimeError("Failed to persist Garmin calendar entries.")
+    stored = _entries_in_window()
+    resolved: dict[tuple[str, str], tuple[dict[str, str], bool]] = {}
+    for key in wanted:
+        entry = stored.get(key)
+        if entry is None:
+            raise RuntimeError("Failed to persist Garmin calendar entries.")
+        resolved[key] = (entry, entry["calendar_entry_id"] in created_ids)
+    return resolved
 
 
 def schedule_garmin_workout_for_day(
@@ -235,50 +326,12 @@ def schedule_garmin_workout_for_day(
     if not workout:
         raise ValueError("workout_code is required.")
 
-    entries = list_garmin_calendar_entries(path)
-    existing = next(
-        (
-            entry
-            for entry in entries
-            if str(entry.get("date_local") or "") == date_key
-            and str(entry.get("garmin_workout_id") or "") == workout_id
-        ),
-        None,
+    entries = _ensure_garmin_calendar_entries(
+        path,
+        [(date_key, {"garmin_workout_id": workout_id, "workout_code": workout})],
     )
-    if existing is not None:
-        return dict(existing), False
-
-    now_iso = _utc_now_iso()
-    created = {
-        "calendar_entry_id": f"gcal-{uuid4().hex}",
-        "date_local": date_key,
-        "garmin_workout_id": workout_id,
-        "workout_code": workout,
-        "scheduled_at_utc": now_iso,
-        "updated_at_utc": now_iso,
-    }
-    entries.append(created)
-    _persist_garmin_calendar_entries(path, entries)
-    return dict(created), True
-
-
-def _latest_matching_sync_request(
-    records: list[dict[str, Any]],
-    *,
-    date_local: str,
-    workout_code: str | None = None,
-) -> dict[str, Any] | None:
-    matches: list[dict[str, Any]] = []
-    for record in records:
-        if str(record.get("date_local") or "") != date_local:
-            continue
-        if workout_code and str(record.get("workout_code") or "").lower() != workout_code.lower():
-            continue
-        matches.append(record)
-    if not matches:
-        return None
-    matches.sort(key=_record_sort_key, reverse=True)
-    return matches[0]
+    entry, created = entries[(date_key, workout_id)]
+    return dict(entry), created
 
 
 def initiate_garmin_sync_request(path: Path, *, date_local: str, workout_code: str) -> dict[str, Any]:
@@ -289,8 +342,7 @@ def initiate_garmin_sync_request(path: Path, *, date_local: str, workout_code: s
     if not workout:
         raise ValueError("workout_code is required.")
 
-    records = list_garmin_sync_requests(path)
-    latest = _latest_matching_sync_request(records, date_local=date_key, workout_code=workout)
+    latest = _latest_matching_sync_request(path, date_local=date_key, workout_code=workout)
     if latest is not None and str(latest.get("status") or "") in ACTIVE_GARMIN_SYNC_STATUSES:
         return dict(latest)
 
@@ -304,8 +356,7 @@ def initiate_garmin_sync_request(path: Path, *, date_local: str, workout_code: s
         "queued_at_utc": now_iso,
         "updated_at_utc": now_iso,
     }
-    records.append(record)
-    _persist_sync_requests(path, records)
+    _persist_sync_requests(path, [record])
     return dict(record)
 
 
@@ -320,9 +371,8 @@ def run_garmin_sync_request(
         raise ValueError("date_local is required.")
     requested_workout = str(workout_code or "").strip() or None
 
-    records = list_garmin_sync_requests(path)
     latest = _latest_matching_sync_request(
-        records,
+        path,
         date_local=date_key,
         workout_code=requested_workout,
     )
@@ -339,15 +389,7 @@ def run_garmin_sync_request(
         existing_status_code in GARMIN_SYNC_CREATE_PHASE_CODES
         or existing_status_code in GARMIN_SYNC_SCHEDULE_PHASE_CODES
     ):
-        workouts = list_garmin_workouts(path)
-        existing_workout = next(
-            (
-                workout
-                for workout in workouts
-                if str(workout.get("garmin_workout_id") or "") == existing_workout_id
-            ),
-            None,
-        )
+        existing_workout = _garmin_workout_by_id(path, existing_workout_id)
         if existing_workout is not None:
             return dict(latest), dict(existing_workout)
 
@@ -360,7 +402,7 @@ def run_garmin_sync_request(
     latest["garmin_workout_created"] = bool(created)
     latest["next_step"] = "schedule_workout_on_calendar"
     latest["updated_at_utc"] = now_iso
-    _persist_sync_requests(path, records)
+    _persist_sync_requests(path, [latest])
     return dict(latest), dict(garmin_workout)
 
 
@@ -375,9 +417,8 @@ def schedule_garmin_sync_request(
         raise ValueError("date_local is required.")
     requested_workout = str(workout_code or "").strip() or None
 
-    records = list_garmin_sync_requests(path)
     latest = _latest_matching_sync_request(
-        records,
+        path,
         date_local=date_key,
         workout_code=requested_workout,
     )
@@ -391,32 +432,16 @@ def schedule_garmin_sync_request(
     if not selected_workout:
         raise ValueError("workout_code is required.")
 
-    workouts = list_garmin_workouts(path)
-    garmin_workout = next(
-        (
-            workout
-            for workout in workouts
-            if str(workout.get("garmin_workout_id") or "") == garmin_workout_id
-        ),
-        None,
-    )
+    garmin_workout = _garmin_workout_by_id(path, garmin_workout_id)
     if garmin_workout is None:
         raise ValueError("Garmin workout record is missing for this request.")
 
     existing_entry_id = str(latest.get("calendar_entry_id") or "").strip()
     existing_status_code = str(latest.get("status_code") or "").strip()
     if existing_entry_id and existing_status_code in GARMIN_SYNC_SCHEDULE_PHASE_CODES:
-        entries = list_garmin_calendar_entries(path)
-        existing_entry = next(
-            (
-                entry
-                for entry in entries
-                if str(entry.get("calendar_entry_id") or "") == existing_entry_id
-            ),
-            None,
-        )
-        if existing_entry is not None:
-            return dict(latest), dict(garmin_workout), dict(existing_entry)
+        entries = list_garmin_calendar_entry_records(path, calendar_entry_ids=[existing_entry_id])
+        if entries:
+            return dict(latest), dict(garmin_workout), dict(entries[0])
 
     calendar_entry, created = schedule_garmin_workout_for_day(
         path,
@@ -431,10 +456,55 @@ def schedule_garmin_sync_request(
     latest["calendar_entry_id"] = str(calendar_entry.get("calendar_entry_id") or "")
     latest["next_step"] = "report_sync_result"
     latest["updated_at_utc"] = now_iso
-    _persist_sync_requests(path, records)
+    _persist_sync_requests(path, [latest])
     return dict(latest), dict(garmin_workout), dict(calendar_entry)
 
 
+def send_garmin_sync_batch(
+    path: Path,
+    sync_requests: list[dict[str, Any]],
+) -> list[tuple[dict[str, Any], dict[str, str], dict[str, str]]]:
+    """Create and schedule a set of initiated sync requests in one pass.
+
+    Each distinct workout code is created once, every calendar entry is written
+    in a single insert, and all requests are moved to ``succeeded`` together.
+    Results are returned in the order of ``sync_requests``.
+    """
+    records: list[dict[str, Any]] = []
+    for item in sync_requests:
+        record = _normalize_sync_record(item)
+        if record is None:
+            raise ValueError("Garmin sync batch contains an invalid request.")
+        records.append(record)
+    if not records:
+        return []
+
+    workouts = _ensure_garmin_workouts(path, [str(record["workout_code"]) for record in records])
+    entries = _ensure_garmin_calendar_entries(
+        path,
+        [
+            (str(record["date_local"]), workouts[str(record["workout_code"]).lower()][0])
+            for record in records
+        ],
+    )
+
+    now_iso = _utc_now_iso()
+    results: list[tuple[dict[str, Any], dict[str, str], dict[str, str]]] = []
+    for record in records:
+        garmin_workout, workout_created = workouts[str(record["workout_code"]).lower()]
+        calendar_entry, entry_created = entries[(str(record["date_local"]), garmin_workout["garmin_workout_id"])]
+        record["status"] = "succeeded"
+        record["status_code"] = "calendar_scheduled" if entry_created else "calendar_exists"
+        record["garmin_workout_id"] = garmin_workout["garmin_workout_id"]
+        record["garmin_workout_created"] = bool(workout_created)
+        record["calendar_entry_id"] = calendar_entry["calendar_entry_id"]
+        record["next_step"] = "report_sync_result"
+        record["updated_at_utc"] = now_iso
+        results.append((dict(record), dict(garmin_workout), dict(calendar_entry)))
+    _persist_sync_requests(path, records)
+    return results
+
+
 def mark_garmin_sync_request_failed(
     path: Path,
     *,
@@ -449,9 +519,8 @@ def mark_garmin_sync_request_failed(
         raise ValueError("date_local is required.")
     requested_workout = str(workout_code or "").strip() or None
 
-    records = list_garmin_sync_requests(path)
     latest = _latest_matching_sync_request(
-        records,
+        path,
         date_local=date_key,
         workout_code=requested_workout,
     )
@@ -468,5 +537,5 @@ def mark_garmin_sync_request_failed(
     )
     latest["next_step"] = "retry_sync"
     latest["updated_at_utc"] = now_iso
-    _persist_sync_requests(path, records)
+    _persist_sync_requests(path, [latest])
     return dict(latest)
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import math
+import threading
+from typing import Any, Iterable
+
+
+DEFAULT_LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+CYCLE_DURATION_BUCKETS_MS = (1000, 2500, 5000, 10000, 30000, 60000, 120000, 300000)
+SQLITE_OP_LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 1000)
+PAYLOAD_SIZE_BUCKETS_BYTES = (16384, 65536, 262144, 1048576, 4194304, 16777216)
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def histogram_bucket_label(value: float, buckets: Iterable[float]) -> str:
+    return next((str(bound) for bound in buckets if value <= bound), "+Inf")
+
+
+def empty_histogram(buckets: Iterable[float]) -> dict[str, Any]:
+    return {
+        # Buckets are stored non-cumulative (like provider_http); exposition makes them cumulative.
+        "buckets": {str(bound): 0 for bound in buckets} | {"+Inf": 0},
+        "count": 0,
+        "sum": 0.0,
+    }
+
+
+def observe_histogram(histogram: dict[str, Any], value: float, buckets: Iterable[float]) -> None:
+    label = histogram_bucket_label(value, buckets)
+    histogram["buckets"][label] = int(histogram["buckets"].get(label, 0)) + 1
+    histogram["count"] = int(histogram.get("count", 0)) + 1
+    histogram["sum"] = float(histogram.get("sum", 0.0)) + float(value)
+
+
+def series_key(labels: dict[str, str] | None) -> str:
+    return ",".join(f"{key}={labels[key]}" for key in sorted(labels or {}))
+
+
+class HistogramFamily:
+    """In-process histogram series keyed by label set."""
+
+    def __init__(self, buckets: Iterable[float]) -> None:
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._series: dict[str, dict[str, Any]] = {}
+
+    def observe(self, value: float, labels: dict[str, str] | None = None) -> None:
+        key = series_key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = empty_histogram(self.buckets) | {"labels": dict(labels or {})}
+                self._series[key] = series
+            observe_histogram(series, value, self.buckets)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            return {
+                key: {
+                    "labels": dict(series["labels"]),
+                    "buckets": dict(series["buckets"]),
+                    "count": int(series["count"]),
+                    "sum": round(float(series["sum"]), 3),
+                }
+                for key, series in self._series.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+class StatementStats:
+    """In-process call aggregates keyed by normalized statement text."""
+
+    OVERFLOW_KEY = "(other statements)"
+
+    def __init__(self, max_statements: int = 500) -> None:
+        self.max_statements = max(1, int(max_statements))
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, Any]] = {}
+
+    def observe(self, statement: str, duration_ms: float, *, op: str, slow: bool = False) -> None:
+        with self._lock:
+            entry = self._entries.get(statement)
+            if entry is None:
+                if len(self._entries) >= self.max_statements:
+                    # Statements built with inline literals would otherwise grow the table without bound.
+                    statement = self.OVERFLOW_KEY
+                    entry = self._entries.get(statement)
+                if entry is None:
+                    entry = {"op": op, "count": 0, "total_ms": 0.0, "max_ms": 0.0, "slow_count": 0, "plan": None}
+                    self._entries[statement] = entry
+            entry["count"] += 1
+            entry["total_ms"] += float(duration_ms)
+            entry["max_ms"] = max(entry["max_ms"], float(duration_ms))
+            if slow:
+                entry["slow_count"] += 1
+                entry["last_slow_ms"] = float(duration_ms)
+
+    def plan(self, statement: str) -> list[str] | None:
+        with self._lock:
+            entry = self._entries.get(statement)
+            return list(entry["plan"]) if entry is not None and entry["plan"] is not None else None
+
+    def set_plan(self, statement: str, plan: list[str]) -> None:
+        with self._lock:
+            entry = self._entries.get(statement)
+            if entry is not None:
+                entry["plan"] = list(plan)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            return {
+                statement: {
+                    "op": entry["op"],
+                    "count": entry["count"],
+                    "total_ms": round(entry["total_ms"], 3),
+                    "max_ms": round(entry["max_ms"], 3),
+                    "slow_count": entry["slow_count"],
+                    "last_slow_ms": round(entry["last_slow_ms"], 3) if "last_slow_ms" in entry else None,
+                    "plan": list(entry["plan"]) if entry["plan"] is not None else None,
+                }
+                for statement, entry in self._entries.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _escape_label_value(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict[str, Any] | None, extra: dict[str, Any] | None = None) -> str:
+    merged = dict(labels or {})
+    merged.update(extra or {})
+    if not merged:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label_value(merged[key])}"' for key in sorted(merged)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, float) and math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _bucket_sort_key(bound: str) -> float:
+    if bound == "+Inf":
+        return math.inf
+    try:
+        return float(bound)
+    except ValueError:
+        return math.inf
+
+
+class MetricsWriter:
+    """Accumulates metric families in Prometheus text exposition format."""
+
+    def __init__(self) -> None:
+        # Samples are grouped per family, as the exposition format requires.
+        self._families: dict[str, tuple[str, str, list[str]]] = {}
+
+    def _samples(self, name: str, metric_type: str, help_text: str) -> list[str]:
+        family = self._families.get(name)
+        if family is None:
+            family = (metric_type, help_text, [])
+            self._families[name] = family
+        return family[2]
+
+    def counter(self, name: str, help_text: str, value: float, labels: dict[str, Any] | None = None) -> None:
+        self._samples(name, "counter", help_text).append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+    def gauge(self, name: str, help_text: str, value: float, labels: dict[str, Any] | None = None) -> None:
+        self._samples(name, "gauge", help_text).append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        histogram: dict[str, Any],
+        labels: dict[str, Any] | None = None,
+    ) -> None:
+        buckets = histogram.get("buckets") if isinstance(histogram, dict) else None
+        if not isinstance(buckets, dict):
+            return
+        samples = self._samples(name, "histogram", help_text)
+        cumulative = 0
+        for bound in sorted(buckets, key=_bucket_sort_key):
+            cumulative += int(buckets.get(bound) or 0)
+            samples.append(f"{name}_bucket{_format_labels(labels, {'le': bound})} {cumulative}")
+        samples.append(f"{name}_sum{_format_labels(labels)} {_format_value(float(histogram.get('sum') or 0.0))}")
+        samples.append(f"{name}_count{_format_labels(labels)} {int(histogram.get('count', cumulative) or 0)}")
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for name, (metric_type, help_text, samples) in self._families.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import os
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from .config import Settings
+from .metrics import MetricsWriter
+from .provider_http import host_metrics_snapshot
+from .storage import (
+    JOB_STATUS_ALL,
+    count_activity_jobs_by_status,
+    delete_runtime_value,
+    get_runtime_value,
+    list_runtime_histograms,
+    list_runtime_values_with_prefix,
+    set_runtime_value,
+    list_service_runtime_counters,
+    sqlite_busy_error_count,
+    sqlite_op_metrics_snapshot,
+)
+
+
+API_PROCESS_METRICS_PREFIX = "api.metrics."
+API_PROCESS_METRICS_PUBLISH_SECONDS = 15.0
+API_PROCESS_METRICS_STALE_SECONDS = 600
+_SERVICE_COUNTER_PATTERN = re.compile(
+    r"^service\.(?P<service>.+?)\."
+    r"(?P<metric>events_total|events\.[a-z_]+|duration_count|duration_total_ms|duration_bucket\.[^.]+)$"
+)
+_RUNTIME_HISTOGRAM_HELP = {
+    "cycle_duration_ms": ("chronicle_cycle_duration_ms", "Worker update cycle wall time in milliseconds."),
+    "dashboard_refresh_duration_ms": (
+        "chronicle_dashboard_refresh_duration_ms",
+        "Dashboard cache refresh wall time in milliseconds.",
+    ),
+    "dashboard_payload_bytes": ("chronicle_dashboard_payload_bytes", "Dashboard payload size after a refresh."),
+}
+
+
+def _service_counters_by_name(path: Any) -> dict[str, dict[str, int]]:
+    services: dict[str, dict[str, int]] = {}
+    for key, value in list_service_runtime_counters(path).items():
+        match = _SERVICE_COUNTER_PATTERN.match(key)
+        if match is None:
+            continue
+        services.setdefault(match.group("service"), {})[match.group("metric")] = value
+    return services
+
+
+def _write_service_metrics(writer: MetricsWriter, settings: Settings) -> None:
+    for service, counters in sorted(_service_counters_by_name(settings.processed_log_file).items()):
+        labels = {"service": service}
+        for metric, value in sorted(counters.items()):
+            if metric.startswith("events."):
+                writer.counter(
+                    "chronicle_service_events_total",
+                    "Service call outcomes recorded by the worker.",
+                    value,
+                    labels | {"outcome": metric[len("events."):]},
+                )
+        buckets = {
+            metric[len("duration_bucket."):]: value
+            for metric, value in counters.items()
+            if metric.startswith("duration_bucket.")
+        }
+        if buckets:
+            writer.histogram(
+                "chronicle_service_call_duration_ms",
+                "Service call latency in milliseconds.",
+                {
+                    "buckets": buckets,
+                    "count": counters.get("duration_count", sum(buckets.values())),
+                    "sum": float(counters.get("duration_total_ms", 0)),
+                },
+                labels,
+            )
+        hits = counters.get("events.cache_hit", 0)
+        misses = counters.get("events.cache_miss", 0)
+        if hits + misses:
+            writer.gauge(
+                "chronicle_service_cache_hit_ratio",
+                "Share of cacheable service lookups served from the result cache.",
+                round(hits / (hits + misses), 4),
+                labels,
+            )
+
+
+def _write_http_host_metrics(writer: MetricsWriter, hosts: Any, *, process: str, pid: str | None = None) -> None:
+    if not isinstance(hosts, dict):
+        return
+    for host, stats in sorted(hosts.items()):
+        if not isinstance(stats, dict):
+            continue
+        labels = {"process": process, "host": host} | ({"pid": pid} if pid else {})
+        count = int(stats.get("requests") or 0)
+        total_ms = stats.get("total_ms")
+        if total_ms is None:
+            total_ms = float(stats.get("avg_ms") or 0.0) * count
+        writer.histogram(
+            "chronicle_provider_http_duration_ms",
+            "Pooled provider HTTP request latency in milliseconds.",
+            {"buckets": stats.get("latency_buckets_ms"), "count": count, "sum": float(total_ms)},
+            labels,
+        )
+        writer.counter(
+            "chronicle_provider_http_errors_total",
+            "Provider HTTP requests that failed or returned 5xx.",
+            int(stats.get("errors") or 0),
+            labels,
+        )
+
+
+def _write_labelled_histograms(
+    writer: MetricsWriter,
+    name: str,
+    help_text: str,
+    families: Any,
+    *,
+    extra_labels: dict[str, str] | None = None,
+) -> None:
+    if not isinstance(families, dict):
+        return
+    for _key, series in sorted(families.items()):
+        if not isinstance(series, dict):
+            continue
+        labels = dict(series.get("labels") or {}) | dict(extra_labels or {})
+        writer.histogram(name, help_text, series, labels)
+
+
+def publish_api_process_metrics(
+    settings: Settings,
+    *,
+    request_histograms: dict[str, dict[str, Any]] | None = None,
+) -> None:
+    """Saves this gunicorn worker's in-process series, so any worker's scrape can expose all of them."""
+    set_runtime_value(
+        settings.processed_log_file,
+        f"{API_PROCESS_METRICS_PREFIX}{os.getpid()}",
+        {
+            "pid": os.getpid(),
+            "updated_at_utc": datetime.now(timezone.utc).isoformat(),
+            "http_hosts": host_metrics_snapshot(),
+            "sqlite_ops": sqlite_op_metrics_snapshot(),
+            "sqlite_busy_errors": sqlite_busy_error_count(),
+            "requests": request_histograms or {},
+        },
+    )
+
+
+def _api_process_snapshots(settings: Settings) -> list[dict[str, Any]]:
+    path = settings.processed_log_file
+    stale_before = datetime.now(timezone.utc) - timedelta(seconds=API_PROCESS_METRICS_STALE_SECONDS)
+    snapshots: list[dict[str, Any]] = []
+    for key, snapshot in sorted(list_runtime_values_with_prefix(path, API_PROCESS_METRICS_PREFIX).items()):
+        try:
+            updated_at = datetime.fromisoformat(str(snapshot.get("updated_at_utc")))
+        except (AttributeError, TypeError, ValueError):
+            updated_at = None
+        if updated_at is None or updated_at < stale_before:
+            # Workers that exited (or were recycled by gunicorn) stop publishing.
+            delete_runtime_value(path, key)
+            continue
+        snapshots.append(snapshot)
+    return snapshots
+
+
+def build_metrics_exposition(
+    settings: Settings,
+    *,
+    request_histograms: dict[str, dict[str, Any]] | None = None,
+) -> str:
+    writer = MetricsWriter()
+    path = settings.processed_log_file
+
+    _write_service_metrics(writer, settings)
+
+    # Every known status is exported, so a drained queue reads as 0 instead of a missing series.
+    job_counts = dict.fromkeys(JOB_STATUS_ALL, 0)
+    job_counts.update(count_activity_jobs_by_status(path))
+    for status, count in sorted(job_counts.items()):
+        writer.gauge("chronicle_job_queue_depth", "Activity jobs by status.", count, {"status": status})
+
+    for name, families in sorted(list_runtime_histograms(path).items()):
+        metric_name, help_text = _RUNTIME_HISTOGRAM_HELP.get(
+            name,
+            (f"chronicle_{re.sub(r'[^a-zA-Z0-9_]', '_', name)}", "Runtime histogram recorded in the runtime DB."),
+        )
+        _write_labelled_histograms(writer, metric_name, help_text, families)
+
+    # The worker publishes its process-local pool and SQLite stats with each cycle snapshot.
+    cycle_metrics = get_runtime_value(path, "cycle.service_calls")
+    if isinstance(cycle_metrics, dict):
+        _write_http_host_metrics(writer, cycle_metrics.get("http_hosts"), process="worker")
+        _write_labelled_histograms(
+            writer,
+            "chronicle_sqlite_op_duration_ms",
+            "Runtime SQLite statement latency in milliseconds.",
+            cycle_metrics.get("sqlite_ops"),
+            extra_labels={"process": "worker"},
+        )
+        if isinstance(cycle_metrics.get("sqlite_busy_errors"), int):
+            writer.counter(
+                "chronicle_sqlite_busy_errors_total",
+                "Runtime SQLite statements that gave up on a locked database.",
+                cycle_metrics["sqlite_busy_errors"],
+                {"process": "worker"},
+            )
+
+    # Each gunicorn worker keeps its own in-process series; label them by pid so
+    # counters stay monotonic whichever worker serves the scrape.
+    publish_api_process_metrics(settings, request_histograms=request_histograms)
+    for snapshot in _api_process_snapshots(settings):
+        pid = str(snapshot.get("pid"))
+        _write_http_host_metrics(writer, snapshot.get("http_hosts"), process="api", pid=pid)
+        _write_labelled_histograms(
+            writer,
+            "chronicle_sqlite_op_duration_ms",
+            "Runtime SQLite statement latency in milliseconds.",
+            snapshot.get("sqlite_ops"),
+            extra_labels={"process": "api", "pid": pid},
+        )
+        writer.counter(
+            "chronicle_sqlite_busy_errors_total",
+            "Runtime SQLite statements that gave up on a locked database.",
+            int(snapshot.get("sqlite_busy_errors") or 0),
+            {"process": "api", "pid": pid},
+        )
+        _write_labelled_histograms(
+            writer,
+            "chronicle_http_request_duration_ms",
+            "API request latency in milliseconds per route.",
+            snapshot.get("requests"),
+            extra_labels={"pid": pid},
+        )
+    return writer.render()
@@ -1,30 +1,126 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime
+from datetime import date, datetime, timedelta, timezone
 from typing import Any, Callable
 
 from .config import Settings
 from .stat_modules.crono_api import format_crono_line, get_crono_summary_for_activity
 from .stat_modules.misery_index import (
+    MISERY_BATCH_COLUMNS,
+    activity_weather_target,
+    calculate_misery_index_batch,
+    fetch_weather_history_batch,
     get_misery_index_details_for_activity,
     get_misery_index_for_activity,
+    weather_cell,
 )
+from .stat_modules.period_stats import garmin_period_windows, period_windows_end_utc
 from .stat_modules.smashrun import (
-    aggregate_elevation_totals,
-    get_activity_elevation_feet,
     get_activity_record,
     get_activities as get_smashrun_activities,
     get_badges as get_smashrun_badges,
+    get_latest_elevation_feet,
     get_notables,
     get_stats as get_smashrun_stats,
+    strava_match_window,
+    to_mirror_record,
 )
+from .storage import (
+    get_runtime_value,
+    get_weather_aqi,
+    get_weather_days,
+    latest_smashrun_activity_id,
+    list_activity_weather_inputs,
+    list_smashrun_activities,
+    register_activity_weather_targets,
+    set_runtime_value,
+    sum_smashrun_elevation,
+    upsert_smashrun_activities,
+    upsert_weather_aqi,
+    upsert_weather_days,
+    write_activity_misery_scores,
+)
+
+
+SMASHRUN_MIRROR_SYNC_KEY = "smashrun.activities.sync"
+WEATHER_RECENT_TTL_SECONDS = 30 * 60
+WEATHER_SETTLED_AFTER_DAYS = 2
+WEATHER_AQI_TTL_SECONDS = 15 * 60
 
 
 RunServiceCall = Callable[..., Any]
 AsFloat = Callable[[Any], float | None]
 
 
+def sync_smashrun_activity_mirror(
+    settings: Settings,
+    *,
+    service_state: dict[str, Any] | None,
+    run_service_call: RunServiceCall,
+) -> dict[str, Any]:
+    path = settings.processed_log_file
+    now_utc = datetime.now(timezone.utc)
+    sync_state = get_runtime_value(path, SMASHRUN_MIRROR_SYNC_KEY)
+    if not isinstance(sync_state, dict):
+        sync_state = {}
+    latest_id = latest_smashrun_activity_id(path)
+    synced_at_raw = sync_state.get("synced_at_utc")
+    try:
+        synced_at = datetime.fromisoformat(str(synced_at_raw)) if synced_at_raw else None
+    except ValueError:
+        synced_at = None
+    ttl_seconds = int(settings.service_cache_ttl_seconds or 0)
+    if (
+        latest_id is not None
+        and synced_at is not None
+        and ttl_seconds > 0
+        and (now_utc - synced_at).total_seconds() < ttl_seconds
+    ):
+        return {**sync_state, "mode": "mirror"}
+
+    fetched = run_service_call(
+        settings,
+        "smashrun.activities",
+        get_smashrun_activities,
+        settings.smashrun_access_token,
+        stop_at_activity_id=latest_id,
+        service_state=service_state,
+    )
+    if not isinstance(fetched, list):
+        return {**sync_state, "mode": "unavailable" if latest_id is None else "stale"}
+
+    records = [record for record in (to_mirror_record(item) for item in fetched) if record is not None]
+    upsert_smashrun_activities(path, records)
+    sync_state = {
+        "synced_at_utc": now_utc.isoformat(),
+        "fetched_records": len(records),
+        "latest_activity_id": latest_smashrun_activity_id(path),
+        "mode": "full" if latest_id is None else "incremental",
+    }
+    set_runtime_value(path, SMASHRUN_MIRROR_SYNC_KEY, sync_state)
+    return sync_state
+
+
+def _mirrored_smashrun_activity_record(
+    settings: Settings,
+    detailed_activity: dict[str, Any],
+) -> dict[str, Any] | None:
+    path = settings.processed_log_file
+    strava_id = detailed_activity.get("id")
+    if strava_id is not None:
+        by_strava_id = list_smashrun_activities(path, strava_activity_id=str(strava_id), limit=1)
+        if by_strava_id:
+            return by_strava_id[0]
+    window = strava_match_window(detailed_activity)
+    if window is not None:
+        candidates = list_smashrun_activities(path, start_from_utc=window[0], start_before_utc=window[1])
+        if candidates:
+            return get_activity_record(candidates, detailed_activity)
+    newest = list_smashrun_activities(path, limit=1)
+    return newest[0] if newest else None
+
+
 def collect_smashrun_context(
     settings: Settings,
     detailed_activity: dict[str, Any],
@@ -44,7 +140,6 @@ def collect_smashrun_context(
         "latest_elevation_feet": None,
         "smashrun_elevation_totals": {"week": 0.0, "month": 0.0, "year": 0.0},
         "smashrun_activity_record": None,
-        "smashrun_activities": [],
         "smashrun_stats": None,
         "smashrun_badges": [],
     }
@@ -52,32 +147,35 @@ def collect_smashrun_context(
     if not (settings.enable_smashrun and settings.smashrun_access_token):
         return context
 
-    smashrun_activities = run_service_call(
+    sync_state = sync_smashrun_activity_mirror(
         settings,
-        "smashrun.activities",
-        get_smashrun_activities,
-        settings.smashrun_access_token,
         service_state=service_state,
-        cache_key="smashrun.activities:default",
-        cache_ttl_seconds=settings.service_cache_ttl_seconds,
+        run_service_call=run_service_call,
     )
 
-    if smashrun_activities:
-        context["smashrun_activities"] = [
-            item for item in smashrun_activities if isinstance(item, dict)
-        ]
-        context["smashrun_activity_record"] = get_activity_record(smashrun_activities, detailed_activity)
-        context["latest_elevation_feet"] = get_activity_elevation_feet(smashrun_activities, detailed_activity)
-        context["smashrun_elevation_totals"] = aggregate_elevation_totals(
-            smashrun_activities,
-            now_utc,
-            timezone_name=settings.timezone,
+    if sync_state.get("mode") != "unavailable":
+        record = _mirrored_smashrun_activity_record(settings, detailed_activity)
+        context["smashrun_activity_record"] = record
+        if record is not None:
+            mirror_record = to_mirror_record(record)
+            latest_elevation_feet = mirror_record["elevation_feet"] if mirror_record is not None else None
+            if latest_elevation_feet is None:
+                latest_elevation_feet = get_latest_elevation_feet(
+                    list_smashrun_activities(settings.processed_log_file, limit=1)
+                )
+            context["latest_elevation_feet"] = latest_elevation_feet
+        windows = garmin_period_windows(now_utc, settings.timezone)
+        context["smashrun_elevation_totals"] = sum_smashrun_elevation(
+            settings.processed_log_file,
+            {period: start_utc for period, (_start_date, start_utc) in windows.items()},
+            end_utc=period_windows_end_utc(now_utc, settings.timezone),
         )
         matched_smashrun_activity_id = None
         if isinstance(context["smashrun_activity_record"], dict):
             matched_smashrun_activity_id = context["smashrun_activity_record"].get("activityId")
         if matched_smashrun_activity_id is None and selected_activity_id == latest_activity_id:
-            matched_smashrun_activity_id = smashrun_activities[0].get("activityId") if smashrun_activities else None
+            newest = list_smashrun_activities(settings.processed_log_file, limit=1)
+            matched_smashrun_activity_id = newest[0].get("activityId") if newest else None
         if matched_smashrun_activity_id is not None:
             notables_payload = run_service_call(
                 settings,
@@ -124,6 +222,112 @@ def collect_smashrun_context(
     return context
 
 
+def _weather_day_expiry(local_date: str, now_utc: datetime) -> datetime | None:
+    try:
+        parsed = date.fromisoformat(str(local_date)[:10])
+    except ValueError:
+        return now_utc + timedelta(seconds=WEATHER_RECENT_TTL_SECONDS)
+    # Forecast and same-day history hours are revised; older local days are final.
+    if parsed <= now_utc.date() - timedelta(days=WEATHER_SETTLED_AFTER_DAYS):
+        return None
+    return now_utc + timedelta(seconds=WEATHER_RECENT_TTL_SECONDS)
+
+
+def weather_store_callbacks(settings: Settings) -> dict[str, Callable[..., Any]]:
+    def day_lookup(keys: list[tuple[str, str]]) -> dict[tuple[str, str], dict[str, Any]]:
+        return get_weather_days(settings.processed_log_file, keys)
+
+    def day_store(days: dict[tuple[str, str], dict[str, Any]]) -> None:
+        now_utc = datetime.now(timezone.utc)
+        upsert_weather_days(
+            settings.processed_log_file,
+            [
+                {
+                    "cell": cell,
+                    "local_date": local_date,
+                    "tz_id": day.get("tz_id"),
+                    "hours": day.get("hours"),
+                    "expires_at_utc": _weather_day_expiry(local_date, now_utc),
+                }
+                for (cell, local_date), day in days.items()
+            ],
+            now_utc=now_utc,
+        )
+
+    def aqi_lookup(cell: str) -> dict[str, Any] | None:
+        return get_weather_aqi(settings.processed_log_file, cell)
+
+    def aqi_store(cell: str, us_epa_index: int | None) -> None:
+        now_utc = datetime.now(timezone.utc)
+        upsert_weather_aqi(
+            settings.processed_log_file,
+            cell,
+            us_epa_index,
+            expires_at_utc=now_utc + timedelta(seconds=WEATHER_AQI_TTL_SECONDS),
+            now_utc=now_utc,
+        )
+
+    return {
+        "day_lookup": day_lookup,
+        "day_store": day_store,
+        "aqi_lookup": aqi_lookup,
+        "aqi_store": aqi_store,
+    }
+
+
+def _misery_score_target(activity: dict[str, Any]) -> dict[str, Any] | None:
+    target = activity_weather_target(activity)
+    if target is None or activity.get("id") is None:
+        return None
+    lat, lon, local_date = target
+    return {
+        "activity_id": str(activity.get("id")),
+        "start_utc": activity.get("start_date"),
+        "cell": weather_cell(lat, lon),
+        "local_date": local_date.isoformat(),
+    }
+
+
+def recompute_misery_scores(settings: Settings, *, activity_ids: list[str] | None = None) -> dict[str, int]:
+    inputs = list_activity_weather_inputs(settings.processed_log_file, activity_ids=activity_ids)
+    with_weather = [item for item in inputs if item["hour"] is not None]
+    columns = {
+        name: [item["hour"].get(name) for item in with_weather]
+        for name in MISERY_BATCH_COLUMNS
+    }
+    results = calculate_misery_index_batch(columns)
+    scores = [
+        {"activity_id": item["activity_id"], **result}
+        for item, result in zip(with_weather, results)
+        if result is not None
+    ]
+    written = write_activity_misery_scores(settings.processed_log_file, scores)
+    return {
+        "activities": len(inputs),
+        "missing_weather": len(inputs) - len(with_weather),
+        "scored": written,
+    }
+
+
+def backfill_weather_history(settings: Settings, activities: list[dict[str, Any]]) -> dict[str, int]:
+    activity_list = [activity for activity in activities if isinstance(activity, dict)]
+    register_activity_weather_targets(
+        settings.processed_log_file,
+        [target for target in (_misery_score_target(activity) for activity in activity_list) if target is not None],
+    )
+    targets = [target for target in (activity_weather_target(activity) for activity in activity_list) if target is not None]
+    if not settings.weather_api_key or not targets:
+        return {"targets": len(targets), "days": 0}
+    callbacks = weather_store_callbacks(settings)
+    days = fetch_weather_history_batch(
+        settings.weather_api_key,
+        targets,
+        day_lookup=callbacks["day_lookup"],
+        day_store=callbacks["day_store"],
+    )
+    return {"targets": len(targets), "days": len(days)}
+
+
 def collect_weather_context(
     settings: Settings,
     detailed_activity: dict[str, Any],
@@ -148,11 +352,31 @@ def collect_weather_context(
         get_misery_index_details_for_activity,
         detailed_activity,
         settings.weather_api_key,
+        **weather_store_callbacks(settings),
         service_state=service_state,
         cache_key=f"weather.details:{selected_activity_id}",
         cache_ttl_seconds=settings.service_cache_ttl_seconds,
     )
     context["weather_details"] = weather_details
+    if isinstance(weather_details, dict) and isinstance(weather_details.get("misery_components"), dict):
+        target = _misery_score_target(detailed_activity)
+        if target is not None:
+            register_activity_weather_targets(settings.processed_log_file, [target])
+            misery = weather_details.get("misery") or {}
+            write_activity_misery_scores(
+                settings.processed_log_file,
+                [
+                    {
+                        "activity_id": target["activity_id"],
+                        "score": weather_details.get("misery_index"),
+                        "polarity": misery.get("polarity"),
+                        "severity": misery.get("severity"),
+                        "emoji": misery.get("emoji"),
+                        "description": weather_details.get("misery_description"),
+                        "components": weather_details["misery_components"],
+                    }
+                ],
+            )
     if weather_details:
         context["misery_index"] = weather_details.get("misery_index")
         context["misery_desc"] = weather_details.get("misery_description")
@@ -166,6 +390,7 @@ def collect_weather_context(
         get_misery_index_for_activity,
         detailed_activity,
         settings.weather_api_key,
+        **weather_store_callbacks(settings),
         service_state=service_state,
         cache_key=f"weather.fallback:{selected_activity_id}",
         cache_ttl_seconds=settings.service_cache_ttl_seconds,
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import math
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from datetime import datetime, timezone
+from typing import Any, Iterator
+
+
+PIPELINE_TRACE_HISTORY_CYCLES = 50
+PIPELINE_TRACE_COUNTERS = ("storage_calls", "rows_read", "rows_written", "bytes_serialized")
+
+_ACTIVE_TRACE: ContextVar["CycleTrace | None"] = ContextVar("chronicle_pipeline_trace", default=None)
+
+
+class _Span:
+    __slots__ = ("name", "path", "started", "duration_ms", "counters", "children")
+
+    def __init__(self, name: str, path: str) -> None:
+        self.name = name
+        self.path = path
+        self.started = time.perf_counter()
+        self.duration_ms = 0.0
+        self.counters: dict[str, int] = {}
+        self.children: list[_Span] = []
+
+    def as_dict(self) -> dict[str, Any]:
+        payload: dict[str, Any] = {
+            "name": self.name,
+            "duration_ms": round(self.duration_ms, 3),
+            "counters": dict(self.counters),
+        }
+        if self.children:
+            payload["children"] = [child.as_dict() for child in self.children]
+        return payload
+
+
+class CycleTrace:
+    """Nested stage timers and counters for one pipeline cycle."""
+
+    def __init__(self) -> None:
+        self.trace_id = uuid.uuid4().hex
+        self.started_at_utc = datetime.now(timezone.utc).isoformat()
+        self._started = time.perf_counter()
+        self._roots: list[_Span] = []
+        self._stack: list[_Span] = []
+        self.counters: dict[str, int] = {}
+        self.duration_ms: float | None = None
+
+    def open_span(self, name: str) -> _Span:
+        parent = self._stack[-1] if self._stack else None
+        span = _Span(name, f"{parent.path}/{name}" if parent is not None else name)
+        (parent.children if parent is not None else self._roots).append(span)
+        self._stack.append(span)
+        return span
+
+    def close_span(self, span: _Span) -> None:
+        span.duration_ms = (time.perf_counter() - span.started) * 1000.0
+        if self._stack and self._stack[-1] is span:
+            self._stack.pop()
+
+    def add(self, counter: str, by: int) -> None:
+        self.counters[counter] = self.counters.get(counter, 0) + by
+        # Counters are inclusive: a parent stage also reports what its children did.
+        for span in self._stack:
+            span.counters[counter] = span.counters.get(counter, 0) + by
+
+    def finish(self) -> None:
+        if self.duration_ms is None:
+            self.duration_ms = (time.perf_counter() - self._started) * 1000.0
+
+    def stage_durations_ms(self) -> dict[str, float]:
+        durations: dict[str, float] = {}
+        pending = list(self._roots)
+        while pending:
+            span = pending.pop()
+            durations[span.path] = round(durations.get(span.path, 0.0) + span.duration_ms, 3)
+            pending.extend(span.children)
+        return durations
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "started_at_utc": self.started_at_utc,
+            "duration_ms": round(self.duration_ms, 3) if self.duration_ms is not None else None,
+            "counters": dict(self.counters),
+            "stages_ms": self.stage_durations_ms(),
+            "spans": [span.as_dict() for span in self._roots],
+        }
+
+
+def begin_cycle_trace(enabled: bool) -> Token | None:
+    if not enabled:
+        return None
+    return _ACTIVE_TRACE.set(CycleTrace())
+
+
+def end_cycle_trace(token: Token | None) -> CycleTrace | None:
+    if token is None:
+        return None
+    trace = _ACTIVE_TRACE.get()
+    _ACTIVE_TRACE.reset(token)
+    if trace is not None:
+        trace.finish()
+    return trace
+
+
+def trace_active() -> bool:
+    return _ACTIVE_TRACE.get() is not None
+
+
+@contextmanager
+def _traced_span(trace: CycleTrace, name: str) -> Iterator[None]:
+    span = trace.open_span(name)
+    try:
+        yield
+    finally:
+        trace.close_span(span)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *_exc: Any) -> bool:
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def trace_span(name: str) -> Any:
+    trace = _ACTIVE_TRACE.get()
+    if trace is None:
+        return _NOOP_SPAN
+    return _traced_span(trace, name)
+
+
+def trace_count(counter: str, by: int = 1) -> None:
+    trace = _ACTIVE_TRACE.get()
+    if trace is None or not by:
+        return
+    trace.add(counter, int(by))
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    # Nearest-rank percentile; the history window is small enough to sort per call.
+    index = max(0, min(len(sorted_values) - 1, math.ceil(fraction * len(sorted_values)) - 1))
+    return round(sorted_values[index], 3)
+
+
+def stage_percentiles(history: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    samples: dict[str, list[float]] = {}
+    for entry in history:
+        stages = entry.get("stages_ms") if isinstance(entry, dict) else None
+        if not isinstance(stages, dict):
+            continue
+        for stage, value in stages.items():
+            if isinstance(value, (int, float)):
+                samples.setdefault(str(stage), []).append(float(value))
+    summary: dict[str, dict[str, Any]] = {}
+    for stage, values in sorted(samples.items()):
+        values.sort()
+        summary[stage] = {
+            "count": len(values),
+            "p50_ms": _percentile(values, 0.50),
+            "p95_ms": _percentile(values, 0.95),
+            "max_ms": round(values[-1], 3),
+        }
+    return summary
@@ -0,0 +1,416 @@
+from __future__ import annotations
+
+import cProfile
+import logging
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Any
+
+from .config import Settings
+from .storage import claim_profiler_slot, get_runtime_value, record_profiler_result, set_runtime_value
+
+
+logger = logging.getLogger(__name__)
+
+PROFILER_ARM_KEY_PREFIX = "profiler.arm."
+PROFILER_RESULTS_KEY = "profiler.results"
+PROFILER_MODES = ("sample", "cprofile")
+PROFILER_TARGETS = ("cycles", "route")
+PROFILER_MAX_COUNT = {"cycles": 50, "route": 1000}
+PROFILER_RESULTS_RETAINED = 20
+PROFILER_MAX_STACK_DEPTH = 128
+PROFILES_DIRNAME = "profiles"
+
+
+def _arm_key(target: str) -> str:
+    # One key per target, so a cycle arm and a route arm can be live at the same time.
+    return f"{PROFILER_ARM_KEY_PREFIX}{target}"
+
+
+def profiles_dir(settings: Settings) -> Path:
+    return settings.state_dir / PROFILES_DIRNAME
+
+
+def _code_label(filename: str, name: str) -> str:
+    return f"{Path(filename).name}:{name}"
+
+
+def _frame_label(code: CodeType) -> str:
+    return _code_label(code.co_filename, getattr(code, "co_qualname", code.co_name))
+
+
+class StackSampler:
+    """Samples one thread's Python stack on a timer and counts collapsed stacks."""
+
+    def __init__(self, thread_id: int, *, interval_ms: int) -> None:
+        self.thread_id = thread_id
+        self.interval_seconds = max(1, int(interval_ms)) / 1000.0
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="chronicle-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._thread.join(timeout=5)
+
+    def _collapse(self, frame: FrameType | None) -> str:
+        labels: list[str] = []
+        while frame is not None and len(labels) < PROFILER_MAX_STACK_DEPTH:
+            labels.append(_frame_label(frame.f_code))
+            frame = frame.f_back
+        labels.reverse()
+        return ";".join(labels)
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval_seconds):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = self._collapse(frame)
+            del frame
+            if stack:
+                self.stacks[stack] += 1
+                self.samples += 1
+
+
+def _validated_arm(
+    *,
+    target: str,
+    count: int,
+    route: str | None,
+    mode: str,
+    interval_ms: int,
+    source: str,
+) -> dict[str, Any]:
+    target_text = str(target or "").strip().lower()
+    if target_text not in PROFILER_TARGETS:
+        raise ValueError(f"target must be one of: {', '.join(PROFILER_TARGETS)}.")
+    mode_text = str(mode or "").strip().lower()
+    if mode_text not in PROFILER_MODES:
+        raise ValueError(f"mode must be one of: {', '.join(PROFILER_MODES)}.")
+    try:
+        count_value = int(count)
+        interval_value = int(interval_ms)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("count and interval_ms must be integers.") from exc
+    max_count = PROFILER_MAX_COUNT[target_text]
+    if count_value < 1 or count_value > max_count:
+        raise ValueError(f"count must be between 1 and {max_count} for {target_text}.")
+    if interval_value < 1 or interval_value > 1000:
+        raise ValueError("interval_ms must be between 1 and 1000.")
+    route_text = str(route or "").strip() or None
+    if target_text == "route" and (route_text is None or not route_text.startswith("/")):
+        raise ValueError("route must be an API path such as /plan/data.json.")
+    return {
+        "arm_id": uuid.uuid4().hex[:12],
+        "target": target_text,
+        "route": route_text if target_text == "route" else None,
+        "count": count_value,
+        "remaining": count_value,
+        "mode": mode_text,
+        "interval_ms": interval_value,
+        "source": source,
+        "armed_at_utc": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def arm_profiler(
+    settings: Settings,
+    *,
+    target: str,
+    count: int,
+    route: str | None = None,
+    mode: str | None = None,
+    interval_ms: int | None = None,
+    source: str = "api",
+) -> dict[str, Any]:
+    arm = _validated_arm(
+        target=target,
+        count=count,
+        route=route,
+        mode=mode or settings.profiler_mode,
+        interval_ms=interval_ms or settings.profiler_sample_interval_ms,
+        source=source,
+    )
+    set_runtime_value(settings.processed_log_file, _arm_key(arm["target"]), arm)
+    return arm
+
+
+def disarm_profiler(settings: Settings, *, target: str | None = None) -> dict[str, dict[str, Any]]:
+    """Cancels the remaining slots of one target's arm, or of every target's; returns the disarmed arms."""
+    if target is not None and target not in PROFILER_TARGETS:
+        raise ValueError(f"target must be one of: {', '.join(PROFILER_TARGETS)}.")
+    disarmed: dict[str, dict[str, Any]] = {}
+    for name in (target,) if target is not None else PROFILER_TARGETS:
+        arm = get_profiler_arm(settings, name)
+        if arm is None:
+            continue
+        disarmed[name] = arm | {"remaining": 0, "disarmed_at_utc": datetime.now(timezone.utc).isoformat()}
+        set_runtime_value(settings.processed_log_file, _arm_key(name), disarmed[name])
+    return disarmed
+
+
+def arm_profiler_from_env(settings: Settings) -> list[dict[str, Any]]:
+    # The worker is a single process, so it owns env-driven arming for both targets.
+    armed: list[dict[str, Any]] = []
+    try:
+        if settings.profile_next_cycles > 0:
+            armed.append(arm_profiler(settings, target="cycles", count=settings.profile_next_cycles, source="env"))
+        if settings.profile_route:
+            armed.append(
+                arm_profiler(
+                    settings,
+                    target="route",
+                    count=settings.profile_route_requests,
+                    route=settings.profile_route,
+                    source="env",
+                )
+            )
+    except ValueError as exc:
+        logger.warning("Ignoring profiler env flags: %s", exc)
+    return armed
+
+
+def get_profiler_arm(settings: Settings, target: str) -> dict[str, Any] | None:
+    arm = get_runtime_value(settings.processed_log_file, _arm_key(target))
+    return arm if isinstance(arm, dict) else None
+
+
+def get_profiler_arms(settings: Settings) -> dict[str, dict[str, Any] | None]:
+    return {target: get_profiler_arm(settings, target) for target in PROFILER_TARGETS}
+
+
+def list_profile_results(settings: Settings) -> list[dict[str, Any]]:
+    results = get_runtime_value(settings.processed_log_file, PROFILER_RESULTS_KEY)
+    return [item for item in results if isinstance(item, dict)] if isinstance(results, list) else []
+
+
+class ProfileSession:
+    """One profiled cycle or request; writes its output under the state dir when finished."""
+
+    def __init__(self, settings: Settings, arm: dict[str, Any], *, label: str) -> None:
+        self.settings = settings
+        self.arm = arm
+        self.label = label
+        self.mode = str(arm.get("mode") or "sample")
+        self.profile_id = f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        self._started = time.perf_counter()
+        self._profile: cProfile.Profile | None = None
+        self._sampler: StackSampler | None = None
+
+    def start(self) -> "ProfileSession":
+        if self.mode == "cprofile":
+            try:
+                self._profile = cProfile.Profile()
+                self._profile.enable()
+            except ValueError:
+                # Only one cProfile can run per process; concurrent requests fall back to sampling.
+                self._profile = None
+                self.mode = "sample"
+        if self.mode != "cprofile":
+            self._sampler = StackSampler(threading.get_ident(), interval_ms=int(self.arm.get("interval_ms") or 5))
+            self._sampler.start()
+        self._started = time.perf_counter()
+        return self
+
+    def finish(self, *, status: str = "ok") -> dict[str, Any] | None:
+        duration_ms = (time.perf_counter() - self._started) * 1000.0
+        try:
+            output_dir = profiles_dir(self.settings)
+            output_dir.mkdir(parents=True, exist_ok=True)
+            if self._profile is not None:
+                self._profile.disable()
+                output_path = output_dir / f"{self.profile_id}.pstats"
+                self._profile.dump_stats(str(output_path))
+                samples = None
+            elif self._sampler is not None:
+                self._sampler.stop()
+                output_path = output_dir / f"{self.profile_id}.collapsed"
+                output_path.write_text(
+                    "".join(f"{stack} {count}\n" for stack, count in self._sampler.stacks.most_common()),
+                    encoding="utf-8",
+                )
+                samples = self._sampler.samples
+            else:
+                return None
+        except OSError as exc:
+            logger.warning("Could not write profile %s: %s", self.profile_id, exc)
+            return None
+        result = {
+            "profile_id": self.profile_id,
+            "arm_id": self.arm.get("arm_id"),
+            "target": self.arm.get("target"),
+            "label": self.label,
+            "mode": self.mode,
+            "status": status,
+            "file": output_path.name,
+            "duration_ms": round(duration_ms, 3),
+            "samples": samples,
+            "finished_at_utc": datetime.now(timezone.utc).isoformat(),
+        }
+        _record_profile_result(self.settings, result)
+        return result
+
+
+def _record_profile_result(settings: Settings, result: dict[str, Any]) -> None:
+    # Route profiles finish concurrently across threads and gunicorn workers.
+    dropped = record_profiler_result(settings.processed_log_file, result, keep=PROFILER_RESULTS_RETAINED)
+    if dropped is None:
+        logger.warning("Could not record profile %s in the runtime DB; discarding it.", result.get("profile_id"))
+        dropped = [result]
+    for item in dropped:
+        try:
+            (profiles_dir(settings) / str(item.get("file") or "")).unlink(missing_ok=True)
+        except OSError:
+            continue
+
+
+def profiler_armed_for(arm: dict[str, Any] | None, *, target: str, route: str | None = None) -> bool:
+    if not isinstance(arm, dict) or arm.get("target") != target:
+        return False
+    if target == "route" and arm.get("route") != route:
+        return False
+    try:
+        return int(arm.get("remaining") or 0) > 0
+    except (TypeError, ValueError):
+        return False
+
+
+def start_profile_session(
+    settings: Settings,
+    *,
+    target: str,
+    label: str,
+    route: str | None = None,
+    arm: dict[str, Any] | None = None,
+) -> ProfileSession | None:
+    # A plain read first so unarmed cycles never take the write lock.
+    if not profiler_armed_for(arm if arm is not None else get_profiler_arm(settings, target), target=target, route=route):
+        return None
+    arm = claim_profiler_slot(settings.processed_log_file, target=target, route=route)
+    if arm is None:
+        return None
+    return ProfileSession(settings, arm, label=label).start()
+
+
+def _collapsed_function_totals(path: Path) -> tuple[Counter[str], Counter[str], int]:
+    self_counts: Counter[str] = Counter()
+    inclusive_counts: Counter[str] = Counter()
+    total = 0
+    for line in path.read_text(encoding="utf-8").splitlines():
+        stack, _, raw_count = line.rpartition(" ")
+        try:
+            count = int(raw_count)
+        except ValueError:
+            continue
+        frames = stack.split(";") if stack else []
+        if not frames:
+            continue
+        total += count
+        self_counts[frames[-1]] += count
+        # Recursive frames only count once per stack.
+        for frame in set(frames):
+            inclusive_counts[frame] += count
+    return self_counts, inclusive_counts, total
+
+
+def _pstats_function_totals(paths: list[Path]) -> tuple[Counter[str], Counter[str], float]:
+    self_seconds: Counter[str] = Counter()
+    inclusive_seconds: Counter[str] = Counter()
+    stats = pstats.Stats(*[str(path) for path in paths])
+    for (filename, _lineno, name), (_cc, _calls, total_time, cumulative_time, _callers) in stats.stats.items():
+        label = _code_label(filename, name)
+        self_seconds[label] += total_time
+        inclusive_seconds[label] = max(inclusive_seconds[label], cumulative_time)
+    return self_seconds, inclusive_seconds, float(stats.total_tt)
+
+
+def top_functions(
+    settings: Settings,
+    *,
+    limit: int = 25,
+    profile_id: str | None = None,
+    mode: str | None = None,
+) -> dict[str, Any]:
+    """Top-N functions from one profile, or from every retained profile of one mode."""
+    results = list_profile_results(settings)
+    if profile_id and profile_id not in {"latest", "all"}:
+        selected = [item for item in results if item.get("profile_id") == profile_id]
+        if not selected:
+            raise LookupError(f"Unknown profile '{profile_id}'.")
+    elif profile_id == "all":
+        wanted_mode = mode or (results[0].get("mode") if results else "sample")
+        selected = [item for item in results if item.get("mode") == wanted_mode]
+    else:
+        selected = results[:1]
+    if not selected:
+        return {"mode": mode, "profiles": [], "unit": None, "total": 0, "functions": []}
+
+    selected_mode = str(selected[0].get("mode") or "sample")
+    selected = [item for item in selected if item.get("mode") == selected_mode]
+    paths = [
+        path
+        for path in (profiles_dir(settings) / str(item.get("file") or "") for item in selected)
+        if path.is_file()
+    ]
+    if selected_mode == "cprofile":
+        self_totals, inclusive_totals, total = _pstats_function_totals(paths) if paths else (Counter(), Counter(), 0.0)
+        unit = "seconds"
+    else:
+        self_totals = Counter()
+        inclusive_totals = Counter()
+        total = 0
+        for path in paths:
+            file_self, file_inclusive, file_total = _collapsed_function_totals(path)
+            self_totals.update(file_self)
+            inclusive_totals.update(file_inclusive)
+            total += file_total
+        unit = "samples"
+
+    functions = []
+    for name, self_value in self_totals.most_common(max(1, int(limit))):
+        inclusive_value = inclusive_totals.get(name, self_value)
+        functions.append(
+            {
+                "function": name,
+                "self": round(self_value, 6) if unit == "seconds" else self_value,
+                "inclusive": round(inclusive_value, 6) if unit == "seconds" else inclusive_value,
+                "self_pct": round(self_value * 100.0 / total, 2) if total else None,
+                "inclusive_pct": round(inclusive_value * 100.0 / total, 2) if total else None,
+            }
+        )
+    return {
+        "mode": selected_mode,
+        "unit": unit,
+        "profiles": [item.get("profile_id") for item in selected],
+        "total": round(total, 6) if unit == "seconds" else total,
+        "functions": functions,
+    }
+
+
+def profiler_status(settings: Settings) -> dict[str, Any]:
+    return {
+        "arms": get_profiler_arms(settings),
+        "results": list_profile_results(settings),
+        "profiles_dir": str(profiles_dir(settings)),
+    }
+
+
+def load_profile_result(settings: Settings, profile_id: str) -> tuple[dict[str, Any], Path] | None:
+    for item in list_profile_results(settings):
+        if item.get("profile_id") == profile_id:
+            path = profiles_dir(settings) / str(item.get("file") or "")
+            return (item, path) if path.is_file() else None
+    return None
+
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+DEFAULT_PROVIDER_HTTP_POOL_MAXSIZE = 8
+DEFAULT_PROVIDER_HTTP_CONNECT_TIMEOUT_SECONDS = 10.0
+DEFAULT_PROVIDER_HTTP_READ_TIMEOUT_SECONDS = 30.0
+PROVIDER_HTTP_LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_SESSIONS_LOCK = threading.Lock()
+_SESSIONS: dict[str, requests.Session] = {}
+_SESSIONS_PID: int | None = None
+_STATS_LOCK = threading.Lock()
+_HOST_STATS: dict[str, dict[str, Any]] = {}
+
+
+def _env_number(name: str, default: float, minimum: float, maximum: float) -> float:
+    raw = os.getenv(name)
+    try:
+        parsed = float(raw.strip()) if raw is not None else default
+    except ValueError:
+        parsed = default
+    return max(minimum, min(maximum, parsed))
+
+
+def provider_http_config() -> dict[str, float | int]:
+    return {
+        "pool_maxsize": int(_env_number("PROVIDER_HTTP_POOL_MAXSIZE", DEFAULT_PROVIDER_HTTP_POOL_MAXSIZE, 1, 64)),
+        "connect_timeout_seconds": _env_number(
+            "PROVIDER_HTTP_CONNECT_TIMEOUT_SECONDS",
+            DEFAULT_PROVIDER_HTTP_CONNECT_TIMEOUT_SECONDS,
+            0.5,
+            120.0,
+        ),
+        "read_timeout_seconds": _env_number(
+            "PROVIDER_HTTP_READ_TIMEOUT_SECONDS",
+            DEFAULT_PROVIDER_HTTP_READ_TIMEOUT_SECONDS,
+            1.0,
+            600.0,
+        ),
+    }
+
+
+def _host_key(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme or 'https'}://{(parts.netloc or '').lower()}"
+
+
+def _build_session(pool_maxsize: int) -> requests.Session:
+    session = requests.Session()
+    # One session per host, so a single pool per adapter is enough.
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def session_for(url: str) -> requests.Session:
+    global _SESSIONS_PID
+    key = _host_key(url)
+    with _SESSIONS_LOCK:
+        pid = os.getpid()
+        if _SESSIONS_PID != pid:
+            # Pooled sockets must not be shared across a fork (gunicorn workers).
+            _SESSIONS.clear()
+            _SESSIONS_PID = pid
+        session = _SESSIONS.get(key)
+        if session is None:
+            session = _build_session(int(provider_http_config()["pool_maxsize"]))
+            _SESSIONS[key] = session
+        return session
+
+
+def close_provider_sessions() -> None:
+    with _SESSIONS_LOCK:
+        sessions = list(_SESSIONS.values())
+        _SESSIONS.clear()
+    for session in sessions:
+        session.close()
+    with _STATS_LOCK:
+        _HOST_STATS.clear()
+
+
+def _resolve_timeout(timeout: Any) -> Any:
+    config = provider_http_config()
+    connect_cap = float(config["connect_timeout_seconds"])
+    read_cap = float(config["read_timeout_seconds"])
+    if isinstance(timeout, tuple):
+        connect_timeout, read_timeout = (float(value) for value in timeout)
+    elif isinstance(timeout, (int, float)):
+        connect_timeout = read_timeout = float(timeout)
+    else:
+        connect_timeout, read_timeout = connect_cap, read_cap
+    # Callers pass their module's own timeout; the configured values are upper bounds on it.
+    read_timeout = min(read_timeout, read_cap)
+    return (min(connect_timeout, connect_cap, read_timeout), read_timeout)
+
+
+def _record(host: str, *, duration_ms: float, status_code: int | None, error: str | None) -> None:
+    with _STATS_LOCK:
+        stats = _HOST_STATS.get(host)
+        if stats is None:
+            stats = {
+                "requests": 0,
+                "errors": 0,
+                "status_classes": {},
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "latency_buckets_ms": {str(bound): 0 for bound in PROVIDER_HTTP_LATENCY_BUCKETS_MS} | {"+Inf": 0},
+                "last_error": None,
+            }
+            _HOST_STATS[host] = stats
+        stats["requests"] += 1
+        stats["total_ms"] += duration_ms
+        stats["max_ms"] = max(stats["max_ms"], duration_ms)
+        bucket = next(
+            (str(bound) for bound in PROVIDER_HTTP_LATENCY_BUCKETS_MS if duration_ms <= bound),
+            "+Inf",
+        )
+        stats["latency_buckets_ms"][bucket] += 1
+        if status_code is not None:
+            status_class = f"{status_code // 100}xx"
+            stats["status_classes"][status_class] = stats["status_classes"].get(status_class, 0) + 1
+        if error is not None or (status_code is not None and status_code >= 500):
+            stats["errors"] += 1
+            stats["last_error"] = error or f"HTTP {status_code}"
+
+
+def request(method: str, url: str, **kwargs: Any) -> requests.Response:
+    host = _host_key(url)
+    kwargs["timeout"] = _resolve_timeout(kwargs.get("timeout"))
+    started = time.perf_counter()
+    try:
+        response = session_for(url).request(method, url, **kwargs)
+    except requests.RequestException as exc:
+        _record(host, duration_ms=(time.perf_counter() - started) * 1000.0, status_code=None, error=str(exc))
+        raise
+    _record(
+        host,
+        duration_ms=(time.perf_counter() - started) * 1000.0,
+        status_code=int(response.status_code),
+        error=None,
+    )
+    return response
+
+
+def get(url: str, **kwargs: Any) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs: Any) -> requests.Response:
+    return request("POST", url, **kwargs)
+
+
+class ProviderSession:
+    """Session-shaped facade over the shared per-host pools."""
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        return request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        return request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        return request("POST", url, **kwargs)
+
+
+def host_metrics_snapshot() -> dict[str, dict[str, Any]]:
+    with _STATS_LOCK:
+        snapshot: dict[str, dict[str, Any]] = {}
+        for host, stats in _HOST_STATS.items():
+            count = int(stats["requests"])
+            snapshot[host] = {
+                "requests": count,
+                "errors": int(stats["errors"]),
+                "status_classes": dict(stats["status_classes"]),
+                "avg_ms": round(stats["total_ms"] / count, 1) if count else None,
+                "total_ms": round(stats["total_ms"], 1),
+                "max_ms": round(stats["max_ms"], 1),
+                "latency_buckets_ms": dict(stats["latency_buckets_ms"]),
+                "last_error": stats["last_error"],
+            }
+        return snapshot
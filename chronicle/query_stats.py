@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+from datetime import datetime, timezone
+from typing import Any
+
+from .config import Settings
+from .storage import (
+    explain_sqlite_statement,
+    get_runtime_value,
+    set_runtime_value,
+    sqlite_slow_query_threshold_ms,
+    sqlite_statement_stats_snapshot,
+)
+
+
+SQLITE_STATEMENTS_WORKER_KEY = "sqlite.statements.worker"
+STATEMENT_SORT_KEYS = ("total_ms", "mean_ms", "max_ms", "count", "slow_count")
+_FULL_SCAN_DETAIL = re.compile(r"^SCAN (\w+)(?: AS \w+)?$")
+
+
+def plan_findings(plan: list[str] | None) -> dict[str, Any]:
+    """Flags the plan details that usually mean a missing index."""
+    details = [line.strip() for line in plan or []]
+    full_scans = []
+    for detail in details:
+        match = _FULL_SCAN_DETAIL.match(detail)
+        if match and match.group(1) not in full_scans:
+            full_scans.append(match.group(1))
+    return {
+        "full_scan_tables": full_scans,
+        "temp_btree": any(detail.startswith("USE TEMP B-TREE") for detail in details),
+    }
+
+
+def statement_rows(
+    statements: dict[str, dict[str, Any]],
+    *,
+    sort: str = "total_ms",
+    limit: int = 25,
+) -> list[dict[str, Any]]:
+    rows = []
+    for statement, entry in statements.items():
+        count = int(entry.get("count") or 0)
+        total_ms = float(entry.get("total_ms") or 0.0)
+        rows.append(
+            {"statement": statement}
+            | entry
+            | {"mean_ms": round(total_ms / count, 3) if count else 0.0}
+            | plan_findings(entry.get("plan"))
+        )
+    sort_key = sort if sort in STATEMENT_SORT_KEYS else "total_ms"
+    rows.sort(key=lambda row: (float(row.get(sort_key) or 0), float(row.get("total_ms") or 0)), reverse=True)
+    return rows[: max(1, int(limit))]
+
+
+def persist_worker_statement_stats(settings: Settings) -> None:
+    set_runtime_value(
+        settings.processed_log_file,
+        SQLITE_STATEMENTS_WORKER_KEY,
+        {
+            "pid": os.getpid(),
+            "updated_at_utc": datetime.now(timezone.utc).isoformat(),
+            "statements": sqlite_statement_stats_snapshot(),
+        },
+    )
+
+
+def statement_report(
+    settings: Settings,
+    *,
+    live_process: str | None = None,
+    sort: str = "total_ms",
+    limit: int = 25,
+    explain: bool = False,
+) -> dict[str, Any]:
+    """Per-statement stats from the worker's last cycle, plus this process's own when live_process is set."""
+    processes: dict[str, dict[str, Any]] = {}
+    worker = get_runtime_value(settings.processed_log_file, SQLITE_STATEMENTS_WORKER_KEY)
+    if isinstance(worker, dict) and isinstance(worker.get("statements"), dict):
+        processes["worker"] = {
+            "pid": worker.get("pid"),
+            "updated_at_utc": worker.get("updated_at_utc"),
+            "statements": statement_rows(worker["statements"], sort=sort, limit=limit),
+        }
+    if live_process:
+        processes[live_process] = {
+            "pid": os.getpid(),
+            "updated_at_utc": datetime.now(timezone.utc).isoformat(),
+            "statements": statement_rows(sqlite_statement_stats_snapshot(), sort=sort, limit=limit),
+        }
+    if explain:
+        # Fills in plans for statements that never crossed the slow threshold.
+        plans: dict[str, list[str]] = {}
+        for process in processes.values():
+            for row in process["statements"]:
+                if row.get("plan") is not None:
+                    continue
+                if row["statement"] not in plans:
+                    plans[row["statement"]] = explain_sqlite_statement(settings.processed_log_file, row["statement"])
+                row["plan"] = plans[row["statement"]]
+                row.update(plan_findings(row["plan"]))
+    return {
+        "slow_query_threshold_ms": sqlite_slow_query_threshold_ms(),
+        "sort": sort if sort in STATEMENT_SORT_KEYS else "total_ms",
+        "processes": processes,
+    }
+
+
+def _format_report(report: dict[str, Any]) -> str:
+    lines = [f"slow query threshold: {report['slow_query_threshold_ms']:g} ms"]
+    if not report["processes"]:
+        lines.append("no statement stats recorded yet; the worker writes them at the end of each cycle")
+    for name, process in report["processes"].items():
+        lines.append("")
+        lines.append(f"[{name}] pid={process.get('pid')} updated={process.get('updated_at_utc')}")
+        lines.append(f"{'count':>8} {'total_ms':>10} {'mean_ms':>8} {'max_ms':>8} {'slow':>5}  statement")
+        for row in process["statements"]:
+            flags = []
+            if row["full_scan_tables"]:
+                flags.append("SCAN " + ",".join(row["full_scan_tables"]))
+            if row["temp_btree"]:
+                flags.append("TEMP B-TREE")
+            statement = row["statement"] if len(row["statement"]) <= 120 else row["statement"][:117] + "..."
+            suffix = f"  [{'; '.join(flags)}]" if flags else ""
+            lines.append(
+                f"{row['count']:>8} {row['total_ms']:>10.1f} {row['mean_ms']:>8.2f} {row['max_ms']:>8.1f} "
+                f"{row['slow_count']:>5}  {statement}{suffix}"
+            )
+            if row.get("plan"):
+                lines.extend(f"{'':>44}{line}" for line in row["plan"])
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m chronicle.query_stats",
+        description="Show per-statement runtime SQLite stats recorded by the worker.",
+    )
+    parser.add_argument("--sort", choices=STATEMENT_SORT_KEYS, default="total_ms")
+    parser.add_argument("--limit", type=int, default=25)
+    parser.add_argument("--explain", action="store_true", help="Run EXPLAIN QUERY PLAN for every listed statement.")
+    parser.add_argument("--json", action="store_true", help="Print the raw report as JSON.")
+    args = parser.parse_args(argv)
+    report = statement_report(Settings.from_env(), sort=args.sort, limit=args.limit, explain=args.explain)
+    if args.json:
+        print(json.dumps(report, indent=2, sort_keys=True))
+    else:
+        print(_format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -7,6 +7,7 @@ from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 import requests
 
+from .. import provider_http
 from ..numeric_utils import as_float
 
 
@@ -61,7 +62,7 @@ def get_crono_summary_for_activity(
     headers = _headers(api_key)
 
     try:
-        macros_response = requests.get(
+        macros_response = provider_http.get(
             f"{base}/api/v1/summary/today-macros",
             params={"date": date_str},
             headers=headers,
@@ -70,7 +71,7 @@ def get_crono_summary_for_activity(
         macros_response.raise_for_status()
         macros_payload = macros_response.json()
 
-        balance_response = requests.get(
+        balance_response = provider_http.get(
             f"{base}/api/v1/summary/weekly-average-deficit",
             params={"days": days},
             headers=headers,
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from datetime import date, datetime, timedelta, timezone
-from typing import Any
+from typing import Any, Callable
 
 from ..numeric_utils import (
     as_float as _shared_as_float,
@@ -17,6 +20,19 @@ from ..numeric_utils import (
 
 logger = logging.getLogger(__name__)
 
+GARMIN_METRIC_ENDPOINT_TIMEOUT_SECONDS = 20.0
+GARMIN_METRIC_FETCH_MAX_WORKERS = 7
+
+# Endpoints whose payload is fully determined by the date argument, so callers
+# can serve them from a (metric, date) cache.
+GARMIN_DAILY_CACHEABLE_ENDPOINTS = frozenset(
+    {"training_status", "rhr_day", "training_readiness", "endurance_score", "hill_score", "fitness_age"}
+)
+
+EndpointReporter = Callable[[str, dict[str, Any]], None]
+DailyCacheLookup = Callable[[list[tuple[str, str]]], dict[tuple[str, str], Any]]
+DailyCacheStore = Callable[[dict[tuple[str, str], Any]], None]
+
 VESCDASH_APP_IDS = {
     "0432631a-d5e3-4272-a072-fa8c7e24c483",
 }
@@ -1076,42 +1092,107 @@ def _reference_start_utc(reference_date: Any) -> datetime | None:
     return parsed.astimezone(timezone.utc)
 
 
-def fetch_training_status_and_scores(
-    client: Any,
-    *,
-    reference_activity: dict[str, Any] | None = None,
-    reference_date: datetime | str | None = None,
-) -> dict[str, Any]:
-    metrics = _default_metrics()
-    try:
-        last_activity = client.get_last_activity() or {}
-    except Exception as exc:
-        logger.error("Failed to fetch Garmin last activity: %s", exc)
-        return metrics
+def _endpoint_timeout(endpoint: str, endpoint_timeout_seconds: float | dict[str, float] | None) -> float:
+    if isinstance(endpoint_timeout_seconds, dict):
+        value = endpoint_timeout_seconds.get(endpoint, GARMIN_METRIC_ENDPOINT_TIMEOUT_SECONDS)
+    elif endpoint_timeout_seconds is None:
+        value = GARMIN_METRIC_ENDPOINT_TIMEOUT_SECONDS
+    else:
+        value = endpoint_timeout_seconds
+    return max(0.0, float(value))
 
-    if not isinstance(last_activity, dict):
-        last_activity = {}
-    activity_source = reference_activity if isinstance(reference_activity, dict) and reference_activity else last_activity
 
-    start_time_dt = _parse_garmin_start_utc(activity_source)
-    if start_time_dt is None:
-        start_time_dt = _reference_start_utc(reference_date)
-    if start_time_dt is None:
-        start_time_dt = _parse_garmin_start_utc(last_activity)
-    if start_time_dt is None:
-        return metrics
-
-    duration_seconds = int(activity_source.get("duration", 0) or 0)
-    end_time_dt = start_time_dt + timedelta(seconds=duration_seconds)
-    start_date = start_time_dt.strftime("%Y-%m-%d")
-    end_date = end_time_dt.strftime("%Y-%m-%d")
+def _fetch_garmin_endpoints(
+    calls: dict[str, tuple[Callable[..., Any], tuple[Any, ...]]],
+    *,
+    endpoint_timeout_seconds: float | dict[str, float] | None = None,
+    max_workers: int = GARMIN_METRIC_FETCH_MAX_WORKERS,
+    on_endpoint_result: EndpointReporter | None = None,
+    while_waiting: Callable[[], None] | None = None,
+) -> dict[str, Any]:
+    """Run independent Garmin endpoint calls concurrently.
+
+    Each endpoint gets its own deadline measured from submission. Endpoints that
+    fail or miss the deadline are left out of the result so callers keep their
+    defaults; a late call keeps running in its worker thread but is never waited on.
+    """
+    results: dict[str, Any] = {}
+    durations_ms: dict[str, int] = {}
+    if not calls:
+        if while_waiting is not None:
+            while_waiting()
+        return results
+
+    def _timed(endpoint: str, fn: Callable[..., Any], args: tuple[Any, ...]) -> Any:
+        started_call = time.monotonic()
+        try:
+            return fn(*args)
+        finally:
+            durations_ms[endpoint] = int((time.monotonic() - started_call) * 1000)
 
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, min(int(max_workers), len(calls))),
+        thread_name_prefix="garmin-metrics",
+    )
+    started = time.monotonic()
+    reports: list[tuple[str, dict[str, Any]]] = []
     try:
-        training_status = client.get_training_status(end_date) or {}
-    except Exception as exc:
-        logger.error("Failed to fetch Garmin training status: %s", exc)
+        futures = {
+            endpoint: executor.submit(_timed, endpoint, fn, args)
+            for endpoint, (fn, args) in calls.items()
+        }
+        if while_waiting is not None:
+            while_waiting()
+        for endpoint, future in futures.items():
+            timeout = _endpoint_timeout(endpoint, endpoint_timeout_seconds)
+            remaining = max(0.0, started + timeout - time.monotonic())
+            try:
+                results[endpoint] = future.result(timeout=remaining)
+                reports.append((endpoint, {"status": "success", "duration_ms": durations_ms.get(endpoint, 0)}))
+            except FuturesTimeoutError:
+                future.cancel()
+                logger.warning("Garmin %s timed out after %.1fs; continuing without it.", endpoint, timeout)
+                reports.append(
+                    (
+                        endpoint,
+                        {
+                            "status": "timeout",
+                            "duration_ms": int((time.monotonic() - started) * 1000),
+                            "error": f"timed out after {timeout:g}s",
+                        },
+                    )
+                )
+            except Exception as exc:
+                logger.debug("Garmin %s unavailable: %s", endpoint, exc)
+                reports.append(
+                    (
+                        endpoint,
+                        {
+                            "status": "error",
+                            "duration_ms": durations_ms.get(endpoint, int((time.monotonic() - started) * 1000)),
+                            "error": str(exc),
+                        },
+                    )
+                )
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    if on_endpoint_result is not None:
+        for endpoint, report in reports:
+            try:
+                on_endpoint_result(endpoint, report)
+            except Exception as exc:
+                logger.debug("Garmin endpoint reporter failed for %s: %s", endpoint, exc)
+    return results
+
+
+def _apply_training_status(
+    metrics: dict[str, Any],
+    training_status: Any,
+    activity_source: dict[str, Any],
+) -> None:
+    if not isinstance(training_status, dict):
         training_status = {}
-
     latest_status_data = _select_training_status_record(training_status, last_activity=activity_source)
     acute_load_dto = latest_status_data.get("acuteTrainingLoadDTO")
     if not isinstance(acute_load_dto, dict):
@@ -1150,6 +1231,8 @@ def fetch_training_status_and_scores(
     metrics["acwr_status"] = acwr_status.capitalize() if acwr_status != "N/A" else "N/A"
     metrics["acwr_status_emoji"] = {"OPTIMAL": "🟢", "HIGH": "🔴", "LOW": "🔴", "N/A": "⚪"}.get(acwr_status, "⚪")
 
+
+def _apply_activity_effects(metrics: dict[str, Any], activity_source: dict[str, Any]) -> None:
     average_hr = activity_source.get("averageHR")
     running_cadence = activity_source.get("averageRunningCadenceInStepsPerMinute")
     aerobic_te = activity_source.get("aerobicTrainingEffect")
@@ -1168,100 +1251,203 @@ def fetch_training_status_and_scores(
         if isinstance(activity_source.get("avgGradeAdjustedSpeed"), (int, float))
         else "N/A"
     )
-    metrics["garmin_last_activity"] = build_garmin_activity_context(client, activity_source)
-    metrics["garmin_segment_notables"] = _normalize_garmin_segment_notables(activity_source)
 
-    try:
-        resting_hr_data = client.get_rhr_day(start_date)
-        metrics["resting_hr"] = safe_get(
-            resting_hr_data, ["allMetrics", "metricsMap", "WELLNESS_RESTING_HEART_RATE", 0, "value"]
-        )
-    except Exception as exc:
-        logger.debug("Garmin resting HR unavailable: %s", exc)
 
-    try:
-        readiness = client.get_training_readiness(start_date)
-        readiness_entry = _select_training_readiness_entry(readiness)
-        readiness_level = safe_get(readiness_entry, ["level"], default="N/A")
-        metrics["training_readiness_score"] = safe_get(readiness_entry, ["score"], default="N/A")
-        metrics["sleep_score"] = safe_get(readiness_entry, ["sleepScore"], default="N/A")
-        metrics["readiness_level"] = readiness_level
-        readiness_feedback = readiness_entry.get("feedbackShort") or readiness_entry.get("feedbackLong")
-        metrics["readiness_feedback"] = (
-            str(readiness_feedback)
-            if isinstance(readiness_feedback, str) and readiness_feedback.strip()
-            else "N/A"
-        )
-        recovery_seconds = readiness_entry.get("recoveryTime")
-        recovery_float = _as_float(recovery_seconds)
-        metrics["recovery_time_hours"] = (
-            round(recovery_float / 3600.0, 1)
-            if recovery_float is not None and recovery_float >= 0
-            else "N/A"
-        )
-        readiness_factors = {
-            "sleep_score_factor_pct": readiness_entry.get("sleepScoreFactorPercent", "N/A"),
-            "sleep_history_factor_pct": readiness_entry.get("sleepHistoryFactorPercent", "N/A"),
-            "hrv_factor_pct": readiness_entry.get("hrvFactorPercent", "N/A"),
-            "stress_history_factor_pct": readiness_entry.get("stressHistoryFactorPercent", "N/A"),
-            "acwr_factor_pct": readiness_entry.get("acwrFactorPercent", "N/A"),
-            "recovery_time_factor_pct": readiness_entry.get("recoveryTimeFactorPercent", "N/A"),
+def _apply_resting_hr(metrics: dict[str, Any], resting_hr_data: Any) -> None:
+    metrics["resting_hr"] = safe_get(
+        resting_hr_data, ["allMetrics", "metricsMap", "WELLNESS_RESTING_HEART_RATE", 0, "value"]
+    )
+
+
+def _apply_training_readiness(metrics: dict[str, Any], readiness: Any) -> None:
+    readiness_entry = _select_training_readiness_entry(readiness)
+    readiness_level = safe_get(readiness_entry, ["level"], default="N/A")
+    metrics["training_readiness_score"] = safe_get(readiness_entry, ["score"], default="N/A")
+    metrics["sleep_score"] = safe_get(readiness_entry, ["sleepScore"], default="N/A")
+    metrics["readiness_level"] = readiness_level
+    readiness_feedback = readiness_entry.get("feedbackShort") or readiness_entry.get("feedbackLong")
+    metrics["readiness_feedback"] = (
+        str(readiness_feedback)
+        if isinstance(readiness_feedback, str) and readiness_feedback.strip()
+        else "N/A"
+    )
+    recovery_seconds = readiness_entry.get("recoveryTime")
+    recovery_float = _as_float(recovery_seconds)
+    metrics["recovery_time_hours"] = (
+        round(recovery_float / 3600.0, 1)
+        if recovery_float is not None and recovery_float >= 0
+        else "N/A"
+    )
+    readiness_factors = {
+        "sleep_score_factor_pct": readiness_entry.get("sleepScoreFactorPercent", "N/A"),
+        "sleep_history_factor_pct": readiness_entry.get("sleepHistoryFactorPercent", "N/A"),
+        "hrv_factor_pct": readiness_entry.get("hrvFactorPercent", "N/A"),
+        "stress_history_factor_pct": readiness_entry.get("stressHistoryFactorPercent", "N/A"),
+        "acwr_factor_pct": readiness_entry.get("acwrFactorPercent", "N/A"),
+        "recovery_time_factor_pct": readiness_entry.get("recoveryTimeFactorPercent", "N/A"),
+    }
+    metrics["readiness_factors"] = readiness_factors
+    metrics["training_readiness_emoji"] = {
+        "POOR": "💀",
+        "LOW": "😵‍💫",
+        "MODERATE": "😒",
+        "HIGH": "😄",
+        "PRIME": "🤩",
+    }.get(str(readiness_level).upper(), "⚪")
+
+
+def _apply_endurance_score(metrics: dict[str, Any], endurance_score: Any) -> None:
+    metrics["endurance_overall_score"] = (
+        endurance_score.get("overallScore", "N/A") if isinstance(endurance_score, dict) else "N/A"
+    )
+
+
+def _apply_hill_score(metrics: dict[str, Any], hill_score: Any) -> None:
+    metrics["hill_overall_score"] = (
+        hill_score.get("overallScore", "N/A") if isinstance(hill_score, dict) else "N/A"
+    )
+
+
+def _apply_fitness_age(metrics: dict[str, Any], fitness_age_data: Any) -> None:
+    age_value = fitness_age_data.get("fitnessAge") if isinstance(fitness_age_data, dict) else None
+    metrics["fitness_age"] = f"{age_value} yr" if age_value is not None else "N/A"
+    if isinstance(fitness_age_data, dict):
+        components = fitness_age_data.get("components")
+        if not isinstance(components, dict):
+            components = {}
+        metrics["fitness_age_details"] = {
+            "fitness_age": age_value if age_value is not None else "N/A",
+            "chronological_age": fitness_age_data.get("chronologicalAge", "N/A"),
+            "achievable_fitness_age": fitness_age_data.get("achievableFitnessAge", "N/A"),
+            "previous_fitness_age": fitness_age_data.get("previousFitnessAge", "N/A"),
+            "body_fat_pct": safe_get(components, ["bodyFat", "value"], default="N/A"),
+            "rhr": safe_get(components, ["rhr", "value"], default="N/A"),
+            "vigorous_days_avg": safe_get(components, ["vigorousDaysAvg", "value"], default="N/A"),
+            "vigorous_minutes_avg": safe_get(components, ["vigorousMinutesAvg", "value"], default="N/A"),
         }
-        metrics["readiness_factors"] = readiness_factors
-        metrics["training_readiness_emoji"] = {
-            "POOR": "💀",
-            "LOW": "😵‍💫",
-            "MODERATE": "😒",
-            "HIGH": "😄",
-            "PRIME": "🤩",
-        }.get(str(readiness_level).upper(), "⚪")
-    except Exception as exc:
-        logger.debug("Garmin training readiness unavailable: %s", exc)
 
-    try:
-        endurance_score = client.get_endurance_score(end_date)
-        metrics["endurance_overall_score"] = (
-            endurance_score.get("overallScore", "N/A") if isinstance(endurance_score, dict) else "N/A"
-        )
-    except Exception as exc:
-        logger.debug("Garmin endurance score unavailable: %s", exc)
 
-    try:
-        hill_score = client.get_hill_score(end_date)
-        metrics["hill_overall_score"] = (
-            hill_score.get("overallScore", "N/A") if isinstance(hill_score, dict) else "N/A"
+def _apply_earned_badges(metrics: dict[str, Any], earned_badges_payload: Any) -> None:
+    metrics["garmin_badges_raw"] = _normalize_garmin_badges_raw(earned_badges_payload)
+    metrics["garmin_badges"] = _normalize_garmin_badges(earned_badges_payload)
+
+
+_GARMIN_ENDPOINT_APPLIERS: dict[str, Callable[[dict[str, Any], Any], None]] = {
+    "rhr_day": _apply_resting_hr,
+    "training_readiness": _apply_training_readiness,
+    "endurance_score": _apply_endurance_score,
+    "hill_score": _apply_hill_score,
+    "fitness_age": _apply_fitness_age,
+    "earned_badges": _apply_earned_badges,
+}
+
+
+def fetch_training_status_and_scores(
+    client: Any,
+    *,
+    reference_activity: dict[str, Any] | None = None,
+    reference_date: datetime | str | None = None,
+    endpoint_timeout_seconds: float | dict[str, float] | None = None,
+    max_workers: int = GARMIN_METRIC_FETCH_MAX_WORKERS,
+    on_endpoint_result: EndpointReporter | None = None,
+    daily_cache_lookup: DailyCacheLookup | None = None,
+    daily_cache_store: DailyCacheStore | None = None,
+) -> dict[str, Any]:
+    metrics = _default_metrics()
+    has_reference = isinstance(reference_activity, dict) and bool(reference_activity)
+    last_activity: Any = {}
+    if not (has_reference and _parse_garmin_start_utc(reference_activity) is not None):
+        # The last activity only matters when it is the activity being described
+        # or the source of the reference date.
+        fetched = _fetch_garmin_endpoints(
+            {"last_activity": (client.get_last_activity, ())},
+            endpoint_timeout_seconds=endpoint_timeout_seconds,
+            max_workers=1,
+            on_endpoint_result=on_endpoint_result,
         )
-    except Exception as exc:
-        logger.debug("Garmin hill score unavailable: %s", exc)
+        if "last_activity" not in fetched:
+            logger.error("Failed to fetch Garmin last activity; using N/A values.")
+            return metrics
+        last_activity = fetched["last_activity"] or {}
 
-    try:
-        fitness_age_data = client.get_fitnessage_data(date.today().isoformat())
-        age_value = fitness_age_data.get("fitnessAge") if isinstance(fitness_age_data, dict) else None
-        metrics["fitness_age"] = f"{age_value} yr" if age_value is not None else "N/A"
-        if isinstance(fitness_age_data, dict):
-            components = fitness_age_data.get("components")
-            if not isinstance(components, dict):
-                components = {}
-            metrics["fitness_age_details"] = {
-                "fitness_age": age_value if age_value is not None else "N/A",
-                "chronological_age": fitness_age_data.get("chronologicalAge", "N/A"),
-                "achievable_fitness_age": fitness_age_data.get("achievableFitnessAge", "N/A"),
-                "previous_fitness_age": fitness_age_data.get("previousFitnessAge", "N/A"),
-                "body_fat_pct": safe_get(components, ["bodyFat", "value"], default="N/A"),
-                "rhr": safe_get(components, ["rhr", "value"], default="N/A"),
-                "vigorous_days_avg": safe_get(components, ["vigorousDaysAvg", "value"], default="N/A"),
-                "vigorous_minutes_avg": safe_get(components, ["vigorousMinutesAvg", "value"], default="N/A"),
-            }
-    except Exception as exc:
-        logger.debug("Garmin fitness age unavailable: %s", exc)
+    if not isinstance(last_activity, dict):
+        last_activity = {}
+    activity_source = reference_activity if has_reference else last_activity
 
-    try:
-        get_earned_badges = getattr(client, "get_earned_badges", None)
-        if callable(get_earned_badges):
-            earned_badges_payload = get_earned_badges()
-            metrics["garmin_badges_raw"] = _normalize_garmin_badges_raw(earned_badges_payload)
-            metrics["garmin_badges"] = _normalize_garmin_badges(earned_badges_payload)
-    except Exception as exc:
-        logger.debug("Garmin badges unavailable: %s", exc)
+    start_time_dt = _parse_garmin_start_utc(activity_source)
+    if start_time_dt is None:
+        start_time_dt = _reference_start_utc(reference_date)
+    if start_time_dt is None:
+        start_time_dt = _parse_garmin_start_utc(last_activity)
+    if start_time_dt is None:
+        return metrics
+
+    duration_seconds = int(activity_source.get("duration", 0) or 0)
+    end_time_dt = start_time_dt + timedelta(seconds=duration_seconds)
+    start_date = start_time_dt.strftime("%Y-%m-%d")
+    end_date = end_time_dt.strftime("%Y-%m-%d")
+
+    calls: dict[str, tuple[Callable[..., Any], tuple[Any, ...]]] = {
+        "training_status": (client.get_training_status, (end_date,)),
+        "rhr_day": (client.get_rhr_day, (start_date,)),
+        "training_readiness": (client.get_training_readiness, (start_date,)),
+        "endurance_score": (client.get_endurance_score, (end_date,)),
+        "hill_score": (client.get_hill_score, (end_date,)),
+        "fitness_age": (client.get_fitnessage_data, (date.today().isoformat(),)),
+    }
+    get_earned_badges = getattr(client, "get_earned_badges", None)
+    if callable(get_earned_badges):
+        calls["earned_badges"] = (get_earned_badges, ())
+
+    def _build_activity_metrics() -> None:
+        _apply_activity_effects(metrics, activity_source)
+        metrics["garmin_last_activity"] = build_garmin_activity_context(client, activity_source)
+        metrics["garmin_segment_notables"] = _normalize_garmin_segment_notables(activity_source)
+
+    cache_keys = {
+        endpoint: (endpoint, str(args[0]))
+        for endpoint, (_fn, args) in calls.items()
+        if endpoint in GARMIN_DAILY_CACHEABLE_ENDPOINTS and args
+    }
+    cached: dict[str, Any] = {}
+    if daily_cache_lookup is not None and cache_keys:
+        try:
+            hits = daily_cache_lookup(list(cache_keys.values()))
+        except Exception as exc:
+            logger.debug("Garmin daily metric cache lookup failed: %s", exc)
+            hits = {}
+        for endpoint, cache_key in cache_keys.items():
+            if cache_key in hits:
+                cached[endpoint] = hits[cache_key]
+                calls.pop(endpoint, None)
+                if on_endpoint_result is not None:
+                    on_endpoint_result(endpoint, {"status": "cache_hit"})
+
+    # The activity context (exercise sets lookup) runs on this thread while the
+    # daily endpoints are in flight.
+    fetched = _fetch_garmin_endpoints(
+        calls,
+        endpoint_timeout_seconds=endpoint_timeout_seconds,
+        max_workers=max_workers,
+        on_endpoint_result=on_endpoint_result,
+        while_waiting=_build_activity_metrics,
+    )
+    if daily_cache_store is not None:
+        fresh = {cache_keys[endpoint]: fetched[endpoint] for endpoint in cache_keys if endpoint in fetched}
+        if fresh:
+            try:
+                daily_cache_store(fresh)
+            except Exception as exc:
+                logger.debug("Garmin daily metric cache store failed: %s", exc)
+    fetched.update(cached)
+
+    _apply_training_status(metrics, fetched.get("training_status") or {}, activity_source)
+    for endpoint, apply in _GARMIN_ENDPOINT_APPLIERS.items():
+        if endpoint not in fetched:
+            continue
+        try:
+            apply(metrics, fetched[endpoint])
+        except Exception as exc:
+            logger.debug("Garmin %s payload unusable: %s", endpoint, exc)
 
     return metrics
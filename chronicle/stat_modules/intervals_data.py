@@ -7,6 +7,7 @@ from typing import Any
 
 import requests
 
+from .. import provider_http
 from ..numeric_utils import (
     as_float as _shared_as_float,
     meters_to_feet_int as _shared_meters_to_feet_int,
@@ -327,7 +328,7 @@ def get_intervals_dashboard_metrics(
     )
 
     try:
-        response = requests.get(list_url, auth=auth, timeout=TIMEOUT_SECONDS)
+        response = provider_http.get(list_url, auth=auth, timeout=TIMEOUT_SECONDS)
         response.raise_for_status()
         activities = _normalize_activities_payload(response.json())
     except requests.RequestException as exc:
@@ -438,7 +439,7 @@ def get_intervals_activity_data(
         f"?oldest={start_date_str}&newest={end_date_str}"
     )
     try:
-        list_response = requests.get(list_url, auth=auth, timeout=TIMEOUT_SECONDS)
+        list_response = provider_http.get(list_url, auth=auth, timeout=TIMEOUT_SECONDS)
         list_response.raise_for_status()
         activities = _normalize_activities_payload(list_response.json())
         if not activities:
@@ -453,7 +454,7 @@ def get_intervals_activity_data(
         if activity_id is None:
             return None
 
-        detail_response = requests.get(
+        detail_response = provider_http.get(
             f"https://intervals.icu/api/v1/activity/{activity_id}",
             auth=auth,
             params={"intervals": "false"},
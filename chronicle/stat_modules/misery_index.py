@@ -2,15 +2,57 @@ from __future__ import annotations
 
 import logging
 import math
-from datetime import datetime, timezone
-from typing import Any
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Sequence
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 import requests
 
+from .. import provider_http
+
 
 logger = logging.getLogger(__name__)
 TIMEOUT_SECONDS = 30
+WEATHER_CELL_DEGREES = 0.1
+WEATHER_HISTORY_BATCH_MAX_DAYS = 30
+WEATHER_HOUR_FIELDS = (
+    "time_epoch",
+    "time",
+    "temp_f",
+    "dewpoint_f",
+    "humidity",
+    "wind_mph",
+    "cloud",
+    "precip_in",
+    "is_day",
+    "chance_of_rain",
+    "chance_of_snow",
+    "will_it_rain",
+    "will_it_snow",
+    "heatindex_f",
+    "windchill_f",
+)
+MISERY_BATCH_COLUMNS = (
+    "temp_f",
+    "dewpoint_f",
+    "humidity",
+    "wind_mph",
+    "cloud",
+    "precip_in",
+    "is_day",
+    "chance_of_rain",
+    "chance_of_snow",
+    "will_it_rain",
+    "will_it_snow",
+    "condition_text",
+    "heatindex_f",
+    "windchill_f",
+)
+
+WeatherDayLookup = Callable[[list[tuple[str, str]]], dict[tuple[str, str], dict[str, Any]]]
+WeatherDayStore = Callable[[dict[tuple[str, str], dict[str, Any]]], None]
+AqiLookup = Callable[[str], dict[str, Any] | None]
+AqiStore = Callable[[str, int | None], None]
 
 IDEAL_WIND_LOW_MPH = 1.5
 IDEAL_WIND_HIGH_MPH = 5.0
@@ -133,40 +175,89 @@ def _to_utc_datetime(value: Any, fallback_tz: timezone | ZoneInfo) -> datetime |
     return None
 
 
-def _get_weather_data(
-    api_key: str,
-    lat: float,
-    lon: float,
-    activity_time: datetime,
-) -> dict[str, Any] | None:
-    activity_date = activity_time.astimezone(timezone.utc).date()
-    today_date = datetime.now(timezone.utc).date()
-    endpoint = "history.json" if activity_date < today_date else "forecast.json"
-    date_str = activity_date.strftime("%Y-%m-%d")
+def weather_cell(lat: float, lon: float) -> str:
+    step = WEATHER_CELL_DEGREES
+    return f"{round(float(lat) / step) * step + 0.0:.2f},{round(float(lon) / step) * step + 0.0:.2f}"
 
-    response = requests.get(
+
+def activity_local_date(activity: dict[str, Any], activity_time: datetime) -> date:
+    # Strava's start_date_local is local wall time; WeatherAPI days are local to the location too.
+    start_date_local = activity.get("start_date_local")
+    if isinstance(start_date_local, str):
+        try:
+            return date.fromisoformat(start_date_local[:10])
+        except ValueError:
+            pass
+    return activity_time.astimezone(timezone.utc).date()
+
+
+def activity_weather_target(activity: dict[str, Any]) -> tuple[float, float, date] | None:
+    start_latlng = activity.get("start_latlng")
+    if not isinstance(start_latlng, list) or len(start_latlng) != 2:
+        return None
+    activity_time = _parse_activity_time(activity)
+    if activity_time is None:
+        return None
+    try:
+        lat, lon = float(start_latlng[0]), float(start_latlng[1])
+    except (TypeError, ValueError):
+        return None
+    return lat, lon, activity_local_date(activity, activity_time)
+
+
+def _trim_weather_hour(hour: dict[str, Any]) -> dict[str, Any]:
+    trimmed = {field: hour.get(field) for field in WEATHER_HOUR_FIELDS}
+    condition = hour.get("condition") or {}
+    trimmed["condition_text"] = condition.get("text") if isinstance(condition, dict) else None
+    return trimmed
+
+
+def _weather_days_from_payload(payload: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    location = payload.get("location") or {}
+    tz_name = location.get("tz_id") if isinstance(location.get("tz_id"), str) else None
+    days: dict[str, dict[str, Any]] = {}
+    for forecast_day in payload.get("forecast", {}).get("forecastday", []) or []:
+        if not isinstance(forecast_day, dict):
+            continue
+        day_key = str(forecast_day.get("date") or "")[:10]
+        hours = [_trim_weather_hour(hour) for hour in forecast_day.get("hour", []) or [] if isinstance(hour, dict)]
+        if day_key and hours:
+            days[day_key] = {"tz_id": tz_name, "hours": hours}
+    return days
+
+
+def fetch_weather_days(
+    api_key: str,
+    cell: str,
+    start_date: date,
+    end_date: date | None = None,
+    *,
+    today: date | None = None,
+) -> dict[str, dict[str, Any]]:
+    today_date = today or datetime.now(timezone.utc).date()
+    endpoint = "history.json" if (end_date or start_date) < today_date else "forecast.json"
+    params = {"key": api_key, "q": cell, "dt": start_date.strftime("%Y-%m-%d")}
+    if end_date is not None and end_date > start_date:
+        params["end_dt"] = end_date.strftime("%Y-%m-%d")
+    response = provider_http.get(
         f"http://api.weatherapi.com/v1/{endpoint}",
-        params={"key": api_key, "q": f"{lat},{lon}", "dt": date_str},
+        params=params,
         timeout=TIMEOUT_SECONDS,
     )
     response.raise_for_status()
-    payload = response.json()
+    return _weather_days_from_payload(response.json())
 
-    location = payload.get("location") or {}
-    tz_name = location.get("tz_id")
+
+def _weather_at_time(day: dict[str, Any], activity_time: datetime) -> dict[str, Any] | None:
+    hourly = [hour for hour in day.get("hours") or [] if isinstance(hour, dict)]
+    if not hourly:
+        return None
+    tz_name = day.get("tz_id")
     try:
         local_tz: timezone | ZoneInfo = ZoneInfo(tz_name) if isinstance(tz_name, str) else timezone.utc
     except ZoneInfoNotFoundError:
         local_tz = timezone.utc
 
-    forecast_days = payload.get("forecast", {}).get("forecastday", [])
-    if not forecast_days:
-        return None
-
-    hourly = forecast_days[0].get("hour", [])
-    if not hourly:
-        return None
-
     activity_time_utc = activity_time.astimezone(timezone.utc)
 
     def _hour_distance(hour: dict[str, Any]) -> float:
@@ -178,8 +269,6 @@ def _get_weather_data(
         return abs((hour_dt - activity_time_utc).total_seconds())
 
     closest = min(hourly, key=_hour_distance)
-    condition = closest.get("condition") or {}
-
     return {
         "temp_f": closest.get("temp_f"),
         "dewpoint_f": closest.get("dewpoint_f"),
@@ -192,28 +281,142 @@ def _get_weather_data(
         "chance_of_snow": closest.get("chance_of_snow"),
         "will_it_rain": closest.get("will_it_rain"),
         "will_it_snow": closest.get("will_it_snow"),
-        "condition_text": condition.get("text"),
+        "condition_text": closest.get("condition_text"),
         "heatindex_f": closest.get("heatindex_f"),
         "windchill_f": closest.get("windchill_f"),
         "tz_id": tz_name,
     }
 
 
-def _get_air_quality_index(api_key: str, lat: float, lon: float) -> int | None:
-    response = requests.get(
+def _lookup_weather_days(
+    day_lookup: WeatherDayLookup | None,
+    keys: list[tuple[str, str]],
+) -> dict[tuple[str, str], dict[str, Any]]:
+    if day_lookup is None or not keys:
+        return {}
+    try:
+        hits = day_lookup(keys)
+    except Exception as exc:
+        logger.warning("Weather store lookup failed: %s", exc)
+        return {}
+    return hits if isinstance(hits, dict) else {}
+
+
+def _store_weather_days(day_store: WeatherDayStore | None, days: dict[tuple[str, str], dict[str, Any]]) -> None:
+    if day_store is None or not days:
+        return
+    try:
+        day_store(days)
+    except Exception as exc:
+        logger.warning("Weather store write failed: %s", exc)
+
+
+def _get_weather_data(
+    api_key: str,
+    lat: float,
+    lon: float,
+    activity_time: datetime,
+    *,
+    local_date: date | None = None,
+    day_lookup: WeatherDayLookup | None = None,
+    day_store: WeatherDayStore | None = None,
+) -> dict[str, Any] | None:
+    cell = weather_cell(lat, lon)
+    day_key = (local_date or activity_time.astimezone(timezone.utc).date()).isoformat()
+    day = _lookup_weather_days(day_lookup, [(cell, day_key)]).get((cell, day_key))
+    if day is None:
+        fetched = fetch_weather_days(api_key, cell, date.fromisoformat(day_key))
+        _store_weather_days(day_store, {(cell, fetched_date): value for fetched_date, value in fetched.items()})
+        day = fetched.get(day_key) or next(iter(fetched.values()), None)
+    if not day:
+        return None
+    return _weather_at_time(day, activity_time)
+
+
+def fetch_weather_history_batch(
+    api_key: str,
+    targets: list[tuple[float, float, date]],
+    *,
+    day_lookup: WeatherDayLookup | None = None,
+    day_store: WeatherDayStore | None = None,
+    today: date | None = None,
+) -> dict[tuple[str, str], dict[str, Any]]:
+    # Group by cell, skip stored days, and request each contiguous run with dt/end_dt.
+    # Plans that ignore end_dt only return the first day; the rest are fetched singly.
+    today_date = today or datetime.now(timezone.utc).date()
+    wanted: dict[str, set[date]] = {}
+    for lat, lon, local_date in targets:
+        if local_date >= today_date:
+            continue
+        wanted.setdefault(weather_cell(lat, lon), set()).add(local_date)
+    keys = [(cell, local_date.isoformat()) for cell, dates in wanted.items() for local_date in dates]
+    resolved = dict(_lookup_weather_days(day_lookup, keys))
+
+    for cell in sorted(wanted):
+        missing = sorted(local_date for local_date in wanted[cell] if (cell, local_date.isoformat()) not in resolved)
+        runs: list[list[date]] = []
+        for local_date in missing:
+            if (
+                runs
+                and local_date - runs[-1][-1] == timedelta(days=1)
+                and len(runs[-1]) < WEATHER_HISTORY_BATCH_MAX_DAYS
+            ):
+                runs[-1].append(local_date)
+            else:
+                runs.append([local_date])
+        for run in runs:
+            fetched: dict[tuple[str, str], dict[str, Any]] = {}
+            try:
+                for fetched_date, day in fetch_weather_days(api_key, cell, run[0], run[-1], today=today_date).items():
+                    fetched[(cell, fetched_date)] = day
+                for local_date in run[1:]:
+                    if (cell, local_date.isoformat()) in fetched:
+                        continue
+                    for fetched_date, day in fetch_weather_days(api_key, cell, local_date, today=today_date).items():
+                        fetched[(cell, fetched_date)] = day
+            except requests.RequestException as exc:
+                logger.error("Weather API history batch request failed for %s: %s", cell, exc)
+            _store_weather_days(day_store, fetched)
+            resolved.update(fetched)
+    return resolved
+
+
+def _get_air_quality_index(
+    api_key: str,
+    lat: float,
+    lon: float,
+    *,
+    aqi_lookup: AqiLookup | None = None,
+    aqi_store: AqiStore | None = None,
+) -> int | None:
+    cell = weather_cell(lat, lon)
+    if aqi_lookup is not None:
+        try:
+            cached = aqi_lookup(cell)
+        except Exception as exc:
+            logger.warning("AQI store lookup failed: %s", exc)
+            cached = None
+        if isinstance(cached, dict):
+            return cached.get("us_epa_index")
+
+    response = provider_http.get(
         "http://api.weatherapi.com/v1/current.json",
-        params={"key": api_key, "q": f"{lat},{lon}", "aqi": "yes"},
+        params={"key": api_key, "q": cell, "aqi": "yes"},
         timeout=TIMEOUT_SECONDS,
     )
     response.raise_for_status()
     payload = response.json()
     index_value = payload.get("current", {}).get("air_quality", {}).get("us-epa-index")
-    if index_value is None:
-        return None
     try:
-        return int(index_value)
+        us_epa_index = int(index_value) if index_value is not None else None
     except (TypeError, ValueError):
-        return None
+        us_epa_index = None
+    if aqi_store is not None:
+        try:
+            aqi_store(cell, us_epa_index)
+        except Exception as exc:
+            logger.warning("AQI store write failed: %s", exc)
+    return us_epa_index
 
 
 def _heat_index_f(temp_f: float, humidity: float) -> float:
@@ -736,9 +939,75 @@ def get_aqi_description(us_epa_index: int | None) -> str:
     return aqi_descriptions.get(us_epa_index, "Unknown")
 
 
+def _misery_summary(components: dict[str, Any]) -> dict[str, Any]:
+    misery = components["score"]
+    polarity = str(components.get("polarity") or "neutral")
+    return {
+        "score": misery,
+        "polarity": polarity,
+        "severity": str(components.get("severity") or get_misery_index_severity(misery)),
+        "emoji": str(components.get("emoji") or get_misery_index_emoji(misery, polarity=polarity)),
+        "description": str(components.get("description") or get_misery_index_description(misery, polarity=polarity)),
+    }
+
+
+def _components_for_weather(
+    weather_data: dict[str, Any],
+    temp_f: float,
+    dew_point_f: float,
+    humidity: float,
+    wind_speed_mph: float,
+) -> dict[str, Any]:
+    return calculate_misery_index_components(
+        temp_f=temp_f,
+        dew_point_f=dew_point_f,
+        humidity=humidity,
+        wind_speed_mph=wind_speed_mph,
+        cloud_cover_pct=_to_float(weather_data.get("cloud")),
+        precip_in=_to_float(weather_data.get("precip_in")),
+        is_day=_to_bool(weather_data.get("is_day")),
+        chance_of_rain=_to_float(weather_data.get("chance_of_rain")),
+        chance_of_snow=_to_float(weather_data.get("chance_of_snow")),
+        condition_text=(
+            str(weather_data.get("condition_text"))
+            if isinstance(weather_data.get("condition_text"), str)
+            else None
+        ),
+        heat_index_f=_to_float(weather_data.get("heatindex_f")),
+        wind_chill_f=_to_float(weather_data.get("windchill_f")),
+        will_it_rain=_to_bool(weather_data.get("will_it_rain")),
+        will_it_snow=_to_bool(weather_data.get("will_it_snow")),
+    )
+
+
+def calculate_misery_index_batch(columns: dict[str, Sequence[Any]]) -> list[dict[str, Any] | None]:
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError("Misery batch columns must all have the same length.")
+    names = list(columns)
+    results: list[dict[str, Any] | None] = []
+    for row_values in zip(*(columns[name] for name in names)):
+        row = dict(zip(names, row_values))
+        temp_f = _to_float(row.get("temp_f"))
+        dew_point_f = _to_float(row.get("dewpoint_f"))
+        humidity = _to_float(row.get("humidity"))
+        wind_speed_mph = _to_float(row.get("wind_mph"))
+        if temp_f is None or dew_point_f is None or humidity is None or wind_speed_mph is None:
+            results.append(None)
+            continue
+        components = _components_for_weather(row, temp_f, dew_point_f, humidity, wind_speed_mph)
+        results.append({**_misery_summary(components), "components": components})
+    return results
+
+
 def get_misery_index_details_for_activity(
     activity: dict[str, Any],
     weather_api_key: str | None,
+    *,
+    day_lookup: WeatherDayLookup | None = None,
+    day_store: WeatherDayStore | None = None,
+    aqi_lookup: AqiLookup | None = None,
+    aqi_store: AqiStore | None = None,
 ) -> dict[str, Any] | None:
     if not weather_api_key:
         return None
@@ -757,12 +1026,26 @@ def get_misery_index_details_for_activity(
     weather_error: requests.RequestException | None = None
     aqi_error: requests.RequestException | None = None
     try:
-        weather_data = _get_weather_data(weather_api_key, float(lat), float(lon), activity_time)
+        weather_data = _get_weather_data(
+            weather_api_key,
+            float(lat),
+            float(lon),
+            activity_time,
+            local_date=activity_local_date(activity, activity_time),
+            day_lookup=day_lookup,
+            day_store=day_store,
+        )
     except requests.RequestException as exc:
         weather_error = exc
         logger.error("Weather API weather request failed: %s", exc)
     try:
-        aqi = _get_air_quality_index(weather_api_key, float(lat), float(lon))
+        aqi = _get_air_quality_index(
+            weather_api_key,
+            float(lat),
+            float(lon),
+            aqi_lookup=aqi_lookup,
+            aqi_store=aqi_store,
+        )
     except requests.RequestException as exc:
         aqi_error = exc
         logger.error("Weather API AQI request failed: %s", exc)
@@ -807,32 +1090,13 @@ def get_misery_index_details_for_activity(
             },
         }
 
-    components = calculate_misery_index_components(
-        temp_f=temp_f,
-        dew_point_f=dew_point_f,
-        humidity=humidity,
-        wind_speed_mph=wind_speed_mph,
-        cloud_cover_pct=_to_float(weather_data.get("cloud")),
-        precip_in=_to_float(weather_data.get("precip_in")),
-        is_day=_to_bool(weather_data.get("is_day")),
-        chance_of_rain=_to_float(weather_data.get("chance_of_rain")),
-        chance_of_snow=_to_float(weather_data.get("chance_of_snow")),
-        condition_text=(
-            str(weather_data.get("condition_text"))
-            if isinstance(weather_data.get("condition_text"), str)
-            else None
-        ),
-        heat_index_f=_to_float(weather_data.get("heatindex_f")),
-        wind_chill_f=_to_float(weather_data.get("windchill_f")),
-        will_it_rain=_to_bool(weather_data.get("will_it_rain")),
-        will_it_snow=_to_bool(weather_data.get("will_it_snow")),
-    )
-
-    misery = components["score"]
-    polarity = str(components.get("polarity") or "neutral")
-    severity = str(components.get("severity") or get_misery_index_severity(misery))
-    emoji = str(components.get("emoji") or get_misery_index_emoji(misery, polarity=polarity))
-    description = str(components.get("description") or get_misery_index_description(misery, polarity=polarity))
+    components = _components_for_weather(weather_data, temp_f, dew_point_f, humidity, wind_speed_mph)
+    summary = _misery_summary(components)
+    misery = summary["score"]
+    polarity = summary["polarity"]
+    severity = summary["severity"]
+    emoji = summary["emoji"]
+    description = summary["description"]
     misery_payload = {
         "index": {
             "value": misery,
@@ -877,8 +1141,9 @@ def get_misery_index_details_for_activity(
 def get_misery_index_for_activity(
     activity: dict[str, Any],
     weather_api_key: str | None,
+    **store_callbacks: Any,
 ) -> tuple[float | None, str | None, int | None, str | None]:
-    details = get_misery_index_details_for_activity(activity, weather_api_key)
+    details = get_misery_index_details_for_activity(activity, weather_api_key, **store_callbacks)
     if details is None:
         return None, None, None, None
 
@@ -1,16 +1,12 @@
 from __future__ import annotations
 
-import logging
-from datetime import date, datetime, timedelta, timezone
+from datetime import date, datetime, time, timedelta, timezone
 from typing import Any
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from ..strava_client import get_gap_speed_mps, mps_to_pace
 
 
-logger = logging.getLogger(__name__)
-
-
 def _parse_datetime(activity: dict[str, Any]) -> datetime | None:
     raw = activity.get("start_date")
     if not isinstance(raw, str):
@@ -149,87 +145,74 @@ def _garmin_gap_speed(activity: dict[str, Any]) -> float | None:
     return None
 
 
-def get_garmin_period_fallback(
-    client: Any | None,
-    now_utc: datetime | None = None,
-    timezone_name: str = "UTC",
-) -> dict[str, dict[str, Any]] | None:
-    if client is None:
-        return None
-
-    now = now_utc or datetime.now(timezone.utc)
+def _resolve_local_tz(timezone_name: str) -> ZoneInfo:
     try:
-        local_tz = ZoneInfo(timezone_name)
+        return ZoneInfo(timezone_name)
     except ZoneInfoNotFoundError:
-        local_tz = ZoneInfo("UTC")
+        return ZoneInfo("UTC")
 
-    local_today = now.astimezone(local_tz).date()
-    week_start_date = local_today - timedelta(days=6)
-    month_start_date = local_today - timedelta(days=29)
-    year_start_date = date(local_today.year, 1, 1)
 
-    try:
-        activities = client.get_activities_by_date(
-            year_start_date.isoformat(),
-            local_today.isoformat(),
-        )
-    except Exception as exc:  # pragma: no cover - depends on live Garmin API
-        logger.error("Garmin period activity fetch failed: %s", exc)
-        return None
-
-    if not isinstance(activities, list):
-        return None
-
-    buckets: dict[str, dict[str, float | int]] = {
-        "week": {"calories": 0.0, "gap_speed_sum": 0.0, "gap_count": 0},
-        "month": {"calories": 0.0, "gap_speed_sum": 0.0, "gap_count": 0},
-        "year": {"calories": 0.0, "gap_speed_sum": 0.0, "gap_count": 0},
+def garmin_period_windows(
+    now_utc: datetime | None = None,
+    timezone_name: str = "UTC",
+) -> dict[str, tuple[date, datetime]]:
+    now = now_utc or datetime.now(timezone.utc)
+    local_tz = _resolve_local_tz(timezone_name)
+    local_today = now.astimezone(local_tz).date()
+    starts = {
+        "week": local_today - timedelta(days=6),
+        "month": local_today - timedelta(days=29),
+        "year": date(local_today.year, 1, 1),
+    }
+    return {
+        period: (start_date, datetime.combine(start_date, time.min, tzinfo=local_tz).astimezone(timezone.utc))
+        for period, start_date in starts.items()
     }
 
-    for activity in activities:
-        if not isinstance(activity, dict) or not _is_garmin_run(activity):
-            continue
 
-        activity_start = _parse_garmin_start_utc(activity)
-        if activity_start is None:
-            continue
+def period_windows_end_utc(
+    now_utc: datetime | None = None,
+    timezone_name: str = "UTC",
+) -> datetime:
+    now = now_utc or datetime.now(timezone.utc)
+    local_tz = _resolve_local_tz(timezone_name)
+    local_tomorrow = now.astimezone(local_tz).date() + timedelta(days=1)
+    return datetime.combine(local_tomorrow, time.min, tzinfo=local_tz).astimezone(timezone.utc)
 
-        local_date = activity_start.astimezone(local_tz).date()
-        targets: list[str] = []
-        if local_date >= week_start_date:
-            targets.append("week")
-        if local_date >= month_start_date:
-            targets.append("month")
-        if local_date >= year_start_date:
-            targets.append("year")
-        if not targets:
-            continue
 
-        calories = activity.get("calories")
-        gap_speed = _garmin_gap_speed(activity)
+def normalize_garmin_period_activity(activity: Any) -> dict[str, Any] | None:
+    if not isinstance(activity, dict) or not _is_garmin_run(activity):
+        return None
+    activity_start = _parse_garmin_start_utc(activity)
+    if activity_start is None:
+        return None
+    raw_id = activity.get("activityId")
+    activity_id = str(raw_id).strip() if raw_id is not None else ""
+    calories = activity.get("calories")
+    return {
+        "activity_id": activity_id or f"start:{activity_start.isoformat()}",
+        "start_utc": activity_start.isoformat(),
+        "calories": float(calories) if isinstance(calories, (int, float)) and calories > 0 else None,
+        "gap_speed_mps": _garmin_gap_speed(activity),
+    }
 
-        for target in targets:
-            if isinstance(calories, (int, float)) and calories > 0:
-                buckets[target]["calories"] += float(calories)
-            if isinstance(gap_speed, (int, float)) and gap_speed > 0:
-                buckets[target]["gap_speed_sum"] += float(gap_speed)
-                buckets[target]["gap_count"] += 1
 
+def format_garmin_period_fallback(buckets: dict[str, dict[str, Any]]) -> dict[str, dict[str, Any]]:
     fallback: dict[str, dict[str, Any]] = {}
-    for period, data in buckets.items():
-        gap_count = int(data["gap_count"])
+    for period in ("week", "month", "year"):
+        data = buckets.get(period) or {}
+        gap_count = int(data.get("gap_count") or 0)
         gap = "N/A"
         if gap_count > 0:
-            gap = mps_to_pace(float(data["gap_speed_sum"]) / gap_count)
+            gap = mps_to_pace(float(data.get("gap_speed_sum") or 0.0) / gap_count)
 
-        calories_total = float(data["calories"])
+        calories_total = float(data.get("calories") or 0.0)
         fallback[period] = {
             "gap": gap,
             "beers_earned": round(calories_total / 150.0, 1),
             "calories": calories_total,
             "gap_count": gap_count,
         }
-
     return fallback
 
 
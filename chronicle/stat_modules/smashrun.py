@@ -1,16 +1,18 @@
 from __future__ import annotations
 
 import logging
-from datetime import date, datetime, timedelta, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Any
-from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 import requests
 
+from .. import provider_http
+
 
 logger = logging.getLogger(__name__)
 BASE_URL = "https://api.smashrun.com/v1"
 TIMEOUT_SECONDS = 30
+MATCH_WINDOW_SECONDS = 12 * 3600
 
 
 def _headers(access_token: str) -> dict[str, str]:
@@ -66,14 +68,26 @@ def _extract_elevation_feet(activity: dict[str, Any]) -> float | None:
     return None
 
 
-def _get_activities_basic(access_token: str, max_items: int = 600) -> list[dict[str, Any]]:
+def _reached_known_activity(item: dict[str, Any], stop_at_activity_id: int | None) -> bool:
+    if stop_at_activity_id is None:
+        return False
+    activity_id = _to_float(item.get("activityId"))
+    return activity_id is not None and activity_id <= stop_at_activity_id
+
+
+def _get_activities_basic(
+    access_token: str,
+    max_items: int = 600,
+    *,
+    stop_at_activity_id: int | None = None,
+) -> list[dict[str, Any]]:
     activities: list[dict[str, Any]] = []
     seen_ids: set[Any] = set()
     offset = 0
     page_size = 100
     while len(activities) < max_items:
         try:
-            response = requests.get(
+            response = provider_http.get(
                 f"{BASE_URL}/my/activities",
                 headers=_headers(access_token),
                 params={"count": page_size, "offset": offset},
@@ -100,12 +114,19 @@ def _get_activities_basic(access_token: str, max_items: int = 600) -> list[dict[
             break
         if len(page) < page_size:
             break
+        if any(_reached_known_activity(item, stop_at_activity_id) for item in page):
+            break
         offset += page_size
 
     return activities[:max_items]
 
 
-def get_activities(access_token: str | None, max_items: int = 600) -> list[dict[str, Any]]:
+def get_activities(
+    access_token: str | None,
+    max_items: int = 600,
+    *,
+    stop_at_activity_id: int | None = None,
+) -> list[dict[str, Any]]:
     if not access_token:
         return []
 
@@ -115,7 +136,7 @@ def get_activities(access_token: str | None, max_items: int = 600) -> list[dict[
     page_size = 100
     while len(activities) < max_items:
         try:
-            response = requests.get(
+            response = provider_http.get(
                 f"{BASE_URL}/my/activities/search/extended",
                 headers=_headers(access_token),
                 params={"count": page_size, "page": page_index},
@@ -124,7 +145,11 @@ def get_activities(access_token: str | None, max_items: int = 600) -> list[dict[
             response.raise_for_status()
         except requests.RequestException as exc:
             logger.warning("Smashrun extended activity fetch failed, falling back to basic endpoint: %s", exc)
-            return _get_activities_basic(access_token, max_items=max_items)
+            return _get_activities_basic(
+                access_token,
+                max_items=max_items,
+                stop_at_activity_id=stop_at_activity_id,
+            )
 
         page = response.json()
         if not isinstance(page, list) or not page:
@@ -142,6 +167,10 @@ def get_activities(access_token: str | None, max_items: int = 600) -> list[dict[
             break
         if len(page) < page_size:
             break
+        # Pages are newest first; once a page reaches a mirrored activity the
+        # rest is already known.
+        if any(_reached_known_activity(item, stop_at_activity_id) for item in page):
+            break
         page_index += 1
 
     return activities[:max_items]
@@ -160,7 +189,7 @@ def get_notables(access_token: str | None, latest_activity_id: int | None = None
             return []
 
     try:
-        response = requests.get(
+        response = provider_http.get(
             f"{BASE_URL}/my/activities/{latest_activity_id}/notables",
             headers=_headers(access_token),
             timeout=TIMEOUT_SECONDS,
@@ -180,7 +209,7 @@ def get_stats(access_token: str | None) -> dict[str, Any] | None:
     if not access_token:
         return None
     try:
-        response = requests.get(
+        response = provider_http.get(
             f"{BASE_URL}/my/stats",
             headers=_headers(access_token),
             timeout=TIMEOUT_SECONDS,
@@ -199,7 +228,7 @@ def get_badges(access_token: str | None) -> list[dict[str, Any]]:
     if not access_token:
         return []
     try:
-        response = requests.get(
+        response = provider_http.get(
             f"{BASE_URL}/my/badges",
             headers=_headers(access_token),
             timeout=TIMEOUT_SECONDS,
@@ -254,6 +283,42 @@ def _extract_activity_datetime(activity: dict[str, Any]) -> datetime | None:
     )
 
 
+def _strava_reference_id(activity: dict[str, Any]) -> str | None:
+    for key in ("stravaActivityId", "externalActivityId", "externalId"):
+        candidate_id = activity.get(key)
+        if candidate_id is not None and str(candidate_id).strip():
+            return str(candidate_id).strip()
+    return None
+
+
+def to_mirror_record(activity: Any) -> dict[str, Any] | None:
+    if not isinstance(activity, dict):
+        return None
+    activity_id = _to_float(activity.get("activityId"))
+    if activity_id is None:
+        return None
+    activity_time = _extract_activity_datetime(activity)
+    return {
+        "activity_id": int(activity_id),
+        "start_utc": activity_time.isoformat() if activity_time is not None else None,
+        "strava_activity_id": _strava_reference_id(activity),
+        "distance_meters": _extract_distance_meters(activity),
+        "elevation_feet": _extract_elevation_feet(activity),
+        "payload": activity,
+    }
+
+
+def strava_match_window(strava_activity: dict[str, Any]) -> tuple[datetime, datetime] | None:
+    strava_start = _parse_datetime(
+        strava_activity.get("start_date")
+        or strava_activity.get("start_date_local")
+    )
+    if strava_start is None:
+        return None
+    window = timedelta(seconds=MATCH_WINDOW_SECONDS)
+    return strava_start - window, strava_start + window + timedelta(seconds=1)
+
+
 def get_activity_record(
     activities: list[dict[str, Any]],
     strava_activity: dict[str, Any],
@@ -288,7 +353,7 @@ def get_activity_record(
             continue
 
         time_delta_seconds = abs((activity_time - strava_start).total_seconds())
-        if time_delta_seconds > 12 * 3600:
+        if time_delta_seconds > MATCH_WINDOW_SECONDS:
             continue
 
         score = float(time_delta_seconds)
@@ -303,53 +368,3 @@ def get_activity_record(
     if best_activity is not None:
         return best_activity
     return activities[0]
-
-
-def get_activity_elevation_feet(
-    activities: list[dict[str, Any]],
-    strava_activity: dict[str, Any],
-) -> float | None:
-    matched = get_activity_record(activities, strava_activity)
-    if matched is None:
-        return None
-    elevation_feet = _extract_elevation_feet(matched)
-    if elevation_feet is not None:
-        return elevation_feet
-    return get_latest_elevation_feet(activities)
-
-
-def aggregate_elevation_totals(
-    activities: list[dict[str, Any]],
-    now_utc: datetime | None = None,
-    timezone_name: str = "UTC",
-) -> dict[str, float]:
-    now = now_utc or datetime.now(timezone.utc)
-    try:
-        local_tz = ZoneInfo(timezone_name)
-    except ZoneInfoNotFoundError:
-        local_tz = ZoneInfo("UTC")
-
-    local_today = now.astimezone(local_tz).date()
-    week_start_date = local_today - timedelta(days=6)
-    month_start_date = local_today - timedelta(days=29)
-    year_start_date = date(local_today.year, 1, 1)
-
-    totals = {"week": 0.0, "month": 0.0, "year": 0.0}
-    for activity in activities:
-        activity_time = _extract_activity_datetime(activity)
-        if activity_time is None:
-            continue
-
-        elevation_feet = _extract_elevation_feet(activity)
-        if elevation_feet is None:
-            continue
-
-        local_activity_date = activity_time.astimezone(local_tz).date()
-        if local_activity_date >= week_start_date:
-            totals["week"] += elevation_feet
-        if local_activity_date >= month_start_date:
-            totals["month"] += elevation_feet
-        if local_activity_date >= year_start_date:
-            totals["year"] += elevation_feet
-
-    return totals
@@ -1,15 +1,31 @@
 from __future__ import annotations
 
+import functools
 import hashlib
 import json
+import logging
 import os
+import re
 import sqlite3
 import threading
+import time
 import uuid
 from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
+from .metrics import (
+    SQLITE_OP_LATENCY_BUCKETS_MS,
+    HistogramFamily,
+    StatementStats,
+    empty_histogram,
+    observe_histogram,
+    series_key,
+)
+from .pipeline_trace import trace_active, trace_count
+
+logger = logging.getLogger(__name__)
+
 JOB_STATUS_QUEUED = "queued"
 JOB_STATUS_CLAIMED = "claimed"
 JOB_STATUS_RUNNING = "running"
@@ -31,6 +47,16 @@ JOB_STATUS_TERMINAL = {
 }
 JOB_STATUS_ALL = JOB_STATUS_NON_TERMINAL | JOB_STATUS_TERMINAL
 
+# Placeholder activity id for "rerun latest" requests whose target is only
+# resolved once the worker lists recent Strava activities.
+ACTIVITY_JOB_LATEST_TARGET = "latest"
+JOB_REQUEST_KIND_RERUN_LATEST = "rerun_latest"
+JOB_REQUEST_KIND_RERUN_ACTIVITY = "rerun_activity"
+JOB_REQUEST_KINDS_RERUN = {
+    JOB_REQUEST_KIND_RERUN_LATEST,
+    JOB_REQUEST_KIND_RERUN_ACTIVITY,
+}
+
 _RUNTIME_SCHEMA_READY: set[str] = set()
 _RUNTIME_SCHEMA_LOCK = threading.Lock()
 
@@ -49,6 +75,84 @@ _ACTIVITY_STATE_EXTRA_COLUMNS: dict[str, str] = {
     "last_is_custom_template": "INTEGER",
 }
 
+_INTERVALS_METRIC_VALUE_COLUMNS = (
+    "avg_pace_mps",
+    "avg_efficiency_factor",
+    "avg_fitness",
+    "avg_fatigue",
+    "moving_time_seconds",
+)
+_SQLITE_IN_CHUNK_SIZE = 500
+_SQLITE_OP_KINDS = frozenset({"select", "insert", "update", "delete", "with", "pragma", "create", "begin"})
+_SQLITE_OP_METRICS = HistogramFamily(SQLITE_OP_LATENCY_BUCKETS_MS)
+_PROFILER_ARM_KEY_PREFIX = "profiler.arm."
+_PROFILER_RESULTS_KEY = "profiler.results"
+_SQLITE_BUSY_LOCK = threading.Lock()
+_SQLITE_BUSY_ERRORS = {"count": 0}
+DEFAULT_SQLITE_SLOW_QUERY_MS = 50.0
+_SQLITE_EXPLAIN_OPS = frozenset({"select", "insert", "update", "delete", "with"})
+_SQLITE_STATEMENT_STATS = StatementStats()
+_SQL_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_SQL_NUMBER_LITERAL = re.compile(r"(?<![\w.?])-?\d+(?:\.\d+)?(?![\w.])")
+_SQL_COMMA_SPACING = re.compile(r"\s*,\s*")
+_SQL_IN_LIST = re.compile(r"\bIN \(\?(?:, \?)+\)", re.IGNORECASE)
+_SQL_VALUES_ROWS = re.compile(r"(\(\?(?:, \?)*\))(?:, \1)+")
+
+# activity_id stays NULL on "latest" rerun jobs until bind_activity_job_target resolves it.
+_JOBS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        job_id TEXT PRIMARY KEY,
+        activity_id TEXT,
+        request_kind TEXT NOT NULL,
+        requested_by TEXT NOT NULL,
+        force_update INTEGER NOT NULL DEFAULT 0,
+        priority INTEGER NOT NULL DEFAULT 100,
+        status TEXT NOT NULL,
+        attempt_count INTEGER NOT NULL DEFAULT 0,
+        max_attempts INTEGER NOT NULL DEFAULT 3,
+        requested_at_utc TEXT NOT NULL,
+        available_at_utc TEXT NOT NULL,
+        lease_owner TEXT,
+        lease_expires_at_utc TEXT,
+        started_at_utc TEXT,
+        finished_at_utc TEXT,
+        run_id TEXT,
+        last_error TEXT,
+        last_result_json TEXT,
+        updated_at_utc TEXT NOT NULL,
+        FOREIGN KEY(activity_id) REFERENCES activities(activity_id)
+    )
+"""
+_RUNS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        run_id TEXT PRIMARY KEY,
+        job_id TEXT NOT NULL,
+        activity_id TEXT,
+        attempt_number INTEGER NOT NULL,
+        worker_owner TEXT,
+        status TEXT NOT NULL,
+        started_at_utc TEXT NOT NULL,
+        finished_at_utc TEXT,
+        error TEXT,
+        result_json TEXT,
+        updated_at_utc TEXT NOT NULL,
+        FOREIGN KEY(job_id) REFERENCES jobs(job_id),
+        FOREIGN KEY(activity_id) REFERENCES activities(activity_id)
+    )
+"""
+
+_CHANGE_LOG_RETENTION_ROWS = 2000
+_CHANGE_LOG_PRUNE_EVERY = 100
+_TEMPLATE_CONTEXT_ARCHIVE_RETENTION_ROWS_PER_PROFILE = 50
+_RUNTIME_METRICS_PREFIX = "metrics."
+_CHANGE_LOG_RUNTIME_TOPICS = (
+    ("worker.activity_detection.", "activity_detection"),
+    ("worker.last_heartbeat_utc", None),
+    ("worker.", "worker"),
+    ("dashboard.refresh.", "dashboard_refresh"),
+    ("cycle.service_calls", "service_metrics"),
+)
+
 
 def _utc_now() -> datetime:
     return datetime.now(timezone.utc)
@@ -78,10 +182,198 @@ def _parse_utc(raw: Any) -> datetime | None:
     return parsed.astimezone(timezone.utc)
 
 
+class _MeteredCursor(sqlite3.Cursor):
+    """Keeps a SELECT's timer running until its rows are fetched, exhausted or dropped."""
+
+    _pending: tuple[str, float, Any] | None = None
+
+    def _finish(self) -> None:
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            self.connection._observe(*pending)
+
+    def fetchone(self) -> Any:
+        row = super().fetchone()
+        if row is None:
+            self._finish()
+        return row
+
+    def fetchmany(self, size: int = 1) -> list[Any]:
+        rows = super().fetchmany(size)
+        if len(rows) < size:
+            self._finish()
+        return rows
+
+    def fetchall(self) -> list[Any]:
+        rows = super().fetchall()
+        self._finish()
+        return rows
+
+    def __next__(self) -> Any:
+        try:
+            return super().__next__()
+        except StopIteration:
+            self._finish()
+            raise
+
+    def close(self) -> None:
+        self._finish()
+        super().close()
+
+    def __del__(self) -> None:
+        # Most lookups read one row and drop the cursor without exhausting it.
+        self._finish()
+
+
+class _TracedCursor(_MeteredCursor):
+    def fetchone(self) -> Any:
+        row = super().fetchone()
+        if row is not None:
+            trace_count("rows_read")
+        return row
+
+    def fetchmany(self, size: int = 1) -> list[Any]:
+        rows = super().fetchmany(size)
+        trace_count("rows_read", len(rows))
+        return rows
+
+    def fetchall(self) -> list[Any]:
+        rows = super().fetchall()
+        trace_count("rows_read", len(rows))
+        return rows
+
+
+def _sqlite_op_kind(sql: str) -> str:
+    verb = sql.lstrip().split(None, 1)[0].lower() if sql.strip() else ""
+    return verb if verb in _SQLITE_OP_KINDS else "other"
+
+
+@functools.lru_cache(maxsize=1)
+def _sqlite_slow_query_ms() -> float:
+    # Read once per process; this runs on every statement.
+    raw = os.getenv("SQLITE_SLOW_QUERY_MS")
+    try:
+        parsed = float(raw.strip()) if raw is not None else DEFAULT_SQLITE_SLOW_QUERY_MS
+    except ValueError:
+        parsed = DEFAULT_SQLITE_SLOW_QUERY_MS
+    return max(0.0, parsed)
+
+
+@functools.lru_cache(maxsize=2048)
+def _normalize_sql(sql: str) -> str:
+    # Literals and IN/VALUES list lengths vary per call; strip them so one statement shape aggregates once.
+    text = _SQL_STRING_LITERAL.sub("?", sql)
+    text = " ".join(text.split()).rstrip(";").strip()
+    text = _SQL_COMMA_SPACING.sub(", ", text).replace("( ", "(").replace(" )", ")")
+    text = _SQL_NUMBER_LITERAL.sub("?", text)
+    text = _SQL_IN_LIST.sub("IN (?)", text)
+    return _SQL_VALUES_ROWS.sub(r"\1", text)
+
+
+def _explain_query_plan(conn: sqlite3.Connection, sql: str, parameters: Any = None) -> list[str]:
+    if parameters is None:
+        # Without real parameters, plan the normalized shape with NULLs bound.
+        sql = _normalize_sql(sql)
+        parameters = (None,) * sql.count("?")
+    try:
+        # The base cursor keeps the EXPLAIN itself out of the statement stats.
+        rows = sqlite3.Connection.cursor(conn).execute(f"EXPLAIN QUERY PLAN {sql}", parameters).fetchall()
+    except sqlite3.Error:
+        return []
+    depths: dict[int, int] = {}
+    plan: list[str] = []
+    for row in rows:
+        depth = depths.get(int(row[1]), -1) + 1
+        depths[int(row[0])] = depth
+        plan.append(f"{'  ' * depth}{row[3]}")
+    return plan
+
+
+def _record_sqlite_busy(exc: sqlite3.OperationalError) -> None:
+    # "database is locked" means the 30s busy timeout ran out waiting on another writer.
+    message = str(exc).lower()
+    if "locked" in message or "busy" in message:
+        with _SQLITE_BUSY_LOCK:
+            _SQLITE_BUSY_ERRORS["count"] += 1
+
+
+class _MeteredConnection(sqlite3.Connection):
+    _traced = False
+
+    def cursor(self, factory: Any = None) -> sqlite3.Cursor:
+        return super().cursor(factory or (_TracedCursor if self._traced else _MeteredCursor))
+
+    def _observe(self, sql: str, started: float, parameters: Any = None) -> None:
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        op = _sqlite_op_kind(sql)
+        _SQLITE_OP_METRICS.observe(elapsed_ms, {"op": op})
+        threshold_ms = _sqlite_slow_query_ms()
+        slow = 0 < threshold_ms <= elapsed_ms
+        statement = _normalize_sql(sql)
+        _SQLITE_STATEMENT_STATS.observe(statement, elapsed_ms, op=op, slow=slow)
+        if slow:
+            self._log_slow_statement(statement, sql, parameters, op, elapsed_ms)
+
+    def _track(self, cursor: sqlite3.Cursor, sql: str, started: float, parameters: Any = None) -> None:
+        if self._traced and cursor.rowcount > 0:
+            trace_count("rows_written", cursor.rowcount)
+        if cursor.description is not None and isinstance(cursor, _MeteredCursor):
+            # Rows are produced lazily by fetches, so the cursor stops the timer.
+            cursor._pending = (sql, started, parameters)
+        else:
+            self._observe(sql, started, parameters)
+
+    def _log_slow_statement(self, statement: str, sql: str, parameters: Any, op: str, elapsed_ms: float) -> None:
+        plan = _SQLITE_STATEMENT_STATS.plan(statement)
+        if plan is None and op in _SQLITE_EXPLAIN_OPS:
+            # Plans rarely change for one statement shape, so each is explained once per process.
+            plan = _explain_query_plan(self, sql, parameters)
+            _SQLITE_STATEMENT_STATS.set_plan(statement, plan)
+        logger.warning(
+            "Slow SQLite statement (%.1f ms): %s | plan: %s",
+            elapsed_ms,
+            statement,
+            " / ".join(line.strip() for line in plan or []) or "n/a",
+        )
+
+    def execute(self, sql: str, parameters: Any = (), /) -> sqlite3.Cursor:
+        started = time.perf_counter()
+        try:
+            cursor = self.cursor().execute(sql, parameters)
+        except sqlite3.Error as exc:
+            if isinstance(exc, sqlite3.OperationalError):
+                _record_sqlite_busy(exc)
+            self._observe(sql, started, parameters)
+            raise
+        self._track(cursor, sql, started, parameters)
+        return cursor
+
+    def executemany(self, sql: str, parameters: Any, /) -> sqlite3.Cursor:
+        started = time.perf_counter()
+        try:
+            cursor = self.cursor().executemany(sql, parameters)
+        except sqlite3.Error as exc:
+            if isinstance(exc, sqlite3.OperationalError):
+                _record_sqlite_busy(exc)
+            self._observe(sql, started)
+            raise
+        self._track(cursor, sql, started)
+        return cursor
+
+
+class _TracedConnection(_MeteredConnection):
+    # Only used while a pipeline trace is active; also counts rows read and written.
+    _traced = True
+
+
 def _connect_runtime_db(path: Path) -> sqlite3.Connection:
     db_path = _runtime_db_path(path)
     db_path.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(db_path, timeout=30)
+    if trace_active():
+        trace_count("storage_calls")
+        conn = sqlite3.connect(db_path, timeout=30, factory=_TracedConnection)
+    else:
+        conn = sqlite3.connect(db_path, timeout=30, factory=_MeteredConnection)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA journal_mode=WAL;")
     conn.execute("PRAGMA synchronous=NORMAL;")
@@ -90,6 +382,37 @@ def _connect_runtime_db(path: Path) -> sqlite3.Connection:
     return conn
 
 
+def sqlite_op_metrics_snapshot() -> dict[str, dict[str, Any]]:
+    return _SQLITE_OP_METRICS.snapshot()
+
+
+def sqlite_busy_error_count() -> int:
+    with _SQLITE_BUSY_LOCK:
+        return int(_SQLITE_BUSY_ERRORS["count"])
+
+
+def sqlite_slow_query_threshold_ms() -> float:
+    return _sqlite_slow_query_ms()
+
+
+def sqlite_statement_stats_snapshot() -> dict[str, dict[str, Any]]:
+    return _SQLITE_STATEMENT_STATS.snapshot()
+
+
+def reset_sqlite_statement_stats() -> None:
+    _SQLITE_STATEMENT_STATS.reset()
+
+
+def explain_sqlite_statement(path: Path, statement: str) -> list[str]:
+    if _sqlite_op_kind(statement) not in _SQLITE_EXPLAIN_OPS:
+        return []
+    try:
+        with _connect_runtime_db(path) as conn:
+            return _explain_query_plan(conn, statement)
+    except sqlite3.Error:
+        return []
+
+
 def _schema_cache_key(db_path: Path) -> str:
     return str(db_path.resolve())
 
@@ -145,51 +468,9 @@ def _initialize_runtime_schema(conn: sqlite3.Connection) -> None:
         )
         """
     )
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS jobs (
-            job_id TEXT PRIMARY KEY,
-            activity_id TEXT NOT NULL,
-            request_kind TEXT NOT NULL,
-            requested_by TEXT NOT NULL,
-            force_update INTEGER NOT NULL DEFAULT 0,
-            priority INTEGER NOT NULL DEFAULT 100,
-            status TEXT NOT NULL,
-            attempt_count INTEGER NOT NULL DEFAULT 0,
-            max_attempts INTEGER NOT NULL DEFAULT 3,
-            requested_at_utc TEXT NOT NULL,
-            available_at_utc TEXT NOT NULL,
-            lease_owner TEXT,
-            lease_expires_at_utc TEXT,
-            started_at_utc TEXT,
-            finished_at_utc TEXT,
-            run_id TEXT,
-            last_error TEXT,
-            last_result_json TEXT,
-            updated_at_utc TEXT NOT NULL,
-            FOREIGN KEY(activity_id) REFERENCES activities(activity_id)
-        )
-        """
-    )
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS runs (
-            run_id TEXT PRIMARY KEY,
-            job_id TEXT NOT NULL,
-            activity_id TEXT NOT NULL,
-            attempt_number INTEGER NOT NULL,
-            worker_owner TEXT,
-            status TEXT NOT NULL,
-            started_at_utc TEXT NOT NULL,
-            finished_at_utc TEXT,
-            error TEXT,
-            result_json TEXT,
-            updated_at_utc TEXT NOT NULL,
-            FOREIGN KEY(job_id) REFERENCES jobs(job_id),
-            FOREIGN KEY(activity_id) REFERENCES activities(activity_id)
-        )
-        """
-    )
+    conn.execute(_JOBS_TABLE_SQL.format(table="jobs"))
+    conn.execute(_RUNS_TABLE_SQL.format(table="runs"))
+    _ensure_nullable_job_activity_ids(conn)
     conn.execute(
         """
         CREATE TABLE IF NOT EXISTS activity_state (
@@ -258,6 +539,334 @@ def _initialize_runtime_schema(conn: sqlite3.Connection) -> None:
         ON activity_summit_metrics (location_key, local_date)
         """
     )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS intervals_metrics (
+            record_key TEXT PRIMARY KEY,
+            strava_activity_id TEXT,
+            start_minute_utc TEXT,
+            start_date TEXT NOT NULL,
+            avg_pace_mps REAL,
+            avg_efficiency_factor REAL,
+            avg_fitness REAL,
+            avg_fatigue REAL,
+            moving_time_seconds REAL,
+            updated_at_utc TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_intervals_metrics_activity
+        ON intervals_metrics (strava_activity_id)
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_intervals_metrics_start_minute
+        ON intervals_metrics (start_minute_utc)
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS garmin_daily_metrics (
+            metric TEXT NOT NULL,
+            metric_date TEXT NOT NULL,
+            payload_json TEXT NOT NULL,
+            fetched_at_utc TEXT NOT NULL,
+            expires_at_utc TEXT,
+            PRIMARY KEY (metric, metric_date)
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS garmin_period_activities (
+            activity_id TEXT PRIMARY KEY,
+            start_utc TEXT NOT NULL,
+            calories REAL,
+            gap_speed_mps REAL,
+            updated_at_utc TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_garmin_period_activities_start
+        ON garmin_period_activities (start_utc)
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS smashrun_activities (
+            activity_id INTEGER PRIMARY KEY,
+            start_utc TEXT,
+            strava_activity_id TEXT,
+            distance_meters REAL,
+            elevation_feet REAL,
+            payload_json TEXT NOT NULL,
+            updated_at_utc TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_smashrun_activities_start
+        ON smashrun_activities (start_utc)
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_smashrun_activities_strava
+        ON smashrun_activities (strava_activity_id)
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS weather_hours (
+            cell TEXT NOT NULL,
+            local_date TEXT NOT NULL,
+            hour_epoch INTEGER NOT NULL,
+            tz_id TEXT,
+            temp_f REAL,
+            dewpoint_f REAL,
+            humidity REAL,
+            wind_mph REAL,
+            cloud REAL,
+            precip_in REAL,
+            is_day INTEGER,
+            hour_json TEXT NOT NULL,
+            fetched_at_utc TEXT NOT NULL,
+            expires_at_utc TEXT,
+            PRIMARY KEY (cell, local_date, hour_epoch)
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS weather_aqi (
+            cell TEXT PRIMARY KEY,
+            us_epa_index INTEGER,
+            fetched_at_utc TEXT NOT NULL,
+            expires_at_utc TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS activity_misery_scores (
+            activity_id TEXT PRIMARY KEY,
+            start_utc TEXT NOT NULL,
+            cell TEXT NOT NULL,
+            local_date TEXT NOT NULL,
+            misery_index REAL,
+            polarity TEXT,
+            severity TEXT,
+            emoji TEXT,
+            description TEXT,
+            components_json TEXT,
+            computed_at_utc TEXT,
+            updated_at_utc TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_activity_misery_scores_start
+        ON activity_misery_scores (start_utc)
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS change_log (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            topic TEXT NOT NULL,
+            payload_json TEXT NOT NULL,
+            created_at_utc TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS agent_drafts (
+            draft_id TEXT PRIMARY KEY,
+            resource_kind TEXT NOT NULL,
+            status TEXT NOT NULL,
+            updated_at_utc TEXT NOT NULL,
+            record_json TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_agent_drafts_kind
+        ON agent_drafts (resource_kind, draft_id DESC)
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS agent_jobs (
+            job_id TEXT PRIMARY KEY,
+            task_kind TEXT NOT NULL,
+            status TEXT NOT NULL,
+            updated_at_utc TEXT NOT NULL,
+            record_json TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_agent_jobs_kind
+        ON agent_jobs (task_kind, job_id DESC)
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS agent_audit_events (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            event_id TEXT NOT NULL UNIQUE,
+            event_type TEXT NOT NULL,
+            resource_kind TEXT,
+            resource_id TEXT,
+            created_at_utc TEXT NOT NULL,
+            record_json TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_agent_audit_events_type
+        ON agent_audit_events (event_type, seq DESC)
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_agent_audit_events_resource
+        ON agent_audit_events (resource_kind, resource_id, seq DESC)
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS activity_template_contexts (
+            activity_id TEXT PRIMARY KEY,
+            profile_id TEXT,
+            fingerprint TEXT,
+            context_json TEXT NOT NULL,
+            archived_at_utc TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_activity_template_contexts_archived
+        ON activity_template_contexts (archived_at_utc DESC)
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_activity_template_contexts_profile
+        ON activity_template_contexts (profile_id, archived_at_utc DESC)
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS garmin_sync_requests (
+            request_id TEXT PRIMARY KEY,
+            date_local TEXT NOT NULL,
+            workout_code TEXT NOT NULL,
+            workout_code_key TEXT NOT NULL,
+            status TEXT NOT NULL,
+            status_code TEXT NOT NULL,
+            queued_at_utc TEXT NOT NULL,
+            updated_at_utc TEXT NOT NULL,
+            garmin_workout_id TEXT,
+            garmin_workout_created INTEGER,
+            calendar_entry_id TEXT,
+            next_step TEXT,
+            error_message TEXT,
+            retry_guidance TEXT
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_garmin_sync_requests_day_workout
+        ON garmin_sync_requests (date_local, workout_code_key, updated_at_utc DESC, queued_at_utc DESC)
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_garmin_sync_requests_status
+        ON garmin_sync_requests (status, date_local)
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS garmin_workouts (
+            garmin_workout_id TEXT PRIMARY KEY,
+            workout_code TEXT NOT NULL,
+            workout_code_key TEXT NOT NULL UNIQUE,
+            title TEXT NOT NULL,
+            created_at_utc TEXT NOT NULL,
+            updated_at_utc TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS garmin_calendar_entries (
+            calendar_entry_id TEXT PRIMARY KEY,
+            date_local TEXT NOT NULL,
+            garmin_workout_id TEXT NOT NULL,
+            workout_code TEXT NOT NULL,
+            scheduled_at_utc TEXT NOT NULL,
+            updated_at_utc TEXT NOT NULL,
+            UNIQUE (date_local, garmin_workout_id)
+        )
+        """
+    )
+
+
+def _ensure_nullable_job_activity_ids(conn: sqlite3.Connection) -> None:
+    def _legacy_tables() -> list[str]:
+        return [
+            table
+            for table in ("jobs", "runs")
+            if any(
+                str(row[1]) == "activity_id" and int(row[3])
+                for row in conn.execute(f"PRAGMA table_info({table})").fetchall()
+            )
+        ]
+
+    if not _legacy_tables():
+        return
+    # Older databases declared activity_id NOT NULL and parked "latest" jobs on a placeholder
+    # activities row. SQLite cannot relax NOT NULL in place, so both tables are rebuilt.
+    if conn.in_transaction:
+        conn.commit()
+    conn.execute("PRAGMA foreign_keys=OFF;")
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        for table in _legacy_tables():
+            template = _JOBS_TABLE_SQL if table == "jobs" else _RUNS_TABLE_SQL
+            rebuilt = f"{table}_rebuild"
+            conn.execute(f"DROP TABLE IF EXISTS {rebuilt}")
+            conn.execute(template.format(table=rebuilt))
+            columns = ", ".join(str(row[1]) for row in conn.execute(f"PRAGMA table_info({rebuilt})").fetchall())
+            conn.execute(f"INSERT INTO {rebuilt} ({columns}) SELECT {columns} FROM {table}")
+            conn.execute(
+                f"UPDATE {rebuilt} SET activity_id = NULL WHERE activity_id = ?",
+                (ACTIVITY_JOB_LATEST_TARGET,),
+            )
+            conn.execute(f"DROP TABLE {table}")
+            conn.execute(f"ALTER TABLE {rebuilt} RENAME TO {table}")
+        conn.execute("DELETE FROM activities WHERE activity_id = ?", (ACTIVITY_JOB_LATEST_TARGET,))
+        conn.commit()
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+    finally:
+        conn.execute("PRAGMA foreign_keys=ON;")
 
 
 def _ensure_activity_state_columns(conn: sqlite3.Connection) -> None:
@@ -376,7 +985,9 @@ def mark_activity_processed(path: Path, activity_id: int | str) -> None:
 
 
 def _to_json_string(value: Any) -> str:
-    return json.dumps(value, sort_keys=True)
+    text = json.dumps(value, sort_keys=True)
+    trace_count("bytes_serialized", len(text))
+    return text
 
 
 def _from_json_string(value_json: str) -> Any:
@@ -387,19 +998,71 @@ def set_runtime_value(path: Path, key: str, value: Any) -> None:
     set_runtime_values(path, {key: value})
 
 
-def set_runtime_values(path: Path, values: dict[str, Any]) -> None:
-    if not values:
-        return
-    rows: list[tuple[str, str, str]] = []
-    updated_at_utc = _utc_now_iso()
-    for key, value in values.items():
-        key_text = str(key).strip()
-        if not key_text:
-            continue
-        rows.append((key_text, _to_json_string(value), updated_at_utc))
-    if not rows:
-        return
-    try:
+def _change_log_topic_for_runtime_key(key: str) -> str | None:
+    for prefix, topic in _CHANGE_LOG_RUNTIME_TOPICS:
+        if key.startswith(prefix):
+            return topic
+    return None
+
+
+def _append_change_event(
+    conn: sqlite3.Connection,
+    topic: str,
+    payload: dict[str, Any],
+    *,
+    created_at_utc: str | None = None,
+) -> None:
+    cursor = conn.execute(
+        """
+        INSERT INTO change_log (topic, payload_json, created_at_utc)
+        VALUES (?, ?, ?)
+        """,
+        (topic, _to_json_string(payload), created_at_utc or _utc_now_iso()),
+    )
+    seq = int(cursor.lastrowid or 0)
+    if seq > _CHANGE_LOG_RETENTION_ROWS and seq % _CHANGE_LOG_PRUNE_EVERY == 0:
+        conn.execute("DELETE FROM change_log WHERE seq <= ?", (seq - _CHANGE_LOG_RETENTION_ROWS,))
+
+
+def _job_target(activity_id: Any) -> str:
+    return ACTIVITY_JOB_LATEST_TARGET if activity_id is None else str(activity_id)
+
+
+def _append_job_change_event(
+    conn: sqlite3.Connection,
+    job_id: str,
+    *,
+    activity_id: str,
+    status: str,
+    created_at_utc: str,
+    **extra: Any,
+) -> None:
+    payload: dict[str, Any] = {
+        "job_id": job_id,
+        "activity_id": None if activity_id == ACTIVITY_JOB_LATEST_TARGET else activity_id,
+        "status": status,
+    }
+    payload.update(extra)
+    _append_change_event(conn, "job", payload, created_at_utc=created_at_utc)
+
+
+def set_runtime_values(path: Path, values: dict[str, Any]) -> None:
+    if not values:
+        return
+    rows: list[tuple[str, str, str]] = []
+    changed_by_topic: dict[str, dict[str, Any]] = {}
+    updated_at_utc = _utc_now_iso()
+    for key, value in values.items():
+        key_text = str(key).strip()
+        if not key_text:
+            continue
+        rows.append((key_text, _to_json_string(value), updated_at_utc))
+        topic = _change_log_topic_for_runtime_key(key_text)
+        if topic:
+            changed_by_topic.setdefault(topic, {})[key_text] = value
+    if not rows:
+        return
+    try:
         with _connect_runtime_db(path) as conn:
             conn.executemany(
                 """
@@ -411,10 +1074,55 @@ def set_runtime_values(path: Path, values: dict[str, Any]) -> None:
                 """,
                 rows,
             )
+            for topic, changed in changed_by_topic.items():
+                _append_change_event(conn, topic, {"values": changed}, created_at_utc=updated_at_utc)
     except sqlite3.Error:
         return
 
 
+def list_change_events(path: Path, *, after_seq: int = 0, limit: int = 200) -> list[dict[str, Any]]:
+    try:
+        with _connect_runtime_db(path) as conn:
+            rows = conn.execute(
+                """
+                SELECT seq, topic, payload_json, created_at_utc
+                FROM change_log
+                WHERE seq > ?
+                ORDER BY seq ASC
+                LIMIT ?
+                """,
+                (max(0, int(after_seq)), max(1, int(limit))),
+            ).fetchall()
+    except sqlite3.Error:
+        return []
+    events: list[dict[str, Any]] = []
+    for row in rows:
+        try:
+            payload = _from_json_string(str(row["payload_json"]))
+        except (TypeError, ValueError):
+            payload = None
+        events.append(
+            {
+                "seq": int(row["seq"]),
+                "topic": str(row["topic"]),
+                "payload": payload,
+                "created_at_utc": str(row["created_at_utc"]),
+            }
+        )
+    return events
+
+
+def latest_change_event_seq(path: Path) -> int:
+    try:
+        with _connect_runtime_db(path) as conn:
+            row = conn.execute("SELECT MAX(seq) AS seq FROM change_log").fetchone()
+    except sqlite3.Error:
+        return 0
+    if row is None or row["seq"] is None:
+        return 0
+    return int(row["seq"])
+
+
 def get_runtime_value(path: Path, key: str, default: Any = None) -> Any:
     try:
         with _connect_runtime_db(path) as conn:
@@ -465,6 +1173,180 @@ def get_runtime_values(path: Path, keys: list[str]) -> dict[str, Any]:
     return values
 
 
+def observe_runtime_histogram(
+    path: Path,
+    name: str,
+    value: float,
+    *,
+    buckets: tuple[float, ...],
+    labels: dict[str, str] | None = None,
+) -> None:
+    runtime_key = f"{_RUNTIME_METRICS_PREFIX}{name}"
+    key = series_key(labels)
+    try:
+        with _connect_runtime_db(path) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT value_json FROM runtime_kv WHERE key = ? LIMIT 1",
+                (runtime_key,),
+            ).fetchone()
+            try:
+                families = _from_json_string(str(row[0])) if row is not None else {}
+            except (json.JSONDecodeError, TypeError, ValueError):
+                families = {}
+            if not isinstance(families, dict):
+                families = {}
+            series = families.get(key)
+            if not isinstance(series, dict) or not isinstance(series.get("buckets"), dict):
+                series = empty_histogram(buckets) | {"labels": dict(labels or {})}
+                families[key] = series
+            observe_histogram(series, float(value), buckets)
+            conn.execute(
+                """
+                INSERT INTO runtime_kv (key, value_json, updated_at_utc)
+                VALUES (?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    value_json = excluded.value_json,
+                    updated_at_utc = excluded.updated_at_utc
+                """,
+                (runtime_key, _to_json_string(families), _utc_now_iso()),
+            )
+    except sqlite3.Error:
+        return
+
+
+def claim_profiler_slot(path: Path, *, target: str, route: str | None = None) -> dict[str, Any] | None:
+    arm_key = f"{_PROFILER_ARM_KEY_PREFIX}{target}"
+    try:
+        with _connect_runtime_db(path) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT value_json FROM runtime_kv WHERE key = ? LIMIT 1",
+                (arm_key,),
+            ).fetchone()
+            try:
+                arm = _from_json_string(str(row[0])) if row is not None else None
+            except (json.JSONDecodeError, TypeError, ValueError):
+                arm = None
+            if not isinstance(arm, dict) or arm.get("target") != target:
+                return None
+            if target == "route" and arm.get("route") != route:
+                return None
+            remaining = int(arm.get("remaining") or 0)
+            if remaining <= 0:
+                return None
+            arm["remaining"] = remaining - 1
+            conn.execute(
+                """
+                INSERT INTO runtime_kv (key, value_json, updated_at_utc)
+                VALUES (?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    value_json = excluded.value_json,
+                    updated_at_utc = excluded.updated_at_utc
+                """,
+                (arm_key, _to_json_string(arm), _utc_now_iso()),
+            )
+    except (sqlite3.Error, TypeError, ValueError):
+        return None
+    return arm
+
+
+def record_profiler_result(path: Path, result: dict[str, Any], *, keep: int) -> list[dict[str, Any]] | None:
+    """Prepends one profile result under the write lock; returns the results that fell out of retention."""
+    try:
+        with _connect_runtime_db(path) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT value_json FROM runtime_kv WHERE key = ? LIMIT 1",
+                (_PROFILER_RESULTS_KEY,),
+            ).fetchone()
+            try:
+                existing = _from_json_string(str(row[0])) if row is not None else []
+            except (json.JSONDecodeError, TypeError, ValueError):
+                existing = []
+            if not isinstance(existing, list):
+                existing = []
+            results = [result] + [item for item in existing if isinstance(item, dict)]
+            keep_count = max(1, int(keep))
+            kept, dropped = results[:keep_count], results[keep_count:]
+            conn.execute(
+                """
+                INSERT INTO runtime_kv (key, value_json, updated_at_utc)
+                VALUES (?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    value_json = excluded.value_json,
+                    updated_at_utc = excluded.updated_at_utc
+                """,
+                (_PROFILER_RESULTS_KEY, _to_json_string(kept), _utc_now_iso()),
+            )
+    except (sqlite3.Error, TypeError, ValueError):
+        return None
+    return dropped
+
+
+def list_runtime_histograms(path: Path) -> dict[str, dict[str, Any]]:
+    try:
+        with _connect_runtime_db(path) as conn:
+            rows = conn.execute(
+                "SELECT key, value_json FROM runtime_kv WHERE key >= ? AND key < ?",
+                (_RUNTIME_METRICS_PREFIX, _RUNTIME_METRICS_PREFIX[:-1] + "/"),
+            ).fetchall()
+    except sqlite3.Error:
+        return {}
+    histograms: dict[str, dict[str, Any]] = {}
+    for row in rows:
+        try:
+            families = _from_json_string(str(row["value_json"]))
+        except (json.JSONDecodeError, TypeError, ValueError):
+            continue
+        if isinstance(families, dict):
+            histograms[str(row["key"])[len(_RUNTIME_METRICS_PREFIX):]] = families
+    return histograms
+
+
+def list_runtime_values_with_prefix(path: Path, prefix: str) -> dict[str, Any]:
+    """Values for every key under a dotted prefix such as ``"api.metrics."``."""
+    try:
+        with _connect_runtime_db(path) as conn:
+            rows = conn.execute(
+                "SELECT key, value_json FROM runtime_kv WHERE key >= ? AND key < ?",
+                (prefix, prefix[:-1] + "/"),
+            ).fetchall()
+    except sqlite3.Error:
+        return {}
+    values: dict[str, Any] = {}
+    for row in rows:
+        try:
+            values[str(row["key"])] = _from_json_string(str(row["value_json"]))
+        except (json.JSONDecodeError, TypeError, ValueError):
+            continue
+    return values
+
+
+def list_service_runtime_counters(path: Path) -> dict[str, int]:
+    try:
+        with _connect_runtime_db(path) as conn:
+            rows = conn.execute(
+                """
+                SELECT key, value_json
+                FROM runtime_kv
+                WHERE key >= 'service.' AND key < 'service/'
+                  AND key NOT LIKE 'service.%.cache.%'
+                """
+            ).fetchall()
+    except sqlite3.Error:
+        return {}
+    counters: dict[str, int] = {}
+    for row in rows:
+        try:
+            value = _from_json_string(str(row["value_json"]))
+        except (json.JSONDecodeError, TypeError, ValueError):
+            continue
+        if isinstance(value, int) and not isinstance(value, bool):
+            counters[str(row["key"])] = value
+    return counters
+
+
 def delete_runtime_value(path: Path, key: str) -> None:
     try:
         with _connect_runtime_db(path) as conn:
@@ -679,549 +1561,1399 @@ def sum_activity_summit_metrics(
     return max(0, int(row["total"] or 0))
 
 
-def set_worker_heartbeat(path: Path, heartbeat_utc: datetime | None = None) -> None:
-    now = heartbeat_utc.astimezone(timezone.utc) if heartbeat_utc else _utc_now()
-    set_runtime_value(path, "worker.last_heartbeat_utc", now.isoformat())
-
+def _minute_key_utc(raw: Any) -> str | None:
+    parsed = _parse_utc(raw)
+    if parsed is None:
+        return None
+    return parsed.replace(second=0, microsecond=0).isoformat()
 
-def get_worker_heartbeat(path: Path) -> datetime | None:
-    raw = get_runtime_value(path, "worker.last_heartbeat_utc")
-    return _parse_utc(raw)
 
+def _chunked(values: list[str], size: int = _SQLITE_IN_CHUNK_SIZE) -> list[list[str]]:
+    return [values[idx : idx + size] for idx in range(0, len(values), size)]
 
-def is_worker_healthy(
-    path: Path,
-    max_age_seconds: int,
-    now_utc: datetime | None = None,
-) -> bool:
-    heartbeat = get_worker_heartbeat(path)
-    if heartbeat is None:
-        return False
-    now = now_utc.astimezone(timezone.utc) if now_utc else _utc_now()
-    age = (now - heartbeat).total_seconds()
-    return age <= max(30, int(max_age_seconds))
 
+def _intervals_metric_row_to_dict(row: sqlite3.Row) -> dict[str, Any]:
+    record: dict[str, Any] = {
+        "strava_activity_id": str(row["strava_activity_id"]) if row["strava_activity_id"] is not None else None,
+        "start_date": str(row["start_date"]),
+    }
+    for column in _INTERVALS_METRIC_VALUE_COLUMNS:
+        if row[column] is not None:
+            record[column] = float(row[column])
+    return record
 
-def acquire_runtime_lock(
-    path: Path,
-    lock_name: str,
-    owner: str,
-    ttl_seconds: int,
-    now_utc: datetime | None = None,
-) -> bool:
-    now = now_utc.astimezone(timezone.utc) if now_utc else _utc_now()
-    expires = now + timedelta(seconds=max(30, int(ttl_seconds)))
-    now_iso = now.isoformat()
-    expires_iso = expires.isoformat()
 
+def upsert_intervals_metrics(path: Path, records: list[dict[str, Any]]) -> int:
+    now_iso = _utc_now_iso()
+    rows: dict[str, tuple[Any, ...]] = {}
+    for record in records:
+        if not isinstance(record, dict):
+            continue
+        activity_id = str(record.get("strava_activity_id") or "").strip()
+        minute_key = _minute_key_utc(record.get("start_date"))
+        if activity_id:
+            record_key = f"id:{activity_id}"
+        elif minute_key:
+            record_key = f"minute:{minute_key}"
+        else:
+            continue
+        rows[record_key] = (
+            record_key,
+            activity_id or None,
+            minute_key,
+            str(record.get("start_date") or minute_key or ""),
+            *(_optional_float(record.get(column)) for column in _INTERVALS_METRIC_VALUE_COLUMNS),
+            now_iso,
+        )
+    if not rows:
+        return 0
     try:
         with _connect_runtime_db(path) as conn:
-            conn.execute("BEGIN IMMEDIATE")
-            row = conn.execute(
-                """
-                SELECT owner, expires_at_utc
-                FROM runtime_locks
-                WHERE lock_name = ?
-                LIMIT 1
-                """,
-                (lock_name,),
-            ).fetchone()
-
-            if row:
-                current_owner = str(row[0])
-                expires_at = _parse_utc(row[1])
-                if expires_at and expires_at > now and current_owner != owner:
-                    return False
-
-            conn.execute(
+            conn.executemany(
                 """
-                INSERT INTO runtime_locks (lock_name, owner, acquired_at_utc, expires_at_utc)
-                VALUES (?, ?, ?, ?)
-                ON CONFLICT(lock_name) DO UPDATE SET
-                    owner = excluded.owner,
-                    acquired_at_utc = excluded.acquired_at_utc,
-                    expires_at_utc = excluded.expires_at_utc
+                INSERT INTO intervals_metrics (
+                    record_key,
+                    strava_activity_id,
+                    start_minute_utc,
+                    start_date,
+                    avg_pace_mps,
+                    avg_efficiency_factor,
+                    avg_fitness,
+                    avg_fatigue,
+                    moving_time_seconds,
+                    updated_at_utc
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(record_key) DO UPDATE SET
+                    strava_activity_id = excluded.strava_activity_id,
+                    start_minute_utc = excluded.start_minute_utc,
+                    start_date = excluded.start_date,
+                    avg_pace_mps = excluded.avg_pace_mps,
+                    avg_efficiency_factor = excluded.avg_efficiency_factor,
+                    avg_fitness = excluded.avg_fitness,
+                    avg_fatigue = excluded.avg_fatigue,
+                    moving_time_seconds = excluded.moving_time_seconds,
+                    updated_at_utc = excluded.updated_at_utc
                 """,
-                (lock_name, owner, now_iso, expires_iso),
+                list(rows.values()),
             )
-        return True
     except sqlite3.Error:
-        return False
+        return 0
+    return len(rows)
 
 
-def release_runtime_lock(path: Path, lock_name: str, owner: str) -> None:
+def list_intervals_metrics(
+    path: Path,
+    *,
+    activity_ids: list[str] | None = None,
+    start_minutes: list[str] | None = None,
+) -> list[dict[str, Any]]:
+    id_values = sorted({str(value).strip() for value in (activity_ids or []) if str(value or "").strip()})
+    minute_values = sorted({str(value).strip() for value in (start_minutes or []) if str(value or "").strip()})
+    rows_by_key: dict[str, sqlite3.Row] = {}
     try:
         with _connect_runtime_db(path) as conn:
-            conn.execute(
-                "DELETE FROM runtime_locks WHERE lock_name = ? AND owner = ?",
-                (lock_name, owner),
-            )
+            for column, values in (("strava_activity_id", id_values), ("start_minute_utc", minute_values)):
+                for chunk in _chunked(values):
+                    placeholders = ", ".join("?" for _ in chunk)
+                    for row in conn.execute(
+                        f"SELECT * FROM intervals_metrics WHERE {column} IN ({placeholders})",
+                        chunk,
+                    ).fetchall():
+                        rows_by_key[str(row["record_key"])] = row
     except sqlite3.Error:
-        return
+        return []
+    ordered = sorted(rows_by_key.values(), key=lambda row: (str(row["start_date"]), str(row["record_key"])))
+    return [_intervals_metric_row_to_dict(row) for row in ordered]
 
 
-def _status_value(value: Any) -> str:
-    return str(value or "").strip().lower()
+def count_intervals_metrics(path: Path) -> int:
+    try:
+        with _connect_runtime_db(path) as conn:
+            row = conn.execute("SELECT COUNT(*) AS total FROM intervals_metrics").fetchone()
+    except sqlite3.Error:
+        return 0
+    return int(row["total"] or 0) if row is not None else 0
 
 
-def _normalize_job_status(status: str, *, default: str = JOB_STATUS_QUEUED) -> str:
-    normalized = _status_value(status)
-    if normalized in JOB_STATUS_ALL:
-        return normalized
-    return default
+def clear_intervals_metrics(path: Path) -> int:
+    try:
+        with _connect_runtime_db(path) as conn:
+            deleted = conn.execute("DELETE FROM intervals_metrics")
+    except sqlite3.Error:
+        return 0
+    return int(max(0, deleted.rowcount))
 
 
-def _description_hash(description: str | None) -> str | None:
-    if not isinstance(description, str):
-        return None
-    text = description.strip()
-    if not text:
-        return None
-    return hashlib.sha256(text.encode("utf-8")).hexdigest()
-
-
-def _to_job_dict(row: sqlite3.Row | None) -> dict[str, Any] | None:
-    if row is None:
-        return None
-    return {
-        "job_id": str(row["job_id"]),
-        "activity_id": str(row["activity_id"]),
-        "request_kind": str(row["request_kind"]),
-        "requested_by": str(row["requested_by"]),
-        "force_update": bool(int(row["force_update"])),
-        "priority": int(row["priority"]),
-        "status": _status_value(row["status"]),
-        "attempt_count": int(row["attempt_count"]),
-        "max_attempts": int(row["max_attempts"]),
-        "requested_at_utc": str(row["requested_at_utc"]),
-        "available_at_utc": str(row["available_at_utc"]),
-        "lease_owner": str(row["lease_owner"]) if row["lease_owner"] is not None else None,
-        "lease_expires_at_utc": (
-            str(row["lease_expires_at_utc"]) if row["lease_expires_at_utc"] is not None else None
-        ),
-        "started_at_utc": str(row["started_at_utc"]) if row["started_at_utc"] is not None else None,
-        "finished_at_utc": str(row["finished_at_utc"]) if row["finished_at_utc"] is not None else None,
-        "run_id": str(row["run_id"]) if row["run_id"] is not None else None,
-        "last_error": str(row["last_error"]) if row["last_error"] is not None else None,
-        "last_result_json": str(row["last_result_json"]) if row["last_result_json"] is not None else None,
-        "updated_at_utc": str(row["updated_at_utc"]),
-    }
+def get_garmin_daily_metrics(
+    path: Path,
+    keys: list[tuple[str, str]],
+    *,
+    now_utc: datetime | None = None,
+) -> dict[tuple[str, str], Any]:
+    wanted = sorted({(str(metric), str(metric_date)) for metric, metric_date in keys if metric and metric_date})
+    if not wanted:
+        return {}
+    now_iso = (now_utc.astimezone(timezone.utc) if now_utc else _utc_now()).isoformat()
+    found: dict[tuple[str, str], Any] = {}
+    try:
+        with _connect_runtime_db(path) as conn:
+            for metric in sorted({metric for metric, _ in wanted}):
+                dates = [metric_date for key_metric, metric_date in wanted if key_metric == metric]
+                for chunk in _chunked(dates):
+                    placeholders = ", ".join("?" for _ in chunk)
+                    for row in conn.execute(
+                        f"""
+                        SELECT metric, metric_date, payload_json
+                        FROM garmin_daily_metrics
+                        WHERE metric = ?
+                          AND metric_date IN ({placeholders})
+                          AND (expires_at_utc IS NULL OR expires_at_utc > ?)
+                        """,
+                        (metric, *chunk, now_iso),
+                    ).fetchall():
+                        found[(str(row["metric"]), str(row["metric_date"]))] = _from_json_string(row["payload_json"])
+    except sqlite3.Error:
+        return {}
+    return found
 
 
-def _upsert_activity_state(
-    conn: sqlite3.Connection,
+def upsert_garmin_daily_metrics(
+    path: Path,
+    entries: list[dict[str, Any]],
     *,
-    activity_id: str,
-    state: str,
-    updated_at_utc: str,
-    last_job_id: str | None = None,
-    last_run_id: str | None = None,
-    last_profile_id: str | None = None,
-    last_title: str | None = None,
-    last_description_hash: str | None = None,
-    last_result_status: str | None = None,
-    last_error: str | None = None,
-    last_template_hash: str | None = None,
-    last_template_path: str | None = None,
-    last_template_version: str | None = None,
-    last_template_name: str | None = None,
-    last_working_profile_id: str | None = None,
-    last_selection_mode: str | None = None,
-    last_is_custom_template: bool | None = None,
-) -> None:
-    conn.execute(
-        """
-        INSERT INTO activity_state (
-            activity_id,
-            state,
-            last_job_id,
-            last_run_id,
-            last_profile_id,
-            last_title,
-            last_description_hash,
-            last_result_status,
-            last_error,
-            last_template_hash,
-            last_template_path,
-            last_template_version,
-            last_template_name,
-            last_working_profile_id,
-            last_selection_mode,
-            last_is_custom_template,
-            updated_at_utc
+    now_utc: datetime | None = None,
+) -> int:
+    now_iso = (now_utc.astimezone(timezone.utc) if now_utc else _utc_now()).isoformat()
+    rows: dict[tuple[str, str], tuple[Any, ...]] = {}
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        metric = str(entry.get("metric") or "").strip()
+        metric_date = str(entry.get("metric_date") or "").strip()
+        if not metric or not metric_date:
+            continue
+        expires_at = entry.get("expires_at_utc")
+        rows[(metric, metric_date)] = (
+            metric,
+            metric_date,
+            _to_json_string(entry.get("payload")),
+            now_iso,
+            expires_at.astimezone(timezone.utc).isoformat() if isinstance(expires_at, datetime) else None,
         )
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ON CONFLICT(activity_id) DO UPDATE SET
-            state = excluded.state,
-            last_job_id = COALESCE(excluded.last_job_id, activity_state.last_job_id),
-            last_run_id = COALESCE(excluded.last_run_id, activity_state.last_run_id),
-            last_profile_id = COALESCE(excluded.last_profile_id, activity_state.last_profile_id),
-            last_title = COALESCE(excluded.last_title, activity_state.last_title),
-            last_description_hash = COALESCE(excluded.last_description_hash, activity_state.last_description_hash),
-            last_result_status = COALESCE(excluded.last_result_status, activity_state.last_result_status),
-            last_error = excluded.last_error,
-            last_template_hash = COALESCE(excluded.last_template_hash, activity_state.last_template_hash),
-            last_template_path = COALESCE(excluded.last_template_path, activity_state.last_template_path),
-            last_template_version = COALESCE(excluded.last_template_version, activity_state.last_template_version),
-            last_template_name = COALESCE(excluded.last_template_name, activity_state.last_template_name),
-            last_working_profile_id = COALESCE(excluded.last_working_profile_id, activity_state.last_working_profile_id),
-            last_selection_mode = COALESCE(excluded.last_selection_mode, activity_state.last_selection_mode),
-            last_is_custom_template = COALESCE(excluded.last_is_custom_template, activity_state.last_is_custom_template),
-            updated_at_utc = excluded.updated_at_utc
-        """,
-        (
-            activity_id,
-            _normalize_job_status(state, default=JOB_STATUS_QUEUED),
-            last_job_id,
-            last_run_id,
-            last_profile_id,
-            last_title,
-            last_description_hash,
-            last_result_status,
-            last_error,
-            last_template_hash,
-            last_template_path,
-            last_template_version,
-            last_template_name,
-            last_working_profile_id,
-            last_selection_mode,
-            (1 if last_is_custom_template else 0) if isinstance(last_is_custom_template, bool) else None,
-            updated_at_utc,
-        ),
-    )
+    if not rows:
+        return 0
+    try:
+        with _connect_runtime_db(path) as conn:
+            conn.executemany(
+                """
+                INSERT INTO garmin_daily_metrics (
+                    metric,
+                    metric_date,
+                    payload_json,
+                    fetched_at_utc,
+                    expires_at_utc
+                )
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(metric, metric_date) DO UPDATE SET
+                    payload_json = excluded.payload_json,
+                    fetched_at_utc = excluded.fetched_at_utc,
+                    expires_at_utc = excluded.expires_at_utc
+                """,
+                list(rows.values()),
+            )
+    except sqlite3.Error:
+        return 0
+    return len(rows)
 
 
-def register_activity_discovery(
-    path: Path,
-    activity_id: int | str,
-    *,
-    sport_type: str | None = None,
-    start_date_utc: str | None = None,
-    discovered_at_utc: datetime | None = None,
-) -> None:
-    activity_id_str = str(activity_id).strip()
-    if not activity_id_str:
-        return
+def _utc_seconds_iso(value: datetime) -> str:
+    return value.astimezone(timezone.utc).replace(microsecond=0).isoformat()
 
-    now_iso = (discovered_at_utc.astimezone(timezone.utc) if discovered_at_utc else _utc_now()).isoformat()
 
+def replace_garmin_period_activities(
+    path: Path,
+    activities: list[dict[str, Any]],
+    *,
+    since_utc: datetime,
+) -> int:
+    since_iso = _utc_seconds_iso(since_utc)
+    now_iso = _utc_now_iso()
+    rows: dict[str, tuple[Any, ...]] = {}
+    for activity in activities:
+        if not isinstance(activity, dict):
+            continue
+        activity_id = str(activity.get("activity_id") or "").strip()
+        start_utc = _parse_utc(activity.get("start_utc"))
+        if not activity_id or start_utc is None:
+            continue
+        rows[activity_id] = (
+            activity_id,
+            _utc_seconds_iso(start_utc),
+            _optional_float(activity.get("calories")),
+            _optional_float(activity.get("gap_speed_mps")),
+            now_iso,
+        )
     try:
         with _connect_runtime_db(path) as conn:
-            conn.execute(
+            conn.execute("BEGIN IMMEDIATE")
+            # The fetched window is authoritative, so activities deleted or
+            # retyped in Garmin drop out of the rollups.
+            conn.execute("DELETE FROM garmin_period_activities WHERE start_utc >= ?", (since_iso,))
+            conn.executemany(
                 """
-                INSERT INTO activities (
+                INSERT INTO garmin_period_activities (
                     activity_id,
-                    first_seen_at_utc,
-                    last_seen_at_utc,
-                    sport_type,
-                    start_date_utc,
+                    start_utc,
+                    calories,
+                    gap_speed_mps,
                     updated_at_utc
                 )
-                VALUES (?, ?, ?, ?, ?, ?)
+                VALUES (?, ?, ?, ?, ?)
                 ON CONFLICT(activity_id) DO UPDATE SET
-                    last_seen_at_utc = excluded.last_seen_at_utc,
-                    sport_type = COALESCE(excluded.sport_type, activities.sport_type),
-                    start_date_utc = COALESCE(excluded.start_date_utc, activities.start_date_utc),
+                    start_utc = excluded.start_utc,
+                    calories = excluded.calories,
+                    gap_speed_mps = excluded.gap_speed_mps,
                     updated_at_utc = excluded.updated_at_utc
                 """,
-                (
-                    activity_id_str,
-                    now_iso,
-                    now_iso,
-                    sport_type.strip() if isinstance(sport_type, str) and sport_type.strip() else None,
-                    start_date_utc.strip() if isinstance(start_date_utc, str) and start_date_utc.strip() else None,
-                    now_iso,
-                ),
+                list(rows.values()),
             )
     except sqlite3.Error:
-        return
+        return 0
+    return len(rows)
 
 
-def enqueue_activity_job(
+def latest_garmin_period_activity_start(path: Path) -> datetime | None:
+    try:
+        with _connect_runtime_db(path) as conn:
+            row = conn.execute("SELECT MAX(start_utc) AS latest FROM garmin_period_activities").fetchone()
+    except sqlite3.Error:
+        return None
+    return _parse_utc(row["latest"]) if row is not None else None
+
+
+def summarize_garmin_period_activities(
     path: Path,
-    activity_id: int | str,
+    window_starts_utc: dict[str, datetime],
     *,
-    request_kind: str,
-    requested_by: str,
-    force_update: bool,
-    priority: int = 100,
-    available_at_utc: datetime | None = None,
-    max_attempts: int = 3,
-) -> str | None:
-    activity_id_str = str(activity_id).strip()
-    if not activity_id_str:
+    end_utc: datetime,
+) -> dict[str, dict[str, Any]] | None:
+    if not window_starts_utc:
+        return {}
+    periods = sorted(window_starts_utc)
+    select_parts: list[str] = []
+    params: list[Any] = []
+    for index, period in enumerate(periods):
+        start_iso = _utc_seconds_iso(window_starts_utc[period])
+        select_parts.extend(
+            [
+                f"SUM(CASE WHEN start_utc >= ? AND calories > 0 THEN calories ELSE 0 END) AS calories_{index}",
+                f"SUM(CASE WHEN start_utc >= ? AND gap_speed_mps > 0 THEN gap_speed_mps ELSE 0 END) AS gap_sum_{index}",
+                f"SUM(CASE WHEN start_utc >= ? AND gap_speed_mps > 0 THEN 1 ELSE 0 END) AS gap_count_{index}",
+            ]
+        )
+        params.extend([start_iso, start_iso, start_iso])
+    earliest_iso = _utc_seconds_iso(min(window_starts_utc.values()))
+    try:
+        with _connect_runtime_db(path) as conn:
+            row = conn.execute(
+                f"""
+                SELECT {", ".join(select_parts)}
+                FROM garmin_period_activities
+                WHERE start_utc >= ? AND start_utc < ?
+                """,
+                (*params, earliest_iso, _utc_seconds_iso(end_utc)),
+            ).fetchone()
+    except sqlite3.Error:
+        return None
+    if row is None:
         return None
+    return {
+        period: {
+            "calories": float(row[f"calories_{index}"] or 0.0),
+            "gap_speed_sum": float(row[f"gap_sum_{index}"] or 0.0),
+            "gap_count": int(row[f"gap_count_{index}"] or 0),
+        }
+        for index, period in enumerate(periods)
+    }
 
-    job_id = uuid.uuid4().hex
-    now = _utc_now()
-    now_iso = now.isoformat()
-    available_iso = (available_at_utc.astimezone(timezone.utc) if available_at_utc else now).isoformat()
-    max_attempts_value = max(1, int(max_attempts))
 
+def upsert_smashrun_activities(path: Path, records: list[dict[str, Any]]) -> int:
+    now_iso = _utc_now_iso()
+    rows: dict[int, tuple[Any, ...]] = {}
+    for record in records:
+        if not isinstance(record, dict):
+            continue
+        try:
+            activity_id = int(record.get("activity_id"))
+        except (TypeError, ValueError):
+            continue
+        start_utc = _parse_utc(record.get("start_utc"))
+        strava_id = str(record.get("strava_activity_id") or "").strip()
+        rows[activity_id] = (
+            activity_id,
+            _utc_seconds_iso(start_utc) if start_utc is not None else None,
+            strava_id or None,
+            _optional_float(record.get("distance_meters")),
+            _optional_float(record.get("elevation_feet")),
+            _to_json_string(record.get("payload") or {}),
+            now_iso,
+        )
+    if not rows:
+        return 0
     try:
         with _connect_runtime_db(path) as conn:
-            conn.execute("BEGIN IMMEDIATE")
-            conn.execute(
+            conn.executemany(
                 """
-                INSERT INTO activities (
+                INSERT INTO smashrun_activities (
                     activity_id,
-                    first_seen_at_utc,
-                    last_seen_at_utc,
-                    sport_type,
-                    start_date_utc,
+                    start_utc,
+                    strava_activity_id,
+                    distance_meters,
+                    elevation_feet,
+                    payload_json,
                     updated_at_utc
                 )
-                VALUES (?, ?, ?, NULL, NULL, ?)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
                 ON CONFLICT(activity_id) DO UPDATE SET
-                    last_seen_at_utc = excluded.last_seen_at_utc,
+                    start_utc = excluded.start_utc,
+                    strava_activity_id = excluded.strava_activity_id,
+                    distance_meters = excluded.distance_meters,
+                    elevation_feet = excluded.elevation_feet,
+                    payload_json = excluded.payload_json,
                     updated_at_utc = excluded.updated_at_utc
                 """,
-                (activity_id_str, now_iso, now_iso, now_iso),
+                list(rows.values()),
             )
-            conn.execute(
-                """
-                INSERT INTO jobs (
-                    job_id,
-                    activity_id,
-                    request_kind,
-                    requested_by,
-                    force_update,
-                    priority,
-                    status,
-                    attempt_count,
-                    max_attempts,
-                    requested_at_utc,
-                    available_at_utc,
-                    updated_at_utc
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, 0, ?, ?, ?, ?)
-                """,
-                (
-                    job_id,
-                    activity_id_str,
-                    str(request_kind or "auto_poll").strip() or "auto_poll",
-                    str(requested_by or "system").strip() or "system",
-                    1 if force_update else 0,
-                    int(priority),
-                    JOB_STATUS_QUEUED,
-                    max_attempts_value,
-                    now_iso,
-                    available_iso,
-                    now_iso,
-                ),
-            )
-            _upsert_activity_state(
-                conn,
-                activity_id=activity_id_str,
-                state=JOB_STATUS_QUEUED,
-                updated_at_utc=now_iso,
-                last_job_id=job_id,
-                last_result_status="queued",
-                last_error=None,
-            )
-        return job_id
+    except sqlite3.Error:
+        return 0
+    return len(rows)
+
+
+def latest_smashrun_activity_id(path: Path) -> int | None:
+    try:
+        with _connect_runtime_db(path) as conn:
+            row = conn.execute("SELECT MAX(activity_id) AS latest FROM smashrun_activities").fetchone()
     except sqlite3.Error:
         return None
+    if row is None or row["latest"] is None:
+        return None
+    return int(row["latest"])
 
 
-def claim_activity_job(
+def list_smashrun_activities(
     path: Path,
-    job_id: str,
     *,
-    owner: str,
-    lease_seconds: int,
-    now_utc: datetime | None = None,
-) -> bool:
-    job_id_value = str(job_id).strip()
-    owner_value = str(owner).strip()
-    if not job_id_value or not owner_value:
-        return False
+    strava_activity_id: str | None = None,
+    start_from_utc: datetime | None = None,
+    start_before_utc: datetime | None = None,
+    limit: int | None = None,
+) -> list[dict[str, Any]]:
+    clauses: list[str] = []
+    params: list[Any] = []
+    if strava_activity_id is not None:
+        clauses.append("strava_activity_id = ?")
+        params.append(str(strava_activity_id).strip())
+    if start_from_utc is not None:
+        clauses.append("start_utc >= ?")
+        params.append(_utc_seconds_iso(start_from_utc))
+    if start_before_utc is not None:
+        clauses.append("start_utc < ?")
+        params.append(_utc_seconds_iso(start_before_utc))
+    query = "SELECT payload_json FROM smashrun_activities"
+    if clauses:
+        query += " WHERE " + " AND ".join(clauses)
+    query += " ORDER BY start_utc DESC, activity_id DESC"
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(max(1, int(limit)))
+    try:
+        with _connect_runtime_db(path) as conn:
+            rows = conn.execute(query, params).fetchall()
+    except sqlite3.Error:
+        return []
+    activities: list[dict[str, Any]] = []
+    for row in rows:
+        payload = _from_json_string(row["payload_json"])
+        if isinstance(payload, dict):
+            activities.append(payload)
+    return activities
 
-    now = now_utc.astimezone(timezone.utc) if now_utc else _utc_now()
-    now_iso = now.isoformat()
-    lease_expires_iso = (now + timedelta(seconds=max(30, int(lease_seconds)))).isoformat()
 
+def sum_smashrun_elevation(
+    path: Path,
+    window_starts_utc: dict[str, datetime],
+    *,
+    end_utc: datetime,
+) -> dict[str, float]:
+    totals = {period: 0.0 for period in window_starts_utc}
+    if not window_starts_utc:
+        return totals
+    periods = sorted(window_starts_utc)
+    select_parts = [
+        f"SUM(CASE WHEN start_utc >= ? THEN elevation_feet ELSE 0 END) AS elevation_{index}"
+        for index, _period in enumerate(periods)
+    ]
+    params = [_utc_seconds_iso(window_starts_utc[period]) for period in periods]
     try:
         with _connect_runtime_db(path) as conn:
-            conn.execute("BEGIN IMMEDIATE")
             row = conn.execute(
-                """
-                SELECT activity_id, status, available_at_utc
-                FROM jobs
-                WHERE job_id = ?
-                LIMIT 1
+                f"""
+                SELECT {", ".join(select_parts)}
+                FROM smashrun_activities
+                WHERE elevation_feet IS NOT NULL
+                  AND start_utc >= ?
+                  AND start_utc < ?
                 """,
-                (job_id_value,),
+                (*params, _utc_seconds_iso(min(window_starts_utc.values())), _utc_seconds_iso(end_utc)),
             ).fetchone()
-            if row is None:
-                return False
+    except sqlite3.Error:
+        return totals
+    if row is None:
+        return totals
+    return {period: float(row[f"elevation_{index}"] or 0.0) for index, period in enumerate(periods)}
 
-            status = _status_value(row["status"])
-            if status not in {JOB_STATUS_QUEUED, JOB_STATUS_RETRY_WAIT}:
-                return False
 
-            available_at = _parse_utc(row["available_at_utc"])
-            if available_at is not None and available_at > now:
-                return False
+def _weather_hour_row_to_dict(row: sqlite3.Row) -> dict[str, Any]:
+    hour = _from_json_string(row["hour_json"])
+    return hour if isinstance(hour, dict) else {}
 
-            conn.execute(
-                """
-                UPDATE jobs
-                SET
-                    status = ?,
-                    lease_owner = ?,
-                    lease_expires_at_utc = ?,
-                    updated_at_utc = ?
-                WHERE job_id = ?
-                """,
+
+def get_weather_days(
+    path: Path,
+    keys: list[tuple[str, str]],
+    *,
+    now_utc: datetime | None = None,
+) -> dict[tuple[str, str], dict[str, Any]]:
+    wanted = sorted({(str(cell), str(local_date)) for cell, local_date in keys if cell and local_date})
+    if not wanted:
+        return {}
+    now_iso = (now_utc.astimezone(timezone.utc) if now_utc else _utc_now()).isoformat()
+    found: dict[tuple[str, str], dict[str, Any]] = {}
+    try:
+        with _connect_runtime_db(path) as conn:
+            for cell in sorted({cell for cell, _ in wanted}):
+                dates = [local_date for key_cell, local_date in wanted if key_cell == cell]
+                for chunk in _chunked(dates):
+                    placeholders = ", ".join("?" for _ in chunk)
+                    for row in conn.execute(
+                        f"""
+                        SELECT cell, local_date, tz_id, hour_json
+                        FROM weather_hours
+                        WHERE cell = ?
+                          AND local_date IN ({placeholders})
+                          AND (expires_at_utc IS NULL OR expires_at_utc > ?)
+                        ORDER BY local_date ASC, hour_epoch ASC
+                        """,
+                        (cell, *chunk, now_iso),
+                    ).fetchall():
+                        day = found.setdefault(
+                            (str(row["cell"]), str(row["local_date"])),
+                            {"tz_id": row["tz_id"], "hours": []},
+                        )
+                        day["hours"].append(_weather_hour_row_to_dict(row))
+    except sqlite3.Error:
+        return {}
+    return found
+
+
+def upsert_weather_days(
+    path: Path,
+    days: list[dict[str, Any]],
+    *,
+    now_utc: datetime | None = None,
+) -> int:
+    now_iso = (now_utc.astimezone(timezone.utc) if now_utc else _utc_now()).isoformat()
+    replaced: dict[tuple[str, str], list[tuple[Any, ...]]] = {}
+    for day in days:
+        if not isinstance(day, dict):
+            continue
+        cell = str(day.get("cell") or "").strip()
+        local_date = str(day.get("local_date") or "").strip()
+        hours = day.get("hours")
+        if not cell or not local_date or not isinstance(hours, list):
+            continue
+        expires_at = day.get("expires_at_utc")
+        expires_iso = expires_at.astimezone(timezone.utc).isoformat() if isinstance(expires_at, datetime) else None
+        tz_id = day.get("tz_id") if isinstance(day.get("tz_id"), str) else None
+        rows: list[tuple[Any, ...]] = []
+        for hour in hours:
+            if not isinstance(hour, dict):
+                continue
+            try:
+                hour_epoch = int(hour.get("time_epoch"))
+            except (TypeError, ValueError):
+                continue
+            is_day = hour.get("is_day")
+            rows.append(
                 (
-                    JOB_STATUS_CLAIMED,
-                    owner_value,
-                    lease_expires_iso,
+                    cell,
+                    local_date,
+                    hour_epoch,
+                    tz_id,
+                    _optional_float(hour.get("temp_f")),
+                    _optional_float(hour.get("dewpoint_f")),
+                    _optional_float(hour.get("humidity")),
+                    _optional_float(hour.get("wind_mph")),
+                    _optional_float(hour.get("cloud")),
+                    _optional_float(hour.get("precip_in")),
+                    None if is_day is None else int(bool(is_day)),
+                    _to_json_string(hour),
                     now_iso,
-                    job_id_value,
-                ),
-            )
-            _upsert_activity_state(
-                conn,
-                activity_id=str(row["activity_id"]),
-                state=JOB_STATUS_CLAIMED,
-                updated_at_utc=now_iso,
-                last_job_id=job_id_value,
-                last_result_status="claimed",
-                last_error=None,
+                    expires_iso,
+                )
             )
-        return True
+        if rows:
+            replaced[(cell, local_date)] = rows
+    if not replaced:
+        return 0
+    try:
+        with _connect_runtime_db(path) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for (cell, local_date), rows in replaced.items():
+                conn.execute(
+                    "DELETE FROM weather_hours WHERE cell = ? AND local_date = ?",
+                    (cell, local_date),
+                )
+                conn.executemany(
+                    """
+                    INSERT INTO weather_hours (
+                        cell,
+                        local_date,
+                        hour_epoch,
+                        tz_id,
+                        temp_f,
+                        dewpoint_f,
+                        humidity,
+                        wind_mph,
+                        cloud,
+                        precip_in,
+                        is_day,
+                        hour_json,
+                        fetched_at_utc,
+                        expires_at_utc
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    rows,
+                )
     except sqlite3.Error:
-        return False
+        return 0
+    return len(replaced)
 
 
-def start_activity_job_run(
+def get_weather_aqi(
     path: Path,
-    job_id: str,
+    cell: str,
     *,
-    owner: str,
     now_utc: datetime | None = None,
 ) -> dict[str, Any] | None:
-    job_id_value = str(job_id).strip()
-    owner_value = str(owner).strip()
-    if not job_id_value or not owner_value:
-        return None
-
-    now = now_utc.astimezone(timezone.utc) if now_utc else _utc_now()
-    now_iso = now.isoformat()
-    run_id = uuid.uuid4().hex
-
+    now_iso = (now_utc.astimezone(timezone.utc) if now_utc else _utc_now()).isoformat()
     try:
         with _connect_runtime_db(path) as conn:
-            conn.execute("BEGIN IMMEDIATE")
             row = conn.execute(
                 """
-                SELECT activity_id, status, attempt_count, max_attempts, force_update, lease_owner, lease_expires_at_utc
-                FROM jobs
-                WHERE job_id = ?
-                LIMIT 1
+                SELECT us_epa_index, fetched_at_utc
+                FROM weather_aqi
+                WHERE cell = ?
+                  AND expires_at_utc > ?
                 """,
-                (job_id_value,),
+                (str(cell), now_iso),
             ).fetchone()
-            if row is None:
-                return None
-            if _status_value(row["status"]) != JOB_STATUS_CLAIMED:
-                return None
-            if str(row["lease_owner"] or "").strip() != owner_value:
-                return None
-            lease_expires = _parse_utc(row["lease_expires_at_utc"])
-            if lease_expires is not None and lease_expires <= now:
-                return None
+    except sqlite3.Error:
+        return None
+    if row is None:
+        return None
+    return {
+        "us_epa_index": None if row["us_epa_index"] is None else int(row["us_epa_index"]),
+        "fetched_at_utc": row["fetched_at_utc"],
+    }
 
-            attempt_number = int(row["attempt_count"]) + 1
+
+def upsert_weather_aqi(
+    path: Path,
+    cell: str,
+    us_epa_index: int | None,
+    *,
+    expires_at_utc: datetime,
+    now_utc: datetime | None = None,
+) -> bool:
+    now_iso = (now_utc.astimezone(timezone.utc) if now_utc else _utc_now()).isoformat()
+    try:
+        with _connect_runtime_db(path) as conn:
             conn.execute(
                 """
-                UPDATE jobs
-                SET
-                    status = ?,
-                    attempt_count = ?,
-                    started_at_utc = COALESCE(started_at_utc, ?),
-                    run_id = ?,
-                    updated_at_utc = ?
-                WHERE job_id = ?
+                INSERT INTO weather_aqi (cell, us_epa_index, fetched_at_utc, expires_at_utc)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(cell) DO UPDATE SET
+                    us_epa_index = excluded.us_epa_index,
+                    fetched_at_utc = excluded.fetched_at_utc,
+                    expires_at_utc = excluded.expires_at_utc
                 """,
                 (
-                    JOB_STATUS_RUNNING,
-                    attempt_number,
-                    now_iso,
-                    run_id,
+                    str(cell),
+                    None if us_epa_index is None else int(us_epa_index),
                     now_iso,
-                    job_id_value,
+                    expires_at_utc.astimezone(timezone.utc).isoformat(),
                 ),
             )
-            conn.execute(
+    except sqlite3.Error:
+        return False
+    return True
+
+
+def register_activity_weather_targets(path: Path, targets: list[dict[str, Any]]) -> int:
+    now_iso = _utc_now_iso()
+    rows: dict[str, tuple[Any, ...]] = {}
+    for target in targets:
+        if not isinstance(target, dict):
+            continue
+        activity_id = str(target.get("activity_id") or "").strip()
+        start_utc = _parse_utc(target.get("start_utc"))
+        cell = str(target.get("cell") or "").strip()
+        local_date = str(target.get("local_date") or "").strip()
+        if not activity_id or start_utc is None or not cell or not local_date:
+            continue
+        rows[activity_id] = (activity_id, _utc_seconds_iso(start_utc), cell, local_date, now_iso)
+    if not rows:
+        return 0
+    try:
+        with _connect_runtime_db(path) as conn:
+            conn.executemany(
                 """
-                INSERT INTO runs (
-                    run_id,
-                    job_id,
+                INSERT INTO activity_misery_scores (
                     activity_id,
-                    attempt_number,
-                    worker_owner,
-                    status,
-                    started_at_utc,
+                    start_utc,
+                    cell,
+                    local_date,
                     updated_at_utc
                 )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(activity_id) DO UPDATE SET
+                    start_utc = excluded.start_utc,
+                    cell = excluded.cell,
+                    local_date = excluded.local_date,
+                    updated_at_utc = excluded.updated_at_utc
                 """,
-                (
-                    run_id,
-                    job_id_value,
-                    str(row["activity_id"]),
-                    attempt_number,
-                    owner_value,
-                    JOB_STATUS_RUNNING,
-                    now_iso,
-                    now_iso,
-                ),
-            )
-            _upsert_activity_state(
-                conn,
-                activity_id=str(row["activity_id"]),
-                state=JOB_STATUS_RUNNING,
-                updated_at_utc=now_iso,
-                last_job_id=job_id_value,
-                last_run_id=run_id,
-                last_result_status="running",
-                last_error=None,
+                list(rows.values()),
             )
-            return {
-                "job_id": job_id_value,
-                "run_id": run_id,
-                "activity_id": str(row["activity_id"]),
-                "attempt_number": attempt_number,
-                "max_attempts": int(row["max_attempts"]),
-                "force_update": bool(int(row["force_update"])),
-            }
     except sqlite3.Error:
-        return None
+        return 0
+    return len(rows)
 
 
-def complete_activity_job_run(
+def list_activity_weather_inputs(
     path: Path,
-    job_id: str,
-    run_id: str,
     *,
-    owner: str,
-    outcome: str,
-    error: str | None = None,
-    result: Any = None,
-    retry_delay_seconds: int = 300,
-    now_utc: datetime | None = None,
-) -> str | None:
-    job_id_value = str(job_id).strip()
-    run_id_value = str(run_id).strip()
-    owner_value = str(owner).strip()
-    if not job_id_value or not run_id_value or not owner_value:
-        return None
-
-    normalized_outcome = _normalize_job_status(outcome, default=JOB_STATUS_FAILED_PERMANENT)
-    if normalized_outcome not in {JOB_STATUS_SUCCEEDED, JOB_STATUS_FAILED_PERMANENT, JOB_STATUS_RETRY_WAIT, JOB_STATUS_CANCELLED}:
+    activity_ids: list[str] | None = None,
+) -> list[dict[str, Any]]:
+    # Each registered activity is paired with the stored hour nearest its start; SQLite
+    # returns bare columns from the row that produced MIN().
+    select = """
+        SELECT
+            targets.activity_id,
+            hours.hour_json,
+            MIN(ABS(hours.hour_epoch - CAST(strftime('%s', targets.start_utc) AS INTEGER))) AS distance_seconds
+        FROM activity_misery_scores AS targets
+        LEFT JOIN weather_hours AS hours
+          ON hours.cell = targets.cell
+         AND hours.local_date = targets.local_date
+    """
+    grouping = " GROUP BY targets.activity_id ORDER BY targets.start_utc ASC"
+    try:
+        with _connect_runtime_db(path) as conn:
+            if activity_ids is None:
+                rows = conn.execute(select + grouping).fetchall()
+            else:
+                rows = []
+                for chunk in _chunked([str(item) for item in activity_ids]):
+                    placeholders = ", ".join("?" for _ in chunk)
+                    rows.extend(
+                        conn.execute(
+                            select + f" WHERE targets.activity_id IN ({placeholders})" + grouping,
+                            chunk,
+                        ).fetchall()
+                    )
+    except sqlite3.Error:
+        return []
+    inputs: list[dict[str, Any]] = []
+    for row in rows:
+        hour = _from_json_string(row["hour_json"]) if row["hour_json"] is not None else None
+        inputs.append({"activity_id": str(row["activity_id"]), "hour": hour if isinstance(hour, dict) else None})
+    return inputs
+
+
+def write_activity_misery_scores(
+    path: Path,
+    scores: list[dict[str, Any]],
+    *,
+    now_utc: datetime | None = None,
+) -> int:
+    now_iso = (now_utc.astimezone(timezone.utc) if now_utc else _utc_now()).isoformat()
+    rows: dict[str, tuple[Any, ...]] = {}
+    for score in scores:
+        if not isinstance(score, dict):
+            continue
+        activity_id = str(score.get("activity_id") or "").strip()
+        if not activity_id:
+            continue
+        rows[activity_id] = (
+            _optional_float(score.get("score")),
+            score.get("polarity"),
+            score.get("severity"),
+            score.get("emoji"),
+            score.get("description"),
+            _to_json_string(score.get("components")) if score.get("components") is not None else None,
+            now_iso,
+            now_iso,
+            activity_id,
+        )
+    if not rows:
+        return 0
+    try:
+        with _connect_runtime_db(path) as conn:
+            updated = conn.executemany(
+                """
+                UPDATE activity_misery_scores
+                SET misery_index = ?,
+                    polarity = ?,
+                    severity = ?,
+                    emoji = ?,
+                    description = ?,
+                    components_json = ?,
+                    computed_at_utc = ?,
+                    updated_at_utc = ?
+                WHERE activity_id = ?
+                """,
+                list(rows.values()),
+            )
+    except sqlite3.Error:
+        return 0
+    return int(max(0, updated.rowcount))
+
+
+def list_activity_misery_scores(
+    path: Path,
+    *,
+    activity_ids: list[str] | None = None,
+    start_from_utc: datetime | None = None,
+    limit: int | None = None,
+) -> list[dict[str, Any]]:
+    clauses = ["computed_at_utc IS NOT NULL"]
+    params: list[Any] = []
+    if activity_ids is not None:
+        wanted = [str(item) for item in activity_ids][:_SQLITE_IN_CHUNK_SIZE]
+        if not wanted:
+            return []
+        clauses.append(f"activity_id IN ({', '.join('?' for _ in wanted)})")
+        params.extend(wanted)
+    if start_from_utc is not None:
+        clauses.append("start_utc >= ?")
+        params.append(_utc_seconds_iso(start_from_utc))
+    query = f"""
+        SELECT activity_id, start_utc, local_date, misery_index, polarity, severity,
+               emoji, description, components_json, computed_at_utc
+        FROM activity_misery_scores
+        WHERE {" AND ".join(clauses)}
+        ORDER BY start_utc DESC
+    """
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(max(1, int(limit)))
+    try:
+        with _connect_runtime_db(path) as conn:
+            rows = conn.execute(query, params).fetchall()
+    except sqlite3.Error:
+        return []
+    return [
+        {
+            "activity_id": str(row["activity_id"]),
+            "start_utc": row["start_utc"],
+            "local_date": row["local_date"],
+            "misery_index": row["misery_index"],
+            "polarity": row["polarity"],
+            "severity": row["severity"],
+            "emoji": row["emoji"],
+            "description": row["description"],
+            "components": _from_json_string(row["components_json"]) if row["components_json"] else None,
+            "computed_at_utc": row["computed_at_utc"],
+        }
+        for row in rows
+    ]
+
+
+def set_worker_heartbeat(path: Path, heartbeat_utc: datetime | None = None) -> None:
+    now = heartbeat_utc.astimezone(timezone.utc) if heartbeat_utc else _utc_now()
+    set_runtime_value(path, "worker.last_heartbeat_utc", now.isoformat())
+
+
+def get_worker_heartbeat(path: Path) -> datetime | None:
+    raw = get_runtime_value(path, "worker.last_heartbeat_utc")
+    return _parse_utc(raw)
+
+
+def is_worker_healthy(
+    path: Path,
+    max_age_seconds: int,
+    now_utc: datetime | None = None,
+) -> bool:
+    heartbeat = get_worker_heartbeat(path)
+    if heartbeat is None:
+        return False
+    now = now_utc.astimezone(timezone.utc) if now_utc else _utc_now()
+    age = (now - heartbeat).total_seconds()
+    return age <= max(30, int(max_age_seconds))
+
+
+def acquire_runtime_lock(
+    path: Path,
+    lock_name: str,
+    owner: str,
+    ttl_seconds: int,
+    now_utc: datetime | None = None,
+) -> bool:
+    now = now_utc.astimezone(timezone.utc) if now_utc else _utc_now()
+    expires = now + timedelta(seconds=max(30, int(ttl_seconds)))
+    now_iso = now.isoformat()
+    expires_iso = expires.isoformat()
+
+    try:
+        with _connect_runtime_db(path) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                """
+                SELECT owner, expires_at_utc
+                FROM runtime_locks
+                WHERE lock_name = ?
+                LIMIT 1
+                """,
+                (lock_name,),
+            ).fetchone()
+
+            if row:
+                current_owner = str(row[0])
+                expires_at = _parse_utc(row[1])
+                if expires_at and expires_at > now and current_owner != owner:
+                    return False
+
+            conn.execute(
+                """
+                INSERT INTO runtime_locks (lock_name, owner, acquired_at_utc, expires_at_utc)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(lock_name) DO UPDATE SET
+                    owner = excluded.owner,
+                    acquired_at_utc = excluded.acquired_at_utc,
+                    expires_at_utc = excluded.expires_at_utc
+                """,
+                (lock_name, owner, now_iso, expires_iso),
+            )
+        return True
+    except sqlite3.Error:
+        return False
+
+
+def release_runtime_lock(path: Path, lock_name: str, owner: str) -> None:
+    try:
+        with _connect_runtime_db(path) as conn:
+            conn.execute(
+                "DELETE FROM runtime_locks WHERE lock_name = ? AND owner = ?",
+                (lock_name, owner),
+            )
+    except sqlite3.Error:
+        return
+
+
+def _status_value(value: Any) -> str:
+    return str(value or "").strip().lower()
+
+
+def _normalize_job_status(status: str, *, default: str = JOB_STATUS_QUEUED) -> str:
+    normalized = _status_value(status)
+    if normalized in JOB_STATUS_ALL:
+        return normalized
+    return default
+
+
+def _description_hash(description: str | None) -> str | None:
+    if not isinstance(description, str):
+        return None
+    text = description.strip()
+    if not text:
+        return None
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _to_job_dict(row: sqlite3.Row | None) -> dict[str, Any] | None:
+    if row is None:
+        return None
+    return {
+        "job_id": str(row["job_id"]),
+        "activity_id": _job_target(row["activity_id"]),
+        "request_kind": str(row["request_kind"]),
+        "requested_by": str(row["requested_by"]),
+        "force_update": bool(int(row["force_update"])),
+        "priority": int(row["priority"]),
+        "status": _status_value(row["status"]),
+        "attempt_count": int(row["attempt_count"]),
+        "max_attempts": int(row["max_attempts"]),
+        "requested_at_utc": str(row["requested_at_utc"]),
+        "available_at_utc": str(row["available_at_utc"]),
+        "lease_owner": str(row["lease_owner"]) if row["lease_owner"] is not None else None,
+        "lease_expires_at_utc": (
+            str(row["lease_expires_at_utc"]) if row["lease_expires_at_utc"] is not None else None
+        ),
+        "started_at_utc": str(row["started_at_utc"]) if row["started_at_utc"] is not None else None,
+        "finished_at_utc": str(row["finished_at_utc"]) if row["finished_at_utc"] is not None else None,
+        "run_id": str(row["run_id"]) if row["run_id"] is not None else None,
+        "last_error": str(row["last_error"]) if row["last_error"] is not None else None,
+        "last_result_json": str(row["last_result_json"]) if row["last_result_json"] is not None else None,
+        "updated_at_utc": str(row["updated_at_utc"]),
+    }
+
+
+def _upsert_activity_state(
+    conn: sqlite3.Connection,
+    *,
+    activity_id: str,
+    state: str,
+    updated_at_utc: str,
+    last_job_id: str | None = None,
+    last_run_id: str | None = None,
+    last_profile_id: str | None = None,
+    last_title: str | None = None,
+    last_description_hash: str | None = None,
+    last_result_status: str | None = None,
+    last_error: str | None = None,
+    last_template_hash: str | None = None,
+    last_template_path: str | None = None,
+    last_template_version: str | None = None,
+    last_template_name: str | None = None,
+    last_working_profile_id: str | None = None,
+    last_selection_mode: str | None = None,
+    last_is_custom_template: bool | None = None,
+) -> None:
+    if activity_id == ACTIVITY_JOB_LATEST_TARGET:
+        return
+    conn.execute(
+        """
+        INSERT INTO activity_state (
+            activity_id,
+            state,
+            last_job_id,
+            last_run_id,
+            last_profile_id,
+            last_title,
+            last_description_hash,
+            last_result_status,
+            last_error,
+            last_template_hash,
+            last_template_path,
+            last_template_version,
+            last_template_name,
+            last_working_profile_id,
+            last_selection_mode,
+            last_is_custom_template,
+            updated_at_utc
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(activity_id) DO UPDATE SET
+            state = excluded.state,
+            last_job_id = COALESCE(excluded.last_job_id, activity_state.last_job_id),
+            last_run_id = COALESCE(excluded.last_run_id, activity_state.last_run_id),
+            last_profile_id = COALESCE(excluded.last_profile_id, activity_state.last_profile_id),
+            last_title = COALESCE(excluded.last_title, activity_state.last_title),
+            last_description_hash = COALESCE(excluded.last_description_hash, activity_state.last_description_hash),
+            last_result_status = COALESCE(excluded.last_result_status, activity_state.last_result_status),
+            last_error = excluded.last_error,
+            last_template_hash = COALESCE(excluded.last_template_hash, activity_state.last_template_hash),
+            last_template_path = COALESCE(excluded.last_template_path, activity_state.last_template_path),
+            last_template_version = COALESCE(excluded.last_template_version, activity_state.last_template_version),
+            last_template_name = COALESCE(excluded.last_template_name, activity_state.last_template_name),
+            last_working_profile_id = COALESCE(excluded.last_working_profile_id, activity_state.last_working_profile_id),
+            last_selection_mode = COALESCE(excluded.last_selection_mode, activity_state.last_selection_mode),
+            last_is_custom_template = COALESCE(excluded.last_is_custom_template, activity_state.last_is_custom_template),
+            updated_at_utc = excluded.updated_at_utc
+        """,
+        (
+            activity_id,
+            _normalize_job_status(state, default=JOB_STATUS_QUEUED),
+            last_job_id,
+            last_run_id,
+            last_profile_id,
+            last_title,
+            last_description_hash,
+            last_result_status,
+            last_error,
+            last_template_hash,
+            last_template_path,
+            last_template_version,
+            last_template_name,
+            last_working_profile_id,
+            last_selection_mode,
+            (1 if last_is_custom_template else 0) if isinstance(last_is_custom_template, bool) else None,
+            updated_at_utc,
+        ),
+    )
+
+
+def register_activity_discovery(
+    path: Path,
+    activity_id: int | str,
+    *,
+    sport_type: str | None = None,
+    start_date_utc: str | None = None,
+    discovered_at_utc: datetime | None = None,
+) -> None:
+    activity_id_str = str(activity_id).strip()
+    if not activity_id_str:
+        return
+
+    now_iso = (discovered_at_utc.astimezone(timezone.utc) if discovered_at_utc else _utc_now()).isoformat()
+
+    try:
+        with _connect_runtime_db(path) as conn:
+            conn.execute(
+                """
+                INSERT INTO activities (
+                    activity_id,
+                    first_seen_at_utc,
+                    last_seen_at_utc,
+                    sport_type,
+                    start_date_utc,
+                    updated_at_utc
+                )
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(activity_id) DO UPDATE SET
+                    last_seen_at_utc = excluded.last_seen_at_utc,
+                    sport_type = COALESCE(excluded.sport_type, activities.sport_type),
+                    start_date_utc = COALESCE(excluded.start_date_utc, activities.start_date_utc),
+                    updated_at_utc = excluded.updated_at_utc
+                """,
+                (
+                    activity_id_str,
+                    now_iso,
+                    now_iso,
+                    sport_type.strip() if isinstance(sport_type, str) and sport_type.strip() else None,
+                    start_date_utc.strip() if isinstance(start_date_utc, str) and start_date_utc.strip() else None,
+                    now_iso,
+                ),
+            )
+    except sqlite3.Error:
+        return
+
+
+def enqueue_activity_job(
+    path: Path,
+    activity_id: int | str,
+    *,
+    request_kind: str,
+    requested_by: str,
+    force_update: bool,
+    priority: int = 100,
+    available_at_utc: datetime | None = None,
+    max_attempts: int = 3,
+) -> str | None:
+    activity_id_str = str(activity_id).strip()
+    if not activity_id_str:
+        return None
+
+    # "latest" jobs have no activity row until the worker resolves and binds the target.
+    job_activity_id = None if activity_id_str == ACTIVITY_JOB_LATEST_TARGET else activity_id_str
+    job_id = uuid.uuid4().hex
+    now = _utc_now()
+    now_iso = now.isoformat()
+    available_iso = (available_at_utc.astimezone(timezone.utc) if available_at_utc else now).isoformat()
+    max_attempts_value = max(1, int(max_attempts))
+
+    try:
+        with _connect_runtime_db(path) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            if job_activity_id is not None:
+                conn.execute(
+                    """
+                    INSERT INTO activities (
+                        activity_id,
+                        first_seen_at_utc,
+                        last_seen_at_utc,
+                        sport_type,
+                        start_date_utc,
+                        updated_at_utc
+                    )
+                    VALUES (?, ?, ?, NULL, NULL, ?)
+                    ON CONFLICT(activity_id) DO UPDATE SET
+                        last_seen_at_utc = excluded.last_seen_at_utc,
+                        updated_at_utc = excluded.updated_at_utc
+                    """,
+                    (activity_id_str, now_iso, now_iso, now_iso),
+                )
+            conn.execute(
+                """
+                INSERT INTO jobs (
+                    job_id,
+                    activity_id,
+                    request_kind,
+                    requested_by,
+                    force_update,
+                    priority,
+                    status,
+                    attempt_count,
+                    max_attempts,
+                    requested_at_utc,
+                    available_at_utc,
+                    updated_at_utc
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, 0, ?, ?, ?, ?)
+                """,
+                (
+                    job_id,
+                    job_activity_id,
+                    str(request_kind or "auto_poll").strip() or "auto_poll",
+                    str(requested_by or "system").strip() or "system",
+                    1 if force_update else 0,
+                    int(priority),
+                    JOB_STATUS_QUEUED,
+                    max_attempts_value,
+                    now_iso,
+                    available_iso,
+                    now_iso,
+                ),
+            )
+            _upsert_activity_state(
+                conn,
+                activity_id=activity_id_str,
+                state=JOB_STATUS_QUEUED,
+                updated_at_utc=now_iso,
+                last_job_id=job_id,
+                last_result_status="queued",
+                last_error=None,
+            )
+            _append_job_change_event(
+                conn,
+                job_id,
+                activity_id=activity_id_str,
+                status=JOB_STATUS_QUEUED,
+                created_at_utc=now_iso,
+                request_kind=str(request_kind or "auto_poll").strip() or "auto_poll",
+            )
+        return job_id
+    except sqlite3.Error:
+        return None
+
+
+def claim_activity_job(
+    path: Path,
+    job_id: str,
+    *,
+    owner: str,
+    lease_seconds: int,
+    now_utc: datetime | None = None,
+) -> bool:
+    job_id_value = str(job_id).strip()
+    owner_value = str(owner).strip()
+    if not job_id_value or not owner_value:
+        return False
+
+    now = now_utc.astimezone(timezone.utc) if now_utc else _utc_now()
+    now_iso = now.isoformat()
+    lease_expires_iso = (now + timedelta(seconds=max(30, int(lease_seconds)))).isoformat()
+
+    try:
+        with _connect_runtime_db(path) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                """
+                SELECT activity_id, status, available_at_utc
+                FROM jobs
+                WHERE job_id = ?
+                LIMIT 1
+                """,
+                (job_id_value,),
+            ).fetchone()
+            if row is None:
+                return False
+
+            status = _status_value(row["status"])
+            if status not in {JOB_STATUS_QUEUED, JOB_STATUS_RETRY_WAIT}:
+                return False
+
+            available_at = _parse_utc(row["available_at_utc"])
+            if available_at is not None and available_at > now:
+                return False
+
+            conn.execute(
+                """
+                UPDATE jobs
+                SET
+                    status = ?,
+                    lease_owner = ?,
+                    lease_expires_at_utc = ?,
+                    updated_at_utc = ?
+                WHERE job_id = ?
+                """,
+                (
+                    JOB_STATUS_CLAIMED,
+                    owner_value,
+                    lease_expires_iso,
+                    now_iso,
+                    job_id_value,
+                ),
+            )
+            _upsert_activity_state(
+                conn,
+                activity_id=_job_target(row["activity_id"]),
+                state=JOB_STATUS_CLAIMED,
+                updated_at_utc=now_iso,
+                last_job_id=job_id_value,
+                last_result_status="claimed",
+                last_error=None,
+            )
+            _append_job_change_event(
+                conn,
+                job_id_value,
+                activity_id=_job_target(row["activity_id"]),
+                status=JOB_STATUS_CLAIMED,
+                created_at_utc=now_iso,
+            )
+        return True
+    except sqlite3.Error:
+        return False
+
+
+def start_activity_job_run(
+    path: Path,
+    job_id: str,
+    *,
+    owner: str,
+    now_utc: datetime | None = None,
+) -> dict[str, Any] | None:
+    job_id_value = str(job_id).strip()
+    owner_value = str(owner).strip()
+    if not job_id_value or not owner_value:
+        return None
+
+    now = now_utc.astimezone(timezone.utc) if now_utc else _utc_now()
+    now_iso = now.isoformat()
+    run_id = uuid.uuid4().hex
+
+    try:
+        with _connect_runtime_db(path) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                """
+                SELECT activity_id, status, attempt_count, max_attempts, force_update, lease_owner, lease_expires_at_utc
+                FROM jobs
+                WHERE job_id = ?
+                LIMIT 1
+                """,
+                (job_id_value,),
+            ).fetchone()
+            if row is None:
+                return None
+            if _status_value(row["status"]) != JOB_STATUS_CLAIMED:
+                return None
+            if str(row["lease_owner"] or "").strip() != owner_value:
+                return None
+            lease_expires = _parse_utc(row["lease_expires_at_utc"])
+            if lease_expires is not None and lease_expires <= now:
+                return None
+
+            attempt_number = int(row["attempt_count"]) + 1
+            conn.execute(
+                """
+                UPDATE jobs
+                SET
+                    status = ?,
+                    attempt_count = ?,
+                    started_at_utc = COALESCE(started_at_utc, ?),
+                    run_id = ?,
+                    updated_at_utc = ?
+                WHERE job_id = ?
+                """,
+                (
+                    JOB_STATUS_RUNNING,
+                    attempt_number,
+                    now_iso,
+                    run_id,
+                    now_iso,
+                    job_id_value,
+                ),
+            )
+            conn.execute(
+                """
+                INSERT INTO runs (
+                    run_id,
+                    job_id,
+                    activity_id,
+                    attempt_number,
+                    worker_owner,
+                    status,
+                    started_at_utc,
+                    updated_at_utc
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    run_id,
+                    job_id_value,
+                    row["activity_id"],
+                    attempt_number,
+                    owner_value,
+                    JOB_STATUS_RUNNING,
+                    now_iso,
+                    now_iso,
+                ),
+            )
+            _upsert_activity_state(
+                conn,
+                activity_id=_job_target(row["activity_id"]),
+                state=JOB_STATUS_RUNNING,
+                updated_at_utc=now_iso,
+                last_job_id=job_id_value,
+                last_run_id=run_id,
+                last_result_status="running",
+                last_error=None,
+            )
+            _append_job_change_event(
+                conn,
+                job_id_value,
+                activity_id=_job_target(row["activity_id"]),
+                status=JOB_STATUS_RUNNING,
+                created_at_utc=now_iso,
+                run_id=run_id,
+                attempt_number=attempt_number,
+            )
+            return {
+                "job_id": job_id_value,
+                "run_id": run_id,
+                "activity_id": _job_target(row["activity_id"]),
+                "attempt_number": attempt_number,
+                "max_attempts": int(row["max_attempts"]),
+                "force_update": bool(int(row["force_update"])),
+            }
+    except sqlite3.Error:
+        return None
+
+
+def complete_activity_job_run(
+    path: Path,
+    job_id: str,
+    run_id: str,
+    *,
+    owner: str,
+    outcome: str,
+    error: str | None = None,
+    result: Any = None,
+    retry_delay_seconds: int = 300,
+    now_utc: datetime | None = None,
+) -> str | None:
+    job_id_value = str(job_id).strip()
+    run_id_value = str(run_id).strip()
+    owner_value = str(owner).strip()
+    if not job_id_value or not run_id_value or not owner_value:
+        return None
+
+    normalized_outcome = _normalize_job_status(outcome, default=JOB_STATUS_FAILED_PERMANENT)
+    if normalized_outcome not in {JOB_STATUS_SUCCEEDED, JOB_STATUS_FAILED_PERMANENT, JOB_STATUS_RETRY_WAIT, JOB_STATUS_CANCELLED}:
         normalized_outcome = JOB_STATUS_FAILED_PERMANENT
 
     now = now_utc.astimezone(timezone.utc) if now_utc else _utc_now()
@@ -1310,7 +3042,7 @@ def complete_activity_job_run(
             )
             _upsert_activity_state(
                 conn,
-                activity_id=str(row["activity_id"]),
+                activity_id=_job_target(row["activity_id"]),
                 state=final_outcome,
                 updated_at_utc=now_iso,
                 last_job_id=job_id_value,
@@ -1318,6 +3050,15 @@ def complete_activity_job_run(
                 last_result_status=final_outcome,
                 last_error=error,
             )
+            _append_job_change_event(
+                conn,
+                job_id_value,
+                activity_id=_job_target(row["activity_id"]),
+                status=final_outcome,
+                created_at_utc=now_iso,
+                run_id=run_id_value,
+                error=error,
+            )
             return final_outcome
     except sqlite3.Error:
         return None
@@ -1355,28 +3096,133 @@ def requeue_expired_jobs(path: Path, *, now_utc: datetime | None = None) -> int:
                   AND lease_expires_at_utc IS NOT NULL
                   AND lease_expires_at_utc <= ?
                 """,
-                (
-                    JOB_STATUS_QUEUED,
-                    now_iso,
-                    now_iso,
-                    JOB_STATUS_CLAIMED,
-                    JOB_STATUS_RUNNING,
-                    now_iso,
-                ),
+                (
+                    JOB_STATUS_QUEUED,
+                    now_iso,
+                    now_iso,
+                    JOB_STATUS_CLAIMED,
+                    JOB_STATUS_RUNNING,
+                    now_iso,
+                ),
+            )
+            for row in expired_rows:
+                _upsert_activity_state(
+                    conn,
+                    activity_id=_job_target(row["activity_id"]),
+                    state=JOB_STATUS_QUEUED,
+                    updated_at_utc=now_iso,
+                    last_job_id=str(row["job_id"]),
+                    last_result_status="requeued_expired_lease",
+                    last_error=None,
+                )
+                _append_job_change_event(
+                    conn,
+                    str(row["job_id"]),
+                    activity_id=_job_target(row["activity_id"]),
+                    status=JOB_STATUS_QUEUED,
+                    created_at_utc=now_iso,
+                    reason="requeued_expired_lease",
+                )
+            return len(expired_rows)
+    except sqlite3.Error:
+        return 0
+
+
+def list_claimable_activity_jobs(
+    path: Path,
+    *,
+    request_kinds: set[str] | None = None,
+    limit: int = 10,
+    now_utc: datetime | None = None,
+) -> list[dict[str, Any]]:
+    now = now_utc.astimezone(timezone.utc) if now_utc else _utc_now()
+    params: list[Any] = [JOB_STATUS_QUEUED, JOB_STATUS_RETRY_WAIT, now.isoformat()]
+    kind_clause = ""
+    if request_kinds:
+        kinds = sorted(str(kind) for kind in request_kinds)
+        kind_clause = f"AND request_kind IN ({', '.join('?' for _ in kinds)})"
+        params.extend(kinds)
+    params.append(max(1, int(limit)))
+    try:
+        with _connect_runtime_db(path) as conn:
+            rows = conn.execute(
+                f"""
+                SELECT *
+                FROM jobs
+                WHERE status IN (?, ?)
+                  AND available_at_utc <= ?
+                  {kind_clause}
+                ORDER BY priority ASC, requested_at_utc ASC
+                LIMIT ?
+                """,
+                tuple(params),
+            ).fetchall()
+    except sqlite3.Error:
+        return []
+    return [job for job in (_to_job_dict(row) for row in rows) if job is not None]
+
+
+def bind_activity_job_target(path: Path, job_id: str, activity_id: int | str) -> bool:
+    job_id_value = str(job_id).strip()
+    activity_id_str = str(activity_id).strip()
+    if not job_id_value or not activity_id_str:
+        return False
+    now_iso = _utc_now_iso()
+    try:
+        with _connect_runtime_db(path) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT status, run_id FROM jobs WHERE job_id = ? LIMIT 1",
+                (job_id_value,),
+            ).fetchone()
+            if row is None:
+                return False
+            conn.execute(
+                """
+                INSERT INTO activities (
+                    activity_id,
+                    first_seen_at_utc,
+                    last_seen_at_utc,
+                    sport_type,
+                    start_date_utc,
+                    updated_at_utc
+                )
+                VALUES (?, ?, ?, NULL, NULL, ?)
+                ON CONFLICT(activity_id) DO UPDATE SET
+                    last_seen_at_utc = excluded.last_seen_at_utc,
+                    updated_at_utc = excluded.updated_at_utc
+                """,
+                (activity_id_str, now_iso, now_iso, now_iso),
             )
-            for row in expired_rows:
-                _upsert_activity_state(
-                    conn,
-                    activity_id=str(row["activity_id"]),
-                    state=JOB_STATUS_QUEUED,
-                    updated_at_utc=now_iso,
-                    last_job_id=str(row["job_id"]),
-                    last_result_status="requeued_expired_lease",
-                    last_error=None,
-                )
-            return len(expired_rows)
+            conn.execute(
+                "UPDATE jobs SET activity_id = ?, updated_at_utc = ? WHERE job_id = ?",
+                (activity_id_str, now_iso, job_id_value),
+            )
+            conn.execute(
+                "UPDATE runs SET activity_id = ?, updated_at_utc = ? WHERE job_id = ?",
+                (activity_id_str, now_iso, job_id_value),
+            )
+            status = _status_value(row["status"])
+            _upsert_activity_state(
+                conn,
+                activity_id=activity_id_str,
+                state=status,
+                updated_at_utc=now_iso,
+                last_job_id=job_id_value,
+                last_run_id=str(row["run_id"]) if row["run_id"] is not None else None,
+                last_result_status=status,
+                last_error=None,
+            )
+            _append_job_change_event(
+                conn,
+                job_id_value,
+                activity_id=activity_id_str,
+                status=status,
+                created_at_utc=now_iso,
+            )
+        return True
     except sqlite3.Error:
-        return 0
+        return False
 
 
 def record_activity_output(
@@ -1501,6 +3347,8 @@ def cleanup_runtime_state(
         "runs_deleted": 0,
         "jobs_deleted": 0,
         "expired_locks_deleted": 0,
+        "garmin_daily_metrics_deleted": 0,
+        "weather_cache_deleted": 0,
         "deleted_total": 0,
         "errors": 0,
     }
@@ -1599,6 +3447,29 @@ def cleanup_runtime_state(
                 (lock_cutoff_iso,),
             )
             stats["expired_locks_deleted"] = int(max(0, deleted.rowcount))
+
+            deleted = conn.execute(
+                """
+                DELETE FROM garmin_daily_metrics
+                WHERE expires_at_utc IS NOT NULL
+                  AND expires_at_utc < ?
+                """,
+                (now.isoformat(),),
+            )
+            stats["garmin_daily_metrics_deleted"] = int(max(0, deleted.rowcount))
+
+            weather_deleted = 0
+            for table in ("weather_hours", "weather_aqi"):
+                deleted = conn.execute(
+                    f"""
+                    DELETE FROM {table}
+                    WHERE expires_at_utc IS NOT NULL
+                      AND expires_at_utc < ?
+                    """,
+                    (now.isoformat(),),
+                )
+                weather_deleted += int(max(0, deleted.rowcount))
+            stats["weather_cache_deleted"] = weather_deleted
     except sqlite3.Error:
         stats["errors"] = 1
 
@@ -1609,10 +3480,21 @@ def cleanup_runtime_state(
         + int(stats["runs_deleted"])
         + int(stats["jobs_deleted"])
         + int(stats["expired_locks_deleted"])
+        + int(stats["garmin_daily_metrics_deleted"])
+        + int(stats["weather_cache_deleted"])
     )
     return stats
 
 
+def count_activity_jobs_by_status(path: Path) -> dict[str, int]:
+    try:
+        with _connect_runtime_db(path) as conn:
+            rows = conn.execute("SELECT status, COUNT(*) AS job_count FROM jobs GROUP BY status").fetchall()
+    except sqlite3.Error:
+        return {}
+    return {str(row["status"]): int(row["job_count"]) for row in rows}
+
+
 def get_activity_job(path: Path, job_id: str) -> dict[str, Any] | None:
     job_id_value = str(job_id).strip()
     if not job_id_value:
@@ -2147,128 +4029,827 @@ def upsert_plan_days_bulk(
                     """,
                     rows,
                 )
-        return True
+        return True
+    except sqlite3.Error:
+        return False
+
+
+def list_plan_sessions(path: Path, *, start_date: str, end_date: str) -> dict[str, list[dict[str, Any]]]:
+    start = _parse_plan_date(start_date)
+    end = _parse_plan_date(end_date)
+    if start is None or end is None:
+        return {}
+    if start > end:
+        start, end = end, start
+
+    try:
+        with _connect_runtime_db(path) as conn:
+            rows = conn.execute(
+                """
+                SELECT
+                    session_id,
+                    date_local,
+                    ordinal,
+                    planned_miles,
+                    actual_miles,
+                    run_type,
+                    workout_code,
+                    source_activity_id,
+                    updated_at_utc
+                FROM plan_sessions
+                WHERE date_local >= ? AND date_local <= ?
+                ORDER BY date_local ASC, ordinal ASC, session_id ASC
+                """,
+                (start.isoformat(), end.isoformat()),
+            ).fetchall()
+    except sqlite3.Error:
+        return {}
+
+    payload: dict[str, list[dict[str, Any]]] = {}
+    for row in rows:
+        date_key = str(row["date_local"])
+        bucket = payload.setdefault(date_key, [])
+        bucket.append(
+            {
+                "session_id": str(row["session_id"]),
+                "date_local": date_key,
+                "ordinal": int(row["ordinal"]),
+                "planned_miles": float(row["planned_miles"]) if row["planned_miles"] is not None else None,
+                "actual_miles": float(row["actual_miles"]) if row["actual_miles"] is not None else None,
+                "run_type": str(row["run_type"]) if row["run_type"] is not None else None,
+                "workout_code": str(row["workout_code"]) if row["workout_code"] is not None else None,
+                "source_activity_id": (
+                    str(row["source_activity_id"]) if row["source_activity_id"] is not None else None
+                ),
+                "updated_at_utc": str(row["updated_at_utc"]),
+            }
+        )
+    return payload
+
+
+def set_plan_setting(path: Path, key: str, value: Any) -> bool:
+    key_text = str(key or "").strip()
+    if not key_text:
+        return False
+    now_iso = _utc_now_iso()
+    try:
+        value_json = json.dumps(value)
+    except (TypeError, ValueError):
+        return False
+
+    try:
+        with _connect_runtime_db(path) as conn:
+            conn.execute(
+                """
+                INSERT INTO plan_settings (
+                    key,
+                    value_json,
+                    updated_at_utc
+                )
+                VALUES (?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    value_json = excluded.value_json,
+                    updated_at_utc = excluded.updated_at_utc
+                """,
+                (
+                    key_text,
+                    value_json,
+                    now_iso,
+                ),
+            )
+        return True
+    except sqlite3.Error:
+        return False
+
+
+def get_plan_setting(path: Path, key: str, default: Any = None) -> Any:
+    key_text = str(key or "").strip()
+    if not key_text:
+        return default
+    try:
+        with _connect_runtime_db(path) as conn:
+            row = conn.execute(
+                """
+                SELECT value_json
+                FROM plan_settings
+                WHERE key = ?
+                LIMIT 1
+                """,
+                (key_text,),
+            ).fetchone()
+    except sqlite3.Error:
+        return default
+    if row is None:
+        return default
+    try:
+        return json.loads(str(row["value_json"]))
+    except (TypeError, ValueError, json.JSONDecodeError):
+        return default
+
+
+def archive_activity_template_context(
+    path: Path,
+    activity_id: int | str,
+    *,
+    context: dict[str, Any],
+    profile_id: str | None = None,
+    fingerprint: str | None = None,
+    keep: int = _TEMPLATE_CONTEXT_ARCHIVE_RETENTION_ROWS_PER_PROFILE,
+) -> bool:
+    activity_id_str = str(activity_id).strip()
+    if not activity_id_str or not isinstance(context, dict):
+        return False
+    try:
+        context_json = _to_json_string(context)
+    except (TypeError, ValueError):
+        return False
+    try:
+        with _connect_runtime_db(path) as conn:
+            conn.execute(
+                """
+                INSERT INTO activity_template_contexts (
+                    activity_id,
+                    profile_id,
+                    fingerprint,
+                    context_json,
+                    archived_at_utc
+                )
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(activity_id) DO UPDATE SET
+                    profile_id = excluded.profile_id,
+                    fingerprint = excluded.fingerprint,
+                    context_json = excluded.context_json,
+                    archived_at_utc = excluded.archived_at_utc
+                """,
+                (activity_id_str, profile_id or None, fingerprint or None, context_json, _utc_now_iso()),
+            )
+            # Retention is per profile so a busy profile cannot evict a rare one's contexts.
+            conn.execute(
+                """
+                DELETE FROM activity_template_contexts
+                WHERE profile_id IS ?
+                  AND activity_id NOT IN (
+                    SELECT activity_id
+                    FROM activity_template_contexts
+                    WHERE profile_id IS ?
+                    ORDER BY archived_at_utc DESC, activity_id DESC
+                    LIMIT ?
+                  )
+                """,
+                (profile_id or None, profile_id or None, max(1, int(keep))),
+            )
+        return True
+    except sqlite3.Error:
+        return False
+
+
+def list_archived_template_contexts(
+    path: Path,
+    *,
+    limit: int = 10,
+    profile_id: str | None = None,
+) -> list[dict[str, Any]]:
+    clauses: list[str] = []
+    params: list[Any] = []
+    if profile_id:
+        clauses.append("profile_id = ?")
+        params.append(str(profile_id))
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    params.append(max(1, int(limit)))
+    try:
+        with _connect_runtime_db(path) as conn:
+            rows = conn.execute(
+                f"""
+                SELECT activity_id, profile_id, fingerprint, context_json, archived_at_utc
+                FROM activity_template_contexts
+                {where}
+                ORDER BY archived_at_utc DESC, activity_id DESC
+                LIMIT ?
+                """,
+                params,
+            ).fetchall()
+    except sqlite3.Error:
+        return []
+    archived: list[dict[str, Any]] = []
+    for row in rows:
+        try:
+            context = json.loads(str(row["context_json"]))
+        except (TypeError, ValueError):
+            continue
+        if not isinstance(context, dict):
+            continue
+        archived.append(
+            {
+                "activity_id": str(row["activity_id"]),
+                "profile_id": row["profile_id"],
+                "fingerprint": row["fingerprint"],
+                "archived_at_utc": row["archived_at_utc"],
+                "context": context,
+            }
+        )
+    return archived
+
+
+def delete_plan_setting(path: Path, key: str) -> bool:
+    key_text = str(key or "").strip()
+    if not key_text:
+        return False
+    try:
+        with _connect_runtime_db(path) as conn:
+            conn.execute("DELETE FROM plan_settings WHERE key = ?", (key_text,))
+        return True
+    except sqlite3.Error:
+        return False
+
+
+_GARMIN_SYNC_REQUEST_COLUMNS = (
+    "request_id",
+    "date_local",
+    "workout_code",
+    "status",
+    "status_code",
+    "queued_at_utc",
+    "updated_at_utc",
+    "garmin_workout_id",
+    "garmin_workout_created",
+    "calendar_entry_id",
+    "next_step",
+    "error_message",
+    "retry_guidance",
+)
+
+
+def _garmin_sync_request_row_to_dict(row: sqlite3.Row) -> dict[str, Any]:
+    record = {column: row[column] for column in _GARMIN_SYNC_REQUEST_COLUMNS}
+    created = record.get("garmin_workout_created")
+    record["garmin_workout_created"] = None if created is None else bool(created)
+    return record
+
+
+def save_garmin_sync_requests(path: Path, records: list[dict[str, Any]]) -> int:
+    rows: dict[str, tuple[Any, ...]] = {}
+    for record in records:
+        if not isinstance(record, dict):
+            continue
+        request_id = str(record.get("request_id") or "").strip()
+        workout_code = str(record.get("workout_code") or "").strip()
+        if not request_id or not workout_code:
+            continue
+        created = record.get("garmin_workout_created")
+        rows[request_id] = (
+            request_id,
+            str(record.get("date_local") or ""),
+            workout_code,
+            workout_code.lower(),
+            str(record.get("status") or ""),
+            str(record.get("status_code") or ""),
+            str(record.get("queued_at_utc") or ""),
+            str(record.get("updated_at_utc") or ""),
+            record.get("garmin_workout_id") or None,
+            None if not isinstance(created, bool) else int(created),
+            record.get("calendar_entry_id") or None,
+            record.get("next_step") or None,
+            record.get("error_message") or None,
+            record.get("retry_guidance") or None,
+        )
+    if not rows:
+        return 0
+    try:
+        with _connect_runtime_db(path) as conn:
+            conn.executemany(
+                """
+                INSERT INTO garmin_sync_requests (
+                    request_id,
+                    date_local,
+                    workout_code,
+                    workout_code_key,
+                    status,
+                    status_code,
+                    queued_at_utc,
+                    updated_at_utc,
+                    garmin_workout_id,
+                    garmin_workout_created,
+                    calendar_entry_id,
+                    next_step,
+                    error_message,
+                    retry_guidance
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(request_id) DO UPDATE SET
+                    date_local = excluded.date_local,
+                    workout_code = excluded.workout_code,
+                    workout_code_key = excluded.workout_code_key,
+                    status = excluded.status,
+                    status_code = excluded.status_code,
+                    queued_at_utc = excluded.queued_at_utc,
+                    updated_at_utc = excluded.updated_at_utc,
+                    garmin_workout_id = excluded.garmin_workout_id,
+                    garmin_workout_created = excluded.garmin_workout_created,
+                    calendar_entry_id = excluded.calendar_entry_id,
+                    next_step = excluded.next_step,
+                    error_message = excluded.error_message,
+                    retry_guidance = excluded.retry_guidance
+                """,
+                list(rows.values()),
+            )
     except sqlite3.Error:
-        return False
+        return -1
+    return len(rows)
 
 
-def list_plan_sessions(path: Path, *, start_date: str, end_date: str) -> dict[str, list[dict[str, Any]]]:
-    start = _parse_plan_date(start_date)
-    end = _parse_plan_date(end_date)
-    if start is None or end is None:
-        return {}
-    if start > end:
-        start, end = end, start
+def get_latest_garmin_sync_request(
+    path: Path,
+    *,
+    date_local: str,
+    workout_code: str | None = None,
+) -> dict[str, Any] | None:
+    clauses = ["date_local = ?"]
+    params: list[Any] = [str(date_local)]
+    if workout_code:
+        clauses.append("workout_code_key = ?")
+        params.append(str(workout_code).strip().lower())
+    try:
+        with _connect_runtime_db(path) as conn:
+            row = conn.execute(
+                f"""
+                SELECT {", ".join(_GARMIN_SYNC_REQUEST_COLUMNS)}
+                FROM garmin_sync_requests
+                WHERE {" AND ".join(clauses)}
+                ORDER BY updated_at_utc DESC, queued_at_utc DESC
+                LIMIT 1
+                """,
+                params,
+            ).fetchone()
+    except sqlite3.Error:
+        return None
+    return _garmin_sync_request_row_to_dict(row) if row is not None else None
 
+
+def list_garmin_sync_request_records(
+    path: Path,
+    *,
+    status: str | None = None,
+    start_date: str | None = None,
+    end_date: str | None = None,
+) -> list[dict[str, Any]]:
+    clauses: list[str] = []
+    params: list[Any] = []
+    if status:
+        clauses.append("status = ?")
+        params.append(str(status))
+    if start_date:
+        clauses.append("date_local >= ?")
+        params.append(str(start_date))
+    if end_date:
+        clauses.append("date_local <= ?")
+        params.append(str(end_date))
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
     try:
         with _connect_runtime_db(path) as conn:
             rows = conn.execute(
+                f"""
+                SELECT {", ".join(_GARMIN_SYNC_REQUEST_COLUMNS)}
+                FROM garmin_sync_requests
+                {where}
+                ORDER BY queued_at_utc ASC, request_id ASC
+                """,
+                params,
+            ).fetchall()
+    except sqlite3.Error:
+        return []
+    return [_garmin_sync_request_row_to_dict(row) for row in rows]
+
+
+def _garmin_workout_row_to_dict(row: sqlite3.Row) -> dict[str, str]:
+    return {
+        "garmin_workout_id": str(row["garmin_workout_id"]),
+        "workout_code": str(row["workout_code"]),
+        "title": str(row["title"]),
+        "created_at_utc": str(row["created_at_utc"]),
+        "updated_at_utc": str(row["updated_at_utc"]),
+    }
+
+
+def list_garmin_workout_records(
+    path: Path,
+    *,
+    workout_codes: list[str] | None = None,
+    garmin_workout_ids: list[str] | None = None,
+) -> list[dict[str, str]]:
+    select = """
+        SELECT garmin_workout_id, workout_code, title, created_at_utc, updated_at_utc
+        FROM garmin_workouts
+    """
+    if workout_codes is not None:
+        column, wanted = "workout_code_key", sorted({str(code).strip().lower() for code in workout_codes})
+    elif garmin_workout_ids is not None:
+        column, wanted = "garmin_workout_id", sorted({str(item).strip() for item in garmin_workout_ids})
+    else:
+        column, wanted = "", []
+    try:
+        with _connect_runtime_db(path) as conn:
+            if not column:
+                rows = conn.execute(select + " ORDER BY created_at_utc ASC, garmin_workout_id ASC").fetchall()
+            else:
+                rows = []
+                for chunk in _chunked(wanted):
+                    placeholders = ", ".join("?" for _ in chunk)
+                    rows.extend(conn.execute(select + f" WHERE {column} IN ({placeholders})", chunk).fetchall())
+    except sqlite3.Error:
+        return []
+    return [_garmin_workout_row_to_dict(row) for row in rows]
+
+
+def insert_garmin_workouts(path: Path, workouts: list[dict[str, Any]]) -> int:
+    rows: dict[str, tuple[Any, ...]] = {}
+    for workout in workouts:
+        if not isinstance(workout, dict):
+            continue
+        workout_id = str(workout.get("garmin_workout_id") or "").strip()
+        workout_code = str(workout.get("workout_code") or "").strip()
+        if not workout_id or not workout_code:
+            continue
+        rows.setdefault(
+            workout_code.lower(),
+            (
+                workout_id,
+                workout_code,
+                workout_code.lower(),
+                str(workout.get("title") or workout_code),
+                str(workout.get("created_at_utc") or ""),
+                str(workout.get("updated_at_utc") or ""),
+            ),
+        )
+    if not rows:
+        return 0
+    try:
+        with _connect_runtime_db(path) as conn:
+            inserted = conn.executemany(
                 """
-                SELECT
-                    session_id,
-                    date_local,
-                    ordinal,
-                    planned_miles,
-                    actual_miles,
-                    run_type,
+                INSERT INTO garmin_workouts (
+                    garmin_workout_id,
                     workout_code,
-                    source_activity_id,
+                    workout_code_key,
+                    title,
+                    created_at_utc,
                     updated_at_utc
-                FROM plan_sessions
-                WHERE date_local >= ? AND date_local <= ?
-                ORDER BY date_local ASC, ordinal ASC, session_id ASC
+                )
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT DO NOTHING
                 """,
-                (start.isoformat(), end.isoformat()),
+                list(rows.values()),
+            )
+    except sqlite3.Error:
+        return -1
+    return int(max(0, inserted.rowcount))
+
+
+def _garmin_calendar_entry_row_to_dict(row: sqlite3.Row) -> dict[str, str]:
+    return {
+        "calendar_entry_id": str(row["calendar_entry_id"]),
+        "date_local": str(row["date_local"]),
+        "garmin_workout_id": str(row["garmin_workout_id"]),
+        "workout_code": str(row["workout_code"]),
+        "scheduled_at_utc": str(row["scheduled_at_utc"]),
+        "updated_at_utc": str(row["updated_at_utc"]),
+    }
+
+
+def list_garmin_calendar_entry_records(
+    path: Path,
+    *,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    calendar_entry_ids: list[str] | None = None,
+) -> list[dict[str, str]]:
+    clauses: list[str] = []
+    params: list[Any] = []
+    if calendar_entry_ids is not None:
+        wanted = sorted({str(item).strip() for item in calendar_entry_ids})[:_SQLITE_IN_CHUNK_SIZE]
+        if not wanted:
+            return []
+        clauses.append(f"calendar_entry_id IN ({', '.join('?' for _ in wanted)})")
+        params.extend(wanted)
+    if start_date:
+        clauses.append("date_local >= ?")
+        params.append(str(start_date))
+    if end_date:
+        clauses.append("date_local <= ?")
+        params.append(str(end_date))
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    try:
+        with _connect_runtime_db(path) as conn:
+            rows = conn.execute(
+                f"""
+                SELECT calendar_entry_id, date_local, garmin_workout_id, workout_code,
+                       scheduled_at_utc, updated_at_utc
+                FROM garmin_calendar_entries
+                {where}
+                ORDER BY date_local ASC, scheduled_at_utc ASC
+                """,
+                params,
             ).fetchall()
     except sqlite3.Error:
-        return {}
+        return []
+    return [_garmin_calendar_entry_row_to_dict(row) for row in rows]
 
-    payload: dict[str, list[dict[str, Any]]] = {}
+
+def insert_garmin_calendar_entries(path: Path, entries: list[dict[str, Any]]) -> int:
+    rows: dict[tuple[str, str], tuple[Any, ...]] = {}
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        entry_id = str(entry.get("calendar_entry_id") or "").strip()
+        date_local = str(entry.get("date_local") or "").strip()
+        workout_id = str(entry.get("garmin_workout_id") or "").strip()
+        if not entry_id or not date_local or not workout_id:
+            continue
+        rows.setdefault(
+            (date_local, workout_id),
+            (
+                entry_id,
+                date_local,
+                workout_id,
+                str(entry.get("workout_code") or ""),
+                str(entry.get("scheduled_at_utc") or ""),
+                str(entry.get("updated_at_utc") or ""),
+            ),
+        )
+    if not rows:
+        return 0
+    try:
+        with _connect_runtime_db(path) as conn:
+            inserted = conn.executemany(
+                """
+                INSERT INTO garmin_calendar_entries (
+                    calendar_entry_id,
+                    date_local,
+                    garmin_workout_id,
+                    workout_code,
+                    scheduled_at_utc,
+                    updated_at_utc
+                )
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT DO NOTHING
+                """,
+                list(rows.values()),
+            )
+    except sqlite3.Error:
+        return -1
+    return int(max(0, inserted.rowcount))
+
+
+def _agent_record_rows(rows: list[sqlite3.Row]) -> list[dict[str, Any]]:
+    records: list[dict[str, Any]] = []
     for row in rows:
-        date_key = str(row["date_local"])
-        bucket = payload.setdefault(date_key, [])
-        bucket.append(
-            {
-                "session_id": str(row["session_id"]),
-                "date_local": date_key,
-                "ordinal": int(row["ordinal"]),
-                "planned_miles": float(row["planned_miles"]) if row["planned_miles"] is not None else None,
-                "actual_miles": float(row["actual_miles"]) if row["actual_miles"] is not None else None,
-                "run_type": str(row["run_type"]) if row["run_type"] is not None else None,
-                "workout_code": str(row["workout_code"]) if row["workout_code"] is not None else None,
-                "source_activity_id": (
-                    str(row["source_activity_id"]) if row["source_activity_id"] is not None else None
-                ),
-                "updated_at_utc": str(row["updated_at_utc"]),
-            }
+        try:
+            record = _from_json_string(str(row["record_json"]))
+        except (TypeError, ValueError):
+            continue
+        if isinstance(record, dict):
+            records.append(record)
+    return records
+
+
+def index_agent_drafts(path: Path, records: list[dict[str, Any]]) -> int:
+    rows = [
+        (
+            str(record.get("draft_id") or "").strip(),
+            str(record.get("resource_kind") or "").strip(),
+            str(record.get("status") or "").strip(),
+            str(record.get("updated_at_utc") or "").strip() or _utc_now_iso(),
+            _to_json_string(record),
         )
-    return payload
+        for record in records
+        if isinstance(record, dict) and str(record.get("draft_id") or "").strip()
+    ]
+    if not rows:
+        return 0
+    try:
+        with _connect_runtime_db(path) as conn:
+            conn.executemany(
+                """
+                INSERT INTO agent_drafts (draft_id, resource_kind, status, updated_at_utc, record_json)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(draft_id) DO UPDATE SET
+                    resource_kind = excluded.resource_kind,
+                    status = excluded.status,
+                    updated_at_utc = excluded.updated_at_utc,
+                    record_json = excluded.record_json
+                """,
+                rows,
+            )
+    except sqlite3.Error:
+        return 0
+    return len(rows)
 
 
-def set_plan_setting(path: Path, key: str, value: Any) -> bool:
-    key_text = str(key or "").strip()
-    if not key_text:
-        return False
-    now_iso = _utc_now_iso()
+def query_agent_drafts(
+    path: Path,
+    *,
+    resource_kind: str | None = None,
+    status: str | None = None,
+    before_id: str | None = None,
+    limit: int | None = None,
+) -> list[dict[str, Any]]:
+    clauses: list[str] = []
+    params: list[Any] = []
+    if resource_kind:
+        clauses.append("resource_kind = ?")
+        params.append(resource_kind)
+    if status:
+        clauses.append("status = ?")
+        params.append(status)
+    if before_id:
+        clauses.append("draft_id < ?")
+        params.append(before_id)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    limit_sql = ""
+    if limit is not None:
+        limit_sql = "LIMIT ?"
+        params.append(max(1, int(limit)))
     try:
-        value_json = json.dumps(value)
-    except (TypeError, ValueError):
-        return False
+        with _connect_runtime_db(path) as conn:
+            rows = conn.execute(
+                f"""
+                SELECT record_json
+                FROM agent_drafts
+                {where}
+                ORDER BY draft_id DESC
+                {limit_sql}
+                """,
+                tuple(params),
+            ).fetchall()
+    except sqlite3.Error:
+        return []
+    return _agent_record_rows(rows)
 
+
+def index_agent_jobs(path: Path, records: list[dict[str, Any]]) -> int:
+    rows = [
+        (
+            str(record.get("job_id") or "").strip(),
+            str(record.get("task_kind") or "").strip(),
+            str(record.get("status") or "").strip(),
+            str(record.get("updated_at_utc") or "").strip() or _utc_now_iso(),
+            _to_json_string(record),
+        )
+        for record in records
+        if isinstance(record, dict) and str(record.get("job_id") or "").strip()
+    ]
+    if not rows:
+        return 0
     try:
         with _connect_runtime_db(path) as conn:
-            conn.execute(
+            conn.executemany(
                 """
-                INSERT INTO plan_settings (
-                    key,
-                    value_json,
-                    updated_at_utc
-                )
-                VALUES (?, ?, ?)
-                ON CONFLICT(key) DO UPDATE SET
-                    value_json = excluded.value_json,
-                    updated_at_utc = excluded.updated_at_utc
+                INSERT INTO agent_jobs (job_id, task_kind, status, updated_at_utc, record_json)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(job_id) DO UPDATE SET
+                    task_kind = excluded.task_kind,
+                    status = excluded.status,
+                    updated_at_utc = excluded.updated_at_utc,
+                    record_json = excluded.record_json
                 """,
-                (
-                    key_text,
-                    value_json,
-                    now_iso,
-                ),
+                rows,
             )
-        return True
     except sqlite3.Error:
-        return False
+        return 0
+    return len(rows)
 
 
-def get_plan_setting(path: Path, key: str, default: Any = None) -> Any:
-    key_text = str(key or "").strip()
-    if not key_text:
-        return default
+def query_agent_jobs(
+    path: Path,
+    *,
+    task_kind: str | None = None,
+    status: str | None = None,
+    before_id: str | None = None,
+    limit: int | None = None,
+) -> list[dict[str, Any]]:
+    clauses: list[str] = []
+    params: list[Any] = []
+    if task_kind:
+        clauses.append("task_kind = ?")
+        params.append(task_kind)
+    if status:
+        clauses.append("status = ?")
+        params.append(status)
+    if before_id:
+        clauses.append("job_id < ?")
+        params.append(before_id)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    limit_sql = ""
+    if limit is not None:
+        limit_sql = "LIMIT ?"
+        params.append(max(1, int(limit)))
     try:
         with _connect_runtime_db(path) as conn:
-            row = conn.execute(
+            rows = conn.execute(
+                f"""
+                SELECT record_json
+                FROM agent_jobs
+                {where}
+                ORDER BY job_id DESC
+                {limit_sql}
+                """,
+                tuple(params),
+            ).fetchall()
+    except sqlite3.Error:
+        return []
+    return _agent_record_rows(rows)
+
+
+def index_agent_audit_events(path: Path, events: list[dict[str, Any]]) -> int:
+    rows = [
+        (
+            str(event.get("event_id") or "").strip(),
+            str(event.get("event_type") or "").strip() or "unknown",
+            str(event.get("resource_kind") or "").strip() or None,
+            str(event.get("resource_id") or "").strip() or None,
+            str(event.get("created_at_utc") or "").strip() or _utc_now_iso(),
+            _to_json_string(event),
+        )
+        for event in events
+        if isinstance(event, dict) and str(event.get("event_id") or "").strip()
+    ]
+    if not rows:
+        return 0
+    try:
+        with _connect_runtime_db(path) as conn:
+            conn.executemany(
                 """
-                SELECT value_json
-                FROM plan_settings
-                WHERE key = ?
-                LIMIT 1
+                INSERT INTO agent_audit_events (
+                    event_id,
+                    event_type,
+                    resource_kind,
+                    resource_id,
+                    created_at_utc,
+                    record_json
+                )
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(event_id) DO NOTHING
                 """,
-                (key_text,),
-            ).fetchone()
+                rows,
+            )
     except sqlite3.Error:
-        return default
-    if row is None:
-        return default
+        return 0
+    return len(rows)
+
+
+def query_agent_audit_events(
+    path: Path,
+    *,
+    event_type: str | None = None,
+    resource_kind: str | None = None,
+    resource_id: str | None = None,
+    before_seq: int | None = None,
+    limit: int = 100,
+) -> list[dict[str, Any]]:
+    """Indexed audit events, newest first, each with its index ``seq`` (the pagination cursor)."""
+    clauses: list[str] = []
+    params: list[Any] = []
+    if event_type:
+        clauses.append("event_type = ?")
+        params.append(event_type)
+    if resource_kind:
+        clauses.append("resource_kind = ?")
+        params.append(resource_kind)
+    if resource_id:
+        clauses.append("resource_id = ?")
+        params.append(resource_id)
+    if before_seq is not None:
+        clauses.append("seq < ?")
+        params.append(int(before_seq))
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    params.append(max(1, int(limit)))
     try:
-        return json.loads(str(row["value_json"]))
-    except (TypeError, ValueError, json.JSONDecodeError):
-        return default
+        with _connect_runtime_db(path) as conn:
+            rows = conn.execute(
+                f"""
+                SELECT seq, record_json
+                FROM agent_audit_events
+                {where}
+                ORDER BY seq DESC
+                LIMIT ?
+                """,
+                tuple(params),
+            ).fetchall()
+    except sqlite3.Error:
+        return []
+    events: list[dict[str, Any]] = []
+    for row in rows:
+        for event in _agent_record_rows([row]):
+            event["seq"] = int(row["seq"])
+            events.append(event)
+    return events
 
 
 def write_json(path: Path, payload: dict[str, Any]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     tmp_path = path.with_suffix(".tmp")
-    tmp_path.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+    text = json.dumps(payload, indent=2, sort_keys=True)
+    trace_count("bytes_serialized", len(text))
+    tmp_path.write_text(text, encoding="utf-8")
     tmp_path.replace(path)
 
 
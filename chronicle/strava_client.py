@@ -1,11 +1,16 @@
 from __future__ import annotations
 
 import logging
+import math
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import Any
+from typing import Any, Iterator
 
 import requests
 
+from . import provider_http
 from .config import Settings
 from .numeric_utils import mps_to_pace as _mps_to_pace
 from .storage import read_json, write_json
@@ -17,6 +22,8 @@ BASE_URL = "https://www.strava.com"
 API_URL = f"{BASE_URL}/api/v3"
 TIMEOUT_SECONDS = 30
 MAX_ACTIVITY_PAGES = 60
+STRAVA_PAGE_FETCH_CONCURRENCY = 4
+STRAVA_RATE_LIMIT_HEADROOM = 20
 
 
 class StravaClient:
@@ -26,7 +33,9 @@ class StravaClient:
         self.refresh_token = settings.strava_refresh_token
         self.access_token = settings.strava_access_token
         self.token_file = settings.strava_token_file
-        self.session = requests.Session()
+        self.session = provider_http.ProviderSession()
+        self.rate_limit_remaining: int | None = None
+        self._token_lock = threading.Lock()
         self._load_tokens_from_cache()
 
     def _load_tokens_from_cache(self) -> None:
@@ -75,22 +84,45 @@ class StravaClient:
         logger.info("Strava access token refreshed.")
         return token
 
+    def _refresh_if_stale(self, stale_token: str | None) -> None:
+        with self._token_lock:
+            if self.access_token == stale_token:
+                self.refresh_access_token()
+
+    def _note_rate_limit(self, response: requests.Response) -> None:
+        # Strava reports "15min,daily" pairs; read endpoints may carry their own tighter pair.
+        remaining: list[int] = []
+        for prefix in ("X-RateLimit", "X-ReadRateLimit"):
+            limit_raw = response.headers.get(f"{prefix}-Limit")
+            usage_raw = response.headers.get(f"{prefix}-Usage")
+            if not isinstance(limit_raw, str) or not isinstance(usage_raw, str):
+                continue
+            try:
+                limits = [int(value) for value in limit_raw.split(",")]
+                usages = [int(value) for value in usage_raw.split(",")]
+            except ValueError:
+                continue
+            remaining.extend(limit - usage for limit, usage in zip(limits, usages))
+        if remaining:
+            self.rate_limit_remaining = min(remaining)
+
     def _request(
         self, method: str, path: str, *, params: dict[str, Any] | None = None, data: dict[str, Any] | None = None
     ) -> requests.Response:
         if not self.access_token:
-            self.refresh_access_token()
+            self._refresh_if_stale(self.access_token)
 
+        token = self.access_token
         response = self.session.request(
             method,
             f"{API_URL}{path}",
-            headers={"Authorization": f"Bearer {self.access_token}"},
+            headers={"Authorization": f"Bearer {token}"},
             params=params,
             data=data,
             timeout=TIMEOUT_SECONDS,
         )
         if response.status_code == 401:
-            self.refresh_access_token()
+            self._refresh_if_stale(token)
             response = self.session.request(
                 method,
                 f"{API_URL}{path}",
@@ -99,6 +131,7 @@ class StravaClient:
                 data=data,
                 timeout=TIMEOUT_SECONDS,
             )
+        self._note_rate_limit(response)
         response.raise_for_status()
         return response
 
@@ -135,33 +168,90 @@ class StravaClient:
         )
         return response.json()
 
+    def estimate_activity_count(self) -> int | None:
+        # Athlete stats only count runs, rides and swims, so this is a lower bound.
+        try:
+            athlete = self._request("GET", "/athlete").json()
+            athlete_id = athlete.get("id") if isinstance(athlete, dict) else None
+            if athlete_id is None:
+                return None
+            stats = self._request("GET", f"/athletes/{athlete_id}/stats").json()
+        except (requests.RequestException, ValueError) as exc:
+            logger.info("Strava activity count estimate unavailable: %s", exc)
+            return None
+        if not isinstance(stats, dict):
+            return None
+        total = 0
+        for key in ("all_run_totals", "all_ride_totals", "all_swim_totals"):
+            totals = stats.get(key)
+            count = totals.get("count") if isinstance(totals, dict) else None
+            if isinstance(count, int) and count > 0:
+                total += count
+        return total or None
+
+    def _activities_page(self, after_dt: datetime, per_page: int, page: int) -> list[dict[str, Any]]:
+        response = self._request(
+            "GET",
+            "/athlete/activities",
+            params={
+                "per_page": per_page,
+                "page": page,
+                "after": int(after_dt.timestamp()),
+            },
+        )
+        page_items = response.json()
+        return page_items if isinstance(page_items, list) else []
+
+    def _page_window(self, max_concurrency: int, *, next_page: int, estimated_pages: int) -> int:
+        if next_page > estimated_pages:
+            return 1
+        if self.rate_limit_remaining is not None and self.rate_limit_remaining <= STRAVA_RATE_LIMIT_HEADROOM:
+            return 1
+        return max(1, max_concurrency)
+
+    def iter_activities_after(
+        self,
+        after_dt: datetime,
+        per_page: int = 200,
+        *,
+        estimated_total: int | None = None,
+        max_concurrency: int = STRAVA_PAGE_FETCH_CONCURRENCY,
+    ) -> Iterator[dict[str, Any]]:
+        # Page 1 goes first so the token refresh and rate-limit headers settle before fanning out.
+        first_page = self._activities_page(after_dt, per_page, 1)
+        yield from first_page
+        if len(first_page) < per_page:
+            return
+
+        if estimated_total is None:
+            estimated_total = self.estimate_activity_count()
+        estimated_pages = min(MAX_ACTIVITY_PAGES, math.ceil(estimated_total / per_page)) if estimated_total else 1
+        next_page = 2
+        pending: deque[Future[list[dict[str, Any]]]] = deque()
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrency), thread_name_prefix="strava-pages") as executor:
+            try:
+                while True:
+                    window = self._page_window(max_concurrency, next_page=next_page, estimated_pages=estimated_pages)
+                    while next_page <= MAX_ACTIVITY_PAGES and len(pending) < window:
+                        pending.append(executor.submit(self._activities_page, after_dt, per_page, next_page))
+                        next_page += 1
+                    if not pending:
+                        logger.warning(
+                            "Strava activities pagination hit cap (%s pages, per_page=%s). Results may be truncated.",
+                            MAX_ACTIVITY_PAGES,
+                            per_page,
+                        )
+                        return
+                    page_items = pending.popleft().result()
+                    yield from page_items
+                    if len(page_items) < per_page:
+                        return
+            finally:
+                for future in pending:
+                    future.cancel()
+
     def get_activities_after(self, after_dt: datetime, per_page: int = 200) -> list[dict[str, Any]]:
-        activities: list[dict[str, Any]] = []
-        page = 1
-        while page <= MAX_ACTIVITY_PAGES:
-            response = self._request(
-                "GET",
-                "/athlete/activities",
-                params={
-                    "per_page": per_page,
-                    "page": page,
-                    "after": int(after_dt.timestamp()),
-                },
-            )
-            page_items = response.json()
-            if not page_items:
-                break
-            activities.extend(page_items)
-            if len(page_items) < per_page:
-                break
-            page += 1
-        else:
-            logger.warning(
-                "Strava activities pagination hit cap (%s pages, per_page=%s). Results may be truncated.",
-                MAX_ACTIVITY_PAGES,
-                per_page,
-            )
-        return activities
+        return list(self.iter_activities_after(after_dt, per_page=per_page))
 
     def update_activity(self, activity_id: int, payload: dict[str, Any]) -> dict[str, Any]:
         response = self._request("PUT", f"/activities/{activity_id}", data=payload)
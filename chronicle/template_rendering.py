@@ -1,23 +1,46 @@
 from __future__ import annotations
 
+from pathlib import Path
 from typing import Any
 
 from .config import Settings
 from .description_template import (
+    build_context_schema,
+    context_schema_cache_path,
     normalize_template_context,
+    render_template_batch,
     render_template_text,
     render_with_active_template,
+    template_context_fingerprint,
     validate_template_text,
 )
+from .storage import read_json, write_json
 
 __all__ = [
     "normalize_template_context",
+    "read_latest_context_schema",
+    "render_template_batch",
     "render_template_text",
     "render_with_active_template",
+    "template_context_fingerprint",
     "validate_template_text",
+    "write_latest_context_schema",
 ]
 
 
+def write_latest_context_schema(latest_json_file: Path, context: dict[str, Any], fingerprint: str) -> None:
+    schema = build_context_schema(normalize_template_context(context))
+    write_json(context_schema_cache_path(latest_json_file), {"fingerprint": fingerprint, "schema": schema})
+
+
+def read_latest_context_schema(latest_json_file: Path, fingerprint: str) -> dict[str, Any] | None:
+    cached = read_json(context_schema_cache_path(latest_json_file))
+    if not isinstance(cached, dict) or cached.get("fingerprint") != fingerprint:
+        return None
+    schema = cached.get("schema")
+    return schema if isinstance(schema, dict) else None
+
+
 def validate_and_render(
     settings: Settings,
     template_text: str,
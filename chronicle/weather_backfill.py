@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import argparse
+import json
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any
+
+from .config import Settings
+from .dashboard_data import load_cached_dashboard_payload
+from .pipeline_context_collectors import backfill_weather_history, recompute_misery_scores
+from .strava_client import StravaClient
+
+
+def cached_activity_dates(
+    settings: Settings,
+    *,
+    start_date: date | None = None,
+    end_date: date | None = None,
+) -> dict[str, date]:
+    """Activity ids and local dates from the cached dashboard payload, limited to the range."""
+    payload = load_cached_dashboard_payload(settings)
+    if payload is None:
+        raise LookupError("Dashboard data is not cached yet; load the dashboard once before backfilling weather.")
+    selected: dict[str, date] = {}
+    activities = payload.get("activities")
+    for item in activities if isinstance(activities, list) else []:
+        if not isinstance(item, dict) or item.get("id") in {None, ""}:
+            continue
+        try:
+            item_date = date.fromisoformat(str(item.get("date") or ""))
+        except ValueError:
+            continue
+        if (start_date is None or item_date >= start_date) and (end_date is None or item_date <= end_date):
+            selected[str(item["id"])] = item_date
+    return selected
+
+
+def _summary_local_date(summary: dict[str, Any]) -> date | None:
+    raw = str(summary.get("start_date_local") or summary.get("start_date") or "")[:10]
+    try:
+        return date.fromisoformat(raw)
+    except ValueError:
+        return None
+
+
+def run_weather_backfill(
+    settings: Settings,
+    *,
+    start_date: date | None = None,
+    end_date: date | None = None,
+) -> dict[str, Any]:
+    """Fetches hourly history for cached dashboard activities, then re-scores their misery index.
+
+    Dashboard activities carry no coordinates, so the Strava summaries for the
+    range are listed once to get each activity's start_latlng.
+    """
+    if not settings.weather_api_key:
+        raise ValueError("WEATHER_API_KEY is not configured.")
+    selected = cached_activity_dates(settings, start_date=start_date, end_date=end_date)
+    range_start = start_date or min(selected.values(), default=None)
+    range_end = end_date or max(selected.values(), default=None)
+    result: dict[str, Any] = {
+        "start_date": range_start.isoformat() if range_start else None,
+        "end_date": range_end.isoformat() if range_end else None,
+        "activities": len(selected),
+        "summaries": 0,
+        "targets": 0,
+        "days": 0,
+        "misery": {"activities": 0, "missing_weather": 0, "scored": 0},
+    }
+    if not selected:
+        return result
+
+    first_date = min(selected.values())
+    last_date = max(selected.values())
+    after_dt = datetime.combine(first_date - timedelta(days=1), time.min, tzinfo=timezone.utc)
+    summaries: list[dict[str, Any]] = []
+    pages = StravaClient(settings).iter_activities_after(after_dt, per_page=200)
+    try:
+        for summary in pages:
+            if not isinstance(summary, dict):
+                continue
+            summary_date = _summary_local_date(summary)
+            # Strava lists activities oldest first after `after`, so stop paging past the range.
+            if summary_date is not None and summary_date > last_date + timedelta(days=1):
+                break
+            if str(summary.get("id")) in selected:
+                summaries.append(summary)
+    finally:
+        pages.close()
+
+    weather = backfill_weather_history(settings, summaries)
+    result.update(weather)
+    result["summaries"] = len(summaries)
+    if summaries:
+        result["misery"] = recompute_misery_scores(
+            settings,
+            activity_ids=sorted(str(summary["id"]) for summary in summaries),
+        )
+    return result
+
+
+def _parse_date_arg(value: str) -> date:
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError("dates must be YYYY-MM-DD") from None
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m chronicle.weather_backfill",
+        description="Backfill hourly weather history for cached dashboard activities and re-score misery.",
+    )
+    parser.add_argument("--start-date", type=_parse_date_arg, help="First activity date (YYYY-MM-DD).")
+    parser.add_argument("--end-date", type=_parse_date_arg, help="Last activity date (YYYY-MM-DD).")
+    args = parser.parse_args(argv)
+    if args.start_date and args.end_date and args.end_date < args.start_date:
+        parser.error("--end-date must be on or after --start-date")
+    try:
+        result = run_weather_backfill(Settings.from_env(), start_date=args.start_date, end_date=args.end_date)
+    except (LookupError, ValueError) as exc:
+        print(f"error: {exc}")
+        return 1
+    print(json.dumps(result, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -8,11 +8,23 @@ from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from .config import Settings
 from .activity_pipeline import run_once
 from .dashboard_data import ensure_dashboard_cache_warm, get_dashboard_payload
-from .storage import cleanup_runtime_state, get_runtime_value, requeue_expired_jobs, set_runtime_values, set_worker_heartbeat
+from .profiler import arm_profiler_from_env
+from .storage import (
+    ACTIVITY_JOB_LATEST_TARGET,
+    JOB_REQUEST_KINDS_RERUN,
+    cleanup_runtime_state,
+    get_runtime_value,
+    list_claimable_activity_jobs,
+    requeue_expired_jobs,
+    set_runtime_values,
+    set_worker_heartbeat,
+)
 
 
 logger = logging.getLogger(__name__)
 RUNTIME_CLEANUP_LAST_AT_KEY = "worker.runtime_cleanup.last_at_utc"
+QUEUED_JOB_POLL_SECONDS = 5
+QUEUED_JOB_BATCH_SIZE = 10
 
 
 def _in_quiet_hours(hour: int, start_hour: int, end_hour: int) -> bool:
@@ -134,6 +146,57 @@ def _maybe_cleanup_runtime_state(settings: Settings, *, now_utc: datetime) -> No
         logger.info("Runtime cleanup deleted %s record(s): %s", deleted_total, cleanup_stats)
 
 
+def _run_queued_rerun_jobs(settings: Settings) -> int:
+    jobs = list_claimable_activity_jobs(
+        settings.processed_log_file,
+        request_kinds=JOB_REQUEST_KINDS_RERUN,
+        limit=QUEUED_JOB_BATCH_SIZE,
+    )
+    processed = 0
+    for job in jobs:
+        job_id = str(job["job_id"])
+        target = str(job.get("activity_id") or "").strip()
+        activity_id = None if target in {"", ACTIVITY_JOB_LATEST_TARGET} else int(target)
+        try:
+            result = run_once(
+                force_update=bool(job.get("force_update")),
+                activity_id=activity_id,
+                queued_job_id=job_id,
+            )
+        except Exception:
+            logger.exception("Queued rerun job %s failed.", job_id)
+            continue
+        status = str(result.get("status") or "").strip().lower() if isinstance(result, dict) else ""
+        if status == "locked":
+            break
+        processed += 1
+        logger.info("Queued rerun job %s result: %s", job_id, result)
+        if _should_refresh_dashboard(result):
+            try:
+                get_dashboard_payload(settings, force_refresh=True)
+            except Exception as exc:
+                logger.warning("Dashboard cache refresh failed: %s", exc)
+    if processed:
+        set_runtime_values(
+            settings.processed_log_file,
+            {
+                "worker.last_queued_jobs_processed": processed,
+                "worker.last_queued_jobs_at_utc": datetime.now(timezone.utc).isoformat(),
+            },
+        )
+    return processed
+
+
+def _sleep_processing_queued_jobs(settings: Settings, seconds: int) -> None:
+    deadline = time.monotonic() + max(0, int(seconds))
+    while True:
+        _run_queued_rerun_jobs(settings)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        time.sleep(min(QUEUED_JOB_POLL_SECONDS, remaining))
+
+
 def main() -> None:
     settings = Settings.from_env()
     settings.ensure_state_paths()
@@ -151,6 +214,8 @@ def main() -> None:
         local_tz = ZoneInfo("UTC")
 
     logger.info("Worker started with poll interval: %ss", interval)
+    for arm in arm_profiler_from_env(settings):
+        logger.info("Profiler armed from env: %s x%s %s", arm["target"], arm["count"], arm.get("route") or "")
     set_runtime_values(
         settings.processed_log_file,
         {
@@ -221,7 +286,7 @@ def main() -> None:
                     "worker.next_wake_utc": (now_utc + timedelta(seconds=sleep_seconds)).isoformat(),
                 },
             )
-            time.sleep(sleep_seconds)
+            _sleep_processing_queued_jobs(settings, sleep_seconds)
             continue
 
         try:
@@ -261,7 +326,7 @@ def main() -> None:
                     "worker.next_wake_utc": (datetime.now(timezone.utc) + timedelta(seconds=interval)).isoformat(),
                 },
             )
-        time.sleep(interval)
+        _sleep_processing_queued_jobs(settings, interval)
 
 
 if __name__ == "__main__":
@@ -5,6 +5,9 @@
   const filterInput = document.getElementById("operationFilter");
   const clearStatusesButton = document.getElementById("clearStatuses");
   const topStatus = document.getElementById("controlTopStatus");
+  const liveStatus = document.getElementById("controlLiveStatus");
+  const LIVE_POLL_INTERVAL_MS = 15000;
+  const LIVE_STREAM_RETRY_MS = 60000;
 
   if (!tableBody) {
     return;
@@ -69,6 +72,81 @@
       input: null,
       buildRequest: () => ({ url: "/service-metrics" }),
     },
+    {
+      id: "profiler_status",
+      method: "GET",
+      command: "/control/profiler",
+      description: "Show the profiler arm state and recent profiles.",
+      input: null,
+      buildRequest: () => ({ url: "/control/profiler" }),
+    },
+    {
+      id: "profiler_arm_cycles",
+      method: "POST",
+      command: "/control/profiler/arm",
+      description: "Profile the next N worker cycles (default 1).",
+      input: {
+        placeholder: "optional cycle count e.g. 3",
+        required: false,
+      },
+      buildRequest: (value) => {
+        const text = String(value || "").trim();
+        const count = text ? Number(ensureIntString(text, "count")) : 1;
+        return { url: "/control/profiler/arm", body: { target: "cycles", count } };
+      },
+    },
+    {
+      id: "profiler_arm_route",
+      method: "POST",
+      command: "/control/profiler/arm",
+      description: "Profile the next N requests to one API route (default 10).",
+      input: {
+        placeholder: "route [count] e.g. /plan/data.json 20",
+        required: true,
+      },
+      buildRequest: (value) => {
+        const [route, countText] = String(value || "").trim().split(/\s+/);
+        if (!route) {
+          throw new Error("route is required.");
+        }
+        const count = countText ? Number(ensureIntString(countText, "count")) : 10;
+        return { url: "/control/profiler/arm", body: { target: "route", route, count } };
+      },
+    },
+    {
+      id: "profiler_top",
+      method: "GET",
+      command: "/control/profiler/top?profile={profile_id}&limit=25",
+      description: "Top functions from the latest profile, one profile_id, or all.",
+      input: {
+        placeholder: "optional profile_id or all",
+        required: false,
+      },
+      buildRequest: (value) => ({
+        url: withQuery("/control/profiler/top", { profile: value, limit: 25 }),
+      }),
+    },
+    {
+      id: "profiler_disarm",
+      method: "POST",
+      command: "/control/profiler/disarm",
+      description: "Cancel any remaining profiler slots.",
+      input: null,
+      buildRequest: () => ({ url: "/control/profiler/disarm" }),
+    },
+    {
+      id: "sqlite_statements",
+      method: "GET",
+      command: "/control/sqlite/statements?sort={sort}&explain=true",
+      description: "Runtime SQLite statements by total time, with query plans.",
+      input: {
+        placeholder: "optional sort: total_ms, mean_ms, max_ms, count, slow_count",
+        required: false,
+      },
+      buildRequest: (value) => ({
+        url: withQuery("/control/sqlite/statements", { sort: value, explain: "true" }),
+      }),
+    },
     {
       id: "dashboard_data",
       method: "GET",
@@ -424,6 +502,9 @@
       if (resultStatus) {
         parts.push(`result:${resultStatus}`);
       }
+      if (typeof payload.job_id === "string" && payload.job_id.trim()) {
+        parts.push(`job:${payload.job_id}`);
+      }
       if (typeof payload.dashboard_refresh === "string" && payload.dashboard_refresh.trim()) {
         parts.push(`dashboard:${payload.dashboard_refresh}`);
       }
@@ -598,8 +679,94 @@
     setTopStatus("success", "Ready");
   }
 
+  function setLiveStatus(message) {
+    if (!liveStatus) return;
+    liveStatus.textContent = `Live updates: ${message}`;
+  }
+
+  function describeChangeEvent(topic, data) {
+    const payload = data && typeof data.payload === "object" && data.payload ? data.payload : {};
+    if (topic === "job") {
+      const target = payload.activity_id ? `activity ${payload.activity_id}` : "latest activity";
+      return `job ${payload.job_id || "?"} (${target}) ${payload.status || "updated"}`;
+    }
+    const values = payload.values && typeof payload.values === "object" ? payload.values : {};
+    const summary = Object.entries(values)
+      .map(([key, value]) => `${key}=${typeof value === "object" ? JSON.stringify(value) : value}`)
+      .join(", ");
+    return summary ? `${topic}: ${summary.slice(0, 160)}` : `${topic} updated`;
+  }
+
+  let liveSource = null;
+  let livePollTimer = null;
+
+  async function pollReady() {
+    try {
+      const response = await fetch("/ready", { headers: { Accept: "application/json" } });
+      const payload = await response.json();
+      const cycleStatus = payload && payload.cycle_last_status ? ` | cycle:${payload.cycle_last_status}` : "";
+      setLiveStatus(`polling /ready, ${(payload && payload.status) || response.status}${cycleStatus}`);
+    } catch (error) {
+      setLiveStatus(`polling /ready failed (${String(error && error.message ? error.message : error)})`);
+    }
+  }
+
+  function startLivePolling() {
+    if (livePollTimer !== null) return;
+    pollReady();
+    livePollTimer = window.setInterval(pollReady, LIVE_POLL_INTERVAL_MS);
+  }
+
+  function stopLivePolling() {
+    if (livePollTimer === null) return;
+    window.clearInterval(livePollTimer);
+    livePollTimer = null;
+  }
+
+  function fallBackToPolling() {
+    if (liveSource) {
+      liveSource.close();
+      liveSource = null;
+    }
+    startLivePolling();
+    // Stream slots are capped per API process; try again once one may have freed up.
+    window.setTimeout(connectLiveStream, LIVE_STREAM_RETRY_MS);
+  }
+
+  function connectLiveStream() {
+    if (liveSource || typeof window.EventSource !== "function") {
+      if (!liveSource) startLivePolling();
+      return;
+    }
+    const source = new window.EventSource("/events");
+    liveSource = source;
+    source.addEventListener("open", () => {
+      stopLivePolling();
+      setLiveStatus("streaming");
+    });
+    source.addEventListener("stream.busy", fallBackToPolling);
+    for (const topic of ["job", "worker", "activity_detection", "dashboard_refresh", "service_metrics"]) {
+      source.addEventListener(topic, (event) => {
+        let data = null;
+        try {
+          data = JSON.parse(event.data);
+        } catch (_error) {
+          data = null;
+        }
+        setLiveStatus(describeChangeEvent(topic, data));
+      });
+    }
+    source.addEventListener("error", () => {
+      // CONNECTING means the browser is reconnecting on its own after the server closed the stream.
+      if (source.readyState === window.EventSource.CLOSED) {
+        fallBackToPolling();
+      }
+    });
+  }
+
   renderOperations();
   setTopStatus("success", "Ready");
+  connectLiveStream();
 
   if (filterInput) {
     filterInput.addEventListener("input", applyFilter);
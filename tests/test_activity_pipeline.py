@@ -1,5 +1,8 @@
 import os
+import sqlite3
 import tempfile
+import threading
+import time
 import unittest
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
@@ -21,15 +24,28 @@ from chronicle.activity_pipeline import (
     _extract_activity_garmin_badges,
     _extract_strava_segment_notables,
     _ensure_garmin_ready,
+    _garmin_daily_metric_expiry,
     _get_garmin_client,
+    _get_garmin_metrics,
+    _get_garmin_period_fallback,
+    garmin_session_snapshot,
+    invalidate_garmin_session,
     _profile_activity_update_payload,
     _profile_match_reasons,
     _resolve_cycle_time_context,
     _select_activity_profile,
     backfill_royale_hill_summits,
     preview_specific_profile_against_activity,
+    run_once,
+)
+from chronicle.config import invalidate_settings_cache
+from chronicle.storage import (
+    ACTIVITY_JOB_LATEST_TARGET,
+    enqueue_activity_job,
+    get_activity_job,
+    get_activity_summit_metric,
+    upsert_activity_summit_metric,
 )
-from chronicle.storage import get_activity_summit_metric, upsert_activity_summit_metric
 
 
 class TestStravaSegmentNotables(unittest.TestCase):
@@ -1612,6 +1628,17 @@ class TestExecutableProfileCriteria(unittest.TestCase):
 
 
 class TestGarminClientLogin(unittest.TestCase):
+    def setUp(self) -> None:
+        invalidate_garmin_session()
+        self.addCleanup(invalidate_garmin_session)
+        for target, value in (
+            ("chronicle.activity_pipeline.acquire_runtime_lock", True),
+            ("chronicle.activity_pipeline.release_runtime_lock", None),
+        ):
+            patcher = patch(target, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
     def _settings(self, tmp_path: Path) -> SimpleNamespace:
         return SimpleNamespace(
             enable_garmin=True,
@@ -1628,7 +1655,9 @@ class TestGarminClientLogin(unittest.TestCase):
 
         with patch("chronicle.activity_pipeline.get_runtime_value", return_value=None), patch(
             "chronicle.activity_pipeline.delete_runtime_value"
-        ) as delete_runtime_value, patch("garminconnect.Garmin", return_value=client):
+        ) as delete_runtime_value, patch("chronicle.activity_pipeline.set_runtime_values"), patch(
+            "garminconnect.Garmin", return_value=client
+        ):
             result = _get_garmin_client(settings)
 
         self.assertIs(result, client)
@@ -1678,6 +1707,180 @@ class TestGarminClientLogin(unittest.TestCase):
         self.assertIsNone(result)
         garmin_cls.assert_not_called()
 
+    def test_get_garmin_client_reuses_process_session_and_records_login_count(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            settings = self._settings(Path(tmpdir))
+            client = MagicMock()
+
+            with patch("garminconnect.Garmin", return_value=client) as garmin_cls:
+                first = _get_garmin_client(settings)
+                second = _get_garmin_client(settings)
+
+            self.assertIs(first, client)
+            self.assertIs(second, client)
+            garmin_cls.assert_called_once()
+            client.login.assert_called_once()
+            snapshot = garmin_session_snapshot(settings)
+            self.assertEqual(snapshot["login_count"], 1)
+            self.assertIsNotNone(snapshot["session_age_seconds"])
+            self.assertEqual(snapshot["process_session"]["reuse_count"], 1)
+
+    def test_session_snapshot_does_not_wait_on_inflight_login(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            settings = self._settings(Path(tmpdir))
+            login_started = threading.Event()
+            release_login = threading.Event()
+            client = MagicMock()
+
+            def slow_login(_tokenstore: str) -> None:
+                login_started.set()
+                release_login.wait(5)
+
+            client.login.side_effect = slow_login
+            with patch("garminconnect.Garmin", return_value=client):
+                worker = threading.Thread(target=_get_garmin_client, args=(settings,))
+                worker.start()
+                self.assertTrue(login_started.wait(5))
+                try:
+                    started = time.monotonic()
+                    snapshot = garmin_session_snapshot(settings)
+                    self.assertLess(time.monotonic() - started, 1.0)
+                    self.assertFalse(snapshot["process_session"]["cached"])
+                finally:
+                    release_login.set()
+                    worker.join(5)
+
+            self.assertTrue(garmin_session_snapshot(settings)["process_session"]["cached"])
+
+    def test_get_garmin_client_refreshes_tokens_before_expiry(self) -> None:
+        import base64
+        import json
+
+        def jwt_expiring_in(seconds: int) -> str:
+            payload = json.dumps({"exp": int(datetime.now(timezone.utc).timestamp()) + seconds}).encode("utf-8")
+            return "header." + base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=") + ".signature"
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            settings = self._settings(Path(tmpdir))
+            client = MagicMock()
+            client.client.di_token = jwt_expiring_in(60)
+            client.client.is_authenticated = True
+
+            def refresh() -> None:
+                client.client.di_token = jwt_expiring_in(3600 * 8)
+
+            client.client._refresh_session.side_effect = refresh
+
+            with patch("garminconnect.Garmin", return_value=client):
+                _get_garmin_client(settings)
+                result = _get_garmin_client(settings)
+
+            self.assertIs(result, client)
+            client.login.assert_called_once()
+            client.client._refresh_session.assert_called_once()
+            snapshot = garmin_session_snapshot(settings)
+            self.assertEqual(snapshot["refresh_count"], 1)
+            self.assertGreater(snapshot["token_expires_in_seconds"], 3600)
+
+    def test_get_garmin_client_logs_in_again_after_session_loses_tokens(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            settings = self._settings(Path(tmpdir))
+            stale_client = MagicMock()
+            fresh_client = MagicMock()
+
+            with patch("garminconnect.Garmin", side_effect=[stale_client, fresh_client]):
+                _get_garmin_client(settings)
+                stale_client.client.is_authenticated = False
+                result = _get_garmin_client(settings)
+
+            self.assertIs(result, fresh_client)
+            self.assertEqual(garmin_session_snapshot(settings)["login_count"], 2)
+
+    def test_get_garmin_metrics_feeds_endpoint_results_into_cycle_buckets(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            settings = self._settings(Path(tmpdir))
+            service_state: dict = {"services": {}}
+
+            def fake_fetch(_client, **kwargs):
+                kwargs["on_endpoint_result"]("hill_score", {"status": "timeout", "duration_ms": 20000, "error": "timed out"})
+                kwargs["on_endpoint_result"]("rhr_day", {"status": "success", "duration_ms": 140})
+                return {"hill_overall_score": "N/A"}
+
+            with patch("chronicle.activity_pipeline.fetch_training_status_and_scores", side_effect=fake_fetch):
+                training = _get_garmin_metrics(MagicMock(), settings=settings, service_state=service_state)
+
+            self.assertEqual(training, {"hill_overall_score": "N/A"})
+            hill_bucket = service_state["services"]["garmin.hill_score"]
+            self.assertEqual(hill_bucket["errors"], 1)
+            self.assertEqual(hill_bucket["timeouts"], 1)
+            self.assertEqual(hill_bucket["last_status"], "timeout")
+            self.assertEqual(service_state["services"]["garmin.rhr_day"]["last_duration_ms"], 140)
+
+    def test_garmin_daily_metric_expiry_keeps_settled_days_permanently(self) -> None:
+        now = datetime(2026, 3, 10, 12, 0, tzinfo=timezone.utc)
+        self.assertIsNone(_garmin_daily_metric_expiry("2026-03-08", {"overallScore": 5}, now))
+        self.assertEqual(_garmin_daily_metric_expiry("2026-03-09", {"overallScore": 5}, now), now + timedelta(minutes=30))
+        self.assertEqual(_garmin_daily_metric_expiry("2026-03-01", None, now), now + timedelta(minutes=30))
+
+    def test_garmin_period_fallback_syncs_incrementally_from_watermark(self) -> None:
+        class _PeriodClient:
+            def __init__(self) -> None:
+                self.requests: list[tuple[str, str]] = []
+                self.activities = [
+                    {
+                        "activityId": 1,
+                        "startTimeGMT": "2026-01-05 12:00:00",
+                        "activityType": {"typeKey": "running"},
+                        "calories": 600,
+                        "avgGradeAdjustedSpeed": 2.7,
+                    },
+                    {
+                        "activityId": 2,
+                        "startTimeGMT": "2026-02-14 12:00:00",
+                        "activityType": {"typeKey": "running"},
+                        "calories": 300,
+                        "avgGradeAdjustedSpeed": 2.9,
+                    },
+                ]
+
+            def get_activities_by_date(self, start: str, end: str):
+                self.requests.append((start, end))
+                return [
+                    item for item in self.activities if start <= item["startTimeGMT"][:10] <= end
+                ]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            settings = SimpleNamespace(
+                processed_log_file=Path(tmpdir) / "processed_activities.log",
+                timezone="UTC",
+                enable_service_result_cache=False,
+                service_cache_ttl_seconds=0,
+                enable_service_call_budget=False,
+                service_retry_count=0,
+                service_retry_backoff_seconds=0,
+            )
+            client = _PeriodClient()
+            now_utc = datetime(2026, 2, 15, 12, 0, tzinfo=timezone.utc)
+
+            first = _get_garmin_period_fallback(settings, client, now_utc=now_utc, service_state=None)
+            self.assertEqual(client.requests[0][0], "2026-01-01")
+            self.assertEqual(first["year"]["calories"], 900.0)
+            self.assertEqual(first["week"]["calories"], 300.0)
+
+            client.activities.append(
+                {
+                    "activityId": 3,
+                    "startTimeGMT": "2026-02-15 06:00:00",
+                    "activityType": {"typeKey": "running"},
+                    "calories": 150,
+                }
+            )
+            second = _get_garmin_period_fallback(settings, client, now_utc=now_utc, service_state=None)
+
+            self.assertEqual(client.requests[1][0], "2026-02-12")
+            self.assertEqual(second["year"]["calories"], 1050.0)
+            self.assertEqual(second["week"]["beers_earned"], 3.0)
+
     def test_ensure_garmin_ready_raises_retryable_error_while_rate_limited(self) -> None:
         tmp_path = Path(self.id().replace(".", "_"))
         settings = self._settings(tmp_path)
@@ -1708,5 +1911,87 @@ class TestGarminClientLogin(unittest.TestCase):
                 _ensure_garmin_ready(settings, None)
 
 
+class TestQueuedRerunJobRun(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.env = patch.dict(
+            os.environ,
+            {
+                "STATE_DIR": self.temp_dir.name,
+                "RUNTIME_DB_FILE": "runtime_state.db",
+                "STRAVA_CLIENT_ID": "client",
+                "STRAVA_CLIENT_SECRET": "secret",
+                "STRAVA_REFRESH_TOKEN": "refresh",
+                "SERVICE_RETRY_COUNT": "0",
+                "ENABLE_PIPELINE_TRACE": "false",
+            },
+        )
+        self.env.start()
+        invalidate_settings_cache()
+        self.path = Path(self.temp_dir.name) / "processed_activities.log"
+
+    def tearDown(self) -> None:
+        self.env.stop()
+        invalidate_settings_cache()
+        self.temp_dir.cleanup()
+
+    def _enqueue_latest(self) -> str:
+        job_id = enqueue_activity_job(
+            self.path,
+            ACTIVITY_JOB_LATEST_TARGET,
+            request_kind="rerun_latest",
+            requested_by="api",
+            force_update=True,
+            priority=10,
+        )
+        self.assertIsNotNone(job_id)
+        return str(job_id)
+
+    def _activity_ids(self) -> list[str]:
+        with sqlite3.connect(self.path.parent / "runtime_state.db") as conn:
+            return [str(row[0]) for row in conn.execute("SELECT activity_id FROM activities ORDER BY activity_id")]
+
+    def test_no_activities_completes_claimed_job(self) -> None:
+        job_id = self._enqueue_latest()
+        self.assertEqual(self._activity_ids(), [])
+        with patch("chronicle.activity_pipeline.StravaClient") as client_cls:
+            client_cls.return_value.get_recent_activities.return_value = []
+            result = run_once(force_update=True, queued_job_id=job_id)
+
+        self.assertEqual(result, {"status": "no_activities"})
+        job = get_activity_job(self.path, job_id)
+        self.assertEqual(job["status"], "succeeded")
+        self.assertEqual(job["attempt_count"], 1)
+        self.assertEqual(job["activity_id"], ACTIVITY_JOB_LATEST_TARGET)
+        self.assertEqual(run_once(force_update=True, queued_job_id=job_id)["status"], "job_unavailable")
+
+    def test_failure_before_selection_fails_unbound_job(self) -> None:
+        job_id = self._enqueue_latest()
+        with patch("chronicle.activity_pipeline.StravaClient") as client_cls:
+            client_cls.return_value.get_recent_activities.side_effect = RuntimeError("strava exploded")
+            with self.assertRaises(RuntimeError):
+                run_once(force_update=True, queued_job_id=job_id)
+
+        job = get_activity_job(self.path, job_id)
+        self.assertEqual(job["status"], "failed_permanent")
+        self.assertIn("strava exploded", job["last_error"])
+        self.assertEqual(job["activity_id"], ACTIVITY_JOB_LATEST_TARGET)
+        self.assertEqual(self._activity_ids(), [])
+
+    def test_failure_after_selection_binds_job_to_activity(self) -> None:
+        job_id = self._enqueue_latest()
+        activity = {"id": 555, "sport_type": "Run", "start_date": "2026-03-01T12:00:00Z"}
+        with patch("chronicle.activity_pipeline.StravaClient") as client_cls:
+            client_cls.return_value.get_recent_activities.return_value = [activity]
+            client_cls.return_value.get_activity_details.side_effect = RuntimeError("details unavailable")
+            with self.assertRaises(RuntimeError):
+                run_once(force_update=True, queued_job_id=job_id)
+
+        job = get_activity_job(self.path, job_id)
+        self.assertEqual(job["activity_id"], "555")
+        self.assertEqual(job["status"], "failed_permanent")
+        self.assertEqual(self._activity_ids(), ["555"])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,7 +1,10 @@
+import json
 import tempfile
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
+import chronicle.agent_store as agent_store
 from chronicle.agent_store import (
     append_audit_event,
     create_draft,
@@ -73,5 +76,89 @@ class TestAgentStore(unittest.TestCase):
             self.assertEqual(events[0]["payload"]["title"], "Example")
 
 
+    def test_list_drafts_filters_and_paginates_from_index(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state_dir = Path(temp_dir)
+            created = [
+                create_draft(state_dir, resource_kind="template" if index % 2 else "profile", payload={"i": index})
+                for index in range(5)
+            ]
+            update_draft(state_dir, created[1]["draft_id"], status="applied")
+
+            templates = list_drafts(state_dir, resource_kind="template")
+            self.assertEqual(
+                [item["draft_id"] for item in templates],
+                sorted((created[1]["draft_id"], created[3]["draft_id"]), reverse=True),
+            )
+            applied = list_drafts(state_dir, status="applied")
+            self.assertEqual([item["draft_id"] for item in applied], [created[1]["draft_id"]])
+
+            first_page = list_drafts(state_dir, limit=2)
+            second_page = list_drafts(state_dir, limit=2, cursor=first_page[-1]["draft_id"])
+            all_ids = sorted((item["draft_id"] for item in created), reverse=True)
+            self.assertEqual([item["draft_id"] for item in first_page + second_page], all_ids[:4])
+
+    def test_index_backfills_existing_files(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state_dir = Path(temp_dir)
+            jobs_dir = state_dir / "agent_control" / "jobs"
+            jobs_dir.mkdir(parents=True)
+            legacy_job = {"job_id": "job_20260101T000000Z_abcd", "task_kind": "plan_next_week", "status": "done"}
+            (jobs_dir / f"{legacy_job['job_id']}.json").write_text(json.dumps(legacy_job), encoding="utf-8")
+            audit_path = state_dir / "agent_control" / "audit.jsonl"
+            audit_path.write_text(
+                json.dumps({"event_id": "audit_1", "event_type": "draft.created", "resource_kind": "draft"}) + "\n",
+                encoding="utf-8",
+            )
+            agent_store._AGENT_INDEX_READY.discard(str(state_dir.resolve()))
+
+            self.assertEqual([item["job_id"] for item in list_jobs(state_dir, task_kind="plan_next_week")], [legacy_job["job_id"]])
+            filtered = list_audit_events(state_dir, event_type="draft.created")
+            self.assertEqual([item["event_id"] for item in filtered], ["audit_1"])
+
+    def test_audit_pages_follow_recording_order(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state_dir = Path(temp_dir)
+            # Same-second ids differ only by random hex, so id order is not recording order.
+            event_ids = iter(f"audit_20260101T000000Z_{suffix}" for suffix in ("ff", "00", "80", "11", "ee", "01", "7f"))
+            with patch.object(agent_store, "_new_id", side_effect=lambda prefix: next(event_ids)):
+                events = [
+                    append_audit_event(
+                        state_dir,
+                        event_type="draft.validated" if index % 3 == 0 else "draft.created",
+                        resource_kind="draft",
+                        resource_id=f"draft_{index}",
+                    )
+                    for index in range(7)
+                ]
+
+            pages: list[dict] = []
+            cursor = None
+            while True:
+                page = list_audit_events(state_dir, limit=3, cursor=cursor)
+                pages.extend(page)
+                if len(page) < 3:
+                    break
+                cursor = page[-1]["seq"]
+            self.assertEqual(
+                [item["event_id"] for item in pages],
+                [item["event_id"] for item in reversed(events)],
+            )
+
+            validated = list_audit_events(state_dir, event_type="draft.validated", limit=2)
+            self.assertEqual([item["resource_id"] for item in validated], ["draft_6", "draft_3"])
+            older = list_audit_events(state_dir, event_type="draft.validated", limit=2, cursor=validated[-1]["seq"])
+            self.assertEqual([item["resource_id"] for item in older], ["draft_0"])
+
+    def test_list_drafts_and_jobs_are_unbounded_by_default(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state_dir = Path(temp_dir)
+            total = agent_store.DEFAULT_LIST_LIMIT + 1
+            for index in range(total):
+                create_draft(state_dir, resource_kind="template", payload={"i": index})
+                create_job(state_dir, task_kind="plan_next_week", request_payload={"i": index})
+            self.assertEqual(len(list_drafts(state_dir)), total)
+            self.assertEqual(len(list_jobs(state_dir)), total)
+
 if __name__ == "__main__":
     unittest.main()
@@ -2,9 +2,23 @@ import json
 import os
 import tempfile
 import unittest
+from datetime import datetime, timezone
 from pathlib import Path
 from unittest.mock import Mock, patch
 
+from chronicle.dashboard_data import dashboard_data_path
+from chronicle.metrics_exposition import API_PROCESS_METRICS_PREFIX
+from chronicle.query_stats import persist_worker_statement_stats
+from chronicle.storage import (
+    archive_activity_template_context,
+    get_runtime_value,
+    observe_runtime_histogram,
+    register_activity_weather_targets,
+    set_runtime_values,
+    write_activity_misery_scores,
+    write_json,
+)
+
 try:
     import chronicle.api_server as api_server
 except ModuleNotFoundError:
@@ -73,7 +87,7 @@ class TestApiServer(unittest.TestCase):
             "week_start": "sunday",
             "activities": [],
         }
-        response = self.client.post("/rerun/latest")
+        response = self.client.post("/rerun/latest?sync=true")
         self.assertEqual(response.status_code, 200)
         payload = response.get_json()
         self.assertEqual(payload["status"], "ok")
@@ -96,7 +110,7 @@ class TestApiServer(unittest.TestCase):
             "week_start": "sunday",
             "activities": [],
         }
-        response = self.client.post("/rerun/activity/123456")
+        response = self.client.post("/rerun/activity/123456?sync=true")
         self.assertEqual(response.status_code, 200)
         payload = response.get_json()
         self.assertEqual(payload["result"]["kwargs"]["activity_id"], 123456)
@@ -107,13 +121,86 @@ class TestApiServer(unittest.TestCase):
         refresh_calls: list[tuple[tuple, dict]] = []
         api_server.run_once = lambda **kwargs: {"status": "already_processed", "kwargs": kwargs}
         api_server.get_dashboard_payload = lambda *args, **kwargs: refresh_calls.append((args, kwargs)) or {}
-        response = self.client.post("/rerun/latest")
+        response = self.client.post("/rerun/latest?sync=true")
         self.assertEqual(response.status_code, 200)
         payload = response.get_json()
         self.assertEqual(payload["status"], "ok")
         self.assertNotIn("dashboard_refresh", payload)
         self.assertEqual(len(refresh_calls), 0)
 
+    def test_rerun_latest_enqueues_job_without_running_cycle(self) -> None:
+        run_calls: list[dict] = []
+        api_server.run_once = lambda **kwargs: run_calls.append(kwargs) or {"status": "updated"}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self._set_temp_state_dir(temp_dir)
+            response = self.client.post("/rerun/latest")
+            self.assertEqual(response.status_code, 202)
+            payload = response.get_json()
+            self.assertEqual(payload["status"], "queued")
+            self.assertEqual(payload["job"]["request_kind"], "rerun_latest")
+            self.assertIsNone(payload["job"]["activity_id"])
+            self.assertEqual(run_calls, [])
+
+            status_response = self.client.get(payload["status_url"])
+            self.assertEqual(status_response.status_code, 200)
+            job = status_response.get_json()["job"]
+            self.assertEqual(job["job_id"], payload["job_id"])
+            self.assertEqual(job["status"], "queued")
+            self.assertFalse(job["terminal"])
+
+            missing_response = self.client.get("/jobs/does-not-exist")
+            self.assertEqual(missing_response.status_code, 404)
+
+    def test_rerun_bulk_enqueues_jobs_for_date_range(self) -> None:
+        refresh_calls: list[tuple] = []
+        api_server.get_dashboard_payload = lambda *args, **kwargs: refresh_calls.append((args, kwargs)) or {}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self._set_temp_state_dir(temp_dir)
+            cold = self.client.post(
+                "/rerun/bulk",
+                json={"start_date": "2026-03-01", "end_date": "2026-03-31"},
+            )
+            self.assertEqual(cold.status_code, 409)
+
+            write_json(
+                dashboard_data_path(api_server.settings),
+                {
+                    "activities": [
+                        {"id": 101, "date": "2026-03-01"},
+                        {"id": 102, "date": "2026-03-05"},
+                        {"id": 103, "date": "2026-04-01"},
+                    ]
+                },
+            )
+            response = self.client.post(
+                "/rerun/bulk",
+                json={"start_date": "2026-03-01", "end_date": "2026-03-31"},
+            )
+            self.assertEqual(response.status_code, 202)
+            payload = response.get_json()
+            self.assertEqual(payload["count"], 2)
+            self.assertEqual([item["activity_id"] for item in payload["jobs"]], ["101", "102"])
+            self.assertEqual(refresh_calls, [])
+
+            by_ids = self.client.post("/rerun/bulk", json={"activity_ids": [7, 7, "8"]})
+            self.assertEqual(by_ids.status_code, 202)
+            self.assertEqual(by_ids.get_json()["count"], 2)
+
+            invalid = self.client.post("/rerun/bulk", json={"activity_ids": ["abc"]})
+            self.assertEqual(invalid.status_code, 400)
+
+    def test_events_stream_replays_change_log(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self._set_temp_state_dir(temp_dir)
+            self.client.post("/rerun/activity/987")
+            with patch("chronicle.event_stream.EVENT_STREAM_MAX_DURATION_SECONDS", 0.05):
+                response = self.client.get("/events", headers={"Last-Event-ID": "0"})
+                body = response.get_data(as_text=True)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.mimetype, "text/event-stream")
+            self.assertIn("event: job", body)
+            self.assertIn('"status": "queued"', body)
+
     def test_rerun_generic_with_invalid_id(self) -> None:
         response = self.client.post("/rerun", json={"activity_id": "abc"})
         self.assertEqual(response.status_code, 400)
@@ -230,6 +317,12 @@ class TestApiServer(unittest.TestCase):
             applied = apply_response.get_json()["draft"]
             self.assertEqual(applied["status"], "applied")
 
+            newest = self.client.get("/agent-control/audit?limit=1").get_json()
+            self.assertEqual(newest["events"][0]["event_type"], "draft.applied")
+            older = self.client.get(f"/agent-control/audit?limit=1&cursor={newest['next_cursor']}").get_json()
+            self.assertEqual(older["events"][0]["event_type"], "draft.dry_run")
+            self.assertEqual(self.client.get("/agent-control/audit?cursor=audit_x").status_code, 400)
+
     def test_agent_task_plan_next_week_creates_job_and_draft(self) -> None:
         with tempfile.TemporaryDirectory() as temp_dir:
             self._set_temp_state_dir(temp_dir)
@@ -333,6 +426,141 @@ class TestApiServer(unittest.TestCase):
         payload = response.get_json()
         self.assertEqual(payload["status"], "ok")
         self.assertIn("cycle_service_calls", payload)
+        self.assertIsNone(payload["cycle_trace"])
+        self.assertIn("session_age_seconds", payload["garmin_session"])
+
+    def test_metrics_endpoint_exposes_worker_and_api_series(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self._set_temp_state_dir(tmpdir)
+            path = api_server.settings.processed_log_file
+            set_runtime_values(
+                path,
+                {
+                    "service.garmin.activity_match.events.cache_hit": 3,
+                    "service.garmin.activity_match.events.cache_miss": 1,
+                    "service.garmin.activity_match.duration_count": 1,
+                    "service.garmin.activity_match.duration_total_ms": 40,
+                    "service.garmin.activity_match.duration_bucket.50": 1,
+                },
+            )
+            observe_runtime_histogram(path, "cycle_duration_ms", 1200.0, buckets=(1000, 5000), labels={"status": "ok"})
+            sibling = {
+                "pid": 999001,
+                "updated_at_utc": datetime.now(timezone.utc).isoformat(),
+                "http_hosts": {},
+                "sqlite_ops": {},
+                "sqlite_busy_errors": 2,
+                "requests": {
+                    "GET /health": {
+                        "labels": {"route": "/health", "method": "GET", "status": "2xx"},
+                        "buckets": {"5": 1, "+Inf": 0},
+                        "count": 1,
+                        "sum": 1.5,
+                    }
+                },
+            }
+            set_runtime_values(
+                path,
+                {
+                    f"{API_PROCESS_METRICS_PREFIX}999001": sibling,
+                    f"{API_PROCESS_METRICS_PREFIX}999002": sibling
+                    | {"pid": 999002, "updated_at_utc": "2020-01-01T00:00:00+00:00"},
+                },
+            )
+            self.client.get("/service-metrics")
+
+            response = self.client.get("/metrics")
+            stale = get_runtime_value(path, f"{API_PROCESS_METRICS_PREFIX}999002")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith("text/plain; version=0.0.4"))
+        body = response.get_data(as_text=True)
+        self.assertIn('chronicle_service_cache_hit_ratio{service="garmin.activity_match"} 0.75', body)
+        self.assertIn(
+            'chronicle_service_events_total{outcome="cache_hit",service="garmin.activity_match"} 3',
+            body,
+        )
+        self.assertIn('chronicle_job_queue_depth{status="queued"} 0', body)
+        self.assertIn('chronicle_job_queue_depth{status="failed_permanent"} 0', body)
+        self.assertIn('chronicle_cycle_duration_ms_bucket{le="1000",status="ok"} 0', body)
+        self.assertIn('chronicle_cycle_duration_ms_bucket{le="5000",status="ok"} 1', body)
+        self.assertIn(f'pid="{os.getpid()}",route="/service-metrics"', body)
+        self.assertIn('chronicle_http_request_duration_ms_count{method="GET",pid="999001",route="/health",status="2xx"} 1', body)
+        self.assertIn('chronicle_sqlite_busy_errors_total{pid="999001",process="api"} 2', body)
+        self.assertNotIn('pid="999002"', body)
+        self.assertIsNone(stale)
+        self.assertEqual(body.count("# TYPE chronicle_sqlite_op_duration_ms histogram"), 1)
+
+    def test_profiler_arm_profiles_next_route_request(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self._set_temp_state_dir(tmpdir)
+            response = self.client.post("/control/profiler/arm", json={"target": "route", "route": "health"})
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.get_json()["status"], "error")
+
+            response = self.client.post(
+                "/control/profiler/arm",
+                json={"target": "route", "route": "/health", "count": 1, "interval_ms": 1},
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.get_json()["arm"]["remaining"], 1)
+
+            self.client.get("/health")
+            self.client.get("/health")
+            status = self.client.get("/control/profiler").get_json()
+            self.assertEqual(status["arms"]["route"]["remaining"], 0)
+            self.assertIsNone(status["arms"]["cycles"])
+            self.assertEqual(len(status["results"]), 1)
+            result = status["results"][0]
+            self.assertEqual(result["label"], "GET /health")
+            self.assertEqual(result["status"], "ok")
+
+            top = self.client.get(f"/control/profiler/top?profile={result['profile_id']}&limit=5")
+            self.assertEqual(top.status_code, 200)
+            self.assertEqual(top.get_json()["profiles"], [result["profile_id"]])
+            self.assertEqual(self.client.get("/control/profiler/top?profile=missing").status_code, 404)
+
+            download = self.client.get(f"/control/profiler/profiles/{result['profile_id']}")
+            self.assertEqual(download.status_code, 200)
+            self.assertIn("attachment", download.headers["Content-Disposition"])
+
+    def test_sqlite_statements_endpoint_reports_api_and_worker_stats(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self._set_temp_state_dir(tmpdir)
+            persist_worker_statement_stats(api_server.settings)
+            self.client.get("/ready")
+            self.assertEqual(self.client.get("/control/sqlite/statements?sort=slowest").status_code, 400)
+
+            response = self.client.get("/control/sqlite/statements?sort=count&limit=200&explain=true")
+        self.assertEqual(response.status_code, 200)
+        payload = response.get_json()
+        self.assertEqual(payload["sort"], "count")
+        self.assertEqual(set(payload["processes"]), {"api", "worker"})
+        api_rows = payload["processes"]["api"]["statements"]
+        self.assertTrue(api_rows)
+        self.assertGreaterEqual(api_rows[0]["count"], api_rows[-1]["count"])
+        selects = [row for row in api_rows if row["op"] == "select" and "runtime_kv" in row["statement"]]
+        self.assertTrue(selects)
+        self.assertIsInstance(selects[0]["plan"], list)
+        self.assertIn("full_scan_tables", selects[0])
+
+    def test_misery_scores_endpoint_reads_effective_settings(self) -> None:
+        with tempfile.TemporaryDirectory() as stale_dir, tempfile.TemporaryDirectory() as live_dir:
+            self._set_temp_state_dir(stale_dir)
+            os.environ["STATE_DIR"] = live_dir
+            live_log = api_server.Settings.from_env().processed_log_file
+            register_activity_weather_targets(
+                live_log,
+                [{"activity_id": "7", "start_utc": "2026-03-07T10:10:00Z", "cell": "33.80,-84.40", "local_date": "2026-03-07"}],
+            )
+            write_activity_misery_scores(live_log, [{"activity_id": "7", "score": 12.5, "description": "Mild"}])
+
+            response = self.client.get("/misery/scores?activity_ids=7")
+            bad_limit = self.client.get("/misery/scores?limit=abc")
+        self.assertEqual(response.status_code, 200)
+        payload = response.get_json()
+        self.assertEqual(payload["count"], 1)
+        self.assertEqual(payload["scores"][0]["misery_index"], 12.5)
+        self.assertEqual(bad_limit.status_code, 400)
 
     def test_setup_page_endpoint(self) -> None:
         response = self.client.get("/setup")
@@ -1281,6 +1509,69 @@ class TestApiServer(unittest.TestCase):
         self.assertTrue(payload["has_context"])
         self.assertTrue(str(payload["context_source"]).startswith("sample"))
 
+    def test_editor_schema_uses_precomputed_latest_schema_and_etag(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self._set_temp_state_dir(temp_dir)
+            latest_path = api_server.settings.latest_json_file
+            latest_path.write_text(
+                json.dumps({"template_context": {"activity": {"distance_miles": 5}}, "template_context_fingerprint": "fp-1"}),
+                encoding="utf-8",
+            )
+            schema_path = latest_path.with_name(f"{latest_path.stem}.schema.json")
+            schema_path.write_text(json.dumps({"fingerprint": "fp-1", "schema": {"precomputed": True}}), encoding="utf-8")
+
+            response = self.client.get("/editor/schema?context_mode=latest")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.get_json()["schema"], {"precomputed": True})
+            etag = response.headers["ETag"]
+
+            cached = self.client.get("/editor/schema?context_mode=latest", headers={"If-None-Match": etag})
+            self.assertEqual(cached.status_code, 304)
+            catalog = self.client.get("/editor/catalog?context_mode=latest", headers={"If-None-Match": etag})
+            self.assertEqual(catalog.status_code, 200)
+            self.assertNotEqual(catalog.headers["ETag"], etag)
+
+    def test_editor_preview_batch_renders_fixtures_and_archived_contexts(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self._set_temp_state_dir(temp_dir)
+            response = self.client.post(
+                "/editor/preview/batch",
+                json={"template": "Miles {{ activity.distance_miles }}", "contexts": "fixtures"},
+            )
+            self.assertEqual(response.status_code, 200)
+            payload = response.get_json()
+            fixture_names = [item["name"] for item in api_server.list_sample_template_fixtures()]
+            self.assertEqual(
+                [item["context_source"] for item in payload["results"]],
+                [f"sample:{name}" for name in fixture_names],
+            )
+            self.assertEqual(payload["summary"]["changed_count"], len(fixture_names))
+            self.assertTrue(all(item["diff"] for item in payload["results"]))
+
+            empty = self.client.post("/editor/preview/batch", json={"contexts": "recent"})
+            self.assertEqual(empty.status_code, 404)
+
+            for activity_id in ("101", "102"):
+                archive_activity_template_context(
+                    api_server.settings.processed_log_file,
+                    activity_id,
+                    context={"activity": {"distance_miles": activity_id}},
+                    profile_id="default",
+                )
+            recent = self.client.post(
+                "/editor/preview/batch",
+                json={"template": "{{ activity.distance_miles }}{{ missing.value }}", "contexts": "recent", "limit": 1},
+            )
+            self.assertEqual(recent.status_code, 200)
+            recent_payload = recent.get_json()
+            self.assertEqual(len(recent_payload["results"]), 1)
+            self.assertFalse(recent_payload["results"][0]["ok"])
+            self.assertEqual(recent_payload["summary"]["error_count"], 1)
+
+            unmatched = self.client.post("/editor/preview/batch", json={"contexts": "profile", "profile_id": "long_run"})
+            self.assertEqual(unmatched.status_code, 404)
+            self.assertIn("matched profile 'long_run'", unmatched.get_json()["error"])
+
     def test_editor_snippets_endpoint(self) -> None:
         response = self.client.get("/editor/snippets")
         self.assertEqual(response.status_code, 200)
@@ -1863,6 +2154,19 @@ class TestApiServer(unittest.TestCase):
         self.assertEqual(payload["status"], "ok")
         self.assertTrue(str(payload["context_source"]).startswith("sample:"))
 
+    def test_unknown_fixture_names_resolve_to_default_cache_entry(self) -> None:
+        for index in range(20):
+            response = self.client.post(
+                "/editor/preview",
+                json={"context_mode": "fixture", "fixture_name": f"bogus-{index}", "template": "ok"},
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.get_json()["context_source"], "sample:default")
+        with api_server._TEMPLATE_CONTEXT_CACHE_LOCK:
+            sample_keys = [key for key in api_server._TEMPLATE_CONTEXT_CACHE if key.startswith("sample:")]
+        self.assertNotIn("sample:bogus-0", sample_keys)
+        self.assertLessEqual(len(sample_keys), len(api_server.list_sample_template_fixtures()))
+
     def test_editor_preview_invalid_context_mode(self) -> None:
         response = self.client.post(
             "/editor/preview",
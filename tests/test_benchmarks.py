@@ -0,0 +1,68 @@
+import unittest
+from datetime import date
+
+import requests
+
+from benchmarks.fake_providers import FakeProviders, ProviderProfile, ProviderRateLimited
+from benchmarks.load_test import DEFAULT_ROUTE_MIX, compare_load_results, parse_route_mix
+from benchmarks.run import compare_results
+from benchmarks.synthetic import SUMMIT_LATITUDE, generate_dataset, latlng_stream
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+    def test_synthetic_dataset_is_deterministic(self) -> None:
+        first = generate_dataset(years=0.25, seed=7, end_date=date(2026, 1, 31))
+        second = generate_dataset(years=0.25, seed=7, end_date=date(2026, 1, 31))
+        self.assertEqual(first.strava_activities, second.strava_activities)
+        self.assertEqual(first.plan_days, second.plan_days)
+        self.assertGreater(len(first.strava_activities), 50)
+        self.assertGreater(first.strava_activities[0]["start_date"], first.strava_activities[-1]["start_date"])
+
+        summit_run = next(item for item in first.strava_activities if item["_summit_loops"])
+        stream = latlng_stream(summit_run, points=400)["latlng"]["data"]
+        self.assertEqual(len(stream), 400)
+        self.assertTrue(any(abs(lat - SUMMIT_LATITUDE) < 0.0002 for lat, _lon in stream))
+
+    def test_rate_limited_provider_raises_429(self) -> None:
+        dataset = generate_dataset(years=0.1, seed=3)
+        providers = FakeProviders(dataset, strava=ProviderProfile(rate_limit_per_minute=2, on_limit="raise"))
+        client = providers.strava_client()
+        client.get_recent_activities()
+        client.get_recent_activities()
+        with self.assertRaises(ProviderRateLimited) as raised:
+            client.get_recent_activities()
+        self.assertIsInstance(raised.exception, requests.HTTPError)
+        self.assertEqual(raised.exception.response.status_code, 429)
+        self.assertEqual(providers.stats()["strava"]["throttled"], 1)
+        detail = FakeProviders(dataset).strava_client().get_activity_details(dataset.strava_activities[0]["id"])
+        self.assertNotIn("_summit_loops", detail)
+
+    def test_compare_results_flags_regressions(self) -> None:
+        baseline = {"scenarios": {"a": {"p50_ms": 100.0}, "b": {"p50_ms": 100.0}}}
+        current = {"scenarios": {"a": {"p50_ms": 130.0}, "b": {"p50_ms": 105.0}, "c": {"p50_ms": 1.0}}}
+        rows = {row["scenario"]: row for row in compare_results(current, baseline, threshold=0.15)}
+        self.assertEqual(rows["a"]["status"], "regressed")
+        self.assertEqual(rows["b"]["status"], "unchanged")
+        self.assertEqual(rows["c"]["status"], "new")
+
+    def test_load_route_mix_and_regression_rows(self) -> None:
+        self.assertEqual(parse_route_mix(None), DEFAULT_ROUTE_MIX)
+        self.assertEqual(parse_route_mix("plan_today=3, dashboard_data"), {"plan_today": 3, "dashboard_data": 1})
+        with self.assertRaises(ValueError):
+            parse_route_mix("plan_tomorrow=1")
+
+        def _route(p95: float, error_rate: float) -> dict:
+            return {"latency_ms": {"p95": p95}, "error_rate": error_rate}
+
+        baseline = {"load": {"routes": {"plan_today": _route(10.0, 0.0), "plan_data": _route(40.0, 0.0)}}}
+        current = {"load": {"routes": {"plan_today": _route(11.0, 0.05), "plan_data": _route(30.0, 0.0)}}}
+        rows = {
+            row["route"]: row
+            for row in compare_load_results(current, baseline, p95_threshold=0.2, error_rate_tolerance=0.01)
+        }
+        self.assertEqual(rows["plan_today"]["status"], "regressed")
+        self.assertEqual(rows["plan_data"]["status"], "improved")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,7 +4,7 @@ import unittest
 from pathlib import Path
 from unittest.mock import patch
 
-from chronicle.config import Settings
+from chronicle.config import Settings, get_settings, invalidate_settings_cache
 from chronicle.storage import write_json
 
 
@@ -169,5 +169,53 @@ class TestConfigEnvAliases(unittest.TestCase):
                 self.assertTrue(settings.enable_weather)
 
 
+class TestSettingsProvider(unittest.TestCase):
+    def setUp(self) -> None:
+        invalidate_settings_cache()
+        self.addCleanup(invalidate_settings_cache)
+
+    def test_get_settings_reuses_instance_until_overrides_change(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            state_dir = Path(tmp_dir)
+            with patch.dict(
+                os.environ,
+                {"STATE_DIR": str(state_dir), "TIMEZONE": "UTC"},
+                clear=True,
+            ):
+                first = get_settings()
+                with patch("chronicle.config.Settings.from_env") as from_env:
+                    self.assertIs(get_settings(), first)
+                    from_env.assert_not_called()
+
+                write_json(
+                    state_dir / "setup_overrides.json",
+                    {
+                        "version": 1,
+                        "updated_at_utc": "2999-01-01T00:00:00+00:00",
+                        "values": {"TIMEZONE": "America/Phoenix"},
+                    },
+                )
+                refreshed = get_settings()
+                self.assertIsNot(refreshed, first)
+                self.assertEqual(refreshed.timezone, "America/Phoenix")
+
+    def test_get_settings_rebuilds_when_environment_changes_or_invalidated(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with patch.dict(
+                os.environ,
+                {"STATE_DIR": tmp_dir, "TIMEZONE": "UTC"},
+                clear=True,
+            ):
+                first = get_settings()
+                os.environ["TIMEZONE"] = "America/Denver"
+                second = get_settings()
+                self.assertEqual(second.timezone, "America/Denver")
+                self.assertIs(get_settings(), second)
+
+                invalidate_settings_cache()
+                self.assertIsNot(get_settings(), second)
+                self.assertIsNot(second, first)
+
+
 if __name__ == "__main__":
     unittest.main()
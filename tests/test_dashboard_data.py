@@ -11,7 +11,7 @@ from unittest import mock
 import chronicle.dashboard_data as dashboard_data
 from chronicle.config import Settings
 from chronicle.dashboard_data import dashboard_data_path, get_dashboard_payload, intervals_metrics_cache_path
-from chronicle.storage import write_json
+from chronicle.storage import count_intervals_metrics, get_runtime_value, write_json
 
 
 class TestDashboardData(unittest.TestCase):
@@ -56,7 +56,7 @@ class TestDashboardData(unittest.TestCase):
 
             with mock.patch("chronicle.dashboard_data.StravaClient") as mock_client_cls:
                 mock_client = mock_client_cls.return_value
-                mock_client.get_activities_after.return_value = fake_activities
+                mock_client.iter_activities_after.return_value = fake_activities
                 with mock.patch.dict(os.environ, {"DASHBOARD_WEEK_START": "sunday"}, clear=False):
                     payload = get_dashboard_payload(settings, force_refresh=True)
 
@@ -472,7 +472,7 @@ class TestDashboardData(unittest.TestCase):
                 return_value=intervals_records,
             ):
                 mock_client = mock_client_cls.return_value
-                mock_client.get_activities_after.return_value = fake_activities
+                mock_client.iter_activities_after.return_value = fake_activities
                 payload = get_dashboard_payload(settings, force_refresh=True)
 
             self.assertEqual(payload["intervals"]["records"], 2)
@@ -533,7 +533,7 @@ class TestDashboardData(unittest.TestCase):
                 side_effect=[seed_records, incremental_records],
             ) as mock_intervals:
                 mock_client = mock_client_cls.return_value
-                mock_client.get_activities_after.return_value = fake_activities
+                mock_client.iter_activities_after.return_value = fake_activities
                 first_payload = get_dashboard_payload(settings, force_refresh=True)
                 second_payload = get_dashboard_payload(settings, force_refresh=True)
 
@@ -544,10 +544,64 @@ class TestDashboardData(unittest.TestCase):
             self.assertEqual(first_call["oldest"], dashboard_data._dashboard_history_start())
             current_year_start = datetime(datetime.now(timezone.utc).year, 1, 1, tzinfo=timezone.utc)
             self.assertGreaterEqual(second_call["oldest"], current_year_start)
-            cache_payload = dashboard_data.read_json(intervals_metrics_cache_path(settings))
-            self.assertIsInstance(cache_payload, dict)
-            assert isinstance(cache_payload, dict)
-            self.assertEqual(cache_payload.get("last_fetch_mode"), "incremental")
+            sync_state = get_runtime_value(settings.processed_log_file, dashboard_data.INTERVALS_CACHE_SYNC_KEY)
+            self.assertIsInstance(sync_state, dict)
+            assert isinstance(sync_state, dict)
+            self.assertEqual(sync_state.get("last_fetch_mode"), "incremental")
+            self.assertEqual(second_payload["intervals"].get("upserted_records"), 1)
+            self.assertEqual(second_payload["intervals"].get("records"), 1)
+            self.assertEqual(count_intervals_metrics(settings.processed_log_file), 1)
+
+    def test_intervals_sync_imports_legacy_json_cache(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            base_settings = self._settings_for(td)
+            settings = replace(
+                base_settings,
+                enable_intervals=True,
+                intervals_user_id="athlete",
+                intervals_api_key="api-key",
+            )
+            legacy_path = intervals_metrics_cache_path(settings)
+            write_json(
+                legacy_path,
+                {
+                    "schema_version": dashboard_data.LEGACY_INTERVALS_CACHE_SCHEMA_VERSION,
+                    "history_start": dashboard_data._dashboard_history_start().isoformat(),
+                    "latest_sync_at": datetime.now(timezone.utc).isoformat(),
+                    "records": [
+                        {
+                            "strava_activity_id": "1001",
+                            "start_date": "2026-02-01T10:15:00+00:00",
+                            "avg_fitness": 70.0,
+                        }
+                    ],
+                },
+            )
+            fake_activities = [
+                {
+                    "id": 1001,
+                    "start_date_local": "2026-02-01T10:15:20+00:00",
+                    "sport_type": "Run",
+                    "distance": 5000.0,
+                    "moving_time": 1500,
+                    "total_elevation_gain": 42.0,
+                }
+            ]
+
+            with mock.patch("chronicle.dashboard_data.StravaClient") as mock_client_cls, mock.patch(
+                "chronicle.dashboard_data.get_intervals_dashboard_metrics",
+                return_value=[],
+            ) as mock_intervals:
+                mock_client_cls.return_value.iter_activities_after.return_value = fake_activities
+                payload = get_dashboard_payload(settings, force_refresh=True)
+
+            self.assertFalse(legacy_path.exists())
+            self.assertEqual(payload["intervals"].get("sync_mode"), "incremental")
+            self.assertEqual(payload["intervals"]["matched_activities"], 1)
+            self.assertGreater(
+                mock_intervals.call_args.kwargs["oldest"],
+                dashboard_data._dashboard_history_start(),
+            )
 
     def test_smart_revalidate_uses_incremental_activity_merge(self) -> None:
         with tempfile.TemporaryDirectory() as td:
@@ -617,7 +671,7 @@ class TestDashboardData(unittest.TestCase):
                 side_effect=AssertionError("full rebuild should not run"),
             ):
                 mock_client = mock_client_cls.return_value
-                mock_client.get_activities_after.return_value = recent_raw
+                mock_client.iter_activities_after.return_value = recent_raw
                 refreshed = dashboard_data._smart_revalidate_payload(settings, data_path, cached_payload)
 
             self.assertEqual(refreshed.get("sync_mode"), "incremental")
@@ -625,7 +679,7 @@ class TestDashboardData(unittest.TestCase):
             self.assertEqual(len(refreshed.get("activities", [])), 2)
             ids = [item.get("id") for item in refreshed["activities"]]
             self.assertEqual(ids, ["1001", "1003"])
-            call_args = mock_client.get_activities_after.call_args
+            call_args = mock_client.iter_activities_after.call_args
             self.assertIsNotNone(call_args)
             assert call_args is not None
             self.assertIsInstance(call_args.args[0], datetime)
@@ -51,7 +51,7 @@ class TestDashboardPayloadContract(unittest.TestCase):
 
             with mock.patch("chronicle.dashboard_data.StravaClient") as mock_client_cls:
                 mock_client = mock_client_cls.return_value
-                mock_client.get_activities_after.return_value = fake_activities
+                mock_client.iter_activities_after.return_value = fake_activities
                 payload = get_dashboard_payload(settings, force_refresh=True)
 
             required_root_keys = {
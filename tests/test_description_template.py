@@ -3,7 +3,9 @@ import tempfile
 import unittest
 from pathlib import Path
 from types import SimpleNamespace
+from unittest.mock import patch
 
+import chronicle.description_template as description_template
 from chronicle.description_template import (
     PROFILE_TEMPLATE_DEFAULTS,
     build_context_schema,
@@ -29,6 +31,7 @@ from chronicle.description_template import (
     list_template_profiles,
     list_template_repository_templates,
     list_template_versions,
+    normalize_template_context,
     render_template_text,
     render_with_active_template,
     rollback_template_version,
@@ -159,6 +162,18 @@ class TestDescriptionTemplate(unittest.TestCase):
         self.assertNotIn("fitness", context["intervals"])
         self.assertNotIn("fitness", context["activity"])
 
+    def test_normalized_context_shares_nested_values_and_is_not_mutable_from_templates(self) -> None:
+        context = get_sample_template_context()
+        normalized = normalize_template_context(context)
+        self.assertIs(normalize_template_context(normalized), normalized)
+        self.assertIs(normalized["periods"], context["periods"])
+        self.assertIsNot(normalized["intervals"], context["intervals"])
+
+        badge_count = len(context["badges"])
+        result = render_template_text("{{ badges.append('x') }}", normalized)
+        self.assertFalse(result["ok"])
+        self.assertEqual(len(context["badges"]), badge_count)
+
     def test_validate_rejects_forbidden_constructs(self) -> None:
         context = {"value": "ok"}
         validation = validate_template_text("{% include 'x' %}", context)
@@ -269,6 +284,85 @@ class TestDescriptionTemplate(unittest.TestCase):
             self.assertFalse(result["fallback_used"])
             self.assertTrue(isinstance(result.get("error"), str) and result["error"])
 
+    def test_render_guard_stops_runaway_loops_and_falls_back_to_seed(self) -> None:
+        runaway = "{% for a in range(10000) %}{% for b in badges %}{{ a }}{% endfor %}{% endfor %}"
+        context = get_sample_template_context()
+        result = render_template_text(runaway, context)
+        self.assertFalse(result["ok"])
+        self.assertTrue(result["budget_exceeded"])
+        self.assertIn("loop iterations", result["error"])
+
+        with tempfile.TemporaryDirectory() as td:
+            settings = _settings_for(Path(td) / "description_template.j2")
+            save_active_template(settings, runaway)
+            fallback = render_with_active_template(settings, context, allow_seed_fallback=False)
+            self.assertTrue(fallback["ok"])
+            self.assertTrue(fallback["fallback_used"])
+            self.assertIn("loop iterations", fallback["fallback_reason"])
+
+    def test_validate_reports_render_cost_and_warns_near_budget(self) -> None:
+        context = get_sample_template_context()
+        validation = validate_template_text("{% for i in range(12000) %}{% endfor %}ok", context)
+        self.assertTrue(validation["valid"])
+        self.assertEqual(validation["render_cost"]["loop_iterations"], 12000)
+        self.assertTrue(any("close to the budget" in item for item in validation["warnings"]))
+
+        with patch.object(description_template, "TEMPLATE_RENDER_MAX_OUTPUT_BYTES", 10):
+            oversized = validate_template_text("{{ 'x' * 50 }}", context)
+        self.assertFalse(oversized["valid"])
+        self.assertIn("bytes of output", oversized["errors"][0])
+
+    def test_render_guard_meters_template_literals(self) -> None:
+        context = get_sample_template_context()
+        nested = render_template_text(
+            "{% for i in [0] * 3000 %}{% for j in [0] * 3000 %}{% endfor %}{% endfor %}",
+            context,
+        )
+        self.assertTrue(nested["budget_exceeded"])
+        self.assertIn("loop iterations", nested["error"])
+
+        for literal in ("{% for c in 'abcdef' %}{% endfor %}ok", "{% for k in {'a': 1, 'b': 2} %}{% endfor %}ok"):
+            validation = validate_template_text(literal, context)
+            self.assertTrue(validation["valid"])
+            self.assertGreater(validation["render_cost"]["loop_iterations"], 0)
+
+        huge_string = render_template_text("{{ 'x' * 50000000 }}", context)
+        self.assertTrue(huge_string["budget_exceeded"])
+        self.assertIn("bytes of output", huge_string["error"])
+        huge_list = render_template_text("{{ ([0] * 1000000) | length }}", context)
+        self.assertTrue(huge_list["budget_exceeded"])
+
+    def test_render_guard_meters_values_built_in_set_statements(self) -> None:
+        context = get_sample_template_context()
+        doubling = "{% set a = 'x' * 60000 %}" + "{% set a = a ~ a %}" * 10 + "{{ a | length }}"
+        validation = validate_template_text(doubling, context)
+        self.assertFalse(validation["valid"])
+        self.assertIn("bytes of output", validation["errors"][0])
+
+        for template in (
+            "{% set a = 'x' * 40000 %}{% set b = a | replace('x', 'xx') %}{{ b | length }}",
+            "{% set a = 'x' * 40000 %}{% set b = a + a %}{{ b | length }}",
+            "{% set a = 'x' * 40000 %}{% set b %}{{ a }}{{ a }}{% endset %}{{ b | length }}",
+        ):
+            result = render_template_text(template, context)
+            self.assertTrue(result["budget_exceeded"], template)
+
+        small = render_template_text(
+            "{% set a | upper %}{{ 'ab' ~ 'c' }}{% endset %}{{ a }} {% filter lower %}X{% endfilter %} {{ [1] + [2] }}",
+            context,
+        )
+        self.assertTrue(small["ok"])
+        self.assertEqual(small["description"], "ABC x [1, 2]")
+
+    def test_render_guard_keeps_range_indexable(self) -> None:
+        context = get_sample_template_context()
+        result = render_template_text(
+            "{{ range(5)[2] }} {{ range(10)[2:5] | list }} {{ range(3) | last }} {{ 4 in range(5) }}",
+            context,
+        )
+        self.assertTrue(result["ok"])
+        self.assertEqual(result["description"], "2 [2, 3, 4] 2 True")
+
     def test_render_with_active_template_exposes_template_metadata(self) -> None:
         with tempfile.TemporaryDirectory() as td:
             template_path = Path(td) / "description_template.j2"
@@ -0,0 +1,82 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import chronicle.event_stream as event_stream
+from chronicle.event_stream import event_stream_max_clients, format_sse_event, stream_change_events
+from chronicle.storage import list_change_events, set_runtime_values
+
+
+def _parse_sse_events(chunks: list[str]) -> list[dict]:
+    parsed: list[dict] = []
+    for chunk in chunks:
+        fields: dict[str, str] = {}
+        for line in chunk.strip().splitlines():
+            if line.startswith(":") or ": " not in line:
+                continue
+            name, value = line.split(": ", 1)
+            fields[name] = value
+        if "event" in fields:
+            parsed.append({"id": fields.get("id"), "event": fields["event"], "data": json.loads(fields["data"])})
+    return parsed
+
+
+class TestEventStream(unittest.TestCase):
+    def test_format_sse_event(self) -> None:
+        text = format_sse_event({"seq": 7, "topic": "job", "payload": {"status": "queued"}, "created_at_utc": "t"})
+        self.assertTrue(text.startswith("id: 7\nevent: job\ndata: "))
+        self.assertTrue(text.endswith("\n\n"))
+
+    def test_max_clients_leaves_threads_for_other_routes(self) -> None:
+        self.assertEqual(event_stream_max_clients(4), 2)
+        self.assertEqual(event_stream_max_clients(1), 1)
+
+    def test_stream_refuses_clients_over_cap(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "processed.log"
+            with patch.object(event_stream, "EVENT_STREAM_MAX_DURATION_SECONDS", 1.0):
+                first = stream_change_events(path, max_clients=1)
+                next(first)
+                self.assertFalse(event_stream.event_stream_has_capacity(path, max_clients=1))
+                refused = list(stream_change_events(path, max_clients=1))
+                first.close()
+            self.assertIn("event: stream.busy", refused[0])
+            self.assertTrue(event_stream.event_stream_has_capacity(path, max_clients=1))
+
+    def test_stream_replays_events_after_last_event_id(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "processed.log"
+            set_runtime_values(path, {"worker.state": "running_cycle"})
+            set_runtime_values(path, {"dashboard.refresh.state": "idle"})
+            first_seq = list_change_events(path)[0]["seq"]
+
+            with patch.object(event_stream, "EVENT_STREAM_MAX_DURATION_SECONDS", 0.05):
+                chunks = list(stream_change_events(path, max_clients=2, last_event_id=first_seq))
+
+            self.assertTrue(chunks[0].startswith("retry: "))
+            events = _parse_sse_events(chunks)
+            self.assertEqual([item["event"] for item in events], ["dashboard_refresh"])
+            self.assertEqual(events[0]["data"]["payload"]["values"], {"dashboard.refresh.state": "idle"})
+
+    def test_stream_pushes_new_events_from_shared_feed(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "processed.log"
+            with patch.object(event_stream, "EVENT_STREAM_MAX_DURATION_SECONDS", 1.0), patch.object(
+                event_stream, "EVENT_STREAM_POLL_SECONDS", 0.02
+            ):
+                stream = stream_change_events(path, max_clients=2)
+                chunks = [next(stream), next(stream)]
+                self.assertEqual(_parse_sse_events(chunks)[0]["event"], "stream.open")
+                set_runtime_values(path, {"worker.activity_detection.status": "new_activity_detected"})
+                chunks.append(next(stream))
+                stream.close()
+
+            events = _parse_sse_events(chunks)
+            self.assertEqual(events[-1]["event"], "activity_detection")
+            self.assertTrue(event_stream.event_stream_has_capacity(path, max_clients=1))
+
+
+if __name__ == "__main__":
+    unittest.main()
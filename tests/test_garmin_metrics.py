@@ -1,3 +1,4 @@
+import threading
 import unittest
 
 from chronicle.stat_modules.garmin_metrics import (
@@ -475,6 +476,72 @@ class TestVo2MaxExpandedMetrics(unittest.TestCase):
         self.assertEqual(metrics["running_cadence"], 182)
         self.assertEqual(metrics["garmin_last_activity"]["activity_id"], 5555)
 
+    def test_fetch_training_status_keeps_partial_results_when_endpoint_times_out(self) -> None:
+        release = threading.Event()
+
+        class _SlowHillScoreClient(_DummyGarminClient):
+            def get_hill_score(self, end_date):
+                release.wait(2)
+                return {"overallScore": 88}
+
+            def get_endurance_score(self, end_date):
+                raise RuntimeError("endurance unavailable")
+
+        reports: dict[str, dict] = {}
+        try:
+            metrics = fetch_training_status_and_scores(
+                _SlowHillScoreClient(),
+                endpoint_timeout_seconds={"hill_score": 0.05},
+                on_endpoint_result=lambda endpoint, result: reports.__setitem__(endpoint, result),
+            )
+        finally:
+            release.set()
+
+        self.assertEqual(metrics["training_status_key"], "Productive")
+        self.assertEqual(metrics["fitness_age"], "34 yr")
+        self.assertEqual(metrics["hill_overall_score"], "N/A")
+        self.assertEqual(metrics["endurance_overall_score"], "N/A")
+        self.assertEqual(reports["hill_score"]["status"], "timeout")
+        self.assertEqual(reports["endurance_score"]["status"], "error")
+        self.assertEqual(reports["training_status"]["status"], "success")
+        self.assertEqual(reports["last_activity"]["status"], "success")
+
+    def test_fetch_training_status_serves_daily_endpoints_from_cache(self) -> None:
+        class _CountingClient(_ReferenceActivityGarminClient):
+            def __init__(self):
+                self.calls: list[str] = []
+
+            def get_last_activity(self):
+                self.calls.append("last_activity")
+                return super().get_last_activity()
+
+            def get_rhr_day(self, start_date):
+                self.calls.append("rhr_day")
+                return super().get_rhr_day(start_date)
+
+            def get_hill_score(self, end_date):
+                self.calls.append("hill_score")
+                return super().get_hill_score(end_date)
+
+        cache: dict[tuple[str, str], object] = {("hill_score", "2026-02-12"): {"overallScore": 123}}
+        client = _CountingClient()
+        reports: dict[str, dict] = {}
+
+        metrics = fetch_training_status_and_scores(
+            client,
+            reference_activity={"activityId": 5555, "startTimeGMT": "2026-02-12 11:42:00", "duration": 2400},
+            on_endpoint_result=lambda endpoint, result: reports.__setitem__(endpoint, result),
+            daily_cache_lookup=lambda keys: {key: cache[key] for key in keys if key in cache},
+            daily_cache_store=cache.update,
+        )
+
+        self.assertEqual(metrics["hill_overall_score"], 123)
+        self.assertEqual(metrics["resting_hr"], 44)
+        self.assertEqual(client.calls, ["rhr_day"])
+        self.assertEqual(reports["hill_score"], {"status": "cache_hit"})
+        self.assertIn(("rhr_day", "2026-02-12"), cache)
+        self.assertIn(("training_readiness", "2026-02-12"), cache)
+
     def test_get_activity_context_for_strava_activity_matches_strength_session(self) -> None:
         strava_activity = {
             "id": 17455368360,
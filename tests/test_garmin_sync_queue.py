@@ -0,0 +1,97 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from chronicle.garmin_sync_queue import (
+    PLAN_GARMIN_SYNC_SETTINGS_KEY,
+    PLAN_GARMIN_WORKOUTS_SETTINGS_KEY,
+    initiate_garmin_sync_request,
+    list_garmin_calendar_entries,
+    list_garmin_sync_requests,
+    list_garmin_workouts,
+    run_garmin_sync_request,
+    schedule_garmin_sync_request,
+    send_garmin_sync_batch,
+)
+from chronicle.storage import get_plan_setting, set_plan_setting
+
+
+class TestGarminSyncQueue(unittest.TestCase):
+    def test_request_lifecycle_uses_latest_request_per_day_and_workout(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "processed.log"
+            first = initiate_garmin_sync_request(path, date_local="2026-03-02", workout_code="Tempo-6")
+            again = initiate_garmin_sync_request(path, date_local="2026-03-02", workout_code="tempo-6")
+            self.assertEqual(again["request_id"], first["request_id"])
+
+            synced, workout = run_garmin_sync_request(path, date_local="2026-03-02", workout_code="Tempo-6")
+            self.assertEqual(synced["status_code"], "workout_created")
+            scheduled, _workout, entry = schedule_garmin_sync_request(path, date_local="2026-03-02")
+            self.assertEqual(scheduled["status"], "succeeded")
+            self.assertEqual(entry["garmin_workout_id"], workout["garmin_workout_id"])
+
+            followup = initiate_garmin_sync_request(path, date_local="2026-03-02", workout_code="Tempo-6")
+            self.assertNotEqual(followup["request_id"], first["request_id"])
+            self.assertEqual(len(list_garmin_sync_requests(path)), 2)
+
+    def test_batch_creates_each_workout_once_and_schedules_every_day(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "processed.log"
+            requests = [
+                initiate_garmin_sync_request(path, date_local=f"2026-03-0{day}", workout_code=code)
+                for day in (2, 3, 4)
+                for code in ("Easy-5", "Strides")
+            ]
+
+            results = send_garmin_sync_batch(path, requests)
+
+            self.assertEqual(len(results), 6)
+            self.assertEqual(len(list_garmin_workouts(path)), 2)
+            self.assertEqual(len(list_garmin_calendar_entries(path)), 6)
+            self.assertEqual({sync["status_code"] for sync, _workout, _entry in results}, {"calendar_scheduled"})
+            self.assertEqual(
+                [sync["request_id"] for sync, _workout, _entry in results],
+                [item["request_id"] for item in requests],
+            )
+
+            repeat = send_garmin_sync_batch(
+                path,
+                [initiate_garmin_sync_request(path, date_local="2026-03-02", workout_code="easy-5")],
+            )
+            self.assertEqual(repeat[0][0]["status_code"], "calendar_exists")
+            self.assertFalse(repeat[0][0]["garmin_workout_created"])
+            self.assertEqual(len(list_garmin_calendar_entries(path)), 6)
+
+    def test_legacy_plan_settings_lists_are_migrated_once(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "processed.log"
+            set_plan_setting(
+                path,
+                PLAN_GARMIN_SYNC_SETTINGS_KEY,
+                [
+                    {
+                        "request_id": "sync-legacy",
+                        "date_local": "2026-03-02",
+                        "workout_code": "Tempo-6",
+                        "status": "in-progress",
+                        "status_code": "workout_created",
+                        "garmin_workout_id": "gw-legacy",
+                        "queued_at_utc": "2026-03-01T10:00:00+00:00",
+                    },
+                    {"request_id": "", "date_local": "2026-03-02"},
+                ],
+            )
+            set_plan_setting(
+                path,
+                PLAN_GARMIN_WORKOUTS_SETTINGS_KEY,
+                [{"garmin_workout_id": "gw-legacy", "workout_code": "Tempo-6"}],
+            )
+
+            self.assertEqual([item["request_id"] for item in list_garmin_sync_requests(path)], ["sync-legacy"])
+            self.assertIsNone(get_plan_setting(path, PLAN_GARMIN_SYNC_SETTINGS_KEY))
+            _sync, _workout, entry = schedule_garmin_sync_request(path, date_local="2026-03-02")
+            self.assertEqual(entry["garmin_workout_id"], "gw-legacy")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -17,7 +17,7 @@ def _response_with_json(payload):
 
 
 class TestIntervalsData(unittest.TestCase):
-    @patch("chronicle.stat_modules.intervals_data.requests.get")
+    @patch("chronicle.stat_modules.intervals_data.provider_http.get")
     def test_handles_null_achievements(self, mock_get) -> None:
         mock_get.side_effect = [
             _response_with_json([{"id": 12345}]),
@@ -30,7 +30,7 @@ class TestIntervalsData(unittest.TestCase):
         assert result is not None
         self.assertEqual(result["achievements"], [])
 
-    @patch("chronicle.stat_modules.intervals_data.requests.get")
+    @patch("chronicle.stat_modules.intervals_data.provider_http.get")
     def test_skips_invalid_achievement_items(self, mock_get) -> None:
         mock_get.side_effect = [
             _response_with_json([{"id": 12345}]),
@@ -54,7 +54,7 @@ class TestIntervalsData(unittest.TestCase):
         self.assertIn("New best power: 321W for 1m 15s", result["achievements"])
         self.assertIn("Big day", result["achievements"])
 
-    @patch("chronicle.stat_modules.intervals_data.requests.get")
+    @patch("chronicle.stat_modules.intervals_data.provider_http.get")
     def test_handles_dict_activities_payload(self, mock_get) -> None:
         mock_get.side_effect = [
             _response_with_json({"activities": [{"id": 222}]}),
@@ -70,7 +70,7 @@ class TestIntervalsData(unittest.TestCase):
         self.assertEqual(result["avg_pace"], "N/A")
         self.assertEqual(result["zone_summary"], "N/A")
 
-    @patch("chronicle.stat_modules.intervals_data.requests.get")
+    @patch("chronicle.stat_modules.intervals_data.provider_http.get")
     def test_formats_extended_metrics(self, mock_get) -> None:
         mock_get.side_effect = [
             _response_with_json([{"id": 888}]),
@@ -128,7 +128,7 @@ class TestIntervalsData(unittest.TestCase):
         self.assertEqual(result["average_temp_f"], "63.2F")
         self.assertIn("Z1", result["zone_summary"])
 
-    @patch("chronicle.stat_modules.intervals_data.requests.get")
+    @patch("chronicle.stat_modules.intervals_data.provider_http.get")
     def test_selects_matching_strava_activity_for_historical_rerun(self, mock_get) -> None:
         mock_get.side_effect = [
             _response_with_json(
@@ -152,7 +152,7 @@ class TestIntervalsData(unittest.TestCase):
         detail_url = mock_get.call_args_list[1].args[0]
         self.assertIn("/activity/222", detail_url)
 
-    @patch("chronicle.stat_modules.intervals_data.requests.get")
+    @patch("chronicle.stat_modules.intervals_data.provider_http.get")
     def test_dashboard_metrics_extracts_strava_match_and_fields(self, mock_get) -> None:
         mock_get.return_value = _response_with_json(
             [
@@ -185,7 +185,7 @@ class TestIntervalsData(unittest.TestCase):
         self.assertEqual(record["avg_fatigue"], 76.0)
         self.assertEqual(record["moving_time_seconds"], 3600.0)
 
-    @patch("chronicle.stat_modules.intervals_data.requests.get")
+    @patch("chronicle.stat_modules.intervals_data.provider_http.get")
     def test_dashboard_metrics_derives_pace_from_distance_and_time(self, mock_get) -> None:
         mock_get.return_value = _response_with_json(
             [
@@ -213,7 +213,7 @@ class TestIntervalsData(unittest.TestCase):
         self.assertEqual(records[0]["avg_pace_mps"], 5.0)
         self.assertEqual(records[0]["avg_efficiency_factor"], 1.11)
 
-    @patch("chronicle.stat_modules.intervals_data.requests.get")
+    @patch("chronicle.stat_modules.intervals_data.provider_http.get")
     def test_dashboard_metrics_supports_numeric_source_id_and_alt_metric_keys(self, mock_get) -> None:
         mock_get.return_value = _response_with_json(
             [
@@ -247,7 +247,7 @@ class TestIntervalsData(unittest.TestCase):
         self.assertEqual(record["avg_fatigue"], 73.0)
         self.assertEqual(record["moving_time_seconds"], 2000.0)
 
-    @patch("chronicle.stat_modules.intervals_data.requests.get")
+    @patch("chronicle.stat_modules.intervals_data.provider_http.get")
     def test_dashboard_metrics_handles_request_failure(self, mock_get) -> None:
         mock_get.side_effect = requests.RequestException("boom")
         records = get_intervals_dashboard_metrics(
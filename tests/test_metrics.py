@@ -0,0 +1,158 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from chronicle.metrics import HistogramFamily, MetricsWriter, StatementStats
+from chronicle.storage import (
+    _MeteredConnection,
+    _normalize_sql,
+    _sqlite_slow_query_ms,
+    reset_sqlite_statement_stats,
+    sqlite_busy_error_count,
+    sqlite_statement_stats_snapshot,
+)
+
+
+class TestMetricsWriter(unittest.TestCase):
+    def test_histogram_buckets_are_rendered_cumulative(self) -> None:
+        writer = MetricsWriter()
+        writer.histogram(
+            "provider_ms",
+            "Provider latency.",
+            {"buckets": {"+Inf": 1, "100": 2, "50": 3}, "count": 6, "sum": 420.5},
+            {"host": "https://example.com"},
+        )
+        lines = writer.render().splitlines()
+        self.assertEqual(lines[1], "# TYPE provider_ms histogram")
+        self.assertEqual(
+            lines[2:],
+            [
+                'provider_ms_bucket{host="https://example.com",le="50"} 3',
+                'provider_ms_bucket{host="https://example.com",le="100"} 5',
+                'provider_ms_bucket{host="https://example.com",le="+Inf"} 6',
+                'provider_ms_sum{host="https://example.com"} 420.5',
+                'provider_ms_count{host="https://example.com"} 6',
+            ],
+        )
+
+    def test_samples_are_grouped_per_family_and_labels_escaped(self) -> None:
+        writer = MetricsWriter()
+        writer.gauge("depth", "Queue depth.", 1, {"status": "queued"})
+        writer.counter("events_total", "Events.", 2, {"outcome": 'say "hi"'})
+        writer.gauge("depth", "Queue depth.", 4, {"status": "running"})
+        self.assertEqual(
+            writer.render().splitlines(),
+            [
+                "# HELP depth Queue depth.",
+                "# TYPE depth gauge",
+                'depth{status="queued"} 1',
+                'depth{status="running"} 4',
+                "# HELP events_total Events.",
+                "# TYPE events_total counter",
+                'events_total{outcome="say \\"hi\\""} 2',
+            ],
+        )
+
+    def test_histogram_family_tracks_series_per_label_set(self) -> None:
+        family = HistogramFamily((10, 100))
+        family.observe(5, {"route": "/a"})
+        family.observe(50, {"route": "/a"})
+        family.observe(500, {"route": "/b"})
+        snapshot = family.snapshot()
+        self.assertEqual(snapshot["route=/a"]["buckets"], {"10": 1, "100": 1, "+Inf": 0})
+        self.assertEqual(snapshot["route=/b"]["count"], 1)
+
+    def test_locked_database_is_counted_as_busy(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = Path(tmpdir) / "busy.db"
+            holder = sqlite3.connect(db_path, isolation_level=None)
+            holder.execute("CREATE TABLE items (value TEXT)")
+            holder.execute("BEGIN EXCLUSIVE")
+            waiter = sqlite3.connect(db_path, timeout=0, factory=_MeteredConnection)
+            before = sqlite_busy_error_count()
+            try:
+                with self.assertRaises(sqlite3.OperationalError):
+                    waiter.execute("INSERT INTO items (value) VALUES ('x')")
+            finally:
+                waiter.close()
+                holder.execute("ROLLBACK")
+                holder.close()
+            self.assertEqual(sqlite_busy_error_count(), before + 1)
+
+    def test_statement_normalization_folds_literals_and_lists(self) -> None:
+        self.assertEqual(
+            _normalize_sql("SELECT key FROM runtime_kv\n  WHERE key IN (?,?, ?) AND note = 'it''s' LIMIT 10;"),
+            "SELECT key FROM runtime_kv WHERE key IN (?) AND note = ? LIMIT ?",
+        )
+        self.assertEqual(
+            _normalize_sql("INSERT INTO items (a,b) VALUES (?, ?), (?,?)"),
+            "INSERT INTO items (a, b) VALUES (?, ?)",
+        )
+        self.assertEqual(_normalize_sql("SELECT col_2 FROM t2 WHERE n = -3"), "SELECT col_2 FROM t2 WHERE n = ?")
+
+    def test_statement_stats_overflow_into_one_bucket(self) -> None:
+        stats = StatementStats(max_statements=2)
+        stats.observe("SELECT a", 1.0, op="select")
+        stats.observe("SELECT b", 3.0, op="select", slow=True)
+        stats.observe("SELECT c", 2.0, op="select")
+        stats.observe("SELECT a", 4.0, op="select")
+        snapshot = stats.snapshot()
+        self.assertEqual(set(snapshot), {"SELECT a", "SELECT b", StatementStats.OVERFLOW_KEY})
+        self.assertEqual(snapshot["SELECT a"]["count"], 2)
+        self.assertEqual(snapshot["SELECT a"]["max_ms"], 4.0)
+        self.assertEqual(snapshot["SELECT b"]["slow_count"], 1)
+        self.assertEqual(snapshot["SELECT b"]["last_slow_ms"], 3.0)
+
+    def test_slow_statement_is_logged_with_query_plan(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            conn = sqlite3.connect(Path(tmpdir) / "slow.db", factory=_MeteredConnection)
+            reset_sqlite_statement_stats()
+            try:
+                conn.execute("CREATE TABLE items (name TEXT, value TEXT)")
+                with mock.patch.dict(os.environ, {"SQLITE_SLOW_QUERY_MS": "0.000001"}):
+                    _sqlite_slow_query_ms.cache_clear()
+                    with self.assertLogs("chronicle.storage", level="WARNING") as logs:
+                        conn.execute("SELECT value FROM items WHERE name = ?", ("a",)).fetchall()
+                        conn.execute("SELECT value FROM items WHERE name = ?", ("b",)).fetchall()
+            finally:
+                _sqlite_slow_query_ms.cache_clear()
+                conn.close()
+            stats = sqlite_statement_stats_snapshot()
+            reset_sqlite_statement_stats()
+        entry = stats["SELECT value FROM items WHERE name = ?"]
+        self.assertEqual(entry["count"], 2)
+        self.assertEqual(entry["slow_count"], 2)
+        self.assertEqual(entry["plan"], ["SCAN items"])
+        self.assertIn("plan: SCAN items", logs.output[0])
+
+    def test_select_timer_runs_until_rows_are_fetched(self) -> None:
+        statement = "SELECT value FROM items ORDER BY value"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            conn = sqlite3.connect(Path(tmpdir) / "fetch.db", factory=_MeteredConnection)
+            reset_sqlite_statement_stats()
+            try:
+                conn.execute("CREATE TABLE items (value INTEGER)")
+                conn.executemany("INSERT INTO items (value) VALUES (?)", [(n,) for n in range(3)])
+                self.assertIn("INSERT INTO items (value) VALUES (?)", sqlite_statement_stats_snapshot())
+
+                cursor = conn.execute(statement)
+                self.assertEqual(cursor.fetchone()[0], 0)
+                self.assertNotIn(statement, sqlite_statement_stats_snapshot())
+                self.assertEqual([row[0] for row in cursor], [1, 2])
+                self.assertEqual(sqlite_statement_stats_snapshot()[statement]["count"], 1)
+
+                conn.execute(statement).fetchmany(1)
+                self.assertEqual(sqlite_statement_stats_snapshot()[statement]["count"], 2)
+                closed = conn.execute(statement)
+                closed.close()
+                self.assertEqual(sqlite_statement_stats_snapshot()[statement]["count"], 3)
+            finally:
+                conn.close()
+                reset_sqlite_statement_stats()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,14 @@
 import unittest
-from unittest.mock import patch
+from datetime import date
+from unittest.mock import MagicMock, patch
 
 import requests
 
 from chronicle.stat_modules.misery_index import (
     calculate_misery_index,
+    calculate_misery_index_batch,
     calculate_misery_index_components,
+    fetch_weather_history_batch,
     get_aqi_description,
     get_misery_index_details_for_activity,
     get_misery_index_description,
@@ -282,5 +285,138 @@ class TestMiseryIndex(unittest.TestCase):
         self.assertEqual(details["weather"]["temp_f"], 62.0)
 
 
+    def test_weather_store_serves_activities_in_same_cell_and_day(self) -> None:
+        store: dict = {}
+        aqi_store: dict = {}
+        weather_payload = {
+            "location": {"tz_id": "America/New_York"},
+            "forecast": {
+                "forecastday": [
+                    {
+                        "date": "2026-03-07",
+                        "hour": [
+                            {
+                                "time_epoch": 1772859600 + index * 3600,
+                                "temp_f": 40.0 + index,
+                                "dewpoint_f": 30.0,
+                                "humidity": 50.0,
+                                "wind_mph": 5.0,
+                                "condition": {"text": "Sunny"},
+                            }
+                            for index in range(24)
+                        ],
+                    }
+                ]
+            },
+        }
+
+        def _fake_get(url, params, timeout):
+            response = MagicMock()
+            if url.endswith("current.json"):
+                response.json.return_value = {"current": {"air_quality": {"us-epa-index": 2}}}
+            else:
+                response.json.return_value = weather_payload
+            return response
+
+        callbacks = {
+            "day_lookup": lambda keys: {key: store[key] for key in keys if key in store},
+            "day_store": store.update,
+            "aqi_lookup": aqi_store.get,
+            "aqi_store": lambda cell, value: aqi_store.__setitem__(cell, {"us_epa_index": value}),
+        }
+        first = {"start_date": "2026-03-07T17:00:00Z", "start_date_local": "2026-03-07T12:00:00Z", "start_latlng": [33.751, -84.389]}
+        second = {"start_date": "2026-03-07T22:00:00Z", "start_date_local": "2026-03-07T17:00:00Z", "start_latlng": [33.768, -84.402]}
+        with patch("chronicle.stat_modules.misery_index.provider_http.get", side_effect=_fake_get) as mocked_get:
+            first_details = get_misery_index_details_for_activity(first, "weather-key", **callbacks)
+            second_details = get_misery_index_details_for_activity(second, "weather-key", **callbacks)
+
+        self.assertEqual(mocked_get.call_count, 2)
+        self.assertEqual(mocked_get.call_args_list[0].kwargs["params"]["q"], "33.80,-84.40")
+        self.assertEqual(list(store), [("33.80,-84.40", "2026-03-07")])
+        self.assertEqual(len(store[("33.80,-84.40", "2026-03-07")]["hours"]), 24)
+        self.assertEqual(first_details["weather"]["temp_f"], 52.0)
+        self.assertEqual(second_details["weather"]["temp_f"], 57.0)
+        self.assertEqual(second_details["aqi"], 2)
+
+    def test_weather_history_batch_requests_contiguous_runs_once(self) -> None:
+        def _fake_get(url, params, timeout):
+            start = date.fromisoformat(params["dt"])
+            end = date.fromisoformat(params.get("end_dt", params["dt"]))
+            days = [date.fromordinal(ordinal) for ordinal in range(start.toordinal(), end.toordinal() + 1)]
+            response = MagicMock()
+            response.json.return_value = {
+                "location": {"tz_id": "UTC"},
+                "forecast": {
+                    "forecastday": [
+                        {"date": day.isoformat(), "hour": [{"time_epoch": 0, "temp_f": 50.0}]} for day in days
+                    ]
+                },
+            }
+            return response
+
+        cached = {("33.80,-84.40", "2026-03-02"): {"tz_id": "UTC", "hours": [{"time_epoch": 0}]}}
+        stored: dict = {}
+        targets = [
+            (33.75, -84.39, date(2026, 3, 1)),
+            (33.76, -84.41, date(2026, 3, 2)),
+            (33.77, -84.40, date(2026, 3, 3)),
+            (33.77, -84.40, date(2026, 3, 4)),
+            (33.77, -84.40, date(2026, 3, 9)),
+            (40.71, -74.01, date(2026, 3, 9)),
+            (40.71, -74.01, date(2026, 3, 20)),
+        ]
+        with patch("chronicle.stat_modules.misery_index.provider_http.get", side_effect=_fake_get) as mocked_get:
+            days = fetch_weather_history_batch(
+                "weather-key",
+                targets,
+                day_lookup=lambda keys: {key: cached[key] for key in keys if key in cached},
+                day_store=stored.update,
+                today=date(2026, 3, 15),
+            )
+
+        requested = [(call.kwargs["params"]["q"], call.kwargs["params"]["dt"], call.kwargs["params"].get("end_dt")) for call in mocked_get.call_args_list]
+        self.assertEqual(
+            requested,
+            [
+                ("33.80,-84.40", "2026-03-01", None),
+                ("33.80,-84.40", "2026-03-03", "2026-03-04"),
+                ("33.80,-84.40", "2026-03-09", None),
+                ("40.70,-74.00", "2026-03-09", None),
+            ],
+        )
+        self.assertTrue(all(call.args[0].endswith("history.json") for call in mocked_get.call_args_list))
+        self.assertEqual(len(days), 6)
+        self.assertEqual(len(stored), 5)
+
+
+    def test_misery_batch_matches_scalar_components(self) -> None:
+        results = calculate_misery_index_batch(
+            {
+                "temp_f": [88.0, 30.0, None],
+                "dewpoint_f": [72.0, 20.0, 40.0],
+                "humidity": [70.0, 60.0, 50.0],
+                "wind_mph": [3.0, 15.0, 5.0],
+                "cloud": [10.0, 90.0, 0.0],
+                "precip_in": [0.0, 0.1, 0.0],
+                "is_day": [1, 0, 1],
+            }
+        )
+        scalar = calculate_misery_index_components(
+            temp_f=88.0,
+            dew_point_f=72.0,
+            humidity=70.0,
+            wind_speed_mph=3.0,
+            cloud_cover_pct=10.0,
+            precip_in=0.0,
+            is_day=True,
+        )
+        self.assertEqual(results[0]["score"], scalar["score"])
+        self.assertEqual(results[0]["polarity"], "hot")
+        self.assertEqual(results[1]["polarity"], "cold")
+        self.assertIsNone(results[2])
+        with self.assertRaises(ValueError):
+            calculate_misery_index_batch({"temp_f": [1.0], "dewpoint_f": []})
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,7 +1,12 @@
 import unittest
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 
-from chronicle.stat_modules.period_stats import get_garmin_period_fallback, get_period_stats, summarize_period
+from chronicle.stat_modules.period_stats import (
+    garmin_period_windows,
+    get_period_stats,
+    period_windows_end_utc,
+    summarize_period,
+)
 
 
 class TestPeriodStats(unittest.TestCase):
@@ -77,6 +82,20 @@ class TestPeriodStats(unittest.TestCase):
         self.assertAlmostEqual(week["distance"], 1.0, places=2)
         self.assertEqual(week["elevation"], 100.0)
 
+    def test_period_windows_follow_local_calendar_days(self) -> None:
+        # 2026-02-15 05:00Z == 2026-02-15 00:00 in America/New_York (EST).
+        now_utc = datetime(2026, 2, 15, 5, 0, 0, tzinfo=timezone.utc)
+
+        windows = garmin_period_windows(now_utc, "America/New_York")
+
+        self.assertEqual(windows["week"], (date(2026, 2, 9), datetime(2026, 2, 9, 5, 0, tzinfo=timezone.utc)))
+        self.assertEqual(windows["month"][0], date(2026, 1, 17))
+        self.assertEqual(windows["year"], (date(2026, 1, 1), datetime(2026, 1, 1, 5, 0, tzinfo=timezone.utc)))
+        self.assertEqual(
+            period_windows_end_utc(now_utc, "America/New_York"),
+            datetime(2026, 2, 16, 5, 0, tzinfo=timezone.utc),
+        )
+
     def test_missing_summary_calories_stays_zero(self) -> None:
         activities = [
             {
@@ -131,36 +150,6 @@ class TestPeriodStats(unittest.TestCase):
         self.assertEqual(period_stats["year"]["beers_earned"], 230.0)
         self.assertEqual(period_stats["week"]["run_count"], 1)
 
-    def test_get_garmin_period_fallback_from_activity_list(self) -> None:
-        class DummyClient:
-            def get_activities_by_date(self, _start: str, _end: str):
-                return [
-                    {
-                        "startTimeGMT": "2026-02-15 10:00:00",
-                        "activityType": {"typeKey": "running"},
-                        "calories": 300,
-                        "avgGradeAdjustedSpeed": 2.728,  # ~9:50
-                    },
-                    {
-                        "startTimeGMT": "2026-02-10 10:00:00",
-                        "activityType": {"typeKey": "running"},
-                        "calories": 450,
-                        "avgGradeAdjustedSpeed": 2.677,  # ~10:00
-                    },
-                ]
-
-        now_utc = datetime(2026, 2, 15, 12, 0, 0, tzinfo=timezone.utc)
-        fallback = get_garmin_period_fallback(
-            DummyClient(),
-            now_utc=now_utc,
-            timezone_name="America/New_York",
-        )
-
-        self.assertIsNotNone(fallback)
-        assert fallback is not None
-        self.assertGreater(fallback["week"]["beers_earned"], 0.0)
-        self.assertNotEqual(fallback["week"]["gap"], "N/A")
-
 
 if __name__ == "__main__":
     unittest.main()
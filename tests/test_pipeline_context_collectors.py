@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import tempfile
 import unittest
 from datetime import datetime, timezone
+from pathlib import Path
 from types import SimpleNamespace
 from typing import Any
 
@@ -9,7 +11,11 @@ from chronicle.pipeline_context_collectors import (
     collect_crono_context,
     collect_smashrun_context,
     collect_weather_context,
+    recompute_misery_scores,
+    sync_smashrun_activity_mirror,
 )
+from chronicle.stat_modules.misery_index import calculate_misery_index_components
+from chronicle.storage import list_activity_misery_scores, register_activity_weather_targets, upsert_weather_days
 
 
 def _settings(**overrides: Any) -> SimpleNamespace:
@@ -28,6 +34,16 @@ def _settings(**overrides: Any) -> SimpleNamespace:
     return SimpleNamespace(**base)
 
 
+def _misery_score_for_temp(temp_f: float) -> float:
+    return calculate_misery_index_components(
+        temp_f=temp_f,
+        dew_point_f=30.0,
+        humidity=50.0,
+        wind_speed_mph=5.0,
+        is_day=True,
+    )["score"]
+
+
 class TestPipelineContextCollectors(unittest.TestCase):
     def test_collect_smashrun_context_disabled_returns_defaults(self) -> None:
         calls: list[str] = []
@@ -79,21 +95,70 @@ class TestPipelineContextCollectors(unittest.TestCase):
                 return []
             return None
 
-        result = collect_smashrun_context(
-            _settings(enable_smashrun=True, smashrun_access_token="token"),
-            {"id": 123, "start_date": "2026-02-10T12:00:00Z", "distance": 5000.0},
-            selected_activity_id=123,
-            latest_activity_id=999,
-            now_utc=datetime.now(timezone.utc),
-            service_state={},
-            run_service_call=_run_service_call,
-            as_float=lambda value: float(value) if isinstance(value, (int, float)) else None,
-        )
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result = collect_smashrun_context(
+                _settings(
+                    enable_smashrun=True,
+                    smashrun_access_token="token",
+                    processed_log_file=Path(tmpdir) / "processed.log",
+                ),
+                {"id": 123, "start_date": "2026-02-10T12:00:00Z", "distance": 5000.0},
+                selected_activity_id=123,
+                latest_activity_id=999,
+                now_utc=datetime(2026, 2, 12, 18, 0, tzinfo=timezone.utc),
+                service_state={},
+                run_service_call=_run_service_call,
+                as_float=lambda value: float(value) if isinstance(value, (int, float)) else None,
+            )
 
         self.assertEqual(result["notables"], ["Historic notable"])
         self.assertEqual(result["longest_streak"], 14)
         self.assertTrue(any(name == "smashrun.notables" for name, _kwargs in calls))
 
+    def test_sync_smashrun_activity_mirror_fetches_only_new_pages(self) -> None:
+        fetch_kwargs: list[dict[str, Any]] = []
+        pages = [
+            [
+                {"activityId": 200, "startDateTimeUtc": "2026-02-11T12:00:00Z", "elevationGainFeet": 150.0},
+                {"activityId": 100, "startDateTimeUtc": "2026-02-10T12:00:00Z", "elevationGainFeet": 90.0},
+            ],
+            [{"activityId": 300, "startDateTimeUtc": "2026-02-12T07:00:00Z", "elevationGainFeet": 60.0}],
+        ]
+
+        def _run_service_call(_settings, service_name, *_args, **kwargs):
+            self.assertEqual(service_name, "smashrun.activities")
+            fetch_kwargs.append(kwargs)
+            return pages[len(fetch_kwargs) - 1]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            settings = _settings(
+                enable_smashrun=True,
+                smashrun_access_token="token",
+                service_cache_ttl_seconds=0,
+                processed_log_file=Path(tmpdir) / "processed.log",
+            )
+            first = sync_smashrun_activity_mirror(settings, service_state={}, run_service_call=_run_service_call)
+            second = sync_smashrun_activity_mirror(settings, service_state={}, run_service_call=_run_service_call)
+
+            result = collect_smashrun_context(
+                settings,
+                {"id": 555, "start_date": "2026-02-12T07:05:00Z"},
+                selected_activity_id=555,
+                latest_activity_id=555,
+                now_utc=datetime(2026, 2, 12, 18, 0, tzinfo=timezone.utc),
+                service_state={},
+                run_service_call=lambda *_args, **_kwargs: [] if _args[1] == "smashrun.activities" else None,
+                as_float=lambda value: float(value) if isinstance(value, (int, float)) else None,
+            )
+
+        self.assertEqual(first["mode"], "full")
+        self.assertEqual(second["mode"], "incremental")
+        self.assertIsNone(fetch_kwargs[0]["stop_at_activity_id"])
+        self.assertEqual(fetch_kwargs[1]["stop_at_activity_id"], 200)
+        self.assertEqual(result["smashrun_activity_record"]["activityId"], 300)
+        self.assertEqual(result["latest_elevation_feet"], 60.0)
+        self.assertEqual(result["smashrun_elevation_totals"]["week"], 300.0)
+
     def test_collect_weather_context_uses_details_then_skips_fallback(self) -> None:
         calls: list[str] = []
 
@@ -141,6 +206,49 @@ class TestPipelineContextCollectors(unittest.TestCase):
         self.assertEqual(result["aqi"], 55)
         self.assertEqual(calls, ["weather.details", "weather.fallback"])
 
+    def test_recompute_misery_scores_uses_nearest_stored_hour(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            settings = _settings(processed_log_file=Path(tmpdir) / "processed.log")
+            day_start = int(datetime(2026, 3, 7, 5, tzinfo=timezone.utc).timestamp())
+            upsert_weather_days(
+                settings.processed_log_file,
+                [
+                    {
+                        "cell": "33.80,-84.40",
+                        "local_date": "2026-03-07",
+                        "tz_id": "America/New_York",
+                        "hours": [
+                            {
+                                "time_epoch": day_start + index * 3600,
+                                "temp_f": 40.0 + index * 2,
+                                "dewpoint_f": 30.0,
+                                "humidity": 50.0,
+                                "wind_mph": 5.0,
+                                "is_day": 1,
+                            }
+                            for index in range(24)
+                        ],
+                    }
+                ],
+            )
+            register_activity_weather_targets(
+                settings.processed_log_file,
+                [
+                    {"activity_id": "1", "start_utc": "2026-03-07T10:10:00Z", "cell": "33.80,-84.40", "local_date": "2026-03-07"},
+                    {"activity_id": "2", "start_utc": "2026-03-07T21:50:00Z", "cell": "33.80,-84.40", "local_date": "2026-03-07"},
+                    {"activity_id": "3", "start_utc": "2026-03-08T12:00:00Z", "cell": "40.70,-74.00", "local_date": "2026-03-08"},
+                ],
+            )
+
+            stats = recompute_misery_scores(settings)
+            scores = {item["activity_id"]: item for item in list_activity_misery_scores(settings.processed_log_file)}
+
+        self.assertEqual(stats, {"activities": 3, "missing_weather": 1, "scored": 2})
+        self.assertEqual(sorted(scores), ["1", "2"])
+        self.assertEqual(scores["1"]["misery_index"], _misery_score_for_temp(50.0))
+        self.assertEqual(scores["2"]["misery_index"], _misery_score_for_temp(74.0))
+        self.assertIsInstance(scores["2"]["description"], str)
+
     def test_collect_crono_context_disabled(self) -> None:
         calls: list[str] = []
 
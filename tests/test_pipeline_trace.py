@@ -0,0 +1,82 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+from chronicle.activity_pipeline import _persist_cycle_trace
+from chronicle.pipeline_trace import (
+    begin_cycle_trace,
+    end_cycle_trace,
+    stage_percentiles,
+    trace_active,
+    trace_count,
+    trace_span,
+)
+from chronicle.storage import get_runtime_value, get_runtime_values, set_runtime_values
+
+
+class TestPipelineTrace(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self._old_runtime = os.environ.get("RUNTIME_DB_FILE")
+        os.environ["RUNTIME_DB_FILE"] = "runtime_state.db"
+        self.processed_log_file = Path(self.temp_dir.name) / "processed_activities.log"
+
+    def tearDown(self) -> None:
+        if self._old_runtime is None:
+            os.environ.pop("RUNTIME_DB_FILE", None)
+        else:
+            os.environ["RUNTIME_DB_FILE"] = self._old_runtime
+        self.temp_dir.cleanup()
+
+    def test_disabled_trace_is_a_noop(self) -> None:
+        token = begin_cycle_trace(False)
+        self.assertIsNone(token)
+        self.assertFalse(trace_active())
+        with trace_span("build_context"):
+            trace_count("rows_read", 5)
+        self.assertIsNone(end_cycle_trace(token))
+
+    def test_nested_spans_collect_inclusive_storage_counters(self) -> None:
+        set_runtime_values(self.processed_log_file, {"warm": True})
+        token = begin_cycle_trace(True)
+        with trace_span("storage_writes"):
+            set_runtime_values(self.processed_log_file, {"a": 1, "b": 2})
+            with trace_span("read_back"):
+                get_runtime_values(self.processed_log_file, ["a", "b"])
+        trace = end_cycle_trace(token)
+        self.assertFalse(trace_active())
+
+        payload = trace.as_dict()
+        self.assertEqual(set(payload["stages_ms"]), {"storage_writes", "storage_writes/read_back"})
+        outer = payload["spans"][0]
+        self.assertEqual(outer["counters"]["storage_calls"], 2)
+        self.assertEqual(outer["counters"]["rows_written"], 2)
+        self.assertEqual(outer["counters"]["rows_read"], 2)
+        self.assertGreater(outer["counters"]["bytes_serialized"], 0)
+        self.assertEqual(outer["children"][0]["counters"], {"storage_calls": 1, "rows_read": 2})
+
+    def test_persisted_trace_keeps_rolling_stage_percentiles(self) -> None:
+        settings = SimpleNamespace(processed_log_file=self.processed_log_file)
+        for _ in range(3):
+            token = begin_cycle_trace(True)
+            with trace_span("template_render"):
+                pass
+            _persist_cycle_trace(settings, end_cycle_trace(token))
+
+        stored = get_runtime_value(self.processed_log_file, "cycle.trace")
+        self.assertEqual(stored["history_cycles"], 3)
+        self.assertEqual(stored["stage_percentiles_ms"]["template_render"]["count"], 3)
+        self.assertEqual(len(get_runtime_value(self.processed_log_file, "cycle.trace_history")), 3)
+
+    def test_stage_percentiles_use_nearest_rank(self) -> None:
+        history = [{"stages_ms": {"render": float(value)}} for value in range(1, 21)]
+        summary = stage_percentiles(history)["render"]
+        self.assertEqual(summary["p50_ms"], 10.0)
+        self.assertEqual(summary["p95_ms"], 19.0)
+        self.assertEqual(summary["max_ms"], 20.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
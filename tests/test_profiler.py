@@ -0,0 +1,168 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+from chronicle.profiler import (
+    PROFILER_RESULTS_RETAINED,
+    arm_profiler,
+    arm_profiler_from_env,
+    disarm_profiler,
+    get_profiler_arm,
+    list_profile_results,
+    profiles_dir,
+    start_profile_session,
+    top_functions,
+)
+
+
+def _busy_loop(seconds: float) -> int:
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(200))
+    return total
+
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self._old_runtime = os.environ.get("RUNTIME_DB_FILE")
+        os.environ["RUNTIME_DB_FILE"] = "runtime_state.db"
+        state_dir = Path(self.temp_dir.name)
+        self.settings = SimpleNamespace(
+            state_dir=state_dir,
+            processed_log_file=state_dir / "processed_activities.log",
+            profiler_mode="sample",
+            profiler_sample_interval_ms=1,
+        )
+
+    def tearDown(self) -> None:
+        if self._old_runtime is None:
+            os.environ.pop("RUNTIME_DB_FILE", None)
+        else:
+            os.environ["RUNTIME_DB_FILE"] = self._old_runtime
+        self.temp_dir.cleanup()
+
+    def test_unarmed_profiler_starts_no_session(self) -> None:
+        self.assertIsNone(start_profile_session(self.settings, target="cycles", label="run_once"))
+        arm_profiler(self.settings, target="route", count=1, route="/plan/data.json")
+        self.assertIsNone(start_profile_session(self.settings, target="cycles", label="run_once"))
+        self.assertIsNone(
+            start_profile_session(self.settings, target="route", label="GET /health", route="/health")
+        )
+
+    def test_arm_validation_rejects_bad_input(self) -> None:
+        with self.assertRaises(ValueError):
+            arm_profiler(self.settings, target="everything", count=1)
+        with self.assertRaises(ValueError):
+            arm_profiler(self.settings, target="cycles", count=0)
+        with self.assertRaises(ValueError):
+            arm_profiler(self.settings, target="route", count=5, route="plan")
+        with self.assertRaises(ValueError):
+            arm_profiler(self.settings, target="cycles", count=1, mode="perf")
+
+    def test_claims_decrement_until_exhausted(self) -> None:
+        arm_profiler(self.settings, target="cycles", count=2)
+        for _ in range(2):
+            session = start_profile_session(self.settings, target="cycles", label="run_once")
+            self.assertIsNotNone(session)
+            session.finish()
+        self.assertEqual(get_profiler_arm(self.settings, "cycles")["remaining"], 0)
+        self.assertIsNone(start_profile_session(self.settings, target="cycles", label="run_once"))
+        self.assertEqual(len(list_profile_results(self.settings)), 2)
+
+    def test_disarm_cancels_remaining_slots(self) -> None:
+        self.assertEqual(disarm_profiler(self.settings), {})
+        arm_profiler(self.settings, target="cycles", count=5)
+        arm_profiler(self.settings, target="route", count=5, route="/plan/data.json")
+        disarmed = disarm_profiler(self.settings, target="cycles")
+        self.assertEqual(disarmed["cycles"]["remaining"], 0)
+        self.assertIsNone(start_profile_session(self.settings, target="cycles", label="run_once"))
+        self.assertEqual(get_profiler_arm(self.settings, "route")["remaining"], 5)
+        self.assertEqual(set(disarm_profiler(self.settings)), {"cycles", "route"})
+        self.assertEqual(get_profiler_arm(self.settings, "route")["remaining"], 0)
+
+    def test_env_arms_for_both_targets_coexist(self) -> None:
+        settings = SimpleNamespace(
+            **vars(self.settings),
+            profile_next_cycles=3,
+            profile_route="/plan/data.json",
+            profile_route_requests=2,
+        )
+        armed = arm_profiler_from_env(settings)
+        self.assertEqual([arm["target"] for arm in armed], ["cycles", "route"])
+        cycle_session = start_profile_session(settings, target="cycles", label="run_once")
+        self.assertIsNotNone(cycle_session)
+        cycle_session.finish()
+        route_session = start_profile_session(
+            settings, target="route", label="GET /plan/data.json", route="/plan/data.json"
+        )
+        self.assertIsNotNone(route_session)
+        route_session.finish()
+        self.assertEqual(get_profiler_arm(settings, "cycles")["remaining"], 2)
+        self.assertEqual(get_profiler_arm(settings, "route")["remaining"], 1)
+
+    def test_concurrent_results_are_all_recorded(self) -> None:
+        arm_profiler(self.settings, target="route", count=8, route="/plan/data.json")
+        sessions = [
+            start_profile_session(self.settings, target="route", label="GET /plan/data.json", route="/plan/data.json")
+            for _ in range(8)
+        ]
+        threads = [threading.Thread(target=session.finish) for session in sessions]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        recorded = {item["profile_id"] for item in list_profile_results(self.settings)}
+        self.assertEqual(recorded, {session.profile_id for session in sessions})
+
+    def test_sample_session_writes_collapsed_stacks_and_top_functions(self) -> None:
+        arm_profiler(self.settings, target="cycles", count=1)
+        session = start_profile_session(self.settings, target="cycles", label="run_once")
+        _busy_loop(0.2)
+        result = session.finish(status="ok")
+
+        self.assertEqual(result["mode"], "sample")
+        self.assertGreater(result["samples"], 0)
+        output = profiles_dir(self.settings) / result["file"]
+        self.assertTrue(output.name.endswith(".collapsed"))
+        self.assertIn("test_profiler.py:_busy_loop", output.read_text(encoding="utf-8"))
+
+        top = top_functions(self.settings, limit=500)
+        self.assertEqual(top["unit"], "samples")
+        self.assertEqual(top["profiles"], [result["profile_id"]])
+        self.assertEqual(top["total"], result["samples"])
+        loop_rows = [row for row in top["functions"] if row["function"] == "test_profiler.py:_busy_loop"]
+        self.assertEqual(len(loop_rows), 1)
+        self.assertGreaterEqual(loop_rows[0]["inclusive"], loop_rows[0]["self"])
+
+    def test_cprofile_session_reports_seconds(self) -> None:
+        arm_profiler(self.settings, target="route", count=1, route="/plan/data.json", mode="cprofile")
+        session = start_profile_session(
+            self.settings, target="route", label="GET /plan/data.json", route="/plan/data.json"
+        )
+        _busy_loop(0.05)
+        result = session.finish()
+        self.assertEqual(result["mode"], "cprofile")
+        self.assertTrue(result["file"].endswith(".pstats"))
+
+        top = top_functions(self.settings, profile_id=result["profile_id"], limit=50)
+        self.assertEqual(top["unit"], "seconds")
+        self.assertIn("test_profiler.py:_busy_loop", [row["function"] for row in top["functions"]])
+        with self.assertRaises(LookupError):
+            top_functions(self.settings, profile_id="missing")
+
+    def test_old_profiles_are_pruned(self) -> None:
+        arm_profiler(self.settings, target="cycles", count=PROFILER_RESULTS_RETAINED + 2)
+        for _ in range(PROFILER_RESULTS_RETAINED + 2):
+            start_profile_session(self.settings, target="cycles", label="run_once").finish()
+        self.assertEqual(len(list_profile_results(self.settings)), PROFILER_RESULTS_RETAINED)
+        self.assertEqual(len(list(profiles_dir(self.settings).iterdir())), PROFILER_RESULTS_RETAINED)
+
+
+if __name__ == "__main__":
+    unittest.main()
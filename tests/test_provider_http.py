@@ -0,0 +1,73 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from chronicle import provider_http
+from chronicle.stat_modules import smashrun
+
+
+class TestProviderHttp(unittest.TestCase):
+    def setUp(self) -> None:
+        provider_http.close_provider_sessions()
+        self.addCleanup(provider_http.close_provider_sessions)
+
+    def test_sessions_are_shared_per_host(self) -> None:
+        first = provider_http.session_for("https://api.smashrun.com/v1/my/stats")
+        second = provider_http.session_for("https://API.smashrun.com/v1/my/badges")
+        other = provider_http.session_for("http://api.weatherapi.com/v1/current.json")
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+
+    def test_pool_size_and_timeouts_are_configurable(self) -> None:
+        with patch.dict(
+            "os.environ",
+            {
+                "PROVIDER_HTTP_POOL_MAXSIZE": "3",
+                "PROVIDER_HTTP_CONNECT_TIMEOUT_SECONDS": "2",
+                "PROVIDER_HTTP_READ_TIMEOUT_SECONDS": "12",
+            },
+        ):
+            session = provider_http.session_for("https://intervals.icu/api/v1/athlete")
+            adapter = session.get_adapter("https://intervals.icu/")
+            self.assertEqual(adapter._pool_maxsize, 3)
+            self.assertEqual(provider_http._resolve_timeout(None), (2.0, 12.0))
+            self.assertEqual(provider_http._resolve_timeout(30), (2.0, 12.0))
+            self.assertEqual(provider_http._resolve_timeout(5), (2.0, 5.0))
+            self.assertEqual(provider_http._resolve_timeout((1, 5)), (1.0, 5.0))
+            self.assertEqual(provider_http._resolve_timeout((5, 60)), (2.0, 12.0))
+
+    def test_configured_read_timeout_caps_provider_calls(self) -> None:
+        response = MagicMock(status_code=200)
+        response.json.return_value = {"totalDistance": 1.0}
+        with patch.dict("os.environ", {"PROVIDER_HTTP_READ_TIMEOUT_SECONDS": "5"}), patch.object(
+            requests.Session, "request", return_value=response
+        ) as mocked_request:
+            self.assertEqual(smashrun.get_stats("token"), {"totalDistance": 1.0})
+        self.assertEqual(smashrun.TIMEOUT_SECONDS, 30)
+        self.assertEqual(mocked_request.call_args.kwargs["timeout"], (5.0, 5.0))
+
+    def test_request_records_host_counts_and_latency_histogram(self) -> None:
+        ok = MagicMock(status_code=200)
+        failing = MagicMock(status_code=503)
+        with patch.object(
+            requests.Session,
+            "request",
+            side_effect=[ok, failing, requests.ConnectionError("reset")],
+        ) as mocked_request:
+            provider_http.get("https://api.smashrun.com/v1/my/stats", timeout=5)
+            provider_http.get("https://api.smashrun.com/v1/my/badges")
+            with self.assertRaises(requests.ConnectionError):
+                provider_http.get("https://api.smashrun.com/v1/my/activities")
+
+        self.assertEqual(mocked_request.call_args_list[0].kwargs["timeout"], (5.0, 5.0))
+        stats = provider_http.host_metrics_snapshot()["https://api.smashrun.com"]
+        self.assertEqual(stats["requests"], 3)
+        self.assertEqual(stats["errors"], 2)
+        self.assertEqual(stats["status_classes"], {"2xx": 1, "5xx": 1})
+        self.assertEqual(sum(stats["latency_buckets_ms"].values()), 3)
+        self.assertEqual(stats["last_error"], "reset")
+
+
+if __name__ == "__main__":
+    unittest.main()
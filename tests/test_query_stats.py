@@ -0,0 +1,79 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from chronicle.query_stats import main, persist_worker_statement_stats, plan_findings, statement_report, statement_rows
+from chronicle.storage import get_runtime_value, reset_sqlite_statement_stats, set_runtime_value
+
+
+class TestQueryStats(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self._old_runtime = os.environ.get("RUNTIME_DB_FILE")
+        os.environ["RUNTIME_DB_FILE"] = "runtime_state.db"
+        state_dir = Path(self.temp_dir.name)
+        self.settings = SimpleNamespace(state_dir=state_dir, processed_log_file=state_dir / "processed_activities.log")
+        reset_sqlite_statement_stats()
+
+    def tearDown(self) -> None:
+        reset_sqlite_statement_stats()
+        if self._old_runtime is None:
+            os.environ.pop("RUNTIME_DB_FILE", None)
+        else:
+            os.environ["RUNTIME_DB_FILE"] = self._old_runtime
+        self.temp_dir.cleanup()
+
+    def test_plan_findings_flag_full_scans_and_temp_sorts(self) -> None:
+        findings = plan_findings(
+            [
+                "SCAN runtime_kv",
+                "SEARCH jobs USING INDEX idx_jobs_status_available (status=?)",
+                "SCAN json_each VIRTUAL TABLE INDEX 1:",
+                "USE TEMP B-TREE FOR ORDER BY",
+            ]
+        )
+        self.assertEqual(findings, {"full_scan_tables": ["runtime_kv"], "temp_btree": True})
+        self.assertEqual(plan_findings(None), {"full_scan_tables": [], "temp_btree": False})
+
+    def test_statement_rows_sort_and_limit(self) -> None:
+        statements = {
+            "SELECT a": {"op": "select", "count": 100, "total_ms": 50.0, "max_ms": 2.0, "slow_count": 0, "plan": None},
+            "SELECT b": {"op": "select", "count": 2, "total_ms": 80.0, "max_ms": 70.0, "slow_count": 1, "plan": None},
+        }
+        self.assertEqual([row["statement"] for row in statement_rows(statements)], ["SELECT b", "SELECT a"])
+        by_count = statement_rows(statements, sort="count", limit=1)
+        self.assertEqual([row["statement"] for row in by_count], ["SELECT a"])
+        self.assertEqual(by_count[0]["mean_ms"], 0.5)
+
+    def test_worker_stats_round_trip_with_explain(self) -> None:
+        set_runtime_value(self.settings.processed_log_file, "warm", True)
+        get_runtime_value(self.settings.processed_log_file, "warm")
+        persist_worker_statement_stats(self.settings)
+
+        report = statement_report(self.settings, explain=True, limit=500)
+        rows = {row["statement"]: row for row in report["processes"]["worker"]["statements"]}
+        lookup = rows["SELECT value_json FROM runtime_kv WHERE key = ? LIMIT ?"]
+        self.assertGreaterEqual(lookup["count"], 1)
+        self.assertTrue(any("runtime_kv" in line for line in lookup["plan"]))
+        self.assertEqual(lookup["full_scan_tables"], [])
+        self.assertEqual(rows["PRAGMA journal_mode=WAL"]["plan"], [])
+        self.assertNotIn("api", report["processes"])
+
+    def test_cli_prints_table(self) -> None:
+        set_runtime_value(self.settings.processed_log_file, "warm", True)
+        persist_worker_statement_stats(self.settings)
+        output = io.StringIO()
+        with mock.patch.dict(os.environ, {"STATE_DIR": self.temp_dir.name}), contextlib.redirect_stdout(output):
+            self.assertEqual(main(["--sort", "count", "--limit", "500"]), 0)
+        text = output.getvalue()
+        self.assertIn("[worker]", text)
+        self.assertIn("INSERT INTO runtime_kv (key, value_json, updated_at_utc) VALUES (?, ?, ?)", text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,22 +7,36 @@ from unittest import mock
 
 import chronicle.storage as storage
 from chronicle.storage import (
+    ACTIVITY_JOB_LATEST_TARGET,
+    JOB_REQUEST_KINDS_RERUN,
     acquire_runtime_lock,
+    archive_activity_template_context,
+    bind_activity_job_target,
     claim_activity_job,
     cleanup_runtime_state,
+    clear_intervals_metrics,
     complete_activity_job_run,
+    count_intervals_metrics,
     enqueue_activity_job,
     get_activity_job,
     get_activity_summit_metric,
     get_activity_state,
+    get_garmin_daily_metrics,
+    get_weather_aqi,
+    get_weather_days,
     get_plan_day,
     get_plan_setting,
+    list_archived_template_contexts,
     list_plan_days,
     list_plan_sessions,
     get_runtime_value,
     get_runtime_values,
     is_activity_processed,
     is_worker_healthy,
+    latest_change_event_seq,
+    list_change_events,
+    list_claimable_activity_jobs,
+    list_intervals_metrics,
     mark_activity_processed,
     requeue_expired_jobs,
     start_activity_job_run,
@@ -37,6 +51,10 @@ from chronicle.storage import (
     set_worker_heartbeat,
     sum_activity_summit_metrics,
     upsert_activity_summit_metric,
+    upsert_garmin_daily_metrics,
+    upsert_weather_aqi,
+    upsert_weather_days,
+    upsert_intervals_metrics,
     upsert_plan_days_bulk,
     upsert_plan_day,
     write_json,
@@ -165,6 +183,119 @@ class TestStorage(unittest.TestCase):
             )
             self.assertEqual(sum_activity_summit_metrics(path, location_key="royale_hill"), 8)
 
+    def test_garmin_daily_metrics_respect_expiry(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "processed.log"
+            now = datetime(2026, 3, 10, 12, 0, tzinfo=timezone.utc)
+            stored = upsert_garmin_daily_metrics(
+                path,
+                [
+                    {"metric": "rhr_day", "metric_date": "2026-03-01", "payload": {"value": 44}},
+                    {
+                        "metric": "rhr_day",
+                        "metric_date": "2026-03-10",
+                        "payload": {"value": 47},
+                        "expires_at_utc": now + timedelta(minutes=30),
+                    },
+                    {"metric": "", "metric_date": "2026-03-10", "payload": {}},
+                ],
+                now_utc=now,
+            )
+            self.assertEqual(stored, 2)
+
+            keys = [("rhr_day", "2026-03-01"), ("rhr_day", "2026-03-10"), ("hill_score", "2026-03-01")]
+            self.assertEqual(
+                get_garmin_daily_metrics(path, keys, now_utc=now),
+                {("rhr_day", "2026-03-01"): {"value": 44}, ("rhr_day", "2026-03-10"): {"value": 47}},
+            )
+            later = now + timedelta(hours=1)
+            self.assertEqual(
+                get_garmin_daily_metrics(path, keys, now_utc=later),
+                {("rhr_day", "2026-03-01"): {"value": 44}},
+            )
+            stats = cleanup_runtime_state(path, now_utc=later)
+            self.assertEqual(stats["garmin_daily_metrics_deleted"], 1)
+
+    def test_weather_days_replace_hours_and_respect_expiry(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "processed.log"
+            now = datetime(2026, 3, 10, 12, 0, tzinfo=timezone.utc)
+            hours = [{"time_epoch": 1772000000 + index * 3600, "temp_f": 50.0 + index} for index in range(24)]
+            stored = upsert_weather_days(
+                path,
+                [
+                    {"cell": "33.80,-84.40", "local_date": "2026-03-01", "tz_id": "America/New_York", "hours": hours},
+                    {
+                        "cell": "33.80,-84.40",
+                        "local_date": "2026-03-10",
+                        "hours": hours[:2],
+                        "expires_at_utc": now + timedelta(minutes=30),
+                    },
+                ],
+                now_utc=now,
+            )
+            self.assertEqual(stored, 2)
+            upsert_weather_days(
+                path,
+                [{"cell": "33.80,-84.40", "local_date": "2026-03-01", "tz_id": "America/New_York", "hours": hours[:3]}],
+                now_utc=now,
+            )
+
+            keys = [("33.80,-84.40", "2026-03-01"), ("33.80,-84.40", "2026-03-10"), ("40.70,-74.00", "2026-03-01")]
+            found = get_weather_days(path, keys, now_utc=now)
+            self.assertEqual(sorted(found), keys[:2])
+            self.assertEqual(found[keys[0]]["tz_id"], "America/New_York")
+            self.assertEqual([hour["temp_f"] for hour in found[keys[0]]["hours"]], [50.0, 51.0, 52.0])
+
+            later = now + timedelta(hours=1)
+            self.assertEqual(sorted(get_weather_days(path, keys, now_utc=later)), keys[:1])
+            self.assertTrue(upsert_weather_aqi(path, "33.80,-84.40", 2, expires_at_utc=now + timedelta(minutes=15), now_utc=now))
+            self.assertEqual(get_weather_aqi(path, "33.80,-84.40", now_utc=now)["us_epa_index"], 2)
+            self.assertIsNone(get_weather_aqi(path, "33.80,-84.40", now_utc=later))
+            stats = cleanup_runtime_state(path, now_utc=later)
+            self.assertEqual(stats["weather_cache_deleted"], 3)
+
+    def test_intervals_metrics_upsert_and_keyed_lookup(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "processed.log"
+            upserted = upsert_intervals_metrics(
+                path,
+                [
+                    {
+                        "strava_activity_id": "1001",
+                        "start_date": "2026-02-01T10:15:00+00:00",
+                        "avg_fitness": 70.0,
+                    },
+                    {
+                        "strava_activity_id": None,
+                        "start_date": "2026-02-01T18:30:00+00:00",
+                        "avg_efficiency_factor": 1.1,
+                    },
+                    {"strava_activity_id": None, "start_date": ""},
+                ],
+            )
+            self.assertEqual(upserted, 2)
+            self.assertEqual(count_intervals_metrics(path), 2)
+
+            upsert_intervals_metrics(
+                path,
+                [{"strava_activity_id": "1001", "start_date": "2026-02-01T10:15:00+00:00", "avg_fitness": 71.0}],
+            )
+            self.assertEqual(count_intervals_metrics(path), 2)
+
+            by_id = list_intervals_metrics(path, activity_ids=["1001", "9999"])
+            self.assertEqual(len(by_id), 1)
+            self.assertEqual(by_id[0]["avg_fitness"], 71.0)
+            self.assertNotIn("avg_efficiency_factor", by_id[0])
+
+            by_minute = list_intervals_metrics(path, start_minutes=["2026-02-01T18:30:00+00:00"])
+            self.assertEqual(len(by_minute), 1)
+            self.assertIsNone(by_minute[0]["strava_activity_id"])
+            self.assertEqual(list_intervals_metrics(path), [])
+
+            self.assertEqual(clear_intervals_metrics(path), 2)
+            self.assertEqual(count_intervals_metrics(path), 0)
+
     def test_plan_day_round_trip(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
             path = Path(tmpdir) / "processed.log"
@@ -506,6 +637,112 @@ class TestStorage(unittest.TestCase):
             assert job is not None
             self.assertEqual(job["status"], "queued")
 
+    def test_claimable_rerun_jobs_and_latest_target_binding(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "processed.log"
+            enqueue_activity_job(
+                path,
+                777,
+                request_kind="auto_poll",
+                requested_by="worker",
+                force_update=False,
+            )
+            latest_job_id = enqueue_activity_job(
+                path,
+                ACTIVITY_JOB_LATEST_TARGET,
+                request_kind="rerun_latest",
+                requested_by="api",
+                force_update=True,
+                priority=10,
+            )
+            self.assertIsNotNone(latest_job_id)
+            self.assertIsNone(get_activity_state(path, ACTIVITY_JOB_LATEST_TARGET))
+
+            claimable = list_claimable_activity_jobs(path, request_kinds=JOB_REQUEST_KINDS_RERUN)
+            self.assertEqual([job["job_id"] for job in claimable], [latest_job_id])
+
+            self.assertTrue(claim_activity_job(path, str(latest_job_id), owner="owner-a", lease_seconds=300))
+            started = start_activity_job_run(path, str(latest_job_id), owner="owner-a")
+            self.assertIsNotNone(started)
+            self.assertEqual(list_claimable_activity_jobs(path, request_kinds=JOB_REQUEST_KINDS_RERUN), [])
+
+            self.assertTrue(bind_activity_job_target(path, str(latest_job_id), 888))
+            job = get_activity_job(path, str(latest_job_id))
+            assert job is not None
+            self.assertEqual(job["activity_id"], "888")
+            state = get_activity_state(path, 888)
+            assert state is not None
+            self.assertEqual(state["last_job_id"], latest_job_id)
+            self.assertEqual(state["state"], "running")
+            with sqlite3.connect(Path(tmpdir) / "runtime_state.db") as conn:
+                activity_ids = [row[0] for row in conn.execute("SELECT activity_id FROM activities")]
+            self.assertNotIn(ACTIVITY_JOB_LATEST_TARGET, activity_ids)
+
+    def test_legacy_not_null_job_tables_are_rebuilt(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "processed.log"
+            with sqlite3.connect(Path(tmpdir) / "runtime_state.db") as conn:
+                conn.execute(
+                    "CREATE TABLE activities (activity_id TEXT PRIMARY KEY, first_seen_at_utc TEXT NOT NULL, "
+                    "last_seen_at_utc TEXT NOT NULL, sport_type TEXT, start_date_utc TEXT, updated_at_utc TEXT NOT NULL)"
+                )
+                for table, template in (("jobs", storage._JOBS_TABLE_SQL), ("runs", storage._RUNS_TABLE_SQL)):
+                    conn.execute(template.format(table=table).replace("activity_id TEXT,", "activity_id TEXT NOT NULL,"))
+                conn.execute("INSERT INTO activities VALUES ('latest', 't', 't', NULL, NULL, 't')")
+                conn.execute(
+                    "INSERT INTO jobs (job_id, activity_id, request_kind, requested_by, status, requested_at_utc, "
+                    "available_at_utc, updated_at_utc) VALUES ('job-1', 'latest', 'rerun_latest', 'api', 'queued', 't', 't', 't')"
+                )
+
+            job = get_activity_job(path, "job-1")
+            assert job is not None
+            self.assertEqual(job["activity_id"], ACTIVITY_JOB_LATEST_TARGET)
+            with sqlite3.connect(Path(tmpdir) / "runtime_state.db") as conn:
+                self.assertEqual(conn.execute("SELECT activity_id FROM jobs").fetchall(), [(None,)])
+                self.assertEqual(conn.execute("SELECT COUNT(*) FROM activities").fetchone(), (0,))
+                notnull = {row[1]: row[3] for row in conn.execute("PRAGMA table_info(runs)")}
+                indexes = {row[1] for row in conn.execute("PRAGMA index_list(jobs)")}
+            self.assertEqual(notnull["activity_id"], 0)
+            self.assertIn("idx_jobs_status_available", indexes)
+
+    def test_change_log_records_job_transitions_and_worker_state(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "processed.log"
+            self.assertEqual(latest_change_event_seq(path), 0)
+            job_id = enqueue_activity_job(
+                path,
+                321,
+                request_kind="rerun_activity",
+                requested_by="api",
+                force_update=True,
+            )
+            self.assertTrue(claim_activity_job(path, str(job_id), owner="owner-a", lease_seconds=300))
+            set_worker_heartbeat(path)
+            set_runtime_values(
+                path,
+                {
+                    "worker.state": "sleeping",
+                    "worker.activity_detection.status": "no_new_activity",
+                    "unrelated.key": 1,
+                },
+            )
+
+            events = list_change_events(path)
+            self.assertEqual(
+                [(event["topic"], event["payload"].get("status")) for event in events[:2]],
+                [("job", "queued"), ("job", "claimed")],
+            )
+            self.assertEqual(events[0]["payload"]["request_kind"], "rerun_activity")
+            self.assertEqual(
+                {event["topic"]: event["payload"]["values"] for event in events[2:]},
+                {
+                    "worker": {"worker.state": "sleeping"},
+                    "activity_detection": {"worker.activity_detection.status": "no_new_activity"},
+                },
+            )
+            self.assertEqual(latest_change_event_seq(path), events[-1]["seq"])
+            self.assertEqual(list_change_events(path, after_seq=events[1]["seq"]), events[2:])
+
     def test_write_config_snapshot(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
             path = Path(tmpdir) / "processed.log"
@@ -513,6 +750,35 @@ class TestStorage(unittest.TestCase):
             self.assertIsNotNone(snapshot_id)
             self.assertTrue(str(snapshot_id))
 
+    def test_archived_template_contexts_are_bounded_and_filterable_by_profile(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "processed.log"
+            for index in range(4):
+                self.assertTrue(
+                    archive_activity_template_context(
+                        path,
+                        f"a{index}",
+                        context={"activity": {"index": index}},
+                        profile_id="long_run" if index % 2 else "default",
+                        keep=3,
+                    )
+                )
+
+            for index in range(4, 8):
+                archive_activity_template_context(
+                    path,
+                    f"a{index}",
+                    context={"activity": {"index": index}},
+                    profile_id="default",
+                    keep=3,
+                )
+
+            archived = list_archived_template_contexts(path, limit=10)
+            self.assertEqual({item["activity_id"] for item in archived}, {"a1", "a3", "a5", "a6", "a7"})
+            long_runs = list_archived_template_contexts(path, limit=10, profile_id="long_run")
+            self.assertEqual({item["activity_id"] for item in long_runs}, {"a1", "a3"})
+            self.assertEqual(long_runs[0]["context"]["activity"]["index"] % 2, 1)
+
     def test_cleanup_runtime_state_prunes_stale_records(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
             path = Path(tmpdir) / "processed.log"
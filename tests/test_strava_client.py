@@ -1,3 +1,5 @@
+import threading
+import time
 import unittest
 from datetime import datetime
 
@@ -67,29 +69,100 @@ class TestStravaUtils(unittest.TestCase):
         self.assertEqual(client.calls[0]["params"], {"keys": "latlng", "key_by_type": "true"})
 
     def test_get_activities_after_honors_max_page_cap(self) -> None:
-        class _PagedClient:
-            def __init__(self):
-                self.calls = []
-
-            def _request(self, method, path, *, params=None, data=None):
-                self.calls.append({"method": method, "path": path, "params": params, "data": data})
-                per_page = int(params["per_page"])
-                return _DummyResponse([{"id": len(self.calls) * 1000 + idx} for idx in range(per_page)])
-
+        client = _PagedClient(total_pages=None, per_page=2)
         original_cap = strava_client.MAX_ACTIVITY_PAGES
         strava_client.MAX_ACTIVITY_PAGES = 3
         try:
-            client = _PagedClient()
-            activities = StravaClient.get_activities_after(
-                client,
-                datetime(2026, 1, 1),
-                per_page=2,
-            )
-            self.assertEqual(len(client.calls), 3)
+            activities = client.get_activities_after(datetime(2026, 1, 1), per_page=2)
+            self.assertEqual(client.page_calls(), [1, 2, 3])
             self.assertEqual(len(activities), 6)
         finally:
             strava_client.MAX_ACTIVITY_PAGES = original_cap
 
+    def test_iter_activities_after_fetches_estimated_pages_concurrently_in_order(self) -> None:
+        client = _PagedClient(total_pages=5, per_page=3, last_page_size=1)
+        activities = list(client.iter_activities_after(datetime(2026, 1, 1), per_page=3, max_concurrency=3))
+
+        self.assertEqual([item["id"] for item in activities], list(range(13)))
+        self.assertEqual(sorted(client.page_calls()), [1, 2, 3, 4, 5])
+        self.assertIn("/athletes/7/stats", [call["path"] for call in client.calls])
+        self.assertGreater(client.max_in_flight, 1)
+
+    def test_iter_activities_after_goes_serial_near_rate_limit(self) -> None:
+        client = _PagedClient(total_pages=5, per_page=2, last_page_size=0, usage="590,900")
+        activities = list(
+            client.iter_activities_after(datetime(2026, 1, 1), per_page=2, estimated_total=8, max_concurrency=4)
+        )
+
+        self.assertEqual(len(activities), 8)
+        self.assertEqual(client.rate_limit_remaining, 10)
+        self.assertEqual(client.max_in_flight, 1)
+        self.assertNotIn("/athlete", [call["path"] for call in client.calls])
+
+
+class _HeaderResponse(_DummyResponse):
+    def __init__(self, payload, headers=None):
+        super().__init__(payload)
+        self.headers = headers or {}
+        self.status_code = 200
+
+    def raise_for_status(self):
+        return None
+
+
+class _PagedSession:
+    def __init__(self, client):
+        self.client = client
+
+    def request(self, method, url, **kwargs):
+        return self.client.respond(url.replace(strava_client.API_URL, ""), kwargs.get("params"))
+
+
+class _PagedClient(StravaClient):
+    def __init__(self, *, total_pages, per_page, last_page_size=None, usage=None):
+        self.access_token = "token"
+        self.refresh_token = "refresh"
+        self.rate_limit_remaining = None
+        self._token_lock = threading.Lock()
+        self.session = _PagedSession(self)
+        self.total_pages = total_pages
+        self.per_page = per_page
+        self.last_page_size = per_page if last_page_size is None else last_page_size
+        self.usage = usage
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def page_calls(self):
+        return [call["params"]["page"] for call in self.calls if call["path"] == "/athlete/activities"]
+
+    def respond(self, path, params):
+        with self.lock:
+            self.calls.append({"path": path, "params": params})
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            headers = {"X-RateLimit-Limit": "600,6000", "X-RateLimit-Usage": self.usage} if self.usage else {}
+            if path == "/athlete":
+                return _HeaderResponse({"id": 7}, headers)
+            if path == "/athletes/7/stats":
+                count = (self.total_pages or 1) * self.per_page
+                return _HeaderResponse({"all_run_totals": {"count": count}}, headers)
+            page = int(params["page"])
+            # Later pages answer first, so ordering comes from the client, not the server.
+            time.sleep(0.01 * max(0, 6 - page))
+            if self.total_pages is None or page < self.total_pages:
+                size = self.per_page
+            elif page == self.total_pages:
+                size = self.last_page_size
+            else:
+                size = 0
+            start = (page - 1) * self.per_page
+            return _HeaderResponse([{"id": start + index} for index in range(size)], headers)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,130 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from datetime import date, datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from chronicle.dashboard_data import dashboard_data_path
+from chronicle.storage import list_activity_misery_scores, write_json
+from chronicle.weather_backfill import main, run_weather_backfill
+
+
+def _fake_weather_get(url, params, timeout):
+    start = date.fromisoformat(params["dt"])
+    end = date.fromisoformat(params.get("end_dt", params["dt"]))
+    days = []
+    for ordinal in range(start.toordinal(), end.toordinal() + 1):
+        day = date.fromordinal(ordinal)
+        day_start = int(datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp())
+        days.append(
+            {
+                "date": day.isoformat(),
+                "hour": [
+                    {
+                        "time_epoch": day_start + hour * 3600,
+                        "temp_f": 60.0 + hour,
+                        "dewpoint_f": 40.0,
+                        "humidity": 50,
+                        "wind_mph": 5.0,
+                    }
+                    for hour in range(24)
+                ],
+            }
+        )
+    response = MagicMock()
+    response.json.return_value = {"location": {"tz_id": "UTC"}, "forecast": {"forecastday": days}}
+    return response
+
+
+class _FakeStravaClient:
+    summaries = [
+        {"id": 11, "start_date": "2026-03-01T12:00:00Z", "start_date_local": "2026-03-01T12:00:00Z", "start_latlng": [33.75, -84.39]},
+        {"id": 12, "start_date": "2026-03-02T08:00:00Z", "start_date_local": "2026-03-02T08:00:00Z", "start_latlng": [33.75, -84.39]},
+        {"id": 13, "start_date": "2026-03-02T18:00:00Z", "start_date_local": "2026-03-02T18:00:00Z", "start_latlng": []},
+        {"id": 14, "start_date": "2026-03-20T08:00:00Z", "start_date_local": "2026-03-20T08:00:00Z", "start_latlng": [33.75, -84.39]},
+    ]
+
+    def __init__(self, settings):
+        self.settings = settings
+
+    def iter_activities_after(self, after_dt, per_page=200):
+        return (summary for summary in self.summaries if summary["start_date"] > after_dt.isoformat())
+
+
+class TestWeatherBackfill(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self._old_runtime = os.environ.get("RUNTIME_DB_FILE")
+        os.environ["RUNTIME_DB_FILE"] = "runtime_state.db"
+        state_dir = Path(self.temp_dir.name)
+        self.settings = SimpleNamespace(
+            state_dir=state_dir,
+            processed_log_file=state_dir / "processed_activities.log",
+            weather_api_key="weather-key",
+            timezone="UTC",
+        )
+
+    def tearDown(self) -> None:
+        if self._old_runtime is None:
+            os.environ.pop("RUNTIME_DB_FILE", None)
+        else:
+            os.environ["RUNTIME_DB_FILE"] = self._old_runtime
+        self.temp_dir.cleanup()
+
+    def _write_dashboard_cache(self) -> None:
+        write_json(
+            dashboard_data_path(self.settings),
+            {
+                "activities": [
+                    {"id": "11", "date": "2026-03-01", "start_date_local": "2026-03-01T12:00:00Z"},
+                    {"id": "12", "date": "2026-03-02", "start_date_local": "2026-03-02T08:00:00Z"},
+                    {"id": "13", "date": "2026-03-02", "start_date_local": "2026-03-02T18:00:00Z"},
+                    {"id": "14", "date": "2026-03-20", "start_date_local": "2026-03-20T08:00:00Z"},
+                ]
+            },
+        )
+
+    def test_backfill_fetches_history_and_scores_range(self) -> None:
+        self._write_dashboard_cache()
+        with patch("chronicle.weather_backfill.StravaClient", _FakeStravaClient), patch(
+            "chronicle.stat_modules.misery_index.provider_http.get", side_effect=_fake_weather_get
+        ) as weather_get:
+            result = run_weather_backfill(
+                self.settings,
+                start_date=date(2026, 3, 1),
+                end_date=date(2026, 3, 5),
+            )
+
+        requested = [(call.kwargs["params"]["dt"], call.kwargs["params"].get("end_dt")) for call in weather_get.call_args_list]
+        self.assertEqual(requested, [("2026-03-01", "2026-03-02")])
+        self.assertEqual(result["activities"], 3)
+        self.assertEqual(result["summaries"], 3)
+        self.assertEqual(result["targets"], 2)
+        self.assertEqual(result["misery"]["scored"], 2)
+        self.assertEqual(result["misery"]["activities"], 2)
+        scores = {item["activity_id"] for item in list_activity_misery_scores(self.settings.processed_log_file)}
+        self.assertEqual(scores, {"11", "12"})
+
+        with patch("chronicle.weather_backfill.StravaClient", _FakeStravaClient), patch(
+            "chronicle.stat_modules.misery_index.provider_http.get", side_effect=_fake_weather_get
+        ) as cached_get:
+            run_weather_backfill(self.settings, start_date=date(2026, 3, 1), end_date=date(2026, 3, 5))
+        self.assertEqual(cached_get.call_count, 0)
+
+    def test_backfill_requires_cached_dashboard(self) -> None:
+        with self.assertRaises(LookupError):
+            run_weather_backfill(self.settings)
+        output = io.StringIO()
+        with patch("chronicle.weather_backfill.Settings.from_env", return_value=self.settings), contextlib.redirect_stdout(
+            output
+        ):
+            self.assertEqual(main(["--start-date", "2026-03-01"]), 1)
+        self.assertIn("not cached", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
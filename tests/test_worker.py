@@ -1,7 +1,17 @@
+import tempfile
 import unittest
 from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
 
-from chronicle.worker import _in_quiet_hours, _seconds_until_quiet_end, _should_refresh_dashboard
+from chronicle.storage import ACTIVITY_JOB_LATEST_TARGET, enqueue_activity_job
+from chronicle.worker import (
+    _in_quiet_hours,
+    _run_queued_rerun_jobs,
+    _seconds_until_quiet_end,
+    _should_refresh_dashboard,
+)
 
 
 class TestWorkerTiming(unittest.TestCase):
@@ -36,5 +46,55 @@ class TestWorkerDashboardRefresh(unittest.TestCase):
         self.assertFalse(_should_refresh_dashboard(None))
 
 
+class TestWorkerQueuedJobs(unittest.TestCase):
+    def test_run_queued_rerun_jobs_passes_job_targets_to_run_once(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            settings = SimpleNamespace(processed_log_file=Path(tmpdir) / "processed.log")
+            latest_job_id = enqueue_activity_job(
+                settings.processed_log_file,
+                ACTIVITY_JOB_LATEST_TARGET,
+                request_kind="rerun_latest",
+                requested_by="api",
+                force_update=True,
+                priority=10,
+            )
+            activity_job_id = enqueue_activity_job(
+                settings.processed_log_file,
+                4321,
+                request_kind="rerun_activity",
+                requested_by="api",
+                force_update=True,
+                priority=20,
+            )
+            with patch("chronicle.worker.run_once", return_value={"status": "already_processed"}) as run_once:
+                processed = _run_queued_rerun_jobs(settings)
+
+            self.assertEqual(processed, 2)
+            self.assertEqual(
+                [call.kwargs for call in run_once.call_args_list],
+                [
+                    {"force_update": True, "activity_id": None, "queued_job_id": latest_job_id},
+                    {"force_update": True, "activity_id": 4321, "queued_job_id": activity_job_id},
+                ],
+            )
+
+    def test_run_queued_rerun_jobs_stops_when_cycle_locked(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            settings = SimpleNamespace(processed_log_file=Path(tmpdir) / "processed.log")
+            for activity_id in (1, 2):
+                enqueue_activity_job(
+                    settings.processed_log_file,
+                    activity_id,
+                    request_kind="rerun_activity",
+                    requested_by="api",
+                    force_update=True,
+                )
+            with patch("chronicle.worker.run_once", return_value={"status": "locked"}) as run_once:
+                processed = _run_queued_rerun_jobs(settings)
+
+            self.assertEqual(processed, 0)
+            self.assertEqual(run_once.call_count, 1)
+
+
 if __name__ == "__main__":
     unittest.main()